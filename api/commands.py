@@ -42,8 +42,10 @@ from models.oauth import DatasourceOauthParamConfig, DatasourceProvider
 from models.provider import Provider, ProviderModel
 from models.provider_ids import DatasourceProviderID, ToolProviderID
 from models.source import DataSourceApiKeyAuthBinding, DataSourceOauthBinding
+from models.statistic import AppStatisticSource
 from models.tools import ToolOAuthSystemClient
 from services.account_service import AccountService, RegisterService, TenantService
+from services.app_statistic_rollup_service import AppStatisticRollupService
 from services.clear_free_plan_tenant_expired_logs import ClearFreePlanTenantExpiredLogs
 from services.plugin.data_migration import PluginDataMigration
 from services.plugin.plugin_migration import PluginMigration
@@ -2668,3 +2670,41 @@ def clean_expired_messages(
         raise
 
     click.echo(click.style("messages cleanup completed.", fg="green"))
+
+
+@click.command(
+    "backfill-app-statistic-rollups", help="Roll up the history of app messages and workflow runs for statistics."
+)
+@click.option(
+    "--since",
+    required=True,
+    type=click.DateTime(formats=["%Y-%m-%d", "%Y-%m-%dT%H:%M:%S"]),
+    help="UTC time to backfill from (inclusive).",
+)
+@click.option(
+    "--source",
+    "sources",
+    multiple=True,
+    type=click.Choice([source.value for source in AppStatisticSource]),
+    help="Source to backfill, may be repeated. Defaults to all sources.",
+)
+def backfill_app_statistic_rollups(since: datetime.datetime, sources: tuple[str, ...]):
+    """
+    Backfill the hourly app statistic rollups from a point in time up to the already rolled up hours.
+    """
+    service = AppStatisticRollupService()
+    for source in [AppStatisticSource(source) for source in sources] or list(AppStatisticSource):
+        click.echo(click.style(f"Backfilling {source} statistics since {since.isoformat()}.", fg="white"))
+        start_at = time.perf_counter()
+
+        def _on_progress(bucket_start: datetime.datetime, rows: int, source=source):
+            if bucket_start.hour == 0:
+                click.echo(f"  {source}: rolled up {bucket_start.date().isoformat()}")
+
+        hours = service.backfill(source, since, on_progress=_on_progress)
+        click.echo(
+            click.style(
+                f"Backfilled {hours} hours of {source} statistics in {time.perf_counter() - start_at:.2f}s.",
+                fg="green",
+            )
+        )
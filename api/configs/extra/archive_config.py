@@ -1,4 +1,4 @@
-from pydantic import Field
+from pydantic import Field, PositiveInt
 from pydantic_settings import BaseSettings
 
 
@@ -41,3 +41,8 @@ class ArchiveStorageConfig(BaseSettings):
         description="Region for storage (use 'auto' if the provider supports it)",
         default="auto",
     )
+
+    ARCHIVE_STORAGE_MULTIPART_CHUNK_SIZE_MB: PositiveInt = Field(
+        description="Part size in MB for multipart archive uploads and downloads, smaller objects use a single request",
+        default=16,
+    )
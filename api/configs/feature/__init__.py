@@ -201,6 +201,21 @@ class TriggerConfig(BaseSettings):
         default=10485760,
     )
 
+    WEBHOOK_ROUTING_CACHE_ENABLED: bool = Field(
+        description="Cache resolved webhook triggers, workflows and node configs in each process",
+        default=True,
+    )
+
+    WEBHOOK_ROUTING_CACHE_MAX_SIZE: PositiveInt = Field(
+        description="Maximum number of webhook routes cached in each process",
+        default=10000,
+    )
+
+    WEBHOOK_ROUTING_CACHE_TTL: PositiveInt = Field(
+        description="Seconds a cached webhook route is used before it is resolved from the database again",
+        default=300,
+    )
+
 
 class AsyncWorkflowConfig(BaseSettings):
     """
@@ -217,6 +232,17 @@ class AsyncWorkflowConfig(BaseSettings):
         ge=1,
     )
 
+    ASYNC_WORKFLOW_SCHEDULER_ADMISSION_DELAY: PositiveInt = Field(
+        description="Seconds a workflow run deferred by the fair share scheduler waits before it is retried",
+        default=5,
+    )
+
+    ASYNC_WORKFLOW_SCHEDULER_TENANT_TTL: PositiveInt = Field(
+        description="Seconds without queued or running workflows after which the fair share state of a tenant is"
+        " dropped",
+        default=3600,
+    )
+
 
 class PluginConfig(BaseSettings):
     """
@@ -265,6 +291,17 @@ class PluginConfig(BaseSettings):
         default=60 * 60,
     )
 
+    PLUGIN_MODEL_SCHEMA_LOCAL_CACHE_SIZE: PositiveInt = Field(
+        description="Maximum number of validated plugin model schemas cached in each process",
+        default=1024,
+    )
+
+    PLUGIN_MODEL_SCHEMA_LOCAL_CACHE_TTL: PositiveInt = Field(
+        description="TTL in seconds for plugin model schemas cached in each process, capped by"
+        " PLUGIN_MODEL_SCHEMA_CACHE_TTL",
+        default=60,
+    )
+
     PLUGIN_MAX_FILE_SIZE: PositiveInt = Field(
         description="Maximum allowed size (bytes) for plugin-generated files",
         default=50 * 1024 * 1024,
@@ -587,6 +624,27 @@ class HttpConfig(BaseSettings):
         default=False,
     )
 
+    HTTP_RESPONSE_CACHE_ENABLED: bool = Field(
+        description="Allow HTTP Request nodes and API tools that opt in to cache GET/HEAD responses",
+        default=True,
+    )
+
+    HTTP_RESPONSE_CACHE_MAX_ENTRY_SIZE: PositiveInt = Field(
+        description="Maximum size in bytes of a single cached HTTP response body",
+        default=1 * 1024 * 1024,
+    )
+
+    HTTP_RESPONSE_CACHE_LOCAL_MAX_SIZE: PositiveInt = Field(
+        description="Maximum total size in bytes of the cached HTTP response bodies kept in each process",
+        default=64 * 1024 * 1024,
+    )
+
+    HTTP_RESPONSE_CACHE_RETENTION: PositiveInt = Field(
+        description="Seconds a cached HTTP response with an ETag or Last-Modified header is kept in Redis"
+        " for conditional revalidation after it becomes stale",
+        default=3600,
+    )
+
 
 class InnerAPIConfig(BaseSettings):
     """
@@ -706,6 +764,15 @@ class WorkflowVariableTruncationConfig(BaseSettings):
         description="maximum length for array to trigger truncation.",
     )
 
+    WORKFLOW_DRAFT_VARIABLE_FLUSH_THRESHOLD: PositiveInt = Field(
+        100,
+        description="number of draft variables buffered during a debug run before they are written to the database",
+    )
+    WORKFLOW_DRAFT_VARIABLE_OFFLOAD_CONCURRENCY: PositiveInt = Field(
+        4,
+        description="maximum number of large draft variables of a node uploaded to storage concurrently",
+    )
+
 
 class WorkflowConfig(BaseSettings):
     """
@@ -759,6 +826,19 @@ class WorkflowConfig(BaseSettings):
         ge=0.1,
     )
 
+    WORKFLOW_PROFILING_ENABLED: bool = Field(
+        description="Enable per-node profiling of workflow runs (ready queue wait, wall and CPU time, event lag and"
+        " variable pool size), exported as OpenTelemetry metrics and span attributes",
+        default=False,
+    )
+
+    WORKFLOW_PAUSE_STATE_COMPRESSION_LEVEL: int = Field(
+        description="gzip compression level (1-9) for persisted workflow pause states, 0 stores them as plain JSON",
+        default=1,
+        ge=0,
+        le=9,
+    )
+
 
 class WorkflowNodeExecutionConfig(BaseSettings):
     """
@@ -896,6 +976,37 @@ class ToolConfig(BaseSettings):
         default=3600,
     )
 
+    AGENT_MAX_PARALLEL_TOOL_CALLS: PositiveInt = Field(
+        description="Default maximum number of tool calls from one function-calling agent turn that run concurrently,"
+        " 1 runs them sequentially. Agents can override it with `max_parallel_tool_calls` in their agent mode.",
+        default=1,
+    )
+
+    MCP_SESSION_POOL_ENABLED: bool = Field(
+        description="Keep MCP client sessions open after a tool call and reuse them for later calls",
+        default=True,
+    )
+
+    MCP_SESSION_POOL_MAX_IDLE_PER_PROVIDER: PositiveInt = Field(
+        description="Maximum number of idle pooled MCP sessions per provider and credentials",
+        default=4,
+    )
+
+    MCP_SESSION_POOL_MAX_SESSIONS: PositiveInt = Field(
+        description="Maximum number of idle pooled MCP sessions per process",
+        default=64,
+    )
+
+    MCP_SESSION_POOL_IDLE_TIMEOUT: PositiveInt = Field(
+        description="Seconds after which an unused pooled MCP session is closed",
+        default=300,
+    )
+
+    MCP_SESSION_POOL_HEALTH_CHECK_INTERVAL: NonNegativeInt = Field(
+        description="Pooled MCP sessions idle for longer than this many seconds are pinged before reuse",
+        default=30,
+    )
+
 
 class TemplateMode(StrEnum):
     # unsafe mode allows flexible operations in templates, but may cause security vulnerabilities
@@ -1081,6 +1192,16 @@ class DataSetConfig(BaseSettings):
         default=0,
     )
 
+    SEGMENT_HYDRATION_CACHE_ENABLED: bool = Field(
+        description="Enable caching in Redis of the document segments that retrieval results are loaded with",
+        default=True,
+    )
+
+    SEGMENT_HYDRATION_CACHE_TTL: PositiveInt = Field(
+        description="Time in seconds that a cached segment of a retrieval result is kept",
+        default=600,
+    )
+
 
 class WorkspaceConfig(BaseSettings):
     """
@@ -1108,6 +1229,27 @@ class IndexingConfig(BaseSettings):
         default=50,
     )
 
+    SEGMENT_BATCH_IMPORT_CHUNK_SIZE: PositiveInt = Field(
+        description="Number of CSV rows read, inserted and indexed together during a batch segment import",
+        default=500,
+    )
+
+    SUMMARY_INDEX_MAX_WORKERS: PositiveInt = Field(
+        description="Maximum number of concurrent LLM calls when generating summary indexes for a document",
+        default=5,
+    )
+
+    SUMMARY_INDEX_VECTORIZE_BATCH_SIZE: PositiveInt = Field(
+        description="Number of generated summaries embedded and written together when building summary indexes",
+        default=32,
+    )
+
+    MULTIMODAL_EMBEDDING_BATCH_MAX_BYTES: PositiveInt = Field(
+        description="Maximum total size in bytes of the files loaded and sent in one multimodal embedding request"
+        " (a single larger file is sent on its own)",
+        default=32 * 1024 * 1024,
+    )
+
 
 class MultiModalTransferConfig(BaseSettings):
     MULTIMODAL_SEND_FORMAT: Literal["base64", "url"] = Field(
@@ -1184,6 +1326,18 @@ class CeleryScheduleTasksConfig(BaseSettings):
         description="Maximum schedules to dispatch per tick (0=unlimited, circuit breaker)",
         default=0,
     )
+    WORKFLOW_SCHEDULE_INDEX_ENABLED: bool = Field(
+        description="Find due workflow schedules in a Redis sorted set instead of scanning the schedule table",
+        default=True,
+    )
+    WORKFLOW_SCHEDULE_INDEX_REBUILD_INTERVAL: PositiveInt = Field(
+        description="Interval in minutes between rebuilds of the workflow schedule index from the database",
+        default=60,
+    )
+    WORKFLOW_SCHEDULE_DISPATCH_JITTER: NonNegativeInt = Field(
+        description="Window in seconds over which schedules due at the same time are spread when dispatched (0=off)",
+        default=0,
+    )
 
     # API token last_used_at batch update
     ENABLE_API_TOKEN_LAST_USED_UPDATE_TASK: bool = Field(
@@ -1195,6 +1349,34 @@ class CeleryScheduleTasksConfig(BaseSettings):
         default=30,
     )
 
+    # Segment hit_count batch update
+    ENABLE_SEGMENT_HIT_COUNT_UPDATE_TASK: bool = Field(
+        description="Enable periodic batch update of segment hit counts recorded by knowledge retrieval",
+        default=True,
+    )
+    SEGMENT_HIT_COUNT_UPDATE_INTERVAL: PositiveInt = Field(
+        description="Interval in minutes for batch updating segment hit counts (default 1)",
+        default=1,
+    )
+
+    # App statistic rollups
+    ENABLE_APP_STATISTIC_ROLLUP_TASK: bool = Field(
+        description="Enable periodic hourly rollup of app messages and workflow runs for the statistics dashboards",
+        default=False,
+    )
+    APP_STATISTIC_ROLLUP_INTERVAL: PositiveInt = Field(
+        description="Interval in minutes for rolling up app statistics (default 10)",
+        default=10,
+    )
+    APP_STATISTIC_ROLLUP_DELAY: NonNegativeInt = Field(
+        description="Minutes after the end of an hour before it is rolled up, so its messages and runs have finished",
+        default=60,
+    )
+    APP_STATISTIC_ROLLUP_MAX_HOURS_PER_RUN: PositiveInt = Field(
+        description="Maximum number of hours rolled up per source in one run of the rollup task",
+        default=24,
+    )
+
     # Trigger provider refresh (simple version)
     ENABLE_TRIGGER_PROVIDER_REFRESH_TASK: bool = Field(
         description="Enable trigger provider refresh poller",
@@ -97,6 +97,12 @@ class VectorStoreConfig(BaseSettings):
         default="Vector_index",
     )
 
+    VECTOR_STORE_BATCH_SEARCH_ENABLED: bool = Field(
+        description="Search the semantic-search datasets of a multi-dataset retrieval with one query per vector store"
+        " where the vector store supports it (pgvector, qdrant, elasticsearch).",
+        default=True,
+    )
+
 
 class KeywordStoreConfig(BaseSettings):
     KEYWORD_STORE: str = Field(
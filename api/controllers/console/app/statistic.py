@@ -4,6 +4,7 @@ import sqlalchemy as sa
 from flask import abort, jsonify, request
 from flask_restx import Resource, fields
 from pydantic import BaseModel, Field, field_validator
+from sqlalchemy.orm import sessionmaker
 
 from controllers.console import console_ns
 from controllers.console.app.wraps import get_app_model
@@ -14,10 +15,15 @@ from libs.datetime_utils import parse_time_range
 from libs.helper import convert_datetime_to_date
 from libs.login import current_account_with_tenant, login_required
 from models import AppMode
+from repositories.sqlalchemy_app_statistic_rollup_repository import SQLAlchemyAppStatisticRollupRepository
 
 DEFAULT_REF_TEMPLATE_SWAGGER_2_0 = "#/definitions/{model}"
 
 
+def _app_statistic_rollup_repository() -> SQLAlchemyAppStatisticRollupRepository:
+    return SQLAlchemyAppStatisticRollupRepository(sessionmaker(bind=db.engine, expire_on_commit=False))
+
+
 class StatisticTimeRangeQuery(BaseModel):
     start: str | None = Field(default=None, description="Start date (YYYY-MM-DD HH:MM)")
     end: str | None = Field(default=None, description="End date (YYYY-MM-DD HH:MM)")
@@ -56,16 +62,6 @@ class DailyMessageStatistic(Resource):
 
         args = StatisticTimeRangeQuery.model_validate(request.args.to_dict(flat=True))  # type: ignore
 
-        converted_created_at = convert_datetime_to_date("created_at")
-        sql_query = f"""SELECT
-    {converted_created_at} AS date,
-    COUNT(*) AS message_count
-FROM
-    messages
-WHERE
-    app_id = :app_id
-    AND invoke_from != :invoke_from"""
-        arg_dict = {"tz": account.timezone, "app_id": app_model.id, "invoke_from": InvokeFrom.DEBUGGER}
         assert account.timezone is not None
 
         try:
@@ -73,22 +69,14 @@ WHERE
         except ValueError as e:
             abort(400, description=str(e))
 
-        if start_datetime_utc:
-            sql_query += " AND created_at >= :start"
-            arg_dict["start"] = start_datetime_utc
-
-        if end_datetime_utc:
-            sql_query += " AND created_at < :end"
-            arg_dict["end"] = end_datetime_utc
-
-        sql_query += " GROUP BY date ORDER BY date"
-
-        response_data = []
+        daily_totals = _app_statistic_rollup_repository().get_daily_message_totals(
+            app_id=app_model.id,
+            start_date=start_datetime_utc,
+            end_date=end_datetime_utc,
+            timezone=account.timezone,
+        )
 
-        with db.engine.begin() as conn:
-            rs = conn.execute(sa.text(sql_query), arg_dict)
-            for i in rs:
-                response_data.append({"date": str(i.date), "message_count": i.message_count})
+        response_data = [{"date": totals["date"], "message_count": totals["message_count"]} for totals in daily_totals]
 
         return jsonify({"data": response_data})
 
@@ -226,17 +214,6 @@ class DailyTokenCostStatistic(Resource):
 
         args = StatisticTimeRangeQuery.model_validate(request.args.to_dict(flat=True))  # type: ignore
 
-        converted_created_at = convert_datetime_to_date("created_at")
-        sql_query = f"""SELECT
-    {converted_created_at} AS date,
-    (SUM(messages.message_tokens) + SUM(messages.answer_tokens)) AS token_count,
-    SUM(total_price) AS total_price
-FROM
-    messages
-WHERE
-    app_id = :app_id
-    AND invoke_from != :invoke_from"""
-        arg_dict = {"tz": account.timezone, "app_id": app_model.id, "invoke_from": InvokeFrom.DEBUGGER}
         assert account.timezone is not None
 
         try:
@@ -244,24 +221,22 @@ WHERE
         except ValueError as e:
             abort(400, description=str(e))
 
-        if start_datetime_utc:
-            sql_query += " AND created_at >= :start"
-            arg_dict["start"] = start_datetime_utc
-
-        if end_datetime_utc:
-            sql_query += " AND created_at < :end"
-            arg_dict["end"] = end_datetime_utc
-
-        sql_query += " GROUP BY date ORDER BY date"
-
-        response_data = []
-
-        with db.engine.begin() as conn:
-            rs = conn.execute(sa.text(sql_query), arg_dict)
-            for i in rs:
-                response_data.append(
-                    {"date": str(i.date), "token_count": i.token_count, "total_price": i.total_price, "currency": "USD"}
-                )
+        daily_totals = _app_statistic_rollup_repository().get_daily_message_totals(
+            app_id=app_model.id,
+            start_date=start_datetime_utc,
+            end_date=end_datetime_utc,
+            timezone=account.timezone,
+        )
+
+        response_data = [
+            {
+                "date": totals["date"],
+                "token_count": totals["message_tokens"] + totals["answer_tokens"],
+                "total_price": totals["total_price"],
+                "currency": "USD",
+            }
+            for totals in daily_totals
+        ]
 
         return jsonify({"data": response_data})
 
@@ -428,16 +403,6 @@ class AverageResponseTimeStatistic(Resource):
 
         args = StatisticTimeRangeQuery.model_validate(request.args.to_dict(flat=True))  # type: ignore
 
-        converted_created_at = convert_datetime_to_date("created_at")
-        sql_query = f"""SELECT
-    {converted_created_at} AS date,
-    AVG(provider_response_latency) AS latency
-FROM
-    messages
-WHERE
-    app_id = :app_id
-    AND invoke_from != :invoke_from"""
-        arg_dict = {"tz": account.timezone, "app_id": app_model.id, "invoke_from": InvokeFrom.DEBUGGER}
         assert account.timezone is not None
 
         try:
@@ -445,22 +410,17 @@ WHERE
         except ValueError as e:
             abort(400, description=str(e))
 
-        if start_datetime_utc:
-            sql_query += " AND created_at >= :start"
-            arg_dict["start"] = start_datetime_utc
-
-        if end_datetime_utc:
-            sql_query += " AND created_at < :end"
-            arg_dict["end"] = end_datetime_utc
-
-        sql_query += " GROUP BY date ORDER BY date"
-
-        response_data = []
+        daily_totals = _app_statistic_rollup_repository().get_daily_message_totals(
+            app_id=app_model.id,
+            start_date=start_datetime_utc,
+            end_date=end_datetime_utc,
+            timezone=account.timezone,
+        )
 
-        with db.engine.begin() as conn:
-            rs = conn.execute(sa.text(sql_query), arg_dict)
-            for i in rs:
-                response_data.append({"date": str(i.date), "latency": round(i.latency * 1000, 4)})
+        response_data = [
+            {"date": totals["date"], "latency": round(totals["total_latency"] / totals["message_count"] * 1000, 4)}
+            for totals in daily_totals
+        ]
 
         return jsonify({"data": response_data})
 
@@ -484,19 +444,6 @@ class TokensPerSecondStatistic(Resource):
         account, _ = current_account_with_tenant()
         args = StatisticTimeRangeQuery.model_validate(request.args.to_dict(flat=True))  # type: ignore
 
-        converted_created_at = convert_datetime_to_date("created_at")
-        sql_query = f"""SELECT
-    {converted_created_at} AS date,
-    CASE
-        WHEN SUM(provider_response_latency) = 0 THEN 0
-        ELSE (SUM(answer_tokens) / SUM(provider_response_latency))
-    END as tokens_per_second
-FROM
-    messages
-WHERE
-    app_id = :app_id
-    AND invoke_from != :invoke_from"""
-        arg_dict = {"tz": account.timezone, "app_id": app_model.id, "invoke_from": InvokeFrom.DEBUGGER}
         assert account.timezone is not None
 
         try:
@@ -504,21 +451,19 @@ WHERE
         except ValueError as e:
             abort(400, description=str(e))
 
-        if start_datetime_utc:
-            sql_query += " AND created_at >= :start"
-            arg_dict["start"] = start_datetime_utc
-
-        if end_datetime_utc:
-            sql_query += " AND created_at < :end"
-            arg_dict["end"] = end_datetime_utc
-
-        sql_query += " GROUP BY date ORDER BY date"
-
-        response_data = []
-
-        with db.engine.begin() as conn:
-            rs = conn.execute(sa.text(sql_query), arg_dict)
-            for i in rs:
-                response_data.append({"date": str(i.date), "tps": round(i.tokens_per_second, 4)})
+        daily_totals = _app_statistic_rollup_repository().get_daily_message_totals(
+            app_id=app_model.id,
+            start_date=start_datetime_utc,
+            end_date=end_datetime_utc,
+            timezone=account.timezone,
+        )
+
+        response_data = [
+            {
+                "date": totals["date"],
+                "tps": round(totals["answer_tokens"] / totals["total_latency"] if totals["total_latency"] else 0, 4),
+            }
+            for totals in daily_totals
+        ]
 
         return jsonify({"data": response_data})
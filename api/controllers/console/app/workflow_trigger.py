@@ -12,9 +12,11 @@ from controllers.common.schema import get_or_create_model
 from extensions.ext_database import db
 from fields.workflow_trigger_fields import trigger_fields, triggers_list_fields, webhook_trigger_fields
 from libs.login import current_user, login_required
-from models.enums import AppTriggerStatus
+from models.enums import AppTriggerStatus, AppTriggerType
 from models.model import Account, App, AppMode
-from models.trigger import AppTrigger, WorkflowWebhookTrigger
+from models.trigger import AppTrigger, WorkflowSchedulePlan, WorkflowWebhookTrigger
+from services.trigger.schedule_dispatch_index import schedule_dispatch_index
+from services.trigger.webhook_routing_cache import webhook_routing_cache
 
 from .. import console_ns
 from ..app.wraps import get_app_model
@@ -156,6 +158,19 @@ class AppTriggerEnableApi(Resource):
             session.commit()
             session.refresh(trigger)
 
+            # plans of disabled triggers leave the schedule index when they come due, put them back when enabled
+            if trigger.trigger_type == AppTriggerType.TRIGGER_SCHEDULE and trigger.status == AppTriggerStatus.ENABLED:
+                schedule_dispatch_index.add(
+                    session.execute(
+                        select(WorkflowSchedulePlan.id, WorkflowSchedulePlan.next_run_at).where(
+                            WorkflowSchedulePlan.app_id == app_model.id,
+                            WorkflowSchedulePlan.node_id == trigger.node_id,
+                        )
+                    ).tuples()
+                )
+
+        webhook_routing_cache.invalidate_app(app_model.id)
+
         # Add computed icon field
         url_prefix = dify_config.CONSOLE_API_URL + "/console/api/workspaces/current/tool-provider/builtin/"
         if trigger.trigger_type == "trigger-plugin":
@@ -52,7 +52,7 @@ from fields.dataset_fields import (
 )
 from fields.document_fields import document_status_fields
 from libs.login import current_account_with_tenant, login_required
-from models import ApiToken, Dataset, Document, DocumentSegment, UploadFile
+from models import ApiToken, Dataset, Document, UploadFile
 from models.dataset import DatasetPermissionEnum
 from models.provider_ids import ModelProviderID
 from services.api_token_service import ApiTokenCache
@@ -706,22 +706,10 @@ class DatasetIndexingStatusApi(Resource):
         documents = db.session.scalars(
             select(Document).where(Document.dataset_id == dataset_id, Document.tenant_id == current_tenant_id)
         ).all()
+        segment_counts = DocumentService.get_segment_counts([str(document.id) for document in documents])
         documents_status = []
         for document in documents:
-            completed_segments = (
-                db.session.query(DocumentSegment)
-                .where(
-                    DocumentSegment.completed_at.isnot(None),
-                    DocumentSegment.document_id == str(document.id),
-                    DocumentSegment.status != "re_segment",
-                )
-                .count()
-            )
-            total_segments = (
-                db.session.query(DocumentSegment)
-                .where(DocumentSegment.document_id == str(document.id), DocumentSegment.status != "re_segment")
-                .count()
-            )
+            completed_segments, total_segments = segment_counts[str(document.id)]
             # Create a dictionary with document attributes and additional fields
             document_dict = {
                 "id": document.id,
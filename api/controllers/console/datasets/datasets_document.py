@@ -326,23 +326,7 @@ class DatasetDocumentListApi(Resource):
         )
 
         if fetch:
-            for document in documents:
-                completed_segments = (
-                    db.session.query(DocumentSegment)
-                    .where(
-                        DocumentSegment.completed_at.isnot(None),
-                        DocumentSegment.document_id == str(document.id),
-                        DocumentSegment.status != "re_segment",
-                    )
-                    .count()
-                )
-                total_segments = (
-                    db.session.query(DocumentSegment)
-                    .where(DocumentSegment.document_id == str(document.id), DocumentSegment.status != "re_segment")
-                    .count()
-                )
-                document.completed_segments = completed_segments
-                document.total_segments = total_segments
+            DocumentService.enrich_documents_with_segment_counts(documents)
             data = marshal(documents, document_with_segments_fields)
         else:
             data = marshal(documents, document_fields)
@@ -664,22 +648,10 @@ class DocumentBatchIndexingStatusApi(DocumentResource):
         dataset_id = str(dataset_id)
         batch = str(batch)
         documents = self.get_batch_documents(dataset_id, batch)
+        segment_counts = DocumentService.get_segment_counts([str(document.id) for document in documents])
         documents_status = []
         for document in documents:
-            completed_segments = (
-                db.session.query(DocumentSegment)
-                .where(
-                    DocumentSegment.completed_at.isnot(None),
-                    DocumentSegment.document_id == str(document.id),
-                    DocumentSegment.status != "re_segment",
-                )
-                .count()
-            )
-            total_segments = (
-                db.session.query(DocumentSegment)
-                .where(DocumentSegment.document_id == str(document.id), DocumentSegment.status != "re_segment")
-                .count()
-            )
+            completed_segments, total_segments = segment_counts[str(document.id)]
             # Create a dictionary with document attributes and additional fields
             document_dict = {
                 "id": document.id,
@@ -715,20 +687,7 @@ class DocumentIndexingStatusApi(DocumentResource):
         document_id = str(document_id)
         document = self.get_document(dataset_id, document_id)
 
-        completed_segments = (
-            db.session.query(DocumentSegment)
-            .where(
-                DocumentSegment.completed_at.isnot(None),
-                DocumentSegment.document_id == str(document_id),
-                DocumentSegment.status != "re_segment",
-            )
-            .count()
-        )
-        total_segments = (
-            db.session.query(DocumentSegment)
-            .where(DocumentSegment.document_id == str(document_id), DocumentSegment.status != "re_segment")
-            .count()
-        )
+        completed_segments, total_segments = DocumentService.get_segment_counts([document_id])[document_id]
 
         # Create a dictionary with document attributes and additional fields
         document_dict = {
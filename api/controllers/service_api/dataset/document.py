@@ -34,7 +34,7 @@ from core.rag.retrieval.retrieval_methods import RetrievalMethod
 from extensions.ext_database import db
 from fields.document_fields import document_fields, document_status_fields
 from libs.login import current_user
-from models.dataset import Dataset, Document, DocumentSegment
+from models.dataset import Dataset, Document
 from services.dataset_service import DatasetService, DocumentService
 from services.entities.knowledge_entities.knowledge_entities import (
     KnowledgeConfig,
@@ -550,22 +550,10 @@ class DocumentIndexingStatusApi(DatasetApiResource):
         documents = DocumentService.get_batch_documents(dataset_id, batch)
         if not documents:
             raise NotFound("Documents not found.")
+        segment_counts = DocumentService.get_segment_counts([str(document.id) for document in documents])
         documents_status = []
         for document in documents:
-            completed_segments = (
-                db.session.query(DocumentSegment)
-                .where(
-                    DocumentSegment.completed_at.isnot(None),
-                    DocumentSegment.document_id == str(document.id),
-                    DocumentSegment.status != "re_segment",
-                )
-                .count()
-            )
-            total_segments = (
-                db.session.query(DocumentSegment)
-                .where(DocumentSegment.document_id == str(document.id), DocumentSegment.status != "re_segment")
-                .count()
-            )
+            completed_segments, total_segments = segment_counts[str(document.id)]
             # Create a dictionary with document attributes and additional fields
             document_dict = {
                 "id": document.id,
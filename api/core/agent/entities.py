@@ -84,6 +84,8 @@ class AgentEntity(BaseModel):
     prompt: AgentPromptEntity | None = None
     tools: list[AgentToolEntity] | None = None
     max_iteration: int = 10
+    # Maximum number of tool calls from one model turn that are invoked concurrently
+    max_parallel_tool_calls: int = 1
 
 
 class AgentInvokeMessage(ToolInvokeMessage):
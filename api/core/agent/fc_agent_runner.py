@@ -1,9 +1,13 @@
+import contextvars
 import json
 import logging
 from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 from typing import Any, Union
 
+from flask import current_app
+
 from core.agent.base_agent_runner import BaseAgentRunner
 from core.app.apps.base_app_queue_manager import PublishFrom
 from core.app.entities.queue_entities import QueueAgentThoughtEvent, QueueMessageEndEvent, QueueMessageFileEvent
@@ -22,10 +26,13 @@ from core.model_runtime.entities import (
     UserPromptMessage,
 )
 from core.model_runtime.entities.message_entities import ImagePromptMessageContent, PromptMessageContentUnionTypes
+from core.ops.ops_trace_manager import TraceQueueManager
 from core.prompt.agent_history_prompt_transform import AgentHistoryPromptTransform
+from core.tools.__base.tool import Tool
 from core.tools.entities.tool_entities import ToolInvokeMeta
 from core.tools.tool_engine import ToolEngine
 from core.workflow.nodes.agent.exc import AgentMaxIterationError
+from libs.flask_utils import preserve_flask_contexts
 from models.model import Message
 
 logger = logging.getLogger(__name__)
@@ -227,45 +234,17 @@ class FunctionCallAgentRunner(BaseAgentRunner):
 
             # call tools
             tool_responses = []
-            for tool_call_id, tool_call_name, tool_call_args in tool_calls:
-                tool_instance = tool_instances.get(tool_call_name)
-                if not tool_instance:
-                    tool_response = {
-                        "tool_call_id": tool_call_id,
-                        "tool_call_name": tool_call_name,
-                        "tool_response": f"there is not a tool named {tool_call_name}",
-                        "meta": ToolInvokeMeta.error_instance(f"there is not a tool named {tool_call_name}").to_dict(),
-                    }
-                else:
-                    # invoke tool
-                    tool_invoke_response, message_files, tool_invoke_meta = ToolEngine.agent_invoke(
-                        tool=tool_instance,
-                        tool_parameters=tool_call_args,
-                        user_id=self.user_id,
-                        tenant_id=self.tenant_id,
-                        message=self.message,
-                        invoke_from=self.application_generate_entity.invoke_from,
-                        agent_tool_callback=self.agent_callback,
-                        trace_manager=trace_manager,
-                        app_id=self.application_generate_entity.app_config.app_id,
-                        message_id=self.message.id,
-                        conversation_id=self.conversation.id,
+            for (tool_call_id, tool_call_name, _), (tool_response, message_files) in zip(
+                tool_calls, self._invoke_tool_calls(tool_instances, tool_calls, trace_manager)
+            ):
+                # publish files
+                for message_file_id in message_files:
+                    # publish message file
+                    self.queue_manager.publish(
+                        QueueMessageFileEvent(message_file_id=message_file_id), PublishFrom.APPLICATION_MANAGER
                     )
-                    # publish files
-                    for message_file_id in message_files:
-                        # publish message file
-                        self.queue_manager.publish(
-                            QueueMessageFileEvent(message_file_id=message_file_id), PublishFrom.APPLICATION_MANAGER
-                        )
-                        # add message file ids
-                        message_file_ids.append(message_file_id)
-
-                    tool_response = {
-                        "tool_call_id": tool_call_id,
-                        "tool_call_name": tool_call_name,
-                        "tool_response": tool_invoke_response,
-                        "meta": tool_invoke_meta.to_dict(),
-                    }
+                    # add message file ids
+                    message_file_ids.append(message_file_id)
 
                 tool_responses.append(tool_response)
                 if tool_response["tool_response"] is not None:
@@ -318,6 +297,76 @@ class FunctionCallAgentRunner(BaseAgentRunner):
             PublishFrom.APPLICATION_MANAGER,
         )
 
+    def _invoke_tool_calls(
+        self,
+        tool_instances: dict[str, Tool],
+        tool_calls: list[tuple[str, str, dict[str, Any]]],
+        trace_manager: TraceQueueManager | None,
+    ) -> list[tuple[dict[str, Any], list[str]]]:
+        """
+        Invoke the tool calls of one model turn, up to `max_parallel_tool_calls` of them concurrently.
+
+        Results are returned in the order of `tool_calls`, so that files, thoughts and observations are
+        published exactly as if the calls had run one after another.
+        """
+        assert self.app_config.agent is not None
+        max_workers = min(self.app_config.agent.max_parallel_tool_calls, len(tool_calls))
+        if max_workers <= 1:
+            return [self._invoke_tool_call(tool_instances, *tool_call, trace_manager) for tool_call in tool_calls]
+
+        flask_app = current_app._get_current_object()  # type: ignore
+        context = contextvars.copy_context()
+
+        def invoke(tool_call: tuple[str, str, dict[str, Any]]) -> tuple[dict[str, Any], list[str]]:
+            with preserve_flask_contexts(flask_app, context_vars=context):
+                return self._invoke_tool_call(tool_instances, *tool_call, trace_manager)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(invoke, tool_calls))
+
+    def _invoke_tool_call(
+        self,
+        tool_instances: dict[str, Tool],
+        tool_call_id: str,
+        tool_call_name: str,
+        tool_call_args: dict[str, Any],
+        trace_manager: TraceQueueManager | None,
+    ) -> tuple[dict[str, Any], list[str]]:
+        """
+        Invoke a single tool call
+
+        :return: tool response and the ids of the message files it created
+        """
+        tool_instance = tool_instances.get(tool_call_name)
+        if not tool_instance:
+            return {
+                "tool_call_id": tool_call_id,
+                "tool_call_name": tool_call_name,
+                "tool_response": f"there is not a tool named {tool_call_name}",
+                "meta": ToolInvokeMeta.error_instance(f"there is not a tool named {tool_call_name}").to_dict(),
+            }, []
+
+        # invoke tool
+        tool_invoke_response, message_files, tool_invoke_meta = ToolEngine.agent_invoke(
+            tool=tool_instance,
+            tool_parameters=tool_call_args,
+            user_id=self.user_id,
+            tenant_id=self.tenant_id,
+            message=self.message,
+            invoke_from=self.application_generate_entity.invoke_from,
+            agent_tool_callback=self.agent_callback,
+            trace_manager=trace_manager,
+            app_id=self.application_generate_entity.app_config.app_id,
+            message_id=self.message.id,
+            conversation_id=self.conversation.id,
+        )
+        return {
+            "tool_call_id": tool_call_id,
+            "tool_call_name": tool_call_name,
+            "tool_response": tool_invoke_response,
+            "meta": tool_invoke_meta.to_dict(),
+        }, message_files
+
     def check_tool_calls(self, llm_result_chunk: LLMResultChunk) -> bool:
         """
         Check if there is any tool call in llm result chunk
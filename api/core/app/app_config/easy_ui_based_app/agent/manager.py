@@ -1,3 +1,4 @@
+from configs import dify_config
 from core.agent.entities import AgentEntity, AgentPromptEntity, AgentToolEntity
 from core.agent.prompt.template import REACT_PROMPT_TEMPLATES
 
@@ -76,6 +77,9 @@ class AgentConfigManager:
                     prompt=agent_prompt_entity,
                     tools=agent_tools,
                     max_iteration=agent_dict.get("max_iteration", 10),
+                    max_parallel_tool_calls=max(
+                        int(agent_dict.get("max_parallel_tool_calls") or dify_config.AGENT_MAX_PARALLEL_TOOL_CALLS), 1
+                    ),
                 )
 
         return None
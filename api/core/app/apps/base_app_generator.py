@@ -1,21 +1,18 @@
 from collections.abc import Generator, Mapping, Sequence
 from typing import TYPE_CHECKING, Any, Union, final
 
-from sqlalchemy.orm import Session
-
 from core.app.app_config.entities import VariableEntityType
+from core.app.apps.stream_event_encoder import EncodedStreamEvent
 from core.app.entities.app_invoke_entities import InvokeFrom
 from core.file import File, FileUploadConfig
-from core.workflow.enums import NodeType
 from core.workflow.repositories.draft_variable_repository import (
-    DraftVariableSaver,
     DraftVariableSaverFactory,
-    NoopDraftVariableSaver,
+    NoopDraftVariableSaverFactory,
 )
 from factories import file_factory
 from libs.orjson import orjson_dumps
 from models import Account, EndUser
-from services.workflow_draft_variable_service import DraftVariableSaver as DraftVariableSaverImpl
+from services.workflow_draft_variable_service import BufferedDraftVariableSaverFactory
 
 if TYPE_CHECKING:
     from core.app.app_config.entities import VariableEntity
@@ -202,7 +199,9 @@ class BaseAppGenerator:
         return value
 
     @classmethod
-    def convert_to_event_stream(cls, generator: Union[Mapping, Generator[Mapping | str, None, None]]):
+    def convert_to_event_stream(
+        cls, generator: Union[Mapping, Generator[Mapping | str | EncodedStreamEvent, None, None]]
+    ):
         """
         Convert messages into event stream
         """
@@ -212,7 +211,9 @@ class BaseAppGenerator:
 
             def gen():
                 for message in generator:
-                    if isinstance(message, Mapping | dict):
+                    if isinstance(message, EncodedStreamEvent):
+                        yield f"data: {message.data}\n\n"
+                    elif isinstance(message, Mapping | dict):
                         yield f"data: {orjson_dumps(message)}\n\n"
                     else:
                         yield f"event: {message}\n\n"
@@ -224,34 +225,5 @@ class BaseAppGenerator:
     def _get_draft_var_saver_factory(invoke_from: InvokeFrom, account: Account | EndUser) -> DraftVariableSaverFactory:
         if invoke_from == InvokeFrom.DEBUGGER:
             assert isinstance(account, Account)
-
-            def draft_var_saver_factory(
-                session: Session,
-                app_id: str,
-                node_id: str,
-                node_type: NodeType,
-                node_execution_id: str,
-                enclosing_node_id: str | None = None,
-            ) -> DraftVariableSaver:
-                return DraftVariableSaverImpl(
-                    session=session,
-                    app_id=app_id,
-                    node_id=node_id,
-                    node_type=node_type,
-                    node_execution_id=node_execution_id,
-                    enclosing_node_id=enclosing_node_id,
-                    user=account,
-                )
-        else:
-
-            def draft_var_saver_factory(
-                session: Session,
-                app_id: str,
-                node_id: str,
-                node_type: NodeType,
-                node_execution_id: str,
-                enclosing_node_id: str | None = None,
-            ) -> DraftVariableSaver:
-                return NoopDraftVariableSaver()
-
-        return draft_var_saver_factory
+            return BufferedDraftVariableSaverFactory(account)
+        return NoopDraftVariableSaverFactory()
@@ -2,6 +2,7 @@ from collections.abc import Generator
 from typing import cast
 
 from core.app.apps.base_app_generate_response_converter import AppGenerateResponseConverter
+from core.app.apps.stream_event_encoder import EncodedStreamEvent, StreamEventEncoder
 from core.app.entities.task_entities import (
     AppStreamResponse,
     CompletionAppBlockingResponse,
@@ -55,12 +56,13 @@ class CompletionAppGenerateResponseConverter(AppGenerateResponseConverter):
     @classmethod
     def convert_stream_full_response(
         cls, stream_response: Generator[AppStreamResponse, None, None]
-    ) -> Generator[dict | str, None, None]:
+    ) -> Generator[dict | str | EncodedStreamEvent, None, None]:
         """
         Convert stream full response.
         :param stream_response: stream response
         :return:
         """
+        encoder = StreamEventEncoder()
         for chunk in stream_response:
             chunk = cast(CompletionAppStreamResponse, chunk)
             sub_stream_response = chunk.stream_response
@@ -79,18 +81,20 @@ class CompletionAppGenerateResponseConverter(AppGenerateResponseConverter):
                 data = cls._error_to_stream_response(sub_stream_response.err)
                 response_chunk.update(data)
             else:
-                response_chunk.update(sub_stream_response.model_dump(mode="json"))
+                yield encoder.encode(response_chunk, sub_stream_response)
+                continue
             yield response_chunk
 
     @classmethod
     def convert_stream_simple_response(
         cls, stream_response: Generator[AppStreamResponse, None, None]
-    ) -> Generator[dict | str, None, None]:
+    ) -> Generator[dict | str | EncodedStreamEvent, None, None]:
         """
         Convert stream simple response.
         :param stream_response: stream response
         :return:
         """
+        encoder = StreamEventEncoder()
         for chunk in stream_response:
             chunk = cast(CompletionAppStreamResponse, chunk)
             sub_stream_response = chunk.stream_response
@@ -116,6 +120,7 @@ class CompletionAppGenerateResponseConverter(AppGenerateResponseConverter):
                 data = cls._error_to_stream_response(sub_stream_response.err)
                 response_chunk.update(data)
             else:
-                response_chunk.update(sub_stream_response.model_dump(mode="json"))
+                yield encoder.encode(response_chunk, sub_stream_response)
+                continue
 
             yield response_chunk
@@ -0,0 +1,119 @@
+"""
+Encoding of app stream responses into event stream payloads.
+
+Every event of a streaming task is its envelope (event, conversation, message or workflow run ids) followed by
+the fields of the stream response. Token deltas (`message`, `agent_message`, `text_chunk`) make up nearly all
+events of a stream and only differ in their text, so for them everything but the text is encoded once per task
+instead of building a dict with `model_dump(mode="json")` per token and encoding it again.
+"""
+
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import orjson
+
+from core.app.entities.task_entities import (
+    AgentMessageStreamResponse,
+    MessageStreamResponse,
+    StreamResponse,
+    TextChunkStreamResponse,
+)
+
+
+def _dumps(value: Any) -> str:
+    return orjson.dumps(value).decode()
+
+
+# Token deltas: the leading fields that stay the same within a task, and the encoded members of the JSON-safe
+# fields that change per event. The changing fields must come last in the model, so the encoded event keeps the
+# `model_dump` key order.
+_DELTA_RESPONSES: dict[type[StreamResponse], tuple[tuple[str, ...], Callable[[Any], str]]] = {
+    MessageStreamResponse: (
+        ("task_id", "id"),
+        lambda response: (
+            f'"answer":{_dumps(response.answer)},"from_variable_selector":{_dumps(response.from_variable_selector)}}}'
+        ),
+    ),
+    AgentMessageStreamResponse: (
+        ("task_id", "id"),
+        lambda response: f'"answer":{_dumps(response.answer)}}}',
+    ),
+    TextChunkStreamResponse: (
+        ("task_id",),
+        lambda response: (
+            f'"data":{{"text":{_dumps(response.data.text)},'
+            f'"from_variable_selector":{_dumps(response.data.from_variable_selector)}}}}}'
+        ),
+    ),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class EncodedStreamEvent:
+    """A stream event already encoded as a JSON object, written out without being encoded again."""
+
+    event: str
+    data: str
+
+
+class StreamEventEncoder:
+    """
+    Encodes the stream responses of one task.
+
+    The result is the same JSON object as `{**envelope, **stream_response.model_dump(mode="json")}`. Responses
+    other than token deltas are returned as that dict, to be encoded by the caller as before.
+    """
+
+    def __init__(self):
+        # None marks envelopes the response overrides fields of, these are always merged
+        self._prefixes: dict[tuple[Any, ...], str | None] = {}
+
+    def encode(
+        self, envelope: Mapping[str, Any], stream_response: StreamResponse
+    ) -> EncodedStreamEvent | dict[str, Any]:
+        """
+        Encode a stream response behind its envelope.
+        :param envelope: the envelope fields, starting with the event
+        :param stream_response: stream response
+        :return: the encoded token delta, or the merged dict for other responses
+        """
+        delta = _DELTA_RESPONSES.get(type(stream_response))
+        if delta is None:
+            return self._merge(envelope, stream_response)
+
+        static_fields, encode_delta = delta
+        # the envelope keys are the same for all events of a stream, its values tell tasks and events apart
+        prefix_key = (
+            type(stream_response),
+            *envelope.values(),
+            *[getattr(stream_response, field) for field in static_fields],
+        )
+        try:
+            prefix = self._prefixes.get(prefix_key, "")
+            if prefix == "":
+                prefix = self._prefixes[prefix_key] = self._encode_prefix(envelope, stream_response, static_fields)
+        except TypeError:
+            # envelopes holding unhashable values are not worth caching
+            return self._merge(envelope, stream_response)
+        if prefix is None:
+            return self._merge(envelope, stream_response)
+
+        return EncodedStreamEvent(event=envelope["event"], data=prefix + encode_delta(stream_response))
+
+    @staticmethod
+    def _encode_prefix(
+        envelope: Mapping[str, Any], stream_response: StreamResponse, static_fields: tuple[str, ...]
+    ) -> str | None:
+        overridden = envelope.keys() & type(stream_response).model_fields.keys()
+        if overridden - {"event"} or envelope.get("event") != stream_response.event.value:
+            return None
+        static = dict(envelope)
+        static.update(stream_response.model_dump(mode="json", include=set(static_fields)))
+        return orjson.dumps(static).decode()[:-1] + ","
+
+    @staticmethod
+    def _merge(envelope: Mapping[str, Any], stream_response: StreamResponse) -> dict[str, Any]:
+        response_chunk = dict(envelope)
+        response_chunk.update(stream_response.model_dump(mode="json"))
+        return response_chunk
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-import json
 import time
 from collections.abc import Callable, Generator, Iterable, Mapping
 from typing import Any
 
+import orjson
+
 from core.app.entities.task_entities import StreamEvent
 from libs.broadcast_channel.channel import Topic
 from libs.broadcast_channel.exc import SubscriptionClosedError
@@ -48,7 +49,7 @@ def stream_topic_events(
 
             last_msg_time = time.time()
             last_ping_time = last_msg_time
-            event = json.loads(msg)
+            event = orjson.loads(msg)
             yield event
             if not isinstance(event, dict):
                 continue
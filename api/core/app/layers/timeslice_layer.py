@@ -1,10 +1,7 @@
 import logging
-import uuid
-from typing import ClassVar
 
-from apscheduler.schedulers.background import BackgroundScheduler  # type: ignore
-
-from core.workflow.graph_engine.entities.commands import CommandType, GraphEngineCommand
+from core.app.layers.timeslice_timer import TimeSliceHandle, time_slice_timer
+from core.workflow.graph_engine.entities.commands import PauseCommand
 from core.workflow.graph_engine.layers.base import GraphEngineLayer
 from core.workflow.graph_events.base import GraphEngineEvent
 from services.workflow.entities import WorkflowScheduleCFSPlanEntity
@@ -18,50 +15,31 @@ class TimeSliceLayer(GraphEngineLayer):
     CFS plan scheduler to control the timeslice of the workflow.
     """
 
-    scheduler: ClassVar[BackgroundScheduler] = BackgroundScheduler()
-
     def __init__(self, cfs_plan_scheduler: CFSPlanScheduler) -> None:
         """
         CFS plan scheduler allows to control the timeslice of the workflow.
         """
-
-        if not TimeSliceLayer.scheduler.running:
-            TimeSliceLayer.scheduler.start()
-
         super().__init__()
         self.cfs_plan_scheduler = cfs_plan_scheduler
         self.stopped = False
-        self.schedule_id = ""
+        self.timer_handle: TimeSliceHandle | None = None
+        # set when the scheduler paused the run to give its worker to another tenant
+        self.preempted = False
 
-    def _checker_job(self, schedule_id: str):
+    def _suspend(self) -> None:
         """
-        Check if the workflow need to be suspended.
+        Suspend the workflow, called by the timer when the scheduler takes the worker back.
         """
-        try:
-            if self.stopped:
-                self.scheduler.remove_job(schedule_id)
-                return
+        if self.stopped:
+            return
 
-            if self.cfs_plan_scheduler.can_schedule() == SchedulerCommand.RESOURCE_LIMIT_REACHED:
-                # remove the job
-                self.scheduler.remove_job(schedule_id)
+        if not self.command_channel:
+            logger.error("No command channel to stop the workflow")
+            return
 
-                if not self.command_channel:
-                    logger.exception("No command channel to stop the workflow")
-                    return
-
-                # send command to pause the workflow
-                self.command_channel.send_command(
-                    GraphEngineCommand(
-                        command_type=CommandType.PAUSE,
-                        payload={
-                            "reason": SchedulerCommand.RESOURCE_LIMIT_REACHED,
-                        },
-                    )
-                )
-
-        except Exception:
-            logger.exception("scheduler error during check if the workflow need to be suspended")
+        # send command to pause the workflow
+        self.command_channel.send_command(PauseCommand(reason=SchedulerCommand.RESOURCE_LIMIT_REACHED))
+        self.preempted = True
 
     def on_graph_start(self):
         """
@@ -69,13 +47,10 @@ class TimeSliceLayer(GraphEngineLayer):
         """
 
         if self.cfs_plan_scheduler.plan.schedule_strategy == WorkflowScheduleCFSPlanEntity.Strategy.TimeSlice:
-            self.schedule_id = uuid.uuid4().hex
-
-            self.scheduler.add_job(
-                lambda: self._checker_job(self.schedule_id),
-                "interval",
-                seconds=self.cfs_plan_scheduler.plan.granularity,
-                id=self.schedule_id,
+            self.timer_handle = time_slice_timer.schedule(
+                self.cfs_plan_scheduler,
+                self.cfs_plan_scheduler.plan.granularity,
+                self._suspend,
             )
 
     def on_event(self, event: GraphEngineEvent):
@@ -83,6 +58,9 @@ class TimeSliceLayer(GraphEngineLayer):
 
     def on_graph_end(self, error: Exception | None) -> None:
         self.stopped = True
-        # remove the scheduler
-        if self.schedule_id:
-            self.scheduler.remove_job(self.schedule_id)
+        # stop the timer
+        if self.timer_handle:
+            self.timer_handle.cancel()
+        # a preempted run already gave its share back when the scheduler paused it
+        if not self.preempted:
+            self.cfs_plan_scheduler.release()
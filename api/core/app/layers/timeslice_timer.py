@@ -0,0 +1,167 @@
+"""
+Process-wide timer driving the time slice checks of TimeSliceLayer.
+
+Every running workflow used to add an interval job to a shared APScheduler BackgroundScheduler, whose job store
+and executor pool became the bottleneck with thousands of runs per worker. A single thread now advances a hashed
+timing wheel: registering or cancelling a run is O(1) and a tick only visits one slot. The checks of all runs due
+in the same tick are handed to their scheduler class at once, so AsyncWorkflowCFSPlanScheduler answers them with
+a single Redis pipeline. Tick lag, how late a tick's checks ran, is exported as an OpenTelemetry metric.
+"""
+
+import functools
+import logging
+import math
+import os
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from opentelemetry.metrics import Histogram, get_meter
+
+from services.workflow.scheduler import CFSPlanScheduler, SchedulerCommand
+
+logger = logging.getLogger(__name__)
+
+# seconds between two ticks, the resolution of time slices
+_TICK = 1.0
+# a slice of up to _SLOTS ticks is placed in a slot directly, longer ones wait for more turns of the wheel
+_SLOTS = 512
+
+
+@dataclass(frozen=True, slots=True)
+class _Instruments:
+    tick_lag: Histogram
+    batch_size: Histogram
+
+
+@functools.cache
+def _instruments() -> _Instruments:
+    meter = get_meter("workflow_time_slice")
+    return _Instruments(
+        tick_lag=meter.create_histogram(
+            "workflow.time_slice.tick_lag",
+            unit="s",
+            description="Delay between when a time slice tick was due and when its checks ran",
+        ),
+        batch_size=meter.create_histogram(
+            "workflow.time_slice.batch_size",
+            unit="{run}",
+            description="Number of workflow runs whose time slice was checked in one tick",
+        ),
+    )
+
+
+@dataclass(eq=False, slots=True)
+class TimeSliceHandle:
+    """A workflow run registered with the timer, checked every `interval` seconds until cancelled."""
+
+    scheduler: CFSPlanScheduler
+    interval: float
+    on_yield: Callable[[], None]
+    rounds: int = field(default=0, repr=False)
+    cancelled: bool = False
+
+    def cancel(self) -> None:
+        # dropped from the wheel when its slot is visited next
+        self.cancelled = True
+
+
+class TimeSliceTimer:
+    def __init__(self, tick: float = _TICK, slots: int = _SLOTS) -> None:
+        self._tick = tick
+        self._wheel: list[list[TimeSliceHandle]] = [[] for _ in range(slots)]
+        self._cursor = 0
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+
+    def schedule(self, scheduler: CFSPlanScheduler, interval: float, on_yield: Callable[[], None]) -> TimeSliceHandle:
+        """
+        Check `scheduler.can_schedule()` every `interval` seconds, calling `on_yield` once and stopping the checks
+        when the run has to give up its worker.
+        """
+        handle = TimeSliceHandle(scheduler=scheduler, interval=interval, on_yield=on_yield)
+        with self._lock:
+            self._start()
+            self._insert(handle)
+        return handle
+
+    def _start(self) -> None:
+        # a forked worker process inherits the wheel but not the thread advancing it
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        self._wheel = [[] for _ in self._wheel]
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name="time-slice-timer", daemon=True)
+        self._thread.start()
+
+    def _insert(self, handle: TimeSliceHandle) -> None:
+        ticks = max(1, math.ceil(handle.interval / self._tick))
+        handle.rounds = (ticks - 1) // len(self._wheel)
+        self._wheel[(self._cursor + ticks) % len(self._wheel)].append(handle)
+
+    def _run(self) -> None:
+        next_tick = time.monotonic() + self._tick
+        while True:
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            _instruments().tick_lag.record(time.monotonic() - next_tick)
+            try:
+                self._advance()
+            except Exception:
+                logger.exception("Failed to check workflow time slices")
+            next_tick += self._tick
+
+    def _advance(self) -> None:
+        """
+        Move the wheel one tick forward and check the runs whose time slice ended.
+        """
+        with self._lock:
+            self._cursor = (self._cursor + 1) % len(self._wheel)
+            slot = self._wheel[self._cursor]
+            self._wheel[self._cursor] = []
+            due = []
+            for handle in slot:
+                if handle.cancelled:
+                    continue
+                if handle.rounds > 0:
+                    handle.rounds -= 1
+                    self._wheel[self._cursor].append(handle)
+                else:
+                    due.append(handle)
+        if not due:
+            return
+        _instruments().batch_size.record(len(due))
+
+        batches: dict[type[CFSPlanScheduler], list[TimeSliceHandle]] = {}
+        for handle in due:
+            batches.setdefault(type(handle.scheduler), []).append(handle)
+
+        running = []
+        for scheduler_type, handles in batches.items():
+            try:
+                commands = scheduler_type.can_schedule_batch([handle.scheduler for handle in handles])
+            except Exception:
+                logger.exception("Failed to check time slices of %d workflow runs", len(handles))
+                commands = [SchedulerCommand.NONE] * len(handles)
+
+            for handle, command in zip(handles, commands):
+                if handle.cancelled:
+                    continue
+                if command != SchedulerCommand.RESOURCE_LIMIT_REACHED:
+                    running.append(handle)
+                    continue
+                try:
+                    handle.on_yield()
+                except Exception:
+                    logger.exception("Failed to suspend workflow run at the end of its time slice")
+
+        with self._lock:
+            for handle in running:
+                if not handle.cancelled:
+                    self._insert(handle)
+
+
+time_slice_timer = TimeSliceTimer()
@@ -2,9 +2,12 @@
 
 from .observability import ObservabilityLayer
 from .persistence import PersistenceWorkflowInfo, WorkflowPersistenceLayer
+from .profiling import NodeProfile, ProfilingLayer
 
 __all__ = [
+    "NodeProfile",
     "ObservabilityLayer",
     "PersistenceWorkflowInfo",
+    "ProfilingLayer",
     "WorkflowPersistenceLayer",
 ]
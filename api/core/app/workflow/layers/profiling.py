@@ -0,0 +1,276 @@
+"""
+Profiling layer for GraphEngine.
+
+This layer records where the time of a workflow run goes. For every node execution it measures how long the
+node waited in the ready queue, its wall and CPU time, how many events it emitted, how long the dispatcher took
+to pick up its result event and how large the variable pool was afterwards. Profiles are exported as
+OpenTelemetry metrics and as attributes of the node span, and summarized per run when the graph ends.
+"""
+
+import functools
+import logging
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, final
+
+from opentelemetry.metrics import Histogram, get_meter
+from opentelemetry.trace import get_current_span
+from typing_extensions import override
+
+from core.workflow.graph_engine.layers.base import GraphEngineLayer
+from core.workflow.graph_events import GraphEngineEvent, GraphNodeEventBase, is_node_result_event
+from core.workflow.nodes.base.node import Node
+
+logger = logging.getLogger(__name__)
+
+# number of slowest node executions listed in the run summary
+_SLOWEST_NODES = 5
+
+
+@dataclass(frozen=True, slots=True)
+class _Instruments:
+    duration: Histogram
+    cpu_time: Histogram
+    ready_queue_wait: Histogram
+    event_lag: Histogram
+    variable_pool_size: Histogram
+
+
+@functools.cache
+def _instruments() -> _Instruments:
+    meter = get_meter("workflow_profiling")
+    return _Instruments(
+        duration=meter.create_histogram(
+            "workflow.node.duration", unit="s", description="Wall time of workflow node executions"
+        ),
+        cpu_time=meter.create_histogram(
+            "workflow.node.cpu_time", unit="s", description="CPU time of workflow node executions"
+        ),
+        ready_queue_wait=meter.create_histogram(
+            "workflow.node.ready_queue_wait",
+            unit="s",
+            description="Time workflow nodes waited in the ready queue before a worker picked them up",
+        ),
+        event_lag=meter.create_histogram(
+            "workflow.node.event_lag",
+            unit="s",
+            description="Time between a workflow node finishing and the engine handling its result event",
+        ),
+        variable_pool_size=meter.create_histogram(
+            "workflow.variable_pool.size",
+            unit="{variable}",
+            description="Number of variables in the variable pool after a workflow node execution",
+        ),
+    )
+
+
+@dataclass(slots=True)
+class NodeProfile:
+    """Timings of a single node execution, in seconds."""
+
+    node_id: str
+    node_type: str
+    ready_queue_wait: float | None = None
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    event_lag: float | None = None
+    event_count: int = 0
+    variable_pool_size: int = 0
+    started_at: float = 0.0
+    cpu_started_at: float = 0.0
+    ended_at: float | None = None
+    result_handled_at: float | None = None
+
+
+@final
+class ProfilingLayer(GraphEngineLayer):
+    """
+    Layer that profiles node executions.
+
+    Node run hooks are called in worker threads and events in the dispatcher thread, so the profiles are
+    guarded by a lock. Register it ahead of the ObservabilityLayer so the node span is still current when a
+    node ends.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._lock = threading.Lock()
+        self._profiles: dict[str, NodeProfile] = {}
+        self._started_at: float = 0.0
+        self._summary: dict[str, Any] | None = None
+
+    @property
+    def profiles(self) -> list[NodeProfile]:
+        """Profiles of the node executions of the current run."""
+        with self._lock:
+            return list(self._profiles.values())
+
+    @property
+    def summary(self) -> Mapping[str, Any] | None:
+        """Summary of the last run, available once the graph has ended."""
+        return self._summary
+
+    @override
+    def on_graph_start(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+        self._started_at = time.perf_counter()
+        self._summary = None
+
+    @override
+    def on_node_run_start(self, node: Node) -> None:
+        execution_id = node.execution_id
+        if not execution_id:
+            return
+
+        now = time.perf_counter()
+        profile = NodeProfile(
+            node_id=node.id,
+            node_type=str(node.node_type),
+            ready_queue_wait=max(0.0, now - node.enqueued_at) if node.enqueued_at is not None else None,
+            started_at=now,
+            cpu_started_at=time.thread_time(),
+        )
+        with self._lock:
+            self._profiles[execution_id] = profile
+
+    @override
+    def on_node_run_end(
+        self, node: Node, error: Exception | None, result_event: GraphNodeEventBase | None = None
+    ) -> None:
+        cpu_ended_at = time.thread_time()
+        ended_at = time.perf_counter()
+        execution_id = node.execution_id
+        if not execution_id:
+            return
+
+        try:
+            variable_pool_size = self.graph_runtime_state.variable_pool.size()
+        except Exception:
+            logger.warning("ProfilingLayer: failed to measure the variable pool size", exc_info=True)
+            variable_pool_size = 0
+
+        with self._lock:
+            profile = self._profiles.get(execution_id)
+            if profile is None:
+                return
+            profile.wall_time = ended_at - profile.started_at
+            profile.cpu_time = cpu_ended_at - profile.cpu_started_at
+            profile.variable_pool_size = variable_pool_size
+            profile.ended_at = ended_at
+            if profile.result_handled_at is not None:
+                profile.event_lag = max(0.0, profile.result_handled_at - ended_at)
+
+        self._export_node_profile(profile)
+
+    @override
+    def on_event(self, event: GraphEngineEvent) -> None:
+        if not isinstance(event, GraphNodeEventBase):
+            return
+
+        handled_at = time.perf_counter()
+        event_lag: float | None = None
+        with self._lock:
+            profile = self._profiles.get(event.id)
+            if profile is None:
+                return
+            profile.event_count += 1
+            if not is_node_result_event(event):
+                return
+            profile.result_handled_at = handled_at
+            if profile.ended_at is not None:
+                event_lag = profile.event_lag = max(0.0, handled_at - profile.ended_at)
+
+        # whichever of the node end hook and the result event comes last records the lag
+        if event_lag is not None:
+            _instruments().event_lag.record(event_lag, {"node_type": profile.node_type})
+
+    @override
+    def on_graph_end(self, error: Exception | None) -> None:
+        elapsed_time = time.perf_counter() - self._started_at
+        with self._lock:
+            profiles = list(self._profiles.values())
+
+        self._summary = self._summarize(profiles, elapsed_time)
+        logger.info(
+            "Workflow run profile: %d node executions in %.3fs, %.3fs node wall time, %.3fs node CPU time, "
+            "%.3fs ready queue wait",
+            self._summary["node_count"],
+            elapsed_time,
+            self._summary["wall_time"],
+            self._summary["cpu_time"],
+            self._summary["ready_queue_wait"],
+        )
+
+        span = get_current_span()
+        if span.is_recording():
+            span.add_event(
+                "workflow.profile",
+                {
+                    "workflow.profile.elapsed_time": elapsed_time,
+                    "workflow.profile.node_count": self._summary["node_count"],
+                    "workflow.profile.wall_time": self._summary["wall_time"],
+                    "workflow.profile.cpu_time": self._summary["cpu_time"],
+                    "workflow.profile.ready_queue_wait": self._summary["ready_queue_wait"],
+                    "workflow.profile.event_lag": self._summary["event_lag"],
+                    "workflow.profile.peak_variable_pool_size": self._summary["peak_variable_pool_size"],
+                },
+            )
+
+    @staticmethod
+    def _export_node_profile(profile: NodeProfile) -> None:
+        attributes = {"node_type": profile.node_type}
+        instruments = _instruments()
+        instruments.duration.record(profile.wall_time, attributes)
+        instruments.cpu_time.record(profile.cpu_time, attributes)
+        instruments.variable_pool_size.record(profile.variable_pool_size, attributes)
+        if profile.ready_queue_wait is not None:
+            instruments.ready_queue_wait.record(profile.ready_queue_wait, attributes)
+        if profile.event_lag is not None:
+            instruments.event_lag.record(profile.event_lag, attributes)
+
+        span = get_current_span()
+        if not span.is_recording():
+            return
+        span_attributes: dict[str, float | int] = {
+            "workflow.node.profile.wall_time": profile.wall_time,
+            "workflow.node.profile.cpu_time": profile.cpu_time,
+            "workflow.node.profile.event_count": profile.event_count,
+            "workflow.node.profile.variable_pool_size": profile.variable_pool_size,
+        }
+        if profile.ready_queue_wait is not None:
+            span_attributes["workflow.node.profile.ready_queue_wait"] = profile.ready_queue_wait
+        span.set_attributes(span_attributes)
+
+    @staticmethod
+    def _summarize(profiles: list[NodeProfile], elapsed_time: float) -> dict[str, Any]:
+        node_types: dict[str, dict[str, float | int]] = {}
+        for profile in profiles:
+            totals = node_types.setdefault(
+                profile.node_type,
+                {"count": 0, "wall_time": 0.0, "cpu_time": 0.0, "ready_queue_wait": 0.0, "event_lag": 0.0},
+            )
+            totals["count"] += 1
+            totals["wall_time"] += profile.wall_time
+            totals["cpu_time"] += profile.cpu_time
+            totals["ready_queue_wait"] += profile.ready_queue_wait or 0.0
+            totals["event_lag"] += profile.event_lag or 0.0
+
+        slowest = sorted(profiles, key=lambda profile: profile.wall_time, reverse=True)[:_SLOWEST_NODES]
+        return {
+            "elapsed_time": elapsed_time,
+            "node_count": len(profiles),
+            "wall_time": sum(profile.wall_time for profile in profiles),
+            "cpu_time": sum(profile.cpu_time for profile in profiles),
+            "ready_queue_wait": sum(profile.ready_queue_wait or 0.0 for profile in profiles),
+            "event_lag": sum(profile.event_lag or 0.0 for profile in profiles),
+            "event_count": sum(profile.event_count for profile in profiles),
+            "peak_variable_pool_size": max((profile.variable_pool_size for profile in profiles), default=0),
+            "node_types": node_types,
+            "slowest_nodes": [
+                {"node_id": profile.node_id, "node_type": profile.node_type, "wall_time": profile.wall_time}
+                for profile in slowest
+            ],
+        }
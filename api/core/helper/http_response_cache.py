@@ -0,0 +1,307 @@
+"""
+Opt-in cache for idempotent (GET/HEAD) HTTP responses of HTTP Request nodes and API tools.
+
+Entries are keyed per tenant and per request (method, URL, parameters and headers), kept in a size-bounded
+in-process LRU backed by Redis, and follow the response's `Cache-Control` / `Expires` freshness. Stale entries
+with an `ETag` or `Last-Modified` validator are revalidated with a conditional request.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+import httpx
+from cachetools import LRUCache
+
+from configs import dify_config
+from extensions.ext_redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+CACHEABLE_METHODS = frozenset({"GET", "HEAD"})
+CACHEABLE_STATUS_CODES = frozenset({200, 203})
+# The body is stored decoded, and these headers describe the encoded body
+_DROPPED_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding", "connection"})
+# Headers of a 304 response that replace the stored ones
+_REVALIDATION_HEADERS = frozenset({"cache-control", "date", "etag", "expires", "last-modified"})
+
+CACHE_KEY = "http_response_cache:{key}"
+STATS_KEY = "http_response_cache:stats:{tenant_id}"
+
+
+@dataclass
+class CachedResponse:
+    status_code: int
+    headers: dict[str, str]
+    content: bytes
+    stored_at: float
+    ttl: float
+
+    @property
+    def size(self) -> int:
+        return len(self.content)
+
+    def is_fresh(self) -> bool:
+        return time.time() < self.stored_at + self.ttl
+
+    def validator_headers(self) -> dict[str, str]:
+        headers = {}
+        if etag := self.headers.get("etag"):
+            headers["If-None-Match"] = etag
+        if last_modified := self.headers.get("last-modified"):
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def to_response(self, request: httpx.Request | None = None) -> httpx.Response:
+        return httpx.Response(self.status_code, headers=self.headers, content=self.content, request=request)
+
+    def dumps(self) -> str:
+        return json.dumps(
+            {
+                "status_code": self.status_code,
+                "headers": self.headers,
+                "content": base64.b64encode(self.content).decode(),
+                "stored_at": self.stored_at,
+                "ttl": self.ttl,
+            }
+        )
+
+    @classmethod
+    def loads(cls, data: str | bytes) -> "CachedResponse":
+        payload = json.loads(data)
+        return cls(
+            status_code=payload["status_code"],
+            headers=payload["headers"],
+            content=base64.b64decode(payload["content"]),
+            stored_at=payload["stored_at"],
+            ttl=payload["ttl"],
+        )
+
+
+@dataclass
+class HttpResponseCacheStats:
+    hits: int = 0
+    revalidations: int = 0
+    misses: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.revalidations + self.misses
+        return (self.hits + self.revalidations) / total if total else 0.0
+
+    def record(self, tenant_id: str, outcome: str):
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+        try:
+            redis_client.hincrby(STATS_KEY.format(tenant_id=tenant_id), outcome, 1)
+        except Exception:
+            logger.debug("Failed to record HTTP response cache stats", exc_info=True)
+
+
+def _parse_cache_control(value: str) -> dict[str, str | None]:
+    directives: dict[str, str | None] = {}
+    for directive in value.split(","):
+        name, _, argument = directive.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') or None
+    return directives
+
+
+def _freshness_lifetime(headers: Mapping[str, str], default_ttl: float) -> float | None:
+    """
+    Seconds the response may be reused without revalidation, or None if it must not be stored.
+    """
+    cache_control = _parse_cache_control(headers.get("cache-control", ""))
+    if "no-store" in cache_control:
+        return None
+    if "no-cache" in cache_control:
+        return 0
+
+    lifetime: float = default_ttl
+    max_age = cache_control.get("max-age")
+    if max_age is not None and max_age.isdigit():
+        lifetime = int(max_age)
+    elif expires := headers.get("expires"):
+        try:
+            date = parsedate_to_datetime(headers["date"]) if "date" in headers else None
+            lifetime = parsedate_to_datetime(expires).timestamp() - (date.timestamp() if date else time.time())
+        except (TypeError, ValueError):
+            # An invalid Expires header means the response is already stale
+            lifetime = 0
+
+    age = headers.get("age", "")
+    if age.isdigit():
+        lifetime -= int(age)
+    return max(lifetime, 0)
+
+
+class HttpResponseCache:
+    """
+    Two-level (process-local LRU and Redis) cache of GET/HEAD responses.
+
+    Use `fetch()` to send a request through the cache; the caller supplies how the request is sent and how its
+    body is read, so that callers keep their own retry, SSRF and size-limit handling.
+    """
+
+    def __init__(self, max_entry_size: int, local_max_size: int, retention: int):
+        self.max_entry_size = max_entry_size
+        self.retention = retention
+        self.stats = HttpResponseCacheStats()
+        self._local: LRUCache[str, CachedResponse] = LRUCache(maxsize=local_max_size, getsizeof=lambda e: e.size)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls) -> "HttpResponseCache":
+        return cls(
+            max_entry_size=dify_config.HTTP_RESPONSE_CACHE_MAX_ENTRY_SIZE,
+            local_max_size=dify_config.HTTP_RESPONSE_CACHE_LOCAL_MAX_SIZE,
+            retention=dify_config.HTTP_RESPONSE_CACHE_RETENTION,
+        )
+
+    @staticmethod
+    def make_key(tenant_id: str, method: str, url: str, request_identity: Any) -> str:
+        """
+        :param request_identity: JSON-serializable parameters, headers and cookies that identify the request
+        """
+        payload = json.dumps([tenant_id, method.upper(), url, request_identity], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def fetch(
+        self,
+        *,
+        tenant_id: str,
+        method: str,
+        url: str,
+        headers: Mapping[str, str],
+        request_identity: Any,
+        send: Callable[[dict[str, str]], httpx.Response],
+        read_body: Callable[[httpx.Response], bytes],
+        default_ttl: float = 0,
+    ) -> httpx.Response:
+        """
+        Return a cached response, or send the request and cache its response.
+
+        :param headers: request headers, to which conditional headers are added when revalidating
+        :param request_identity: everything besides method and URL that the response may depend on
+        :param send: sends the request with the given headers, the response body may be unread
+        :param read_body: reads the body of a response returned by `send`
+        :param default_ttl: seconds a response without freshness information is fresh
+        :return: a response whose body has been read
+        """
+        request_cache_control = _parse_cache_control(
+            next((v for k, v in headers.items() if k.lower() == "cache-control"), "")
+        )
+        if method.upper() not in CACHEABLE_METHODS or "no-store" in request_cache_control:
+            return self._send_uncached(send, dict(headers), read_body)
+
+        key = self.make_key(tenant_id, method, url, request_identity)
+        entry = self._get(key)
+        if entry is not None and entry.is_fresh() and "no-cache" not in request_cache_control:
+            self.stats.record(tenant_id, "hits")
+            return entry.to_response()
+
+        request_headers = dict(headers)
+        if entry is not None:
+            request_headers.update(entry.validator_headers())
+
+        response = send(request_headers)
+        try:
+            if entry is not None and response.status_code == 304:
+                entry = self._revalidate(key, entry, response.headers, default_ttl)
+                self.stats.record(tenant_id, "revalidations")
+                return entry.to_response(response.request)
+
+            content = read_body(response)
+        finally:
+            response.close()
+
+        self.stats.record(tenant_id, "misses")
+        headers_to_store = {k.lower(): v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS}
+        if response.status_code in CACHEABLE_STATUS_CODES and len(content) <= self.max_entry_size:
+            ttl = _freshness_lifetime(headers_to_store, default_ttl)
+            if ttl is not None:
+                self._set(key, CachedResponse(response.status_code, headers_to_store, content, time.time(), ttl))
+        return httpx.Response(response.status_code, headers=headers_to_store, content=content, request=response.request)
+
+    @staticmethod
+    def _send_uncached(
+        send: Callable[[dict[str, str]], httpx.Response],
+        headers: dict[str, str],
+        read_body: Callable[[httpx.Response], bytes],
+    ) -> httpx.Response:
+        response = send(headers)
+        try:
+            content = read_body(response)
+        finally:
+            response.close()
+        headers_to_keep = {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS}
+        return httpx.Response(response.status_code, headers=headers_to_keep, content=content, request=response.request)
+
+    def _revalidate(
+        self, key: str, entry: CachedResponse, headers: httpx.Headers, default_ttl: float
+    ) -> CachedResponse:
+        updated_headers = dict(entry.headers)
+        updated_headers.update({k.lower(): v for k, v in headers.items() if k.lower() in _REVALIDATION_HEADERS})
+        ttl = _freshness_lifetime(updated_headers, default_ttl)
+        entry = CachedResponse(entry.status_code, updated_headers, entry.content, time.time(), ttl or 0)
+        if ttl is None:
+            self._delete(key)
+        else:
+            self._set(key, entry)
+        return entry
+
+    def _get(self, key: str) -> CachedResponse | None:
+        with self._lock:
+            entry = self._local.get(key)
+        if entry is not None and entry.is_fresh():
+            return entry
+
+        try:
+            data = redis_client.get(CACHE_KEY.format(key=key))
+        except Exception:
+            logger.warning("Failed to read HTTP response cache entry from Redis", exc_info=True)
+            return entry
+        if not data:
+            return entry
+
+        shared_entry = CachedResponse.loads(data)
+        if entry is None or shared_entry.stored_at > entry.stored_at:
+            self._set_local(key, shared_entry)
+            return shared_entry
+        return entry
+
+    def _set(self, key: str, entry: CachedResponse):
+        # Stale entries are only useful for revalidation, which needs a validator
+        retention = self.retention if entry.validator_headers() else 0
+        expire = int(entry.ttl) + retention
+        if expire <= 0:
+            return
+        self._set_local(key, entry)
+        try:
+            redis_client.setex(CACHE_KEY.format(key=key), expire, entry.dumps())
+        except Exception:
+            logger.warning("Failed to write HTTP response cache entry to Redis", exc_info=True)
+
+    def _set_local(self, key: str, entry: CachedResponse):
+        with self._lock:
+            if entry.size <= self._local.maxsize:
+                self._local[key] = entry
+
+    def _delete(self, key: str):
+        with self._lock:
+            self._local.pop(key, None)
+        try:
+            redis_client.delete(CACHE_KEY.format(key=key))
+        except Exception:
+            logger.warning("Failed to delete HTTP response cache entry from Redis", exc_info=True)
+
+
+http_response_cache = HttpResponseCache.from_config()
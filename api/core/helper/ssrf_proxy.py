@@ -130,7 +130,25 @@ def _inject_trace_headers(headers: Headers | None) -> Headers:
     return headers
 
 
+def _send_request(client: httpx.Client, method: str, url: str, stream: bool, **kwargs: Any) -> httpx.Response:
+    if not stream:
+        return client.request(method=method, url=url, **kwargs)
+
+    # The body of a streamed response is not read, the caller iterates and closes it
+    follow_redirects = kwargs.pop("follow_redirects", httpx.USE_CLIENT_DEFAULT)
+    auth = kwargs.pop("auth", httpx.USE_CLIENT_DEFAULT)
+    request = client.build_request(method=method, url=url, **kwargs)
+    return client.send(request, stream=True, auth=auth, follow_redirects=follow_redirects)
+
+
 def make_request(method: str, url: str, max_retries: int = SSRF_DEFAULT_MAX_RETRIES, **kwargs: Any) -> httpx.Response:
+    """
+    Send a request through the SSRF proxy, retrying on connection errors and on status codes in STATUS_FORCELIST.
+
+    With `stream=True` the response body is not read; the caller must iterate it and close the response.
+    """
+    stream = bool(kwargs.pop("stream", False))
+
     # Convert requests-style allow_redirects to httpx-style follow_redirects
     if "allow_redirects" in kwargs:
         allow_redirects = kwargs.pop("allow_redirects")
@@ -173,7 +191,7 @@ def make_request(method: str, url: str, max_retries: int = SSRF_DEFAULT_MAX_RETR
             if user_provided_host is not None:
                 headers["host"] = user_provided_host
             kwargs["headers"] = headers
-            response = client.request(method=method, url=url, **kwargs)
+            response = _send_request(client, method, url, stream, **kwargs)
 
             # Check for SSRF protection by Squid proxy
             if response.status_code in (401, 403):
@@ -183,6 +201,7 @@ def make_request(method: str, url: str, max_retries: int = SSRF_DEFAULT_MAX_RETR
 
                 # Squid typically identifies itself in Server or Via headers
                 if "squid" in server_header or "squid" in via_header:
+                    response.close()
                     raise ToolSSRFError(
                         f"Access to '{url}' was blocked by SSRF protection. "
                         f"The URL may point to a private or local network address. "
@@ -191,6 +210,7 @@ def make_request(method: str, url: str, max_retries: int = SSRF_DEFAULT_MAX_RETR
             if response.status_code not in STATUS_FORCELIST:
                 return response
             else:
+                response.close()
                 logger.warning(
                     "Received status code %s for URL %s which is in the force list",
                     response.status_code,
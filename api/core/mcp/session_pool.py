@@ -0,0 +1,207 @@
+"""
+Per-process pool of initialized MCP client sessions.
+
+Connecting to an MCP server (transport connect plus the `initialize` handshake, and for SSE servers a new event
+stream) costs far more than the tool call itself. Sessions are therefore kept open after use and handed to later
+calls for the same provider and credentials instead of being torn down after every call.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from configs import dify_config
+from core.entities.mcp_provider import MCPProviderEntity
+from core.mcp.auth_client import MCPClientWithAuthRetry
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class MCPSessionKey:
+    tenant_id: str
+    provider_id: str
+    # Hash of the server URL and request headers, so that sessions are never shared across credentials
+    credential_hash: str
+
+
+@dataclass
+class _IdleSession:
+    client: MCPClientWithAuthRetry
+    last_used: float
+
+
+def _credential_hash(server_url: str, headers: dict[str, str]) -> str:
+    payload = json.dumps([server_url, sorted(headers.items())])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class MCPSessionPool:
+    """
+    Pool of initialized MCP client sessions keyed by tenant, provider and credentials.
+
+    A session is checked out for the duration of one `session()` block and returned afterwards. Sessions are
+    discarded instead of returned when the block raises, since the transport may be broken; they are pinged
+    before reuse once idle for longer than the health check interval, and closed once idle for longer than
+    the idle timeout or when the pool is full.
+
+    When a call refreshes the OAuth token, the client reconnects with the new token and is returned under
+    the key of its new credentials, which is the key the next call loads from the database.
+    """
+
+    def __init__(
+        self,
+        max_idle_per_key: int,
+        max_sessions: int,
+        idle_timeout: float,
+        health_check_interval: float,
+    ):
+        self.max_idle_per_key = max_idle_per_key
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self._idle: dict[MCPSessionKey, list[_IdleSession]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls) -> "MCPSessionPool":
+        return cls(
+            max_idle_per_key=dify_config.MCP_SESSION_POOL_MAX_IDLE_PER_PROVIDER,
+            max_sessions=dify_config.MCP_SESSION_POOL_MAX_SESSIONS,
+            idle_timeout=dify_config.MCP_SESSION_POOL_IDLE_TIMEOUT,
+            health_check_interval=dify_config.MCP_SESSION_POOL_HEALTH_CHECK_INTERVAL,
+        )
+
+    @staticmethod
+    def make_key(tenant_id: str, provider_id: str, server_url: str, headers: dict[str, str]) -> MCPSessionKey:
+        return MCPSessionKey(tenant_id, provider_id, _credential_hash(server_url, headers))
+
+    @contextmanager
+    def session(
+        self,
+        *,
+        provider_entity: MCPProviderEntity,
+        server_url: str,
+        headers: dict[str, str],
+        timeout: float | None = None,
+        sse_read_timeout: float | None = None,
+    ) -> Generator[MCPClientWithAuthRetry, None, None]:
+        """
+        Check out an initialized client for the provider, connecting a new one if none is idle.
+
+        Args:
+            provider_entity: Provider entity, used by the client to refresh OAuth tokens
+            server_url: Decrypted server URL
+            headers: Decrypted request headers, including the Authorization header if any
+            timeout: Request timeout
+            sse_read_timeout: SSE read timeout
+        """
+        key = self.make_key(provider_entity.tenant_id, provider_entity.id, server_url, headers)
+        client = self._checkout(key)
+        if client is None:
+            client = MCPClientWithAuthRetry(
+                server_url=server_url,
+                headers=dict(headers),
+                timeout=timeout,
+                sse_read_timeout=sse_read_timeout,
+                provider_entity=provider_entity,
+            )
+            client.__enter__()
+        else:
+            client.provider_entity = provider_entity
+
+        try:
+            yield client
+        except BaseException:
+            self._close(client)
+            raise
+
+        # The key changes when the client refreshed its token during the call
+        self._return(self.make_key(key.tenant_id, key.provider_id, client.server_url, client.headers), client)
+
+    def _checkout(self, key: MCPSessionKey) -> MCPClientWithAuthRetry | None:
+        expired = self._evict_expired()
+        for idle in expired:
+            self._close(idle.client)
+
+        while True:
+            with self._lock:
+                idle_sessions = self._idle.get(key)
+                if not idle_sessions:
+                    return None
+                # Take the most recently used session, so that rarely needed extra sessions expire
+                idle = idle_sessions.pop()
+                if not idle_sessions:
+                    del self._idle[key]
+
+            if time.monotonic() - idle.last_used < self.health_check_interval or self._is_healthy(idle.client):
+                return idle.client
+            self._close(idle.client)
+
+    def _return(self, key: MCPSessionKey, client: MCPClientWithAuthRetry):
+        evicted: list[_IdleSession] = []
+        with self._lock:
+            idle_sessions = self._idle.setdefault(key, [])
+            if len(idle_sessions) >= self.max_idle_per_key:
+                evicted.append(idle_sessions.pop(0))
+            idle_sessions.append(_IdleSession(client=client, last_used=time.monotonic()))
+            if self._idle_count() > self.max_sessions:
+                evicted.append(self._pop_least_recently_used())
+        for idle in evicted:
+            self._close(idle.client)
+
+    def _evict_expired(self) -> list[_IdleSession]:
+        deadline = time.monotonic() - self.idle_timeout
+        expired: list[_IdleSession] = []
+        with self._lock:
+            for key in list(self._idle):
+                idle_sessions = self._idle[key]
+                expired.extend(idle for idle in idle_sessions if idle.last_used < deadline)
+                idle_sessions[:] = [idle for idle in idle_sessions if idle.last_used >= deadline]
+                if not idle_sessions:
+                    del self._idle[key]
+        return expired
+
+    def _idle_count(self) -> int:
+        return sum(len(idle_sessions) for idle_sessions in self._idle.values())
+
+    def _pop_least_recently_used(self) -> _IdleSession:
+        key = min(self._idle, key=lambda k: self._idle[k][0].last_used)
+        idle = self._idle[key].pop(0)
+        if not self._idle[key]:
+            del self._idle[key]
+        return idle
+
+    @staticmethod
+    def _is_healthy(client: MCPClientWithAuthRetry) -> bool:
+        try:
+            if not client._session:
+                return False
+            client._session.send_ping()
+            return True
+        except Exception:
+            logger.debug("Pooled MCP session to %s failed its health check", client.server_url, exc_info=True)
+            return False
+
+    @staticmethod
+    def _close(client: MCPClientWithAuthRetry):
+        try:
+            client.cleanup()
+        except Exception:
+            logger.debug("Failed to close MCP session to %s", client.server_url, exc_info=True)
+
+    def close_all(self):
+        """Close every idle session."""
+        with self._lock:
+            idle_sessions = [idle for sessions in self._idle.values() for idle in sessions]
+            self._idle.clear()
+        for idle in idle_sessions:
+            self._close(idle.client)
+
+
+mcp_session_pool = MCPSessionPool.from_config()
@@ -684,6 +684,22 @@ model: %s""",
         res: bool = redis_client.exists(cooldown_cache_key)
         return res
 
+    def cooldown_ttl(self) -> int:
+        """
+        Get the remaining cooldown of the model, i.e. the time until one of its load balancing configs is usable again
+        :return: seconds until the first config leaves cooldown, 0 if any config is available now
+        """
+        ttls = []
+        for config in self._load_balancing_configs:
+            in_cooldown, ttl = self.get_config_in_cooldown_and_ttl(
+                self._tenant_id, self._provider, self._model_type, self._model, config.id
+            )
+            if not in_cooldown:
+                return 0
+            ttls.append(ttl)
+
+        return max(min(ttls), 1) if ttls else 0
+
     @staticmethod
     def get_config_in_cooldown_and_ttl(
         tenant_id: str, provider: str, model_type: ModelType, model: str, config_id: str
@@ -1,11 +1,8 @@
 import decimal
-import hashlib
 import logging
 
-from pydantic import BaseModel, ConfigDict, Field, ValidationError
-from redis import RedisError
+from pydantic import BaseModel, ConfigDict, Field
 
-from configs import dify_config
 from core.model_runtime.entities.common_entities import I18nObject
 from core.model_runtime.entities.defaults import PARAMETER_RULE_TEMPLATE
 from core.model_runtime.entities.model_entities import (
@@ -24,8 +21,8 @@ from core.model_runtime.errors.invoke import (
     InvokeRateLimitError,
     InvokeServerUnavailableError,
 )
+from core.model_runtime.model_providers.model_schema_cache import model_schema_cache
 from core.plugin.entities.plugin_daemon import PluginModelProviderEntity
-from extensions.ext_redis import redis_client
 
 logger = logging.getLogger(__name__)
 
@@ -146,40 +143,14 @@ class AIModel(BaseModel):
         """
         from core.plugin.impl.model import PluginModelClient
 
-        plugin_model_manager = PluginModelClient()
-        cache_key = f"{self.tenant_id}:{self.plugin_id}:{self.provider_name}:{self.model_type.value}:{model}"
-        sorted_credentials = sorted(credentials.items()) if credentials else []
-        cache_key += ":".join([hashlib.md5(f"{k}:{v}".encode()).hexdigest() for k, v in sorted_credentials])
-
-        cached_schema_json = None
-        try:
-            cached_schema_json = redis_client.get(cache_key)
-        except (RedisError, RuntimeError) as exc:
-            logger.warning(
-                "Failed to read plugin model schema cache for model %s: %s",
-                model,
-                str(exc),
-                exc_info=True,
-            )
-        if cached_schema_json:
-            try:
-                return AIModelEntity.model_validate_json(cached_schema_json)
-            except ValidationError:
-                logger.warning(
-                    "Failed to validate cached plugin model schema for model %s",
-                    model,
-                    exc_info=True,
-                )
-                try:
-                    redis_client.delete(cache_key)
-                except (RedisError, RuntimeError) as exc:
-                    logger.warning(
-                        "Failed to delete invalid plugin model schema cache for model %s: %s",
-                        model,
-                        str(exc),
-                        exc_info=True,
-                    )
+        cache_key = model_schema_cache.make_key(
+            self.tenant_id, self.plugin_id, self.provider_name, self.model_type.value, model, credentials
+        )
+        cached_schema = model_schema_cache.get(cache_key, model)
+        if cached_schema:
+            return cached_schema
 
+        plugin_model_manager = PluginModelClient()
         schema = plugin_model_manager.get_model_schema(
             tenant_id=self.tenant_id,
             user_id="unknown",
@@ -191,15 +162,7 @@ class AIModel(BaseModel):
         )
 
         if schema:
-            try:
-                redis_client.setex(cache_key, dify_config.PLUGIN_MODEL_SCHEMA_CACHE_TTL, schema.model_dump_json())
-            except (RedisError, RuntimeError) as exc:
-                logger.warning(
-                    "Failed to write plugin model schema cache for model %s: %s",
-                    model,
-                    str(exc),
-                    exc_info=True,
-                )
+            model_schema_cache.set(cache_key, model, schema)
 
         return schema
 
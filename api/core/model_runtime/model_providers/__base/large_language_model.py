@@ -348,19 +348,27 @@ class LargeLanguageModel(AIModel):
         """
         callbacks = callbacks or []
         message_content: list[PromptMessageContentUnionTypes] = []
+        # Text deltas are joined once at the end instead of creating a content object per chunk
+        text_deltas: list[str] = []
         usage = None
         system_fingerprint = None
         real_model = model
 
+        def _flush_text_deltas():
+            if text_deltas:
+                message_content.append(TextPromptMessageContent(data="".join(text_deltas)))
+                text_deltas.clear()
+
         def _update_message_content(content: str | list[PromptMessageContentUnionTypes] | None):
             if not content:
                 return
+            if isinstance(content, str):
+                text_deltas.append(content)
+                return
             if isinstance(content, list):
+                _flush_text_deltas()
                 message_content.extend(content)
                 return
-            if isinstance(content, str):
-                message_content.append(TextPromptMessageContent(data=content))
-                return
 
         try:
             for chunk in result:
@@ -370,6 +378,10 @@ class LargeLanguageModel(AIModel):
                 chunk.prompt_messages = prompt_messages
                 yield chunk
 
+                # The assembled result is only consumed by callbacks, skip all per-chunk work without them
+                if not callbacks:
+                    continue
+
                 self._trigger_new_chunk_callbacks(
                     chunk=chunk,
                     model=model,
@@ -394,6 +406,10 @@ class LargeLanguageModel(AIModel):
         except Exception as e:
             raise self._transform_invoke_error(e)
 
+        if not callbacks:
+            return
+
+        _flush_text_deltas()
         assistant_message = AssistantPromptMessage(content=message_content)
         self._trigger_after_invoke_callbacks(
             model=model,
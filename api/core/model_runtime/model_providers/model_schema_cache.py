@@ -0,0 +1,111 @@
+"""
+Cache of plugin model schemas.
+
+Model schemas are looked up on every model invocation (token counting, pricing, embeddings, LLM nodes). They
+are kept in Redis for `PLUGIN_MODEL_SCHEMA_CACHE_TTL` and, in front of that, in a per-process LRU of validated
+`AIModelEntity` objects so that a lookup does not pay a Redis round trip and a JSON validation each time.
+
+Cached entities are shared between callers and must not be mutated.
+"""
+
+import hashlib
+import logging
+import threading
+
+from cachetools import TTLCache
+from pydantic import ValidationError
+from redis import RedisError
+
+from configs import dify_config
+from core.model_runtime.entities.model_entities import AIModelEntity
+from extensions.ext_redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class ModelSchemaCache:
+    def __init__(self, local_max_size: int, local_ttl: int):
+        self._local: TTLCache[str, AIModelEntity] = TTLCache(maxsize=local_max_size, ttl=local_ttl)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls) -> "ModelSchemaCache":
+        return cls(
+            local_max_size=dify_config.PLUGIN_MODEL_SCHEMA_LOCAL_CACHE_SIZE,
+            local_ttl=min(dify_config.PLUGIN_MODEL_SCHEMA_LOCAL_CACHE_TTL, dify_config.PLUGIN_MODEL_SCHEMA_CACHE_TTL),
+        )
+
+    @staticmethod
+    def make_key(
+        tenant_id: str, plugin_id: str, provider: str, model_type: str, model: str, credentials: dict | None
+    ) -> str:
+        cache_key = f"{tenant_id}:{plugin_id}:{provider}:{model_type}:{model}"
+        if credentials:
+            # A single digest over all credentials, the key must not contain the credentials themselves
+            digest = hashlib.blake2b(repr(sorted(credentials.items())).encode(), digest_size=16).hexdigest()
+            cache_key += f":{digest}"
+        return cache_key
+
+    def get(self, cache_key: str, model: str) -> AIModelEntity | None:
+        with self._lock:
+            schema = self._local.get(cache_key)
+        if schema is not None:
+            return schema
+
+        cached_schema_json = None
+        try:
+            cached_schema_json = redis_client.get(cache_key)
+        except (RedisError, RuntimeError) as exc:
+            logger.warning(
+                "Failed to read plugin model schema cache for model %s: %s",
+                model,
+                str(exc),
+                exc_info=True,
+            )
+        if not cached_schema_json:
+            return None
+
+        try:
+            schema = AIModelEntity.model_validate_json(cached_schema_json)
+        except ValidationError:
+            logger.warning(
+                "Failed to validate cached plugin model schema for model %s",
+                model,
+                exc_info=True,
+            )
+            try:
+                redis_client.delete(cache_key)
+            except (RedisError, RuntimeError) as exc:
+                logger.warning(
+                    "Failed to delete invalid plugin model schema cache for model %s: %s",
+                    model,
+                    str(exc),
+                    exc_info=True,
+                )
+            return None
+
+        self._set_local(cache_key, schema)
+        return schema
+
+    def set(self, cache_key: str, model: str, schema: AIModelEntity):
+        self._set_local(cache_key, schema)
+        try:
+            redis_client.setex(cache_key, dify_config.PLUGIN_MODEL_SCHEMA_CACHE_TTL, schema.model_dump_json())
+        except (RedisError, RuntimeError) as exc:
+            logger.warning(
+                "Failed to write plugin model schema cache for model %s: %s",
+                model,
+                str(exc),
+                exc_info=True,
+            )
+
+    def clear(self):
+        with self._lock:
+            self._local.clear()
+
+    def _set_local(self, cache_key: str, schema: AIModelEntity):
+        with self._lock:
+            self._local[cache_key] = schema
+
+
+model_schema_cache = ModelSchemaCache.from_config()
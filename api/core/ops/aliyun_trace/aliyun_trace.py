@@ -89,6 +89,9 @@ class AliyunDataTrace(BaseTraceInstance):
         if isinstance(trace_info, GenerateNameTraceInfo):
             pass
 
+    def flush(self):
+        self.trace_client.flush()
+
     def api_check(self):
         return self.trace_client.api_check()
 
@@ -120,6 +120,11 @@ class TraceClient:
             except Exception as e:
                 logger.warning("Error exporting spans: %s", e)
 
+    def flush(self) -> None:
+        """Export all queued spans now instead of waiting for the worker's schedule."""
+        while self.queue:
+            self._export_batch()
+
     def shutdown(self) -> None:
         with self.condition:
             self.done = True
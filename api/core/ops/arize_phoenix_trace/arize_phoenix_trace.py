@@ -17,7 +17,7 @@ from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExport
 from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter as HttpOTLPSpanExporter
 from opentelemetry.sdk import trace as trace_sdk
 from opentelemetry.sdk.resources import Resource
-from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export import BatchSpanProcessor
 from opentelemetry.semconv.trace import SpanAttributes as OTELSpanAttributes
 from opentelemetry.trace import Span, Status, StatusCode, set_span_in_context, use_span
 from opentelemetry.trace.propagation.tracecontext import TraceContextTextMapPropagator
@@ -45,7 +45,7 @@ from models.workflow import WorkflowNodeExecutionTriggeredFrom
 logger = logging.getLogger(__name__)
 
 
-def setup_tracer(arize_phoenix_config: ArizeConfig | PhoenixConfig) -> tuple[trace_sdk.Tracer, SimpleSpanProcessor]:
+def setup_tracer(arize_phoenix_config: ArizeConfig | PhoenixConfig) -> tuple[trace_sdk.Tracer, BatchSpanProcessor]:
     """Configure OpenTelemetry tracer with OTLP exporter for Arize/Phoenix."""
     try:
         # Choose the appropriate exporter based on config type
@@ -86,7 +86,8 @@ def setup_tracer(arize_phoenix_config: ArizeConfig | PhoenixConfig) -> tuple[tra
         }
         resource = Resource(attributes=attributes)
         provider = trace_sdk.TracerProvider(resource=resource)
-        processor = SimpleSpanProcessor(
+        # Spans are exported in batches; ArizePhoenixDataTrace.flush exports them at the end of each trace batch
+        processor = BatchSpanProcessor(
             exporter,
         )
         provider.add_span_processor(processor)
@@ -195,6 +196,9 @@ class ArizePhoenixDataTrace(BaseTraceInstance):
             logger.error("[Arize/Phoenix] Trace Entity Error: %s", str(e), exc_info=True)
             raise
 
+    def flush(self):
+        self.processor.force_flush()
+
     def workflow_trace(self, trace_info: WorkflowTraceInfo):
         file_list = trace_info.file_list if isinstance(trace_info.file_list, list) else []
 
@@ -1,4 +1,6 @@
+import logging
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 
 from sqlalchemy import select
 from sqlalchemy.orm import Session
@@ -8,6 +10,8 @@ from core.ops.entities.trace_entity import BaseTraceInfo
 from extensions.ext_database import db
 from models import Account, App, TenantAccountJoin
 
+logger = logging.getLogger(__name__)
+
 
 class BaseTraceInstance(ABC):
     """
@@ -30,6 +34,36 @@ class BaseTraceInstance(ABC):
         """
         ...
 
+    def batch_trace(self, trace_infos: Sequence[BaseTraceInfo]) -> int:
+        """
+        Trace a batch of activities, then flush the provider client once for the whole batch.
+        Providers whose clients expose a native batch API should override this
+        to send the whole batch in one request.
+
+        Returns:
+            int: The number of trace infos that failed to be traced
+        """
+        failed = 0
+        for trace_info in trace_infos:
+            try:
+                self.trace(trace_info)
+            except Exception:
+                logger.exception("Failed to trace %s", type(trace_info).__name__)
+                failed += 1
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Failed to flush trace batch")
+        return failed
+
+    def flush(self):
+        """
+        Export activities buffered by the provider client.
+        Providers whose clients queue activities and export them in the background override this,
+        so that a batch is exported together rather than on the client's own schedule.
+        """
+        return
+
     def get_service_account_with_tenant(self, app_id: str) -> Account:
         """
         Get service account for an app and set up its tenant.
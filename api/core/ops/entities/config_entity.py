@@ -268,4 +268,5 @@ class DatabricksConfig(BaseTracingConfig):
 
 
 OPS_FILE_PATH = "ops_trace/"
+OPS_BATCH_FILE_EXTENSION = "ndjson"
 OPS_TRACE_FAILED_KEY = "FAILED_OPS_TRACE"
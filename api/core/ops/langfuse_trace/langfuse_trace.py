@@ -65,6 +65,10 @@ class LangFuseDataTrace(BaseTraceInstance):
         if isinstance(trace_info, GenerateNameTraceInfo):
             self.generate_name_trace(trace_info)
 
+    def flush(self):
+        # The Langfuse client queues events and ingests them in batches
+        self.langfuse_client.flush()
+
     def workflow_trace(self, trace_info: WorkflowTraceInfo):
         trace_id = trace_info.trace_id or trace_info.workflow_run_id
         user_id = trace_info.metadata.get("user_id")
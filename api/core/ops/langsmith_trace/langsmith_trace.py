@@ -1,6 +1,8 @@
 import logging
 import os
+import threading
 import uuid
+from collections.abc import Sequence
 from datetime import datetime, timedelta
 from typing import cast
 
@@ -45,6 +47,7 @@ class LangSmithDataTrace(BaseTraceInstance):
         self.project_name = langsmith_config.project
         self.project_id = None
         self.langsmith_client = Client(api_key=langsmith_config.api_key, api_url=langsmith_config.endpoint)
+        self._pending_runs = threading.local()
         self.file_base_url = os.getenv("FILES_URL", "http://127.0.0.1:5001")
 
     def trace(self, trace_info: BaseTraceInfo):
@@ -472,6 +475,23 @@ class LangSmithDataTrace(BaseTraceInstance):
 
         self.add_run(name_run)
 
+    def batch_trace(self, trace_infos: Sequence[BaseTraceInfo]) -> int:
+        # Collect the runs of the whole batch and ingest them with a single batch request.
+        self._pending_runs.runs = []
+        try:
+            failed = super().batch_trace(trace_infos)
+        finally:
+            runs, self._pending_runs.runs = self._pending_runs.runs, None
+        if runs:
+            try:
+                self.langsmith_client.batch_ingest_runs(create=runs)
+                logger.debug("LangSmith ingested %s runs successfully.", len(runs))
+            except Exception:
+                # The runs of every trace in the batch were in the failed request
+                logger.exception("LangSmith Failed to batch ingest %s runs", len(runs))
+                return len(trace_infos)
+        return failed
+
     def add_run(self, run_data: LangSmithRunModel):
         data = run_data.model_dump()
         if self.project_id:
@@ -480,6 +500,10 @@ class LangSmithDataTrace(BaseTraceInstance):
             data["session_name"] = self.project_name
 
         data = filter_none_values(data)
+        pending_runs = getattr(self._pending_runs, "runs", None)
+        if pending_runs is not None and data.get("trace_id") and data.get("dotted_order"):
+            pending_runs.append(data)
+            return
         try:
             self.langsmith_client.create_run(**data)
             logger.debug("LangSmith Run created successfully.")
@@ -106,6 +106,10 @@ class MLflowDataTrace(BaseTraceInstance):
             logger.exception("[MLflow] Trace error")
             raise
 
+    def flush(self):
+        # Traces are logged asynchronously (MLFLOW_ENABLE_ASYNC_TRACE_LOGGING)
+        mlflow.flush_trace_async_logging()
+
     def workflow_trace(self, trace_info: WorkflowTraceInfo):
         """Create workflow span as root, with node spans as children"""
         # fields with sys.xyz is added by Dify, they are duplicate to trace_info.metadata
@@ -94,6 +94,10 @@ class OpikDataTrace(BaseTraceInstance):
         if isinstance(trace_info, GenerateNameTraceInfo):
             self.generate_name_trace(trace_info)
 
+    def flush(self):
+        # The Opik client sends traces and spans from a background queue
+        self.opik_client.flush()
+
     def workflow_trace(self, trace_info: WorkflowTraceInfo):
         dify_trace_id = trace_info.trace_id or trace_info.workflow_run_id
         opik_trace_id = prepare_opik_uuid(trace_info.start_time, dify_trace_id)
@@ -9,13 +9,13 @@ from datetime import timedelta
 from typing import TYPE_CHECKING, Any, Optional, Union
 from uuid import UUID, uuid4
 
-from cachetools import LRUCache
+from cachetools import LRUCache, TTLCache
 from flask import current_app
 from sqlalchemy import select
 from sqlalchemy.orm import Session, sessionmaker
 
 from core.helper.encrypter import batch_decrypt_token, encrypt_token, obfuscated_token
-from core.ops.entities.config_entity import OPS_FILE_PATH, TracingProviderEnum
+from core.ops.entities.config_entity import OPS_BATCH_FILE_EXTENSION, OPS_FILE_PATH, TracingProviderEnum
 from core.ops.entities.trace_entity import (
     DatasetRetrievalTraceInfo,
     GenerateNameTraceInfo,
@@ -28,6 +28,7 @@ from core.ops.entities.trace_entity import (
     WorkflowTraceInfo,
 )
 from core.ops.utils import get_message_data
+from extensions.ext_redis import redis_client
 from extensions.ext_storage import storage
 from models.engine import db
 from models.model import App, AppModelConfig, Conversation, Message, MessageFile, TraceAppConfig
@@ -154,10 +155,19 @@ class OpsTraceProviderConfigMap(collections.UserDict[str, dict[str, Any]]):
 
 provider_config_map = OpsTraceProviderConfigMap()
 
+# Sentinel cached for apps without an effective tracing config, so that they are not looked up on every request
+_TRACING_DISABLED = object()
+
+# Redis key holding the version of an app's tracing config, bumped on every change so that all processes
+# (API and ops_trace workers) drop their cached trace instance for the app
+TRACE_CONFIG_VERSION_KEY = "ops_trace_config_version:{app_id}"
+
 
 class OpsTraceManager:
     ops_trace_instances_cache: LRUCache = LRUCache(maxsize=128)
     decrypted_configs_cache: LRUCache = LRUCache(maxsize=128)
+    app_trace_instances_cache: TTLCache = TTLCache(maxsize=1024, ttl=int(os.getenv("TRACE_INSTANCE_CACHE_TTL", 60)))
+    _app_trace_instances_cache_lock = threading.Lock()
     _decryption_cache_lock = threading.RLock()
 
     @classmethod
@@ -351,6 +361,57 @@ class OpsTraceManager:
             logger.info("new tracing_instance for app_id: %s", app_id)
         return tracing_instance
 
+    @classmethod
+    def get_cached_ops_trace_instance(
+        cls,
+        app_id: Union[UUID, str] | None = None,
+    ):
+        """
+        Get ops trace instance of an app, cached per app for TRACE_INSTANCE_CACHE_TTL seconds.
+        Each cached entry records the app's tracing config version from Redis and is reloaded
+        as soon as invalidate_ops_trace_instance_cache bumps the version in any process.
+        :param app_id: app_id
+        :return:
+        """
+        if app_id is None:
+            return None
+        app_id = str(app_id)
+
+        version = cls._get_trace_config_version(app_id)
+        with cls._app_trace_instances_cache_lock:
+            cached = cls.app_trace_instances_cache.get(app_id)
+        if cached is None or cached[0] != version:
+            tracing_instance = cls.get_ops_trace_instance(app_id) or _TRACING_DISABLED
+            with cls._app_trace_instances_cache_lock:
+                cls.app_trace_instances_cache[app_id] = (version, tracing_instance)
+        else:
+            tracing_instance = cached[1]
+
+        return None if tracing_instance is _TRACING_DISABLED else tracing_instance
+
+    @classmethod
+    def invalidate_ops_trace_instance_cache(cls, app_id: Union[UUID, str]):
+        """
+        Drop the cached ops trace instance of an app after its tracing config changed
+        :param app_id: app_id
+        """
+        app_id = str(app_id)
+        with cls._app_trace_instances_cache_lock:
+            cls.app_trace_instances_cache.pop(app_id, None)
+        try:
+            redis_client.incr(TRACE_CONFIG_VERSION_KEY.format(app_id=app_id))
+        except Exception:
+            logger.warning("Failed to publish tracing config change of app %s", app_id, exc_info=True)
+
+    @classmethod
+    def _get_trace_config_version(cls, app_id: str) -> bytes | None:
+        try:
+            return redis_client.get(TRACE_CONFIG_VERSION_KEY.format(app_id=app_id))
+        except Exception:
+            # Fall back to the TTL alone while Redis is unavailable
+            logger.warning("Failed to read tracing config version of app %s", app_id, exc_info=True)
+            return None
+
     @classmethod
     def get_app_config_through_message_id(cls, message_id: str):
         app_model_config = None
@@ -398,6 +459,7 @@ class OpsTraceManager:
             }
         )
         db.session.commit()
+        cls.invalidate_ops_trace_instance_cache(app_id)
 
     @classmethod
     def get_app_tracing_config(cls, app_id: str):
@@ -935,7 +997,7 @@ class TraceQueueManager:
 
         self.app_id = app_id
         self.user_id = user_id
-        self.trace_instance = OpsTraceManager.get_ops_trace_instance(app_id)
+        self.trace_instance = OpsTraceManager.get_cached_ops_trace_instance(app_id)
         self.flask_app = current_app._get_current_object()  # type: ignore
         if trace_manager_timer is None:
             self.start_timer()
@@ -977,22 +1039,34 @@ class TraceQueueManager:
             trace_manager_timer.start()
 
     def send_to_celery(self, tasks: list[TraceTask]):
+        """
+        Export the collected trace tasks as one NDJSON batch file and one celery task per app
+        """
         with self.flask_app.app_context():
+            batches: dict[str, list[str]] = collections.defaultdict(list)
             for task in tasks:
                 if task.app_id is None:
                     continue
-                file_id = uuid4().hex
-                trace_info = task.execute()
+                try:
+                    trace_info = task.execute()
+                except Exception:
+                    logger.exception("Error executing trace task, trace_type %s", task.trace_type)
+                    continue
 
                 task_data = TaskData(
                     app_id=task.app_id,
                     trace_info_type=type(trace_info).__name__,
                     trace_info=trace_info.model_dump() if trace_info else None,
                 )
-                file_path = f"{OPS_FILE_PATH}{task.app_id}/{file_id}.json"
-                storage.save(file_path, task_data.model_dump_json().encode("utf-8"))
+                batches[task.app_id].append(task_data.model_dump_json())
+
+            for app_id, lines in batches.items():
+                file_id = uuid4().hex
+                file_path = f"{OPS_FILE_PATH}{app_id}/{file_id}.{OPS_BATCH_FILE_EXTENSION}"
+                storage.save(file_path, "\n".join(lines).encode("utf-8"))
                 file_info = {
                     "file_id": file_id,
-                    "app_id": task.app_id,
+                    "app_id": app_id,
+                    "batch": True,
                 }
                 process_trace_tasks.delay(file_info)  # type: ignore
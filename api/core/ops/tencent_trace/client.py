@@ -506,6 +506,11 @@ class TencentTraceClient:
         """Get project console URL"""
         return "https://console.cloud.tencent.com/apm"
 
+    def flush(self) -> None:
+        """Export queued spans now instead of waiting for the batch processor's schedule"""
+        if self.span_processor:
+            _ = self.span_processor.force_flush()
+
     def shutdown(self) -> None:
         """Shutdown the client and export remaining spans"""
         try:
@@ -66,6 +66,9 @@ class TencentDataTrace(BaseTraceInstance):
         elif isinstance(trace_info, GenerateNameTraceInfo):
             pass
 
+    def flush(self):
+        self.trace_client.flush()
+
     def api_check(self) -> bool:
         return self.trace_client.api_check()
 
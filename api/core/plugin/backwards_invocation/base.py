@@ -3,14 +3,21 @@ from typing import Generic, TypeVar
 
 from pydantic import BaseModel
 
+from core.app.apps.stream_event_encoder import EncodedStreamEvent
+
 
 class BaseBackwardsInvocation:
     @classmethod
-    def convert_to_event_stream(cls, response: Generator[BaseModel | Mapping | str, None, None] | BaseModel | Mapping):
+    def convert_to_event_stream(
+        cls, response: Generator[BaseModel | Mapping | str | EncodedStreamEvent, None, None] | BaseModel | Mapping
+    ):
         if isinstance(response, Generator):
             try:
                 for chunk in response:
-                    if isinstance(chunk, BaseModel | dict):
+                    if isinstance(chunk, EncodedStreamEvent):
+                        # same as BaseBackwardsInvocationResponse(data=...), without decoding the event again
+                        yield f'{{"data":{chunk.data},"error":""}}'.encode()
+                    elif isinstance(chunk, BaseModel | dict):
                         yield BaseBackwardsInvocationResponse(data=chunk).model_dump_json().encode()
             except Exception as e:
                 error_message = BaseBackwardsInvocationResponse(error=str(e)).model_dump_json()
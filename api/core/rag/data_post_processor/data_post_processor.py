@@ -72,6 +72,8 @@ class DataPostProcessor:
                 runner_type=reranking_mode, rerank_model_instance=rerank_model_instance
             )
             return runner
+        elif reranking_mode in (RerankMode.RECIPROCAL_RANK_FUSION, RerankMode.WEIGHTED_FUSION):
+            return RerankRunnerFactory.create_rerank_runner(runner_type=reranking_mode)
         return None
 
     def _get_reorder_runner(self, reorder_enabled) -> ReorderRunner | None:
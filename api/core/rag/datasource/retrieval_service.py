@@ -13,6 +13,7 @@ from core.model_manager import ModelManager
 from core.model_runtime.entities.model_entities import ModelType
 from core.rag.data_post_processor.data_post_processor import DataPostProcessor
 from core.rag.datasource.keyword.keyword_factory import Keyword
+from core.rag.datasource.segment_cache import segment_hydration_cache
 from core.rag.datasource.vdb.vector_factory import Vector
 from core.rag.embedding.retrieval import RetrievalChildChunk, RetrievalSegments
 from core.rag.entities.metadata_entities import MetadataCondition
@@ -20,6 +21,7 @@ from core.rag.index_processor.constant.doc_type import DocType
 from core.rag.index_processor.constant.index_type import IndexStructureType
 from core.rag.index_processor.constant.query_type import QueryType
 from core.rag.models.document import Document
+from core.rag.rerank.fusion_rerank import fuse_documents
 from core.rag.rerank.rerank_type import RerankMode
 from core.rag.retrieval.retrieval_methods import RetrievalMethod
 from core.tools.signature import sign_upload_file
@@ -374,6 +376,22 @@ class RetrievalService:
     def escape_query_for_search(query: str) -> str:
         return query.replace('"', '\\"')
 
+    @staticmethod
+    def _get_index_node_segments(session: Session, index_nodes: dict[str, str]) -> list[DocumentSegment]:
+        """Load the enabled, completed segments of index nodes (index_node_id -> dataset_id), cached if enabled"""
+
+        def load(index_node_ids: list[str]) -> list[DocumentSegment]:
+            document_segment_stmt = select(DocumentSegment).where(
+                DocumentSegment.enabled == True,
+                DocumentSegment.status == "completed",
+                DocumentSegment.index_node_id.in_(index_node_ids),
+            )
+            return list(session.execute(document_segment_stmt).scalars().all())
+
+        if not dify_config.SEGMENT_HYDRATION_CACHE_ENABLED:
+            return load(list(index_nodes))
+        return segment_hydration_cache.load(index_nodes, load)
+
     @classmethod
     def format_retrieval_documents(cls, documents: list[Document]) -> list[RetrievalSegments]:
         """Format retrieval documents with optimized batch processing"""
@@ -399,6 +417,7 @@ class RetrievalService:
             image_doc_ids: list[Any] = []
             child_index_node_ids = []
             index_node_ids = []
+            index_node_datasets: dict[str, str] = {}  # Map index_node_id to dataset_id for the segment cache
             doc_to_document_map = {}
             summary_segment_ids = set()  # Track segments retrieved via summary
             summary_score_map: dict[str, float] = {}  # Map original_chunk_id to summary score
@@ -451,6 +470,7 @@ class RetrievalService:
                         image_doc_ids.append(doc_id)
                     else:
                         index_node_ids.append(doc_id)
+                        index_node_datasets[doc_id] = dataset_document.dataset_id
 
             image_doc_ids = [i for i in image_doc_ids if i]
             child_index_node_ids = [i for i in child_index_node_ids if i]
@@ -493,12 +513,9 @@ class RetrievalService:
                         doc_segment_map[i.segment_id] = [i.index_node_id]
 
                 if index_node_ids:
-                    document_segment_stmt = select(DocumentSegment).where(
-                        DocumentSegment.enabled == True,
-                        DocumentSegment.status == "completed",
-                        DocumentSegment.index_node_id.in_(index_node_ids),
+                    index_node_segments = cls._get_index_node_segments(
+                        session, {i: index_node_datasets[i] for i in index_node_ids}
                     )
-                    index_node_segments = session.execute(document_segment_stmt).scalars().all()  # type: ignore
                     for index_node_segment in index_node_segments:
                         doc_segment_map[index_node_segment.id] = [index_node_segment.index_node_id]
 
@@ -702,7 +719,10 @@ class RetrievalService:
         if not query and not attachment_id:
             return
         with flask_app.app_context():
-            all_documents_item: list[Document] = []
+            # results are kept per search so that hybrid search can fuse them by rank
+            keyword_documents: list[Document] = []
+            semantic_documents: list[Document] = []
+            full_text_documents: list[Document] = []
             # Optimize multithreading with thread pools
             with ThreadPoolExecutor(max_workers=dify_config.RETRIEVAL_SERVICE_EXECUTORS) as executor:  # type: ignore
                 futures = []
@@ -714,7 +734,7 @@ class RetrievalService:
                             dataset_id=dataset.id,
                             query=query,
                             top_k=top_k,
-                            all_documents=all_documents_item,
+                            all_documents=keyword_documents,
                             exceptions=exceptions,
                             document_ids_filter=document_ids_filter,
                         )
@@ -730,7 +750,7 @@ class RetrievalService:
                                 top_k=top_k,
                                 score_threshold=score_threshold,
                                 reranking_model=reranking_model,
-                                all_documents=all_documents_item,
+                                all_documents=semantic_documents,
                                 retrieval_method=retrieval_method,
                                 exceptions=exceptions,
                                 document_ids_filter=document_ids_filter,
@@ -747,7 +767,7 @@ class RetrievalService:
                                 top_k=top_k,
                                 score_threshold=score_threshold,
                                 reranking_model=reranking_model,
-                                all_documents=all_documents_item,
+                                all_documents=semantic_documents,
                                 retrieval_method=retrieval_method,
                                 exceptions=exceptions,
                                 document_ids_filter=document_ids_filter,
@@ -764,7 +784,7 @@ class RetrievalService:
                             top_k=top_k,
                             score_threshold=score_threshold,
                             reranking_model=reranking_model,
-                            all_documents=all_documents_item,
+                            all_documents=full_text_documents,
                             retrieval_method=retrieval_method,
                             exceptions=exceptions,
                             document_ids_filter=document_ids_filter,
@@ -782,8 +802,26 @@ class RetrievalService:
             if exceptions:
                 raise ValueError(";\n".join(exceptions))
 
+            all_documents_item = [*keyword_documents, *semantic_documents, *full_text_documents]
+            if retrieval_method == RetrievalMethod.HYBRID_SEARCH and reranking_mode in (
+                RerankMode.RECIPROCAL_RANK_FUSION,
+                RerankMode.WEIGHTED_FUSION,
+            ):
+                # fuse the semantic and full-text rankings from their scores, no model is called
+                all_documents_item = fuse_documents(
+                    [semantic_documents, full_text_documents],
+                    RerankMode(reranking_mode),
+                    weights=[
+                        weights["vector_setting"]["vector_weight"],
+                        weights["keyword_setting"]["keyword_weight"],
+                    ]
+                    if weights
+                    else None,
+                    score_threshold=score_threshold,
+                    top_n=top_k,
+                )
             # Deduplicate documents for hybrid search to avoid duplicate chunks
-            if retrieval_method == RetrievalMethod.HYBRID_SEARCH:
+            elif retrieval_method == RetrievalMethod.HYBRID_SEARCH:
                 if attachment_id and reranking_mode == RerankMode.WEIGHTED_SCORE:
                     all_documents.extend(all_documents_item)
                 all_documents_item = self._deduplicate_documents(all_documents_item)
@@ -0,0 +1,170 @@
+"""
+Redis-backed state of the document segments returned by knowledge retrieval.
+
+SegmentHydrationCache is a read-through cache of the segments that retrieval results are loaded with, keyed by
+index_node_id. Every dataset has a version in Redis that is part of the keys of its entries; changing the segments
+of a dataset replaces the version, which makes all of its entries unreachable at once, and they expire after the TTL.
+
+record_segment_hits buffers the hit_count increments of retrieved segments in a Redis hash, which the
+batch_update_segment_hit_count scheduled task flushes to the database.
+"""
+
+import json
+import logging
+from collections.abc import Callable, Collection, Iterable, Mapping, Sequence
+from datetime import datetime
+from typing import Any
+from uuid import uuid4
+
+import sqlalchemy as sa
+
+from configs import dify_config
+from extensions.ext_redis import redis_client
+from models.dataset import DocumentSegment
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_CACHE_KEY_PREFIX = "segment_hydration"
+PENDING_HIT_COUNT_KEY = "segment_hit_count:pending"
+
+_COLUMNS = [attr.key for attr in sa.inspect(DocumentSegment).column_attrs]
+_DATETIME_COLUMNS = [
+    attr.key for attr in sa.inspect(DocumentSegment).column_attrs if isinstance(attr.columns[0].type, sa.DateTime)
+]
+
+
+class SegmentHydrationCache:
+    """
+    Cache of enabled, completed document segments by index_node_id.
+
+    The cached copies are detached DocumentSegment instances; their hit_count may lag behind the database by up to
+    the TTL, everything else is current as long as the segment changes invalidate the dataset.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+
+    @staticmethod
+    def _version_key(dataset_id: str) -> str:
+        return f"{SEGMENT_CACHE_KEY_PREFIX}:version:{dataset_id}"
+
+    @staticmethod
+    def _entry_key(dataset_id: str, version: str, index_node_id: str) -> str:
+        return f"{SEGMENT_CACHE_KEY_PREFIX}:{dataset_id}:{version}:{index_node_id}"
+
+    def load(
+        self,
+        index_nodes: Mapping[str, str],
+        loader: Callable[[list[str]], Sequence[DocumentSegment]],
+    ) -> list[DocumentSegment]:
+        """
+        Return the segments of the index nodes, given as index_node_id -> dataset_id, calling loader with the
+        index_node_ids that are not cached and caching what it returns.
+
+        The dataset versions are read before loader runs, so segments loaded while an invalidation is in flight are
+        stored under the old version and never served.
+        """
+        if not index_nodes:
+            return []
+        try:
+            versions = self._versions(index_nodes.values())
+            cached = self._get_many(index_nodes, versions)
+        except Exception as e:
+            logger.warning("Failed to read the segment hydration cache: %s", e)
+            return list(loader(list(index_nodes)))
+
+        missing = [index_node_id for index_node_id in index_nodes if index_node_id not in cached]
+        segments = list(cached.values())
+        if missing:
+            loaded = loader(missing)
+            segments.extend(loaded)
+            try:
+                self._set_many(loaded, versions)
+            except Exception as e:
+                logger.warning("Failed to write the segment hydration cache: %s", e)
+        return segments
+
+    def invalidate(self, dataset_ids: Iterable[str]) -> None:
+        """Drop the cached segments of the datasets; call it after their segments changed."""
+        dataset_ids = set(dataset_ids)
+        if not dataset_ids:
+            return
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for dataset_id in dataset_ids:
+                # a random version never matches the entries of an earlier one; the key outlives the entries
+                # cached before it existed, which are read again once it expires
+                pipe.set(self._version_key(dataset_id), uuid4().hex, ex=self.ttl * 2)
+            pipe.execute()
+        except Exception as e:
+            logger.warning("Failed to invalidate the segment hydration cache of datasets %s: %s", dataset_ids, e)
+
+    def _versions(self, dataset_ids: Iterable[str]) -> dict[str, str]:
+        unique_ids = list(dict.fromkeys(dataset_ids))
+        values = redis_client.mget([self._version_key(dataset_id) for dataset_id in unique_ids])
+        return {
+            dataset_id: value.decode() if isinstance(value, bytes) else value or "0"
+            for dataset_id, value in zip(unique_ids, values)
+        }
+
+    def _get_many(self, index_nodes: Mapping[str, str], versions: Mapping[str, str]) -> dict[str, DocumentSegment]:
+        index_node_ids = list(index_nodes)
+        keys = [
+            self._entry_key(index_nodes[index_node_id], versions[index_nodes[index_node_id]], index_node_id)
+            for index_node_id in index_node_ids
+        ]
+        values = redis_client.mget(keys)
+        return {
+            index_node_id: self._loads(value)
+            for index_node_id, value in zip(index_node_ids, values)
+            if value is not None
+        }
+
+    def _set_many(self, segments: Iterable[DocumentSegment], versions: Mapping[str, str]) -> None:
+        pipe = redis_client.pipeline(transaction=False)
+        for segment in segments:
+            version = versions.get(segment.dataset_id)
+            if version is None or not segment.index_node_id:
+                continue
+            pipe.setex(
+                self._entry_key(segment.dataset_id, version, segment.index_node_id), self.ttl, self._dumps(segment)
+            )
+        pipe.execute()
+
+    @staticmethod
+    def _dumps(segment: DocumentSegment) -> str:
+        values: dict[str, Any] = {column: getattr(segment, column) for column in _COLUMNS}
+        for column in _DATETIME_COLUMNS:
+            if values[column] is not None:
+                values[column] = values[column].isoformat()
+        return json.dumps(values)
+
+    @staticmethod
+    def _loads(value: bytes | str) -> DocumentSegment:
+        values = json.loads(value)
+        for column in _DATETIME_COLUMNS:
+            if values.get(column) is not None:
+                values[column] = datetime.fromisoformat(values[column])
+        return DocumentSegment(**values)
+
+
+segment_hydration_cache = SegmentHydrationCache(ttl=dify_config.SEGMENT_HYDRATION_CACHE_TTL)
+
+
+def record_segment_hits(segment_ids: Collection[str]) -> bool:
+    """
+    Add one hit to each segment in the pending hit counts flushed by the batch_update_segment_hit_count task.
+
+    Returns False when the hits could not be recorded and should be written to the database directly.
+    """
+    if not dify_config.ENABLE_SEGMENT_HIT_COUNT_UPDATE_TASK:
+        return False
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for segment_id in segment_ids:
+            pipe.hincrby(PENDING_HIT_COUNT_KEY, segment_id, 1)
+        pipe.execute()
+    except Exception as e:
+        logger.warning("Failed to record segment hits: %s", e)
+        return False
+    return True
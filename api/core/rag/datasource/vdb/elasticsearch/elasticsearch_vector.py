@@ -1,6 +1,7 @@
 import json
 import logging
 import math
+from collections.abc import Sequence
 from typing import Any, cast
 from urllib.parse import urlparse
 
@@ -11,7 +12,7 @@ from packaging.version import parse as parse_version
 from pydantic import BaseModel, model_validator
 
 from core.rag.datasource.vdb.field import Field
-from core.rag.datasource.vdb.vector_base import BaseVector
+from core.rag.datasource.vdb.vector_base import BaseVector, CollectionSearch
 from core.rag.datasource.vdb.vector_factory import AbstractVectorFactory
 from core.rag.datasource.vdb.vector_type import VectorType
 from core.rag.embedding.embedding_base import Embeddings
@@ -224,6 +225,50 @@ class ElasticSearchVector(BaseVector):
 
         return docs
 
+    supports_batch_search = True
+
+    def search_by_vector_batch(
+        self, query_vector: list[float], searches: Sequence[CollectionSearch]
+    ) -> list[list[Document]]:
+        """
+        Search the indices of several datasets with one multi search request.
+        """
+        if not searches:
+            return []
+        body: list[dict[str, Any]] = []
+        for search in searches:
+            knn: dict[str, Any] = {
+                "field": Field.VECTOR,
+                "query_vector": query_vector,
+                "k": search.top_k,
+                "num_candidates": math.ceil(search.top_k * 1.5),
+            }
+            if search.document_ids_filter:
+                knn["filter"] = {"terms": {"metadata.document_id": search.document_ids_filter}}
+            body.append({"index": search.collection_name.lower()})
+            body.append({"knn": knn, "size": search.top_k})
+
+        responses = self._client.msearch(searches=body)["responses"]
+        results = []
+        for search, response in zip(searches, responses):
+            if "error" in response:
+                raise ValueError(f"Elasticsearch search of {search.collection_name} failed: {response['error']}")
+            docs = []
+            score_threshold = float(search.score_threshold or 0.0)
+            for hit in response["hits"]["hits"]:
+                if hit["_score"] >= score_threshold:
+                    metadata = hit["_source"][Field.METADATA_KEY]
+                    metadata["score"] = hit["_score"]
+                    docs.append(
+                        Document(
+                            page_content=hit["_source"][Field.CONTENT_KEY],
+                            vector=hit["_source"][Field.VECTOR],
+                            metadata=metadata,
+                        )
+                    )
+            results.append(docs)
+        return results
+
     def search_by_full_text(self, query: str, **kwargs: Any) -> list[Document]:
         query_str: dict[str, Any] = {"match": {Field.CONTENT_KEY: query}}
         document_ids_filter = kwargs.get("document_ids_filter")
@@ -2,6 +2,7 @@ import hashlib
 import json
 import logging
 import uuid
+from collections.abc import Sequence
 from contextlib import contextmanager
 from typing import Any
 
@@ -11,7 +12,7 @@ import psycopg2.pool
 from pydantic import BaseModel, model_validator
 
 from configs import dify_config
-from core.rag.datasource.vdb.vector_base import BaseVector
+from core.rag.datasource.vdb.vector_base import BaseVector, CollectionSearch
 from core.rag.datasource.vdb.vector_factory import AbstractVectorFactory
 from core.rag.datasource.vdb.vector_type import VectorType
 from core.rag.embedding.embedding_base import Embeddings
@@ -199,6 +200,44 @@ class PGVector(BaseVector):
                     docs.append(Document(page_content=text, metadata=metadata))
         return docs
 
+    supports_batch_search = True
+
+    def search_by_vector_batch(
+        self, query_vector: list[float], searches: Sequence[CollectionSearch]
+    ) -> list[list[Document]]:
+        """
+        Search the tables of several datasets with one UNION ALL query, each table keeps its own HNSW scan.
+        """
+        subqueries = []
+        params: list[Any] = []
+        for index, search in enumerate(searches):
+            if not isinstance(search.top_k, int) or search.top_k <= 0:
+                raise ValueError("top_k must be a positive integer")
+            where_clause = ""
+            params.append(json.dumps(query_vector))
+            if search.document_ids_filter:
+                where_clause = " WHERE meta->>'document_id' = ANY(%s)"
+                params.append(search.document_ids_filter)
+            subqueries.append(
+                f"(SELECT {index} AS search, meta, text, embedding <=> %s AS distance"
+                f" FROM embedding_{search.collection_name}{where_clause}"
+                f" ORDER BY distance LIMIT {search.top_k})"
+            )
+        results: list[list[Document]] = [[] for _ in searches]
+        if not subqueries:
+            return results
+
+        with self._get_cursor() as cur:
+            cur.execute(" UNION ALL ".join(subqueries), params)
+            for index, metadata, text, distance in cur:
+                score = 1 - distance
+                metadata["score"] = score
+                if score >= float(searches[index].score_threshold or 0.0):
+                    results[index].append(Document(page_content=text, metadata=metadata))
+        for docs in results:
+            docs.sort(key=lambda doc: doc.metadata["score"], reverse=True)
+        return results
+
     def search_by_full_text(self, query: str, **kwargs: Any) -> list[Document]:
         top_k = kwargs.get("top_k", 5)
         if not isinstance(top_k, int) or top_k <= 0:
@@ -22,7 +22,7 @@ from sqlalchemy import select
 
 from configs import dify_config
 from core.rag.datasource.vdb.field import Field
-from core.rag.datasource.vdb.vector_base import BaseVector
+from core.rag.datasource.vdb.vector_base import BaseVector, CollectionSearch
 from core.rag.datasource.vdb.vector_factory import AbstractVectorFactory
 from core.rag.datasource.vdb.vector_type import VectorType
 from core.rag.embedding.embedding_base import Embeddings
@@ -390,6 +390,58 @@ class QdrantVector(BaseVector):
         docs = sorted(docs, key=lambda x: x.metadata["score"] if x.metadata is not None else 0, reverse=True)
         return docs
 
+    supports_batch_search = True
+
+    def search_by_vector_batch(
+        self, query_vector: list[float], searches: Sequence[CollectionSearch]
+    ) -> list[list[Document]]:
+        """
+        Search several datasets with one batch search request per collection, datasets sharing a collection are
+        told apart by their group_id.
+        """
+        from qdrant_client.http import models
+
+        results: list[list[Document]] = [[] for _ in searches]
+        collections: dict[str, list[int]] = {}
+        for index, search in enumerate(searches):
+            # qdrant may reject a score threshold of 1, see search_by_vector
+            if float(search.score_threshold or 0.0) < 1:
+                collections.setdefault(search.collection_name, []).append(index)
+
+        for collection_name, indexes in collections.items():
+            requests = []
+            for index in indexes:
+                search = searches[index]
+                conditions: list[models.Condition] = [
+                    models.FieldCondition(key="group_id", match=models.MatchValue(value=search.group_id))
+                ]
+                if search.document_ids_filter:
+                    conditions.append(
+                        models.FieldCondition(
+                            key="metadata.document_id", match=models.MatchAny(any=search.document_ids_filter)
+                        )
+                    )
+                requests.append(
+                    models.SearchRequest(
+                        vector=query_vector,
+                        filter=models.Filter(must=conditions),
+                        limit=search.top_k,
+                        with_payload=True,
+                        with_vector=True,
+                        score_threshold=float(search.score_threshold or 0.0),
+                    )
+                )
+            for index, points in zip(indexes, self._client.search_batch(collection_name, requests=requests)):
+                for point in points:
+                    if point.payload is None:
+                        continue
+                    metadata = point.payload.get(Field.METADATA_KEY) or {}
+                    metadata["score"] = point.score
+                    results[index].append(
+                        Document(page_content=point.payload.get(Field.CONTENT_KEY, ""), metadata=metadata)
+                    )
+        return results
+
     def search_by_full_text(self, query: str, **kwargs: Any) -> list[Document]:
         """Return docs most similar by full-text search.
 
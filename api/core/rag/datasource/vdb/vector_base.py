@@ -1,11 +1,26 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from dataclasses import dataclass
 from typing import Any
 
 from core.rag.models.document import Document
 
 
+@dataclass(frozen=True)
+class CollectionSearch:
+    """
+    Vector search of one dataset, run together with the searches of other datasets on the same vector store.
+    """
+
+    collection_name: str
+    group_id: str
+    top_k: int = 4
+    score_threshold: float | None = None
+    document_ids_filter: list[str] | None = None
+
+
 class BaseVector(ABC):
     def __init__(self, collection_name: str):
         self._collection_name = collection_name
@@ -41,6 +56,18 @@ class BaseVector(ABC):
     def search_by_vector(self, query_vector: list[float], **kwargs: Any) -> list[Document]:
         raise NotImplementedError
 
+    supports_batch_search = False
+
+    def search_by_vector_batch(
+        self, query_vector: list[float], searches: Sequence[CollectionSearch]
+    ) -> list[list[Document]]:
+        """
+        Run several vector searches, each in its own collection, with one request to the vector store.
+
+        Only vector stores with supports_batch_search implement it; the results are in the order of the searches.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def search_by_full_text(self, query: str, **kwargs: Any) -> list[Document]:
         raise NotImplementedError
@@ -2,6 +2,7 @@ import base64
 import logging
 import time
 from abc import ABC, abstractmethod
+from collections.abc import Generator, Sequence
 from typing import Any
 
 from sqlalchemy import select
@@ -9,7 +10,7 @@ from sqlalchemy import select
 from configs import dify_config
 from core.model_manager import ModelManager
 from core.model_runtime.entities.model_entities import ModelType
-from core.rag.datasource.vdb.vector_base import BaseVector
+from core.rag.datasource.vdb.vector_base import BaseVector, CollectionSearch
 from core.rag.datasource.vdb.vector_type import VectorType
 from core.rag.embedding.cached_embedding import CacheEmbedding
 from core.rag.embedding.embedding_base import Embeddings
@@ -216,7 +217,7 @@ class Vector:
             start = time.time()
             logger.info("start embedding %s files %s", len(file_documents), start)
             batch_size = 1000
-            total_batches = len(file_documents) + batch_size - 1
+            total_batches = (len(file_documents) + batch_size - 1) // batch_size
             for i in range(0, len(file_documents), batch_size):
                 batch = file_documents[i : i + batch_size]
                 batch_start = time.time()
@@ -228,30 +229,72 @@ class Vector:
                 upload_files = db.session.scalars(stmt).all()
                 upload_file_map = {str(f.id): f for f in upload_files}
 
-                file_base64_list = []
+                # Reuse cached embeddings before reading any file from storage
+                cached_embeddings = self._embeddings.get_cached_multimodal_embeddings(
+                    [f.hash for f in upload_files if f.hash] + list(upload_file_map)
+                )
                 real_batch = []
+                batch_embeddings = []
+                pending: list[tuple[Any, UploadFile]] = []
                 for document in batch:
-                    attachment_id = document.metadata["doc_id"]
-                    doc_type = document.metadata["doc_type"]
-                    upload_file = upload_file_map.get(attachment_id)
-                    if upload_file:
-                        blob = storage.load_once(upload_file.key)
-                        file_base64_str = base64.b64encode(blob).decode()
-                        file_base64_list.append(
-                            {
-                                "content": file_base64_str,
-                                "content_type": doc_type,
-                                "file_id": attachment_id,
-                            }
-                        )
+                    upload_file = upload_file_map.get(document.metadata["doc_id"])
+                    if not upload_file:
+                        continue
+                    embedding = (upload_file.hash and cached_embeddings.get(upload_file.hash)) or cached_embeddings.get(
+                        upload_file.id
+                    )
+                    if embedding:
                         real_batch.append(document)
-                batch_embeddings = self._embeddings.embed_multimodal_documents(file_base64_list)
+                        batch_embeddings.append(embedding)
+                    else:
+                        pending.append((document, upload_file))
+
+                # Load, encode and embed the remaining files in sub-batches bounded by size,
+                # so only one sub-batch of base64 content is held in memory at a time
+                for sub_batch in self._split_by_byte_budget(pending):
+                    file_base64_list = [
+                        {
+                            "content": base64.b64encode(storage.load_once(upload_file.key)).decode(),
+                            "content_type": document.metadata["doc_type"],
+                            "file_id": upload_file.id,
+                        }
+                        for document, upload_file in sub_batch
+                    ]
+                    cache_keys = [upload_file.hash or upload_file.id for _, upload_file in sub_batch]
+                    batch_embeddings.extend(
+                        self._embeddings.embed_multimodal_documents(file_base64_list, cache_keys=cache_keys)
+                    )
+                    del file_base64_list
+                    real_batch.extend(document for document, _ in sub_batch)
+
                 logger.info(
-                    "Embedding batch %s/%s took %s s", i // batch_size + 1, total_batches, time.time() - batch_start
+                    "Embedding batch %s/%s took %s s (%s cached)",
+                    i // batch_size + 1,
+                    total_batches,
+                    time.time() - batch_start,
+                    len(batch) - len(pending),
                 )
-                self._vector_processor.create(texts=real_batch, embeddings=batch_embeddings, **kwargs)
+                if real_batch:
+                    self._vector_processor.create(texts=real_batch, embeddings=batch_embeddings, **kwargs)
             logger.info("Embedding %s files took %s s", len(file_documents), time.time() - start)
 
+    @staticmethod
+    def _split_by_byte_budget(
+        pending: list[tuple[Any, UploadFile]],
+    ) -> Generator[list[tuple[Any, UploadFile]], None, None]:
+        max_bytes = dify_config.MULTIMODAL_EMBEDDING_BATCH_MAX_BYTES
+        sub_batch: list[tuple[Any, UploadFile]] = []
+        sub_batch_bytes = 0
+        for document, upload_file in pending:
+            if sub_batch and sub_batch_bytes + upload_file.size > max_bytes:
+                yield sub_batch
+                sub_batch = []
+                sub_batch_bytes = 0
+            sub_batch.append((document, upload_file))
+            sub_batch_bytes += upload_file.size
+        if sub_batch:
+            yield sub_batch
+
     def add_texts(self, documents: list[Document], **kwargs):
         if kwargs.get("duplicate_check", False):
             documents = self._filter_duplicate_texts(documents)
@@ -272,13 +315,26 @@ class Vector:
         query_vector = self._embeddings.embed_query(query)
         return self._vector_processor.search_by_vector(query_vector, **kwargs)
 
+    @property
+    def supports_batch_search(self) -> bool:
+        return self._vector_processor.supports_batch_search
+
+    def search_by_vector_batch(self, query: str, searches: Sequence[CollectionSearch]) -> list[list[Document]]:
+        query_vector = self._embeddings.embed_query(query)
+        return self._vector_processor.search_by_vector_batch(query_vector, searches)
+
     def search_by_file(self, file_id: str, **kwargs: Any) -> list[Document]:
         upload_file: UploadFile | None = db.session.query(UploadFile).where(UploadFile.id == file_id).first()
 
         if not upload_file:
             return []
+        multimodal_vector = self._embeddings.get_cached_multimodal_query_embedding(file_id)
+        if multimodal_vector:
+            return self._vector_processor.search_by_vector(multimodal_vector, **kwargs)
+
         blob = storage.load_once(upload_file.key)
         file_base64_str = base64.b64encode(blob).decode()
+        del blob
         multimodal_vector = self._embeddings.embed_multimodal_query(
             {
                 "content": file_base64_str,
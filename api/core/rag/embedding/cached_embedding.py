@@ -1,6 +1,8 @@
 import base64
 import logging
 import pickle
+import threading
+from concurrent.futures import Future
 from typing import Any, cast
 
 import numpy as np
@@ -19,6 +21,11 @@ from models.dataset import Embedding
 
 logger = logging.getLogger(__name__)
 
+# queries being embedded in this process, a retrieval over several datasets of the same embedding model searches
+# them in parallel threads which wait for the first one instead of embedding the query again
+_pending_query_embeddings: dict[str, Future[list[float]]] = {}
+_pending_query_embeddings_lock = threading.Lock()
+
 
 class CacheEmbedding(Embeddings):
     def __init__(self, model_instance: ModelInstance, user: str | None = None):
@@ -104,22 +111,41 @@ class CacheEmbedding(Embeddings):
 
         return text_embeddings
 
-    def embed_multimodal_documents(self, multimodel_documents: list[dict]) -> list[list[float]]:
-        """Embed file documents."""
+    def get_cached_multimodal_embeddings(self, cache_keys: list[str]) -> dict[str, list[float]]:
+        """Get cached multimodal document embeddings by cache key with a single query."""
+        if not cache_keys:
+            return {}
+        embeddings = (
+            db.session.query(Embedding)
+            .where(
+                Embedding.model_name == self._model_instance.model,
+                Embedding.provider_name == self._model_instance.provider,
+                Embedding.hash.in_(set(cache_keys)),
+            )
+            .all()
+        )
+        return {embedding.hash: embedding.get_embedding() for embedding in embeddings}
+
+    def embed_multimodal_documents(
+        self, multimodel_documents: list[dict], cache_keys: list[str] | None = None
+    ) -> list[list[float]]:
+        """
+        Embed file documents.
+
+        cache_keys are the keys the embeddings are cached under, one per document (e.g. the file content hash,
+        so identical files uploaded more than once share one embedding); they default to the file ids.
+        Embeddings cached under the file id are reused as well.
+        """
         # use doc embedding cache or store if not exists
+        file_ids = [document["file_id"] for document in multimodel_documents]
+        cache_keys = [key or file_id for key, file_id in zip(cache_keys, file_ids)] if cache_keys else file_ids
         multimodel_embeddings: list[Any] = [None for _ in range(len(multimodel_documents))]
         embedding_queue_indices = []
-        for i, multimodel_document in enumerate(multimodel_documents):
-            file_id = multimodel_document["file_id"]
-            embedding = (
-                db.session.query(Embedding)
-                .filter_by(
-                    model_name=self._model_instance.model, hash=file_id, provider_name=self._model_instance.provider
-                )
-                .first()
-            )
+        cached_embeddings = self.get_cached_multimodal_embeddings(cache_keys + file_ids)
+        for i in range(len(multimodel_documents)):
+            embedding = cached_embeddings.get(cache_keys[i]) or cached_embeddings.get(file_ids[i])
             if embedding:
-                multimodel_embeddings[i] = embedding.get_embedding()
+                multimodel_embeddings[i] = embedding
             else:
                 embedding_queue_indices.append(i)
 
@@ -165,17 +191,17 @@ class CacheEmbedding(Embeddings):
                 try:
                     for i, n_embedding in zip(embedding_queue_indices, embedding_queue_embeddings):
                         multimodel_embeddings[i] = n_embedding
-                        file_id = multimodel_documents[i]["file_id"]
-                        if file_id not in cache_embeddings:
+                        cache_key = cache_keys[i]
+                        if cache_key not in cache_embeddings:
                             embedding_cache = Embedding(
                                 model_name=self._model_instance.model,
-                                hash=file_id,
+                                hash=cache_key,
                                 provider_name=self._model_instance.provider,
                                 embedding=pickle.dumps(n_embedding, protocol=pickle.HIGHEST_PROTOCOL),
                             )
                             embedding_cache.set_embedding(n_embedding)
                             db.session.add(embedding_cache)
-                            cache_embeddings.append(file_id)
+                            cache_embeddings.append(cache_key)
                     db.session.commit()
                 except IntegrityError:
                     db.session.rollback()
@@ -196,6 +222,26 @@ class CacheEmbedding(Embeddings):
             redis_client.expire(embedding_cache_key, 600)
             decoded_embedding = np.frombuffer(base64.b64decode(embedding), dtype="float")
             return [float(x) for x in decoded_embedding]
+
+        with _pending_query_embeddings_lock:
+            pending = _pending_query_embeddings.get(embedding_cache_key)
+            if pending is None:
+                future: Future[list[float]] = Future()
+                _pending_query_embeddings[embedding_cache_key] = future
+        if pending is not None:
+            return list(pending.result())
+        try:
+            embedding_results = self._embed_query(text, embedding_cache_key)
+            future.set_result(embedding_results)
+            return embedding_results
+        except Exception as ex:
+            future.set_exception(ex)
+            raise
+        finally:
+            with _pending_query_embeddings_lock:
+                _pending_query_embeddings.pop(embedding_cache_key, None)
+
+    def _embed_query(self, text: str, embedding_cache_key: str) -> list[float]:
         try:
             embedding_result = self._model_instance.invoke_text_embedding(
                 texts=[text], user=self._user, input_type=EmbeddingInputType.QUERY
@@ -229,16 +275,24 @@ class CacheEmbedding(Embeddings):
 
         return embedding_results  # type: ignore
 
+    def get_cached_multimodal_query_embedding(self, file_id: str) -> list[float] | None:
+        """Get cached multimodal query embedding of a file."""
+        embedding_cache_key = f"{self._model_instance.provider}_{self._model_instance.model}_{file_id}"
+        embedding = redis_client.get(embedding_cache_key)
+        if not embedding:
+            return None
+        redis_client.expire(embedding_cache_key, 600)
+        decoded_embedding = np.frombuffer(base64.b64decode(embedding), dtype="float")
+        return [float(x) for x in decoded_embedding]
+
     def embed_multimodal_query(self, multimodel_document: dict) -> list[float]:
         """Embed multimodal documents."""
         # use doc embedding cache or store if not exists
         file_id = multimodel_document["file_id"]
         embedding_cache_key = f"{self._model_instance.provider}_{self._model_instance.model}_{file_id}"
-        embedding = redis_client.get(embedding_cache_key)
-        if embedding:
-            redis_client.expire(embedding_cache_key, 600)
-            decoded_embedding = np.frombuffer(base64.b64decode(embedding), dtype="float")
-            return [float(x) for x in decoded_embedding]
+        cached_embedding = self.get_cached_multimodal_query_embedding(file_id)
+        if cached_embedding:
+            return cached_embedding
         try:
             embedding_result = self._model_instance.invoke_multimodal_embedding(
                 multimodel_documents=[multimodel_document], user=self._user, input_type=EmbeddingInputType.QUERY
@@ -10,8 +10,10 @@ class Embeddings(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def embed_multimodal_documents(self, multimodel_documents: list[dict]) -> list[list[float]]:
-        """Embed file documents."""
+    def embed_multimodal_documents(
+        self, multimodel_documents: list[dict], cache_keys: list[str] | None = None
+    ) -> list[list[float]]:
+        """Embed file documents, caching the embeddings under cache_keys (defaults to the file ids)."""
         raise NotImplementedError
 
     @abstractmethod
@@ -24,6 +26,14 @@ class Embeddings(ABC):
         """Embed multimodal query."""
         raise NotImplementedError
 
+    def get_cached_multimodal_embeddings(self, cache_keys: list[str]) -> dict[str, list[float]]:
+        """Get already cached multimodal document embeddings by cache key, without embedding anything."""
+        return {}
+
+    def get_cached_multimodal_query_embedding(self, file_id: str) -> list[float] | None:
+        """Get an already cached multimodal query embedding, without embedding anything."""
+        return None
+
     async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
         """Asynchronous Embed search docs."""
         raise NotImplementedError
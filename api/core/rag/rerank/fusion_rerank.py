@@ -0,0 +1,130 @@
+"""
+Rank fusion of retrieval result lists.
+
+Hybrid search runs a semantic and a full-text search, and multi-dataset retrieval searches every dataset; their
+result lists are merged here without calling a model. Reciprocal Rank Fusion scores a document by the sum of
+1 / (k + rank) over the lists it appears in, weighted score fusion by the weighted sum of its min-max normalized
+scores. Documents are deduplicated by doc_id, or by content when they have none, through a hash index that maps
+each one to a column of a (lists x documents) NumPy matrix, so a fusion is a few vector operations. Only the
+scores the searches returned are used, so fusion can run on search hits before segment content is loaded.
+"""
+
+from collections.abc import Hashable, Sequence
+
+import numpy as np
+
+from core.rag.index_processor.constant.query_type import QueryType
+from core.rag.models.document import Document
+from core.rag.rerank.rerank_base import BaseRerankRunner
+from core.rag.rerank.rerank_type import RerankMode
+
+# rank constant of Reciprocal Rank Fusion, damps the weight of the first ranks
+RRF_K = 60
+
+
+def document_key(document: Document) -> Hashable:
+    """
+    Identity of a retrieved document: its doc_id for dify segments, its content otherwise.
+    """
+    doc_id = document.metadata.get("doc_id") if document.provider == "dify" else None
+    if doc_id:
+        return ("dify", doc_id)
+    return (document.provider or "dify", document.page_content)
+
+
+def fuse_documents(
+    result_lists: Sequence[Sequence[Document]],
+    mode: RerankMode,
+    weights: Sequence[float] | None = None,
+    score_threshold: float | None = None,
+    top_n: int | None = None,
+    rrf_k: int = RRF_K,
+) -> list[Document]:
+    """
+    Merge ranked result lists into one list ordered by fused score, which is stored in metadata["score"].
+
+    Fused scores are in [0, 1]: weights are normalized to sum to 1 and reciprocal rank scores are divided by the
+    score of a document ranked first in every list. A document is represented by its first occurrence.
+    """
+    columns: dict[Hashable, int] = {}
+    documents: list[Document] = []
+    rows: list[int] = []
+    cols: list[int] = []
+    ranks: list[int] = []
+    scores: list[float] = []
+    for row, result in enumerate(result_lists):
+        for rank, document in enumerate(result):
+            column = columns.setdefault(document_key(document), len(documents))
+            if column == len(documents):
+                documents.append(document)
+            rows.append(row)
+            cols.append(column)
+            ranks.append(rank)
+            scores.append(float(document.metadata.get("score") or 0.0))
+    if not documents:
+        return []
+
+    row_index = np.asarray(rows, dtype=np.intp)
+    col_index = np.asarray(cols, dtype=np.intp)
+    if mode == RerankMode.RECIPROCAL_RANK_FUSION:
+        contributions = (rrf_k + 1) / (rrf_k + 1 + np.asarray(ranks, dtype=np.float64)) / len(result_lists)
+    elif mode == RerankMode.WEIGHTED_FUSION:
+        list_weights = np.asarray(weights if weights is not None else [1.0] * len(result_lists), dtype=np.float64)
+        if len(list_weights) != len(result_lists) or (list_weights < 0).any() or list_weights.sum() <= 0:
+            raise ValueError("weighted fusion needs one non-negative weight per result list")
+        list_weights = list_weights / list_weights.sum()
+        # min-max normalize every list, the scales of cosine similarity and BM25 scores differ
+        values = np.asarray(scores, dtype=np.float64)
+        lows = np.full(len(result_lists), np.inf)
+        highs = np.full(len(result_lists), -np.inf)
+        np.minimum.at(lows, row_index, values)
+        np.maximum.at(highs, row_index, values)
+        spans = (highs - lows)[row_index]
+        normalized = np.divide(values - lows[row_index], spans, out=np.ones_like(values), where=spans > 0)
+        contributions = list_weights[row_index] * normalized
+    else:
+        raise ValueError(f"Unknown fusion mode: {mode}")
+
+    # a document listed twice by the same search counts once, with its best rank or score
+    matrix = np.zeros((len(result_lists), len(documents)))
+    np.maximum.at(matrix, (row_index, col_index), contributions)
+    fused = matrix.sum(axis=0)
+
+    order = np.argsort(-fused, kind="stable")
+    if score_threshold:
+        order = order[fused[order] >= score_threshold]
+    if top_n:
+        order = order[:top_n]
+
+    fused_documents = []
+    for column in order.tolist():
+        document = documents[column]
+        document.metadata["score"] = float(fused[column])
+        fused_documents.append(document)
+    return fused_documents
+
+
+class FusionRerankRunner(BaseRerankRunner):
+    """
+    Fuse the results of several datasets, each dataset's documents form one list ranked by their scores.
+    """
+
+    def __init__(self, mode: RerankMode):
+        self.mode = mode
+
+    def run(
+        self,
+        query: str,
+        documents: list[Document],
+        score_threshold: float | None = None,
+        top_n: int | None = None,
+        user: str | None = None,
+        query_type: QueryType = QueryType.TEXT_QUERY,
+    ) -> list[Document]:
+        result_lists: dict[str | None, list[Document]] = {}
+        for document in documents:
+            result_lists.setdefault(document.metadata.get("dataset_id"), []).append(document)
+        for result in result_lists.values():
+            result.sort(key=lambda document: document.metadata.get("score") or 0.0, reverse=True)
+
+        return fuse_documents(list(result_lists.values()), self.mode, score_threshold=score_threshold, top_n=top_n)
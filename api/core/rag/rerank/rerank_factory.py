@@ -1,3 +1,4 @@
+from core.rag.rerank.fusion_rerank import FusionRerankRunner
 from core.rag.rerank.rerank_base import BaseRerankRunner
 from core.rag.rerank.rerank_model import RerankModelRunner
 from core.rag.rerank.rerank_type import RerankMode
@@ -12,5 +13,7 @@ class RerankRunnerFactory:
                 return RerankModelRunner(*args, **kwargs)
             case RerankMode.WEIGHTED_SCORE:
                 return WeightRerankRunner(*args, **kwargs)
+            case RerankMode.RECIPROCAL_RANK_FUSION | RerankMode.WEIGHTED_FUSION:
+                return FusionRerankRunner(RerankMode(runner_type), *args, **kwargs)
             case _:
                 raise ValueError(f"Unknown runner type: {runner_type}")
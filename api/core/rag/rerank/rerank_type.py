@@ -4,3 +4,5 @@ from enum import StrEnum
 class RerankMode(StrEnum):
     RERANKING_MODEL = "reranking_model"
     WEIGHTED_SCORE = "weighted_score"
+    RECIPROCAL_RANK_FUSION = "reciprocal_rank_fusion"
+    WEIGHTED_FUSION = "weighted_fusion"
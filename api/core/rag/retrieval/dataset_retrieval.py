@@ -12,6 +12,7 @@ from flask import Flask, current_app
 from sqlalchemy import and_, func, literal, or_, select
 from sqlalchemy.orm import Session
 
+from configs import dify_config
 from core.app.app_config.entities import (
     DatasetEntity,
     DatasetRetrieveConfigEntity,
@@ -39,6 +40,9 @@ from core.prompt.simple_prompt_transform import ModelMode
 from core.rag.data_post_processor.data_post_processor import DataPostProcessor
 from core.rag.datasource.keyword.jieba.jieba_keyword_table_handler import JiebaKeywordTableHandler
 from core.rag.datasource.retrieval_service import RetrievalService
+from core.rag.datasource.segment_cache import record_segment_hits
+from core.rag.datasource.vdb.vector_base import CollectionSearch
+from core.rag.datasource.vdb.vector_factory import Vector
 from core.rag.entities.citation_metadata import RetrievalSourceMetadata
 from core.rag.entities.context_entities import DocumentContext
 from core.rag.entities.metadata_entities import Condition, MetadataCondition
@@ -955,8 +959,8 @@ class DatasetRetrieval:
                         bindings = session.scalars(bindings_stmt).all()
                         segment_ids_to_update.update(str(binding.segment_id) for binding in bindings)
 
-                # Batch update hit_count for all segments
-                if segment_ids_to_update:
+                # Buffer hit_count increments for the scheduled batch update, or update them here as a fallback
+                if segment_ids_to_update and not record_segment_hits(segment_ids_to_update):
                     session.query(DocumentSegment).where(DocumentSegment.id.in_(segment_ids_to_update)).update(
                         {DocumentSegment.hit_count: DocumentSegment.hit_count + 1},
                         synchronize_session=False,
@@ -1695,6 +1699,25 @@ class DatasetRetrieval:
                 threads = []
                 all_documents_item: list[Document] = []
                 index_type = None
+
+                def start_retriever(dataset_id: str, document_ids_filter: list[str] | None):
+                    retrieval_thread = threading.Thread(
+                        target=self._retriever,
+                        kwargs={
+                            "flask_app": flask_app,
+                            "dataset_id": dataset_id,
+                            "query": query,
+                            "top_k": top_k,
+                            "all_documents": all_documents_item,
+                            "document_ids_filter": document_ids_filter,
+                            "metadata_condition": metadata_condition,
+                            "attachment_ids": [attachment_id] if attachment_id else None,
+                        },
+                    )
+                    threads.append(retrieval_thread)
+                    retrieval_thread.start()
+
+                retriever_datasets: list[tuple[Dataset, list[str] | None]] = []
                 for dataset in available_datasets:
                     # Check for cancellation signal
                     if cancel_event and cancel_event.is_set():
@@ -1710,21 +1733,24 @@ class DatasetRetrieval:
                                 document_ids_filter = document_ids
                             else:
                                 continue
-                    retrieval_thread = threading.Thread(
-                        target=self._retriever,
-                        kwargs={
-                            "flask_app": flask_app,
-                            "dataset_id": dataset.id,
-                            "query": query,
-                            "top_k": top_k,
-                            "all_documents": all_documents_item,
-                            "document_ids_filter": document_ids_filter,
-                            "metadata_condition": metadata_condition,
-                            "attachment_ids": [attachment_id] if attachment_id else None,
-                        },
-                    )
-                    threads.append(retrieval_thread)
-                    retrieval_thread.start()
+                    retriever_datasets.append((dataset, document_ids_filter))
+
+                batch_groups: list[list[tuple[Dataset, CollectionSearch]]] = []
+                if query and top_k > 0 and dify_config.VECTOR_STORE_BATCH_SEARCH_ENABLED:
+                    retriever_datasets, batch_groups = self._group_batch_searches(retriever_datasets)
+                for dataset, document_ids_filter in retriever_datasets:
+                    start_retriever(dataset.id, document_ids_filter)
+                for group in batch_groups:
+                    if cancel_event and cancel_event.is_set():
+                        break
+                    try:
+                        batched = self._batch_vector_search(cast(str, query), group, all_documents_item)
+                    except Exception:
+                        logger.warning("Batched vector search failed, searching the datasets one by one", exc_info=True)
+                        batched = False
+                    if not batched:
+                        for dataset, search in group:
+                            start_retriever(dataset.id, search.document_ids_filter)
 
                 # Poll threads with short timeout to respond quickly to cancellation
                 while any(t.is_alive() for t in threads):
@@ -1773,6 +1799,65 @@ class DatasetRetrieval:
             if thread_exceptions is not None:
                 thread_exceptions.append(e)
 
+    @staticmethod
+    def _group_batch_searches(
+        datasets: list[tuple[Dataset, list[str] | None]],
+    ) -> tuple[list[tuple[Dataset, list[str] | None]], list[list[tuple[Dataset, CollectionSearch]]]]:
+        """
+        Group the semantic search datasets by vector store and embedding model, each group of several datasets can
+        be searched with one query. Returns the datasets left to search one by one and the groups.
+        """
+        remaining = []
+        groups: dict[tuple[str, str | None, str | None], list[tuple[Dataset, CollectionSearch]]] = {}
+        for dataset, document_ids_filter in datasets:
+            retrieval_model = dataset.retrieval_model or default_retrieval_model
+            # reranked and hybrid searches, and datasets sharing a collection binding, keep the per-dataset path
+            if (
+                dataset.provider == "external"
+                or dataset.indexing_technique != IndexTechniqueType.HIGH_QUALITY
+                or retrieval_model.get("search_method") != RetrievalMethod.SEMANTIC_SEARCH
+                or retrieval_model.get("reranking_enable")
+                or dataset.collection_binding_id
+                or not dataset.index_struct_dict
+            ):
+                remaining.append((dataset, document_ids_filter))
+                continue
+            index_struct = dataset.index_struct_dict
+            search = CollectionSearch(
+                collection_name=index_struct["vector_store"]["class_prefix"],
+                group_id=dataset.id,
+                top_k=retrieval_model.get("top_k") or 4,
+                score_threshold=retrieval_model.get("score_threshold", 0.0)
+                if retrieval_model.get("score_threshold_enabled")
+                else 0.0,
+                document_ids_filter=document_ids_filter,
+            )
+            key = (index_struct["type"], dataset.embedding_model_provider, dataset.embedding_model)
+            groups.setdefault(key, []).append((dataset, search))
+
+        batch_groups = []
+        for group in groups.values():
+            if len(group) > 1:
+                batch_groups.append(group)
+            else:
+                remaining.extend((dataset, search.document_ids_filter) for dataset, search in group)
+        return remaining, batch_groups
+
+    @staticmethod
+    def _batch_vector_search(
+        query: str, group: list[tuple[Dataset, CollectionSearch]], all_documents: list[Document]
+    ) -> bool:
+        """
+        Search a group of datasets with one embedding of the query and one vector store request, returns False
+        when the vector store has no batch search.
+        """
+        vector = Vector(dataset=group[0][0])
+        if not vector.supports_batch_search:
+            return False
+        for documents in vector.search_by_vector_batch(query, [search for _, search in group]):
+            all_documents.extend(documents)
+        return True
+
     def _get_available_datasets(self, tenant_id: str, dataset_ids: list[str]) -> list[Dataset]:
         with session_factory.create_session() as session:
             subquery = (
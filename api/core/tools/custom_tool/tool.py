@@ -7,8 +7,10 @@ from urllib.parse import urlencode
 
 import httpx
 
+from configs import dify_config
 from core.file.file_manager import download
 from core.helper import ssrf_proxy
+from core.helper.http_response_cache import http_response_cache
 from core.tools.__base.tool import Tool
 from core.tools.__base.tool_runtime import ToolRuntime
 from core.tools.entities.tool_bundle import ApiToolBundle
@@ -286,21 +288,54 @@ class ApiTool(Tool):
         method_lc = method.lower()
         if method_lc not in _METHOD_MAP:
             raise ValueError(f"Invalid http method {method}")
-        response: httpx.Response = _METHOD_MAP[
-            method_lc
-        ](  # https://discuss.python.org/t/type-inference-for-function-return-types/42926
-            url,
-            max_retries=0,
-            params=params,
-            headers=headers,
-            cookies=cookies,
-            data=body,
-            files=files,
-            timeout=API_TOOL_DEFAULT_TIMEOUT,
-            follow_redirects=True,
-        )
+
+        def send(request_headers: dict[str, Any]) -> httpx.Response:
+            return _METHOD_MAP[
+                method_lc
+            ](  # https://discuss.python.org/t/type-inference-for-function-return-types/42926
+                url,
+                max_retries=0,
+                params=params,
+                headers=request_headers,
+                cookies=cookies,
+                data=body,
+                files=files,
+                timeout=API_TOOL_DEFAULT_TIMEOUT,
+                follow_redirects=True,
+            )
+
+        cache_ttl = self._response_cache_ttl()
+        if cache_ttl is not None and method_lc in ("get", "head") and self.runtime and self.runtime.tenant_id:
+            return http_response_cache.fetch(
+                tenant_id=self.runtime.tenant_id,
+                method=method_lc,
+                url=url,
+                headers=headers,
+                request_identity={"params": params, "headers": headers, "cookies": cookies},
+                send=send,
+                read_body=lambda response: response.content,
+                default_ttl=cache_ttl,
+            )
+
+        response: httpx.Response = send(headers)
         return response
 
+    def _response_cache_ttl(self) -> int | None:
+        """
+        Get the response cache setting of the operation, None if its responses are not cached.
+
+        Caching is enabled with the `x-dify-response-cache` extension of the OpenAPI operation, either `true` or
+        `{"ttl": <seconds a response without Cache-Control max-age or Expires is reused>}`.
+        """
+        if not dify_config.HTTP_RESPONSE_CACHE_ENABLED:
+            return None
+        setting = self.api_bundle.openapi.get("x-dify-response-cache")
+        if setting is True:
+            return 0
+        if isinstance(setting, dict):
+            return max(int(setting.get("ttl", 0)), 0)
+        return None
+
     def _convert_body_property_any_of(
         self, property: dict[str, Any], value: Any, any_of: list[dict[str, Any]], max_recursive=10
     ):
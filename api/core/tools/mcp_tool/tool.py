@@ -6,8 +6,10 @@ import logging
 from collections.abc import Generator, Mapping
 from typing import Any, cast
 
+from configs import dify_config
 from core.mcp.auth_client import MCPClientWithAuthRetry
 from core.mcp.error import MCPConnectionError
+from core.mcp.session_pool import mcp_session_pool
 from core.mcp.types import (
     AudioContent,
     BlobResourceContents,
@@ -269,14 +271,26 @@ class MCPTool(Tool):
 
         # Step 2: Session is now closed, perform network operations without holding database connection
         # MCPClientWithAuthRetry will create a new session lazily only if auth retry is needed
+        # When pooling is enabled, the connection and `initialize` handshake are reused across calls with the
+        # same provider and credentials
         try:
-            with MCPClientWithAuthRetry(
-                server_url=server_url,
-                headers=headers,
-                timeout=self.timeout,
-                sse_read_timeout=self.sse_read_timeout,
-                provider_entity=provider_entity,
-            ) as mcp_client:
+            if dify_config.MCP_SESSION_POOL_ENABLED:
+                client_context = mcp_session_pool.session(
+                    provider_entity=provider_entity,
+                    server_url=server_url,
+                    headers=headers,
+                    timeout=self.timeout,
+                    sse_read_timeout=self.sse_read_timeout,
+                )
+            else:
+                client_context = MCPClientWithAuthRetry(
+                    server_url=server_url,
+                    headers=headers,
+                    timeout=self.timeout,
+                    sse_read_timeout=self.sse_read_timeout,
+                    provider_entity=provider_entity,
+                )
+            with client_context as mcp_client:
                 return mcp_client.invoke_tool(tool_name=self.entity.identity.name, tool_args=tool_parameters)
         except MCPConnectionError as e:
             raise ToolInvokeError(f"Failed to connect to MCP server: {e}") from e
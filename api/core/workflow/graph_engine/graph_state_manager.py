@@ -3,6 +3,7 @@ Graph state manager that combines node, edge, and execution tracking.
 """
 
 import threading
+import time
 from collections.abc import Sequence
 from typing import TypedDict, final
 
@@ -50,7 +51,9 @@ class GraphStateManager:
             node_id: The ID of the node to enqueue
         """
         with self._lock:
-            self._graph.nodes[node_id].state = NodeState.TAKEN
+            node = self._graph.nodes[node_id]
+            node.state = NodeState.TAKEN
+            node.enqueued_at = time.perf_counter()
             self._ready_queue.put(node_id)
 
     def mark_node_skipped(self, node_id: str) -> None:
@@ -234,6 +234,7 @@ class Node(Generic[NodeDataT]):
         self.workflow_call_depth = graph_init_params.call_depth
         self.graph_runtime_state = graph_runtime_state
         self.state: NodeState = NodeState.UNKNOWN  # node execution state
+        self.enqueued_at: float | None = None  # perf_counter() when the node was put on the ready queue
 
         node_id = config.get("id")
         if not node_id:
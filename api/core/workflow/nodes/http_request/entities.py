@@ -58,6 +58,16 @@ class HttpRequestNodeBody(BaseModel):
         return v
 
 
+class HttpRequestNodeCache(BaseModel):
+    """
+    Response cache settings, only GET and HEAD responses are cached.
+    """
+
+    enabled: bool = False
+    # Seconds a response without Cache-Control max-age or Expires is reused without revalidation
+    ttl: int = Field(default=0, ge=0)
+
+
 class HttpRequestNodeTimeout(BaseModel):
     connect: int = dify_config.HTTP_REQUEST_MAX_CONNECT_TIMEOUT
     read: int = dify_config.HTTP_REQUEST_MAX_READ_TIMEOUT
@@ -92,17 +102,24 @@ class HttpRequestNodeData(BaseNodeData):
     body: HttpRequestNodeBody | None = None
     timeout: HttpRequestNodeTimeout | None = None
     ssl_verify: bool | None = dify_config.HTTP_REQUEST_NODE_SSL_VERIFY
+    cache: HttpRequestNodeCache = Field(default_factory=HttpRequestNodeCache)
 
 
 class Response:
     headers: dict[str, str]
     response: httpx.Response
     _cached_text: str | None
+    _content: bytes | None
 
-    def __init__(self, response: httpx.Response):
+    def __init__(self, response: httpx.Response, content: bytes | None = None):
+        """
+        :param response: the httpx response
+        :param content: the response body, for streamed responses whose body was read by the caller
+        """
         self.response = response
         self.headers = dict(response.headers)
         self._cached_text = None
+        self._content = content
 
     @property
     def is_file(self):
@@ -138,7 +155,7 @@ class Response:
             # Try to detect if content is text-based by sampling first few bytes
             try:
                 # Sample first 1024 bytes for text detection
-                content_sample = self.response.content[:1024]
+                content_sample = self.content[:1024]
                 content_sample.decode("utf-8")
                 # If we can decode as UTF-8 and find common text patterns, likely not a file
                 text_markers = (b"{", b"[", b"<", b"function", b"var ", b"const ", b"let ")
@@ -173,10 +190,10 @@ class Response:
             return self._cached_text
 
         # Try charset_normalizer for robust encoding detection first
-        detected_encoding = charset_normalizer.from_bytes(self.response.content).best()
+        detected_encoding = charset_normalizer.from_bytes(self.content).best()
         if detected_encoding and detected_encoding.encoding:
             try:
-                text = self.response.content.decode(detected_encoding.encoding)
+                text = self.content.decode(detected_encoding.encoding)
                 self._cached_text = text
                 return text
             except (UnicodeDecodeError, TypeError, LookupError):
@@ -184,12 +201,17 @@ class Response:
                 pass
 
         # Fallback to httpx's built-in encoding detection
-        text = self.response.text
+        if self._content is None:
+            text = self.response.text
+        else:
+            text = self._content.decode(self.response.encoding or "utf-8", errors="replace")
         self._cached_text = text
         return text
 
     @property
     def content(self) -> bytes:
+        if self._content is not None:
+            return self._content
         return self.response.content
 
     @property
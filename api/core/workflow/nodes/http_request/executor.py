@@ -13,6 +13,7 @@ from json_repair import repair_json
 from configs import dify_config
 from core.file.enums import FileTransferMethod
 from core.file.file_manager import file_manager as default_file_manager
+from core.helper.http_response_cache import CACHEABLE_METHODS, http_response_cache
 from core.helper.ssrf_proxy import ssrf_proxy
 from core.variables.segments import ArrayFileSegment, FileSegment
 from core.workflow.runtime import VariablePool
@@ -81,6 +82,7 @@ class Executor:
         max_retries: int = dify_config.SSRF_DEFAULT_MAX_RETRIES,
         http_client: HttpClientProtocol | None = None,
         file_manager: FileManagerProtocol | None = None,
+        tenant_id: str | None = None,
     ):
         # If authorization API key is present, convert the API key using the variable pool
         if node_data.authorization.type == "api-key":
@@ -109,6 +111,7 @@ class Executor:
         self.max_retries = max_retries
         self._http_client = http_client or ssrf_proxy
         self._file_manager = file_manager or default_file_manager
+        self.tenant_id = tenant_id
 
         # init template
         self.variable_pool = variable_pool
@@ -316,7 +319,7 @@ class Executor:
         return headers
 
     def _validate_and_parse_response(self, response: httpx.Response) -> Response:
-        executor_response = Response(response)
+        executor_response = Response(response, content=self._read_response_content(response))
 
         threshold_size = (
             dify_config.HTTP_REQUEST_NODE_MAX_BINARY_SIZE
@@ -332,6 +335,33 @@ class Executor:
 
         return executor_response
 
+    @staticmethod
+    def _read_response_content(response: httpx.Response) -> bytes:
+        """
+        Read a streamed response body, aborting as soon as it exceeds the larger of the text and binary limits.
+
+        Whether the body is a file can depend on its first bytes, so the exact limit is checked once it is read.
+        """
+        max_size = max(dify_config.HTTP_REQUEST_NODE_MAX_BINARY_SIZE, dify_config.HTTP_REQUEST_NODE_MAX_TEXT_SIZE)
+        content_length = response.headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > max_size:
+            raise ResponseSizeError(
+                f"Response size is too large, max size is {max_size / 1024 / 1024:.2f} MB,"
+                f" but Content-Length is {int(content_length) / 1024 / 1024:.2f} MB."
+            )
+
+        chunks: list[bytes] = []
+        size = 0
+        for chunk in response.iter_bytes():
+            size += len(chunk)
+            if size > max_size:
+                raise ResponseSizeError(
+                    f"Response size is too large, max size is {max_size / 1024 / 1024:.2f} MB,"
+                    f" the download was aborted after {size / 1024 / 1024:.2f} MB."
+                )
+            chunks.append(chunk)
+        return b"".join(chunks)
+
     def _do_http_request(self, headers: dict[str, Any]) -> httpx.Response:
         """
         do http request depending on api bundle
@@ -358,6 +388,8 @@ class Executor:
             "timeout": (self.timeout.connect, self.timeout.read, self.timeout.write),
             "ssl_verify": self.ssl_verify,
             "follow_redirects": True,
+            # the body is read by _read_response_content, which aborts once it exceeds the size limit
+            "stream": True,
         }
         # request_args = {k: v for k, v in request_args.items() if v is not None}
         try:
@@ -370,13 +402,43 @@ class Executor:
             raise HttpRequestNodeError(str(e)) from e
         return response
 
+    def _use_response_cache(self) -> bool:
+        return (
+            dify_config.HTTP_RESPONSE_CACHE_ENABLED
+            and self.node_data.cache.enabled
+            and self.tenant_id is not None
+            and self.method.upper() in CACHEABLE_METHODS
+        )
+
+    def _do_cached_http_request(self, headers: dict[str, Any]) -> httpx.Response:
+        """
+        do http request through the tenant's response cache, the returned response has been read
+        """
+        assert self.tenant_id is not None
+        return http_response_cache.fetch(
+            tenant_id=self.tenant_id,
+            method=self.method,
+            url=self.url,
+            headers=headers,
+            request_identity={"params": self.params, "headers": headers, "ssl_verify": self.ssl_verify},
+            send=self._do_http_request,
+            read_body=self._read_response_content,
+            default_ttl=self.node_data.cache.ttl,
+        )
+
     def invoke(self) -> Response:
         # assemble headers
         headers = self._assembling_headers()
         # do http request
-        response = self._do_http_request(headers)
+        if self._use_response_cache():
+            response = self._do_cached_http_request(headers)
+        else:
+            response = self._do_http_request(headers)
         # validate response
-        return self._validate_and_parse_response(response)
+        try:
+            return self._validate_and_parse_response(response)
+        finally:
+            response.close()
 
     def to_log(self):
         url_parts = urlparse(self.url)
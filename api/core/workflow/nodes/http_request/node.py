@@ -101,6 +101,7 @@ class HttpRequestNode(Node[HttpRequestNodeData]):
                 max_retries=0,
                 http_client=self._http_client,
                 file_manager=self._file_manager,
+                tenant_id=self.tenant_id,
             )
             process_data["request"] = http_executor.to_log()
 
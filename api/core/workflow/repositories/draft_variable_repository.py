@@ -28,7 +28,28 @@ class DraftVariableSaverFactory(Protocol):
     ) -> DraftVariableSaver:
         pass
 
+    @abc.abstractmethod
+    def flush(self):
+        """Persist the draft variables buffered by the savers of this factory, called when a run ends."""
+        pass
+
 
 class NoopDraftVariableSaver(DraftVariableSaver):
     def save(self, process_data: Mapping[str, Any] | None, outputs: Mapping[str, Any] | None):
         pass
+
+
+class NoopDraftVariableSaverFactory(DraftVariableSaverFactory):
+    def __call__(
+        self,
+        session: Session,
+        app_id: str,
+        node_id: str,
+        node_type: NodeType,
+        node_execution_id: str,
+        enclosing_node_id: str | None = None,
+    ) -> DraftVariableSaver:
+        return NoopDraftVariableSaver()
+
+    def flush(self):
+        pass
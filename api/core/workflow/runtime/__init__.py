@@ -1,9 +1,10 @@
 from .graph_runtime_state import GraphRuntimeState
 from .graph_runtime_state_protocol import ReadOnlyGraphRuntimeState, ReadOnlyVariablePool
 from .read_only_wrappers import ReadOnlyGraphRuntimeStateWrapper, ReadOnlyVariablePoolWrapper
-from .variable_pool import VariablePool, VariableValue
+from .variable_pool import CompiledSelector, VariablePool, VariableValue, compile_selector
 
 __all__ = [
+    "CompiledSelector",
     "GraphRuntimeState",
     "ReadOnlyGraphRuntimeState",
     "ReadOnlyGraphRuntimeStateWrapper",
@@ -11,4 +12,5 @@ __all__ = [
     "ReadOnlyVariablePoolWrapper",
     "VariablePool",
     "VariableValue",
+    "compile_selector",
 ]
@@ -8,6 +8,7 @@ from copy import deepcopy
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, ClassVar, Protocol
 
+import orjson
 from pydantic import BaseModel, Field
 from pydantic.json import pydantic_encoder
 
@@ -372,7 +373,11 @@ class GraphRuntimeState:
         if self._response_coordinator is not None and self._graph is not None:
             snapshot["response_coordinator"] = self._response_coordinator.dumps()
 
-        return json.dumps(snapshot, default=pydantic_encoder)
+        try:
+            return orjson.dumps(snapshot, default=pydantic_encoder).decode()
+        except TypeError:
+            # orjson rejects integers beyond 64 bits, which the standard library still encodes
+            return json.dumps(snapshot, default=pydantic_encoder, separators=(",", ":"))
 
     @classmethod
     def from_snapshot(cls, data: str | Mapping[str, Any]) -> GraphRuntimeState:
@@ -21,6 +21,10 @@ class ReadOnlyVariablePool(Protocol):
         """Get all variables stored under a given node prefix (read-only)."""
         ...
 
+    def size(self) -> int:
+        """Get the number of variables in the pool."""
+        ...
+
 
 class ReadOnlyGraphRuntimeState(Protocol):
     """
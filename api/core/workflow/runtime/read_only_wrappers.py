@@ -35,6 +35,10 @@ class ReadOnlyVariablePoolWrapper:
         """Return a copy of all variables stored under the given prefix."""
         return self._variable_pool.get_by_prefix(prefix)
 
+    def size(self) -> int:
+        """Return the number of variables in the pool without copying them."""
+        return sum(len(variables) for variables in list(self._variable_pool.variable_dictionary.values()))
+
 
 class ReadOnlyGraphRuntimeStateWrapper:
     """Expose a defensive, read-only view of ``GraphRuntimeState``."""
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+import functools
 import re
 from collections import defaultdict
 from collections.abc import Mapping, Sequence
 from copy import deepcopy
+from dataclasses import dataclass
 from typing import Annotated, Any, Union, cast
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from core.file import File, FileAttribute, file_manager
 from core.variables import Segment, SegmentGroup, VariableBase
@@ -26,6 +28,48 @@ VariableValue = Union[str, int, float, dict[str, object], list[object], File]
 
 VARIABLE_PATTERN = re.compile(r"\{\{#([a-zA-Z0-9_]{1,50}(?:\.[a-zA-Z_][a-zA-Z0-9_]{0,29}){1,10})#\}\}")
 
+_FILE_ATTRIBUTES = frozenset(item.value for item in FileAttribute)
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledSelector:
+    """
+    A variable selector split into its lookup keys once.
+
+    `VariablePool.get` accepts a compiled selector in place of a plain sequence; callers that look up the same
+    selector many times (templates, conditions) compile it once instead of re-deriving the keys on every call.
+    """
+
+    node_id: str
+    name: str
+    attrs: tuple[str, ...]
+    path: tuple[str, ...]
+
+
+@functools.lru_cache(maxsize=8192)
+def _compile_selector(path: tuple[str, ...]) -> CompiledSelector:
+    return CompiledSelector(node_id=path[0], name=path[1], attrs=path[2:], path=path)
+
+
+def compile_selector(selector: Sequence[str] | CompiledSelector, /) -> CompiledSelector | None:
+    """Compile a selector, returning None if it is too short to address a variable."""
+    if isinstance(selector, CompiledSelector):
+        return selector
+    if len(selector) < SELECTORS_LENGTH:
+        return None
+    return _compile_selector(tuple(selector))
+
+
+# A parsed template is a sequence of (text, selector) parts; `selector` is None for parts that are plain text.
+_TemplatePart = tuple[str, CompiledSelector | None]
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_template(template: str) -> tuple[_TemplatePart, ...]:
+    """Split a template into its parts once, so that repeated renders of the same template skip the regex."""
+    parts = VARIABLE_PATTERN.split(template)
+    return tuple((part, compile_selector(part.split(".")) if "." in part else None) for part in parts if part)
+
 
 class VariablePool(BaseModel):
     # Variable dictionary is a dictionary for looking up variables by their selector.
@@ -59,6 +103,10 @@ class VariablePool(BaseModel):
         default_factory=list,
     )
 
+    # Segments resolved for nested selectors ([node_id, variable_name, attr, ...]), keyed by node id and then by the
+    # full selector. Entries of a node are dropped whenever one of its variables is added or removed.
+    _nested_segments: dict[str, dict[tuple[str, ...], Segment | None]] = PrivateAttr(default_factory=dict)
+
     def model_post_init(self, context: Any, /):
         # Create a mapping from field names to SystemVariableKey enum values
         self._add_system_variables(self.system_variables)
@@ -114,6 +162,7 @@ class VariablePool(BaseModel):
             variable = variable_factory.segment_to_variable(segment=segment, selector=selector)
 
         node_id, name = self._selector_to_keys(selector)
+        self._nested_segments.pop(node_id, None)
         # Based on the definition of `Variable`,
         # `VariableBase` instances can be safely used as `Variable` since they are compatible.
         self.variable_dictionary[node_id][name] = cast(Variable, variable)
@@ -130,7 +179,7 @@ class VariablePool(BaseModel):
             return False
         return True
 
-    def get(self, selector: Sequence[str], /) -> Segment | None:
+    def get(self, selector: Sequence[str] | CompiledSelector, /) -> Segment | None:
         """
         Retrieve a variable's value from the pool as a Segment.
 
@@ -139,7 +188,7 @@ class VariablePool(BaseModel):
         ObjectSegment types.
 
         Args:
-            selector: A sequence with at least 2 elements:
+            selector: A sequence with at least 2 elements, or a `CompiledSelector`:
                      - [node_id, variable_name]: Returns the full segment
                      - [node_id, variable_name, attr, ...]: Returns a nested value
                        from FileSegment (e.g., 'url', 'name') or ObjectSegment
@@ -151,26 +200,34 @@ class VariablePool(BaseModel):
         Raises:
             ValueError: If attempting to access an invalid FileAttribute.
         """
-        if len(selector) < SELECTORS_LENGTH:
+        compiled = compile_selector(selector)
+        if compiled is None:
             return None
 
-        node_id, name = self._selector_to_keys(selector)
-        node_map = self.variable_dictionary.get(node_id)
+        node_map = self.variable_dictionary.get(compiled.node_id)
         if node_map is None:
             return None
 
-        segment: Segment | None = node_map.get(name)
+        segment: Segment | None = node_map.get(compiled.name)
 
         if segment is None:
             return None
 
-        if len(selector) == 2:
+        if not compiled.attrs:
             return segment
 
+        node_cache = self._nested_segments.setdefault(compiled.node_id, {})
+        if compiled.path in node_cache:
+            return node_cache[compiled.path]
+        result = self._resolve_nested(segment, compiled.attrs)
+        node_cache[compiled.path] = result
+        return result
+
+    def _resolve_nested(self, segment: Segment, attrs: tuple[str, ...]) -> Segment | None:
         if isinstance(segment, FileSegment):
-            attr = selector[2]
+            attr = attrs[0]
             # Python support `attr in FileAttribute` after 3.12
-            if attr not in {item.value for item in FileAttribute}:
+            if attr not in _FILE_ATTRIBUTES:
                 return None
             attr = FileAttribute(attr)
             attr_value = file_manager.get_attr(file=segment.value, attr=attr)
@@ -178,7 +235,7 @@ class VariablePool(BaseModel):
 
         # Navigate through nested attributes
         result: Any = segment
-        for attr in selector[2:]:
+        for attr in attrs:
             result = self._extract_value(result)
             result = self._get_nested_attribute(result, attr)
             if result is None:
@@ -220,6 +277,7 @@ class VariablePool(BaseModel):
         """
         if not selector:
             return
+        self._nested_segments.pop(selector[0], None)
         if len(selector) == 1:
             self.variable_dictionary[selector[0]] = {}
             return
@@ -227,10 +285,9 @@ class VariablePool(BaseModel):
         self.variable_dictionary[key].pop(hash_key, None)
 
     def convert_template(self, template: str, /):
-        parts = VARIABLE_PATTERN.split(template)
         segments: list[Segment] = []
-        for part in filter(lambda x: x, parts):
-            if "." in part and (variable := self.get(part.split("."))):
+        for part, selector in _parse_template(template):
+            if selector and (variable := self.get(selector)):
                 segments.append(variable)
             else:
                 segments.append(variable_factory.build_segment(part))
@@ -8,6 +8,7 @@ from configs import dify_config
 from core.app.apps.exc import GenerateTaskStoppedError
 from core.app.entities.app_invoke_entities import InvokeFrom
 from core.app.workflow.layers.observability import ObservabilityLayer
+from core.app.workflow.layers.profiling import ProfilingLayer
 from core.app.workflow.node_factory import DifyNodeFactory
 from core.file.models import File
 from core.workflow.constants import ENVIRONMENT_VARIABLE_NODE_ID
@@ -107,6 +108,10 @@ class WorkflowEntry:
         )
         self.graph_engine.layer(limits_layer)
 
+        # Add profiling layer when enabled, ahead of the observability layer so node spans are still current
+        if dify_config.WORKFLOW_PROFILING_ENABLED:
+            self.graph_engine.layer(ProfilingLayer())
+
         # Add observability layer when OTel is enabled
         if dify_config.ENABLE_OTEL or is_instrument_flag_enabled():
             self.graph_engine.layer(ObservabilityLayer())
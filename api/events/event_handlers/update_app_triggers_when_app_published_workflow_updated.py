@@ -10,6 +10,7 @@ from models import AppMode
 from models.enums import AppTriggerStatus
 from models.trigger import AppTrigger
 from models.workflow import Workflow
+from services.trigger.webhook_routing_cache import webhook_routing_cache
 
 
 @app_published_workflow_was_updated.connect
@@ -81,6 +82,8 @@ def handle(sender, **kwargs):
 
         session.commit()
 
+    webhook_routing_cache.invalidate_app(app.id)
+
 
 def get_trigger_infos_from_workflow(published_workflow: Workflow) -> list[dict]:
     """
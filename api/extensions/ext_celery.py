@@ -204,6 +204,20 @@ def init_app(app: DifyApp) -> Celery:
             "schedule": timedelta(minutes=dify_config.API_TOKEN_LAST_USED_UPDATE_INTERVAL),
         }
 
+    if dify_config.ENABLE_SEGMENT_HIT_COUNT_UPDATE_TASK:
+        imports.append("schedule.update_segment_hit_count_task")
+        beat_schedule["batch_update_segment_hit_count"] = {
+            "task": "schedule.update_segment_hit_count_task.batch_update_segment_hit_count",
+            "schedule": timedelta(minutes=dify_config.SEGMENT_HIT_COUNT_UPDATE_INTERVAL),
+        }
+
+    if dify_config.ENABLE_APP_STATISTIC_ROLLUP_TASK:
+        imports.append("schedule.app_statistic_rollup_task")
+        beat_schedule["roll_up_app_statistics"] = {
+            "task": "schedule.app_statistic_rollup_task.roll_up_app_statistics",
+            "schedule": timedelta(minutes=dify_config.APP_STATISTIC_ROLLUP_INTERVAL),
+        }
+
     celery_app.conf.update(beat_schedule=beat_schedule, imports=imports)
 
     return celery_app
@@ -7,11 +7,11 @@ WorkflowNodeExecutionModel operations using Aliyun SLS LogStore.
 
 import logging
 import time
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from core.workflow.enums import WorkflowNodeExecutionStatus
 from extensions.logstore.aliyun_logstore import AliyunLogStore
@@ -323,6 +323,21 @@ class LogstoreAPIWorkflowNodeExecutionRepository(DifyAPIWorkflowNodeExecutionRep
             logger.exception("Failed to get executions by workflow run from LogStore")
             raise
 
+    def iter_executions_by_workflow_run(
+        self,
+        session: Session,
+        tenant_id: str,
+        app_id: str,
+        workflow_run_id: str,
+        batch_size: int = 500,
+    ) -> Iterator[WorkflowNodeExecutionModel]:
+        """
+        Stream all node executions of a workflow run.
+
+        LogStore queries are not paginated here, so this iterates over the result of `get_executions_by_workflow_run`.
+        """
+        yield from self.get_executions_by_workflow_run(tenant_id, app_id, workflow_run_id)
+
     def get_execution_by_id(
         self,
         execution_id: str,
@@ -9,11 +9,12 @@ import base64
 import datetime
 import hashlib
 import logging
-from collections.abc import Generator
-from typing import Any, cast
+from collections.abc import Generator, Iterable, Iterator
+from typing import IO, Any, cast
 
 import boto3
 import orjson
+from boto3.s3.transfer import TransferConfig
 from botocore.client import Config
 from botocore.exceptions import ClientError
 
@@ -73,6 +74,8 @@ class ArchiveStorage:
                 max_pool_connections=64,
             ),
         )
+        chunk_size = dify_config.ARCHIVE_STORAGE_MULTIPART_CHUNK_SIZE_MB * 1024 * 1024
+        self.transfer_config = TransferConfig(multipart_threshold=chunk_size, multipart_chunksize=chunk_size)
 
         # Verify bucket accessibility
         try:
@@ -119,6 +122,37 @@ class ArchiveStorage:
         except ClientError as e:
             raise ArchiveStorageError(f"Failed to upload object '{key}': {e}")
 
+    def put_object_stream(self, key: str, fileobj: IO[bytes]) -> str:
+        """
+        Upload an object from a seekable file, in parts once it exceeds the multipart chunk size.
+
+        Unlike `put_object`, the object is never held in memory as a whole.
+
+        Args:
+            key: Object key (path) within the bucket
+            fileobj: Seekable binary file positioned anywhere, uploaded from its start
+
+        Returns:
+            MD5 checksum of the uploaded data
+
+        Raises:
+            ArchiveStorageError: If upload fails
+        """
+        fileobj.seek(0)
+        md5 = hashlib.md5()
+        size = 0
+        while chunk := fileobj.read(self.transfer_config.multipart_chunksize):
+            md5.update(chunk)
+            size += len(chunk)
+        checksum = md5.hexdigest()
+        fileobj.seek(0)
+        try:
+            self.client.upload_fileobj(fileobj, self.bucket, key, Config=self.transfer_config)
+        except ClientError as e:
+            raise ArchiveStorageError(f"Failed to upload object '{key}': {e}")
+        logger.debug("Uploaded object: %s (size=%d, checksum=%s)", key, size, checksum)
+        return checksum
+
     def get_object(self, key: str) -> bytes:
         """
         Download an object from the archive storage.
@@ -165,6 +199,27 @@ class ArchiveStorage:
                 raise FileNotFoundError(f"Archive object not found: {key}")
             raise ArchiveStorageError(f"Failed to stream object '{key}': {e}")
 
+    def download_object(self, key: str, fileobj: IO[bytes]) -> None:
+        """
+        Download an object into a binary file, in parts once it exceeds the multipart chunk size.
+
+        Args:
+            key: Object key (path) within the bucket
+            fileobj: Writable binary file, left positioned at its start
+
+        Raises:
+            ArchiveStorageError: If download fails
+            FileNotFoundError: If object does not exist
+        """
+        try:
+            self.client.download_fileobj(self.bucket, key, fileobj, Config=self.transfer_config)
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code")
+            if error_code in ("404", "NoSuchKey"):
+                raise FileNotFoundError(f"Archive object not found: {key}")
+            raise ArchiveStorageError(f"Failed to download object '{key}': {e}")
+        fileobj.seek(0)
+
     def object_exists(self, key: str) -> bool:
         """
         Check if an object exists in the archive storage.
@@ -258,16 +313,21 @@ class ArchiveStorage:
         Returns:
             JSONL bytes
         """
-        lines = []
-        for record in records:
-            serialized = ArchiveStorage._serialize_record(record)
-            lines.append(orjson.dumps(serialized))
+        return b"".join(ArchiveStorage.iter_jsonl(records))
+
+    @staticmethod
+    def iter_jsonl(records: Iterable[dict[str, Any]]) -> Iterator[bytes]:
+        """
+        Serialize records to JSONL lines one at a time.
 
-        jsonl_content = b"\n".join(lines)
-        if jsonl_content:
-            jsonl_content += b"\n"
+        Args:
+            records: Iterable of dictionaries to serialize, consumed lazily
 
-        return jsonl_content
+        Yields:
+            One JSONL line per record, including the trailing newline
+        """
+        for record in records:
+            yield orjson.dumps(ArchiveStorage._serialize_record(record), option=orjson.OPT_APPEND_NEWLINE)
 
     @staticmethod
     def deserialize_from_jsonl(data: bytes) -> list[dict[str, Any]]:
@@ -280,13 +340,22 @@ class ArchiveStorage:
         Returns:
             List of dictionaries
         """
-        records = []
+        return list(ArchiveStorage.iter_jsonl_records(data.splitlines()))
 
-        for line in data.splitlines():
-            if line:
-                records.append(orjson.loads(line))
+    @staticmethod
+    def iter_jsonl_records(lines: Iterable[bytes]) -> Iterator[dict[str, Any]]:
+        """
+        Deserialize JSONL lines to records one at a time.
+
+        Args:
+            lines: Iterable of JSONL lines, e.g. a binary file opened for reading
 
-        return records
+        Yields:
+            One dictionary per non-empty line
+        """
+        for line in lines:
+            if line.strip():
+                yield orjson.loads(line)
 
     @staticmethod
     def _serialize_record(record: dict[str, Any]) -> dict[str, Any]:
@@ -24,6 +24,7 @@ from core.app.features.rate_limiting.rate_limit import RateLimitGenerator
 from core.file import helpers as file_helpers
 from core.model_runtime.utils.encoders import jsonable_encoder
 from extensions.ext_redis import redis_client
+from libs.orjson import orjson_dumps
 
 if TYPE_CHECKING:
     from models import Account
@@ -288,8 +289,13 @@ def generate_text_hash(text: str) -> str:
 
 def compact_generate_response(response: Union[Mapping, Generator, RateLimitGenerator]) -> Response:
     if isinstance(response, dict):
+        try:
+            # most blocking responses are JSON-safe already, skip walking them with jsonable_encoder
+            body = orjson_dumps(response)
+        except TypeError:
+            body = json.dumps(jsonable_encoder(response))
         return Response(
-            response=json.dumps(jsonable_encoder(response)),
+            response=body,
             status=200,
             content_type="application/json; charset=utf-8",
         )
@@ -0,0 +1,66 @@
+"""add app statistic rollups
+
+Revision ID: 240d2f886ef6
+Revises: fce013ca180e
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from alembic import op
+import models as models
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "240d2f886ef6"
+down_revision = "fce013ca180e"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "app_statistic_rollups",
+        sa.Column("id", models.types.StringUUID(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+
+        sa.Column("source", sa.String(length=20), nullable=False),
+        sa.Column("app_id", models.types.StringUUID(), nullable=False),
+        sa.Column("triggered_from", sa.String(length=255), server_default=sa.text("''"), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(), nullable=False),
+        sa.Column("record_count", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("message_tokens", sa.BigInteger(), server_default=sa.text("0"), nullable=False),
+        sa.Column("answer_tokens", sa.BigInteger(), server_default=sa.text("0"), nullable=False),
+        sa.Column("total_tokens", sa.BigInteger(), server_default=sa.text("0"), nullable=False),
+        sa.Column("total_price", sa.Numeric(precision=20, scale=7), nullable=True),
+        sa.Column("total_latency", sa.Float(), server_default=sa.text("0"), nullable=False),
+        sa.PrimaryKeyConstraint("id", name=op.f("app_statistic_rollups_pkey")),
+        sa.UniqueConstraint(
+            "app_id", "source", "triggered_from", "bucket_start", name="app_statistic_rollup_app_bucket_key"
+        ),
+    )
+    with op.batch_alter_table("app_statistic_rollups", schema=None) as batch_op:
+        batch_op.create_index("app_statistic_rollup_source_bucket_idx", ["source", "bucket_start"], unique=False)
+
+    op.create_table(
+        "app_statistic_rollup_cursors",
+        sa.Column("id", models.types.StringUUID(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+
+        sa.Column("source", sa.String(length=20), nullable=False),
+        sa.Column("start_at", sa.DateTime(), nullable=False),
+        sa.Column("end_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id", name=op.f("app_statistic_rollup_cursors_pkey")),
+        sa.UniqueConstraint("source", name="app_statistic_rollup_cursor_source_key"),
+    )
+
+
+def downgrade():
+    op.drop_table("app_statistic_rollup_cursors")
+
+    with op.batch_alter_table("app_statistic_rollups", schema=None) as batch_op:
+        batch_op.drop_index("app_statistic_rollup_source_bucket_idx")
+
+    op.drop_table("app_statistic_rollups")
@@ -82,6 +82,7 @@ from .provider import (
     TenantPreferredModelProvider,
 )
 from .source import DataSourceApiKeyAuthBinding, DataSourceOauthBinding
+from .statistic import AppStatisticRollup, AppStatisticRollupCursor, AppStatisticSource
 from .task import CeleryTask, CeleryTaskSet
 from .tools import (
     ApiToolProvider,
@@ -131,6 +132,9 @@ __all__ = [
     "AppMCPServer",
     "AppMode",
     "AppModelConfig",
+    "AppStatisticRollup",
+    "AppStatisticRollupCursor",
+    "AppStatisticSource",
     "AppTrigger",
     "AppTriggerStatus",
     "AppTriggerType",
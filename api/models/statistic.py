@@ -0,0 +1,61 @@
+from datetime import datetime
+from decimal import Decimal
+from enum import StrEnum
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base, DefaultFieldsMixin
+from .types import EnumText, StringUUID
+
+
+class AppStatisticSource(StrEnum):
+    MESSAGE = "message"
+    WORKFLOW_RUN = "workflow_run"
+
+
+class AppStatisticRollup(DefaultFieldsMixin, Base):
+    """
+    Hourly totals of an app's messages or workflow runs, backing the app statistics dashboards.
+
+    Buckets are UTC hours, so they can be regrouped into days of any timezone whose offset is a whole number of
+    hours. Only additive totals are kept; distinct counts (conversations, end users) are still queried live.
+    """
+
+    __tablename__ = "app_statistic_rollups"
+    __table_args__ = (
+        sa.UniqueConstraint(
+            "app_id", "source", "triggered_from", "bucket_start", name="app_statistic_rollup_app_bucket_key"
+        ),
+        sa.Index("app_statistic_rollup_source_bucket_idx", "source", "bucket_start"),
+    )
+
+    source: Mapped[AppStatisticSource] = mapped_column(EnumText(AppStatisticSource, length=20), nullable=False)
+    app_id: Mapped[str] = mapped_column(StringUUID, nullable=False)
+    # `WorkflowRun.triggered_from` for workflow runs, empty for messages
+    triggered_from: Mapped[str] = mapped_column(sa.String(255), nullable=False, server_default=sa.text("''"))
+    # start of the UTC hour the totals cover
+    bucket_start: Mapped[datetime] = mapped_column(sa.DateTime, nullable=False)
+
+    record_count: Mapped[int] = mapped_column(sa.Integer, nullable=False, server_default=sa.text("0"))
+    message_tokens: Mapped[int] = mapped_column(sa.BigInteger, nullable=False, server_default=sa.text("0"))
+    answer_tokens: Mapped[int] = mapped_column(sa.BigInteger, nullable=False, server_default=sa.text("0"))
+    total_tokens: Mapped[int] = mapped_column(sa.BigInteger, nullable=False, server_default=sa.text("0"))
+    total_price: Mapped[Decimal | None] = mapped_column(sa.Numeric(20, 7), nullable=True)
+    total_latency: Mapped[float] = mapped_column(sa.Float, nullable=False, server_default=sa.text("0"))
+
+
+class AppStatisticRollupCursor(DefaultFieldsMixin, Base):
+    """
+    The contiguous range of UTC hours `[start_at, end_at)` rolled up for a source.
+
+    The scheduled rollup moves `end_at` forward, backfilling moves `start_at` back. Statistics outside the
+    range are queried live.
+    """
+
+    __tablename__ = "app_statistic_rollup_cursors"
+    __table_args__ = (sa.UniqueConstraint("source", name="app_statistic_rollup_cursor_source_key"),)
+
+    source: Mapped[AppStatisticSource] = mapped_column(EnumText(AppStatisticSource, length=20), nullable=False)
+    start_at: Mapped[datetime] = mapped_column(sa.DateTime, nullable=False)
+    end_at: Mapped[datetime] = mapped_column(sa.DateTime, nullable=False)
@@ -9,7 +9,7 @@ The service repository handles operations that require access to database-specif
 tenant_id, app_id, triggered_from, etc., which are not part of the core domain model.
 """
 
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Protocol
@@ -110,6 +110,32 @@ class DifyAPIWorkflowNodeExecutionRepository(WorkflowNodeExecutionRepository, Pr
         """
         ...
 
+    def iter_executions_by_workflow_run(
+        self,
+        session: Session,
+        tenant_id: str,
+        app_id: str,
+        workflow_run_id: str,
+        batch_size: int = 500,
+    ) -> Iterator[WorkflowNodeExecutionModel]:
+        """
+        Stream all node executions of a workflow run, ordered by creation time.
+
+        Rows are fetched from the database `batch_size` at a time, so runs with many large
+        executions can be processed without loading all of them at once.
+
+        Args:
+            session: The database session to use, which must stay open while iterating
+            tenant_id: The tenant identifier
+            app_id: The application identifier
+            workflow_run_id: The workflow run identifier
+            batch_size: Number of rows fetched per round trip
+
+        Returns:
+            An iterator of WorkflowNodeExecutionModel instances
+        """
+        ...
+
     def get_execution_snapshots_by_workflow_run(
         self,
         tenant_id: str,
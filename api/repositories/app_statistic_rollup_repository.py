@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Protocol
+
+from models.statistic import AppStatisticSource
+from repositories.types import DailyMessageTotals, DailyWorkflowRunTotals
+
+
+class AppStatisticRollupRepository(Protocol):
+    """
+    Hourly rollups of app messages and workflow runs behind the app statistics dashboards.
+
+    Each source keeps a contiguous range of rolled up UTC hours. Daily totals are served from the rollups within
+    that range and queried live outside of it, so they always match a live query.
+    """
+
+    def get_rolled_up_range(self, source: AppStatisticSource) -> tuple[datetime, datetime] | None:
+        """Return the range `[start, end)` of UTC hours rolled up for the source, or None before the first rollup."""
+        ...
+
+    def roll_up_hour(self, source: AppStatisticSource, bucket_start: datetime) -> int:
+        """
+        Recompute the rollups of one UTC hour for all apps and add it to the rolled up range.
+
+        The hour must lie in or right next to the rolled up range, so the range stays contiguous.
+        Returns the number of rollup rows written.
+        """
+        ...
+
+    def get_daily_message_totals(
+        self,
+        app_id: str,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        timezone: str = "UTC",
+    ) -> list[DailyMessageTotals]:
+        """Return the totals of an app's non-debugger messages per day of the timezone."""
+        ...
+
+    def get_daily_workflow_run_totals(
+        self,
+        tenant_id: str,
+        app_id: str,
+        triggered_from: str,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        timezone: str = "UTC",
+    ) -> list[DailyWorkflowRunTotals]:
+        """Return the totals of an app's workflow runs per day of the timezone."""
+        ...
+
+
+__all__ = ["AppStatisticRollupRepository"]
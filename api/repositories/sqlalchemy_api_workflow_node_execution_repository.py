@@ -6,7 +6,7 @@ using SQLAlchemy 2.0 style queries for WorkflowNodeExecutionModel operations.
 """
 
 import json
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from datetime import datetime
 from typing import cast
 
@@ -120,6 +120,32 @@ class DifyAPISQLAlchemyWorkflowNodeExecutionRepository(DifyAPIWorkflowNodeExecut
         with self._session_maker() as session:
             return session.execute(stmt).scalars().all()
 
+    def iter_executions_by_workflow_run(
+        self,
+        session: Session,
+        tenant_id: str,
+        app_id: str,
+        workflow_run_id: str,
+        batch_size: int = 500,
+    ) -> Iterator[WorkflowNodeExecutionModel]:
+        """
+        Stream all node executions of a workflow run, ordered by creation time.
+
+        Uses `yield_per`, which streams the result with a server side cursor where the driver supports it.
+        The session only keeps weak references to unmodified instances, so consumed rows can be released.
+        """
+        stmt = (
+            select(WorkflowNodeExecutionModel)
+            .where(
+                WorkflowNodeExecutionModel.tenant_id == tenant_id,
+                WorkflowNodeExecutionModel.app_id == app_id,
+                WorkflowNodeExecutionModel.workflow_run_id == workflow_run_id,
+            )
+            .order_by(asc(WorkflowNodeExecutionModel.created_at))
+            .execution_options(yield_per=batch_size)
+        )
+        yield from session.scalars(stmt)
+
     def get_execution_snapshots_by_workflow_run(
         self,
         tenant_id: str,
@@ -19,6 +19,7 @@ Implementation Notes:
 - Maintains data consistency with proper transaction handling
 """
 
+import gzip
 import json
 import logging
 import uuid
@@ -33,6 +34,7 @@ from sqlalchemy import and_, delete, func, null, or_, select
 from sqlalchemy.engine import CursorResult
 from sqlalchemy.orm import Session, selectinload, sessionmaker
 
+from configs import dify_config
 from core.workflow.entities.pause_reason import HumanInputRequired, PauseReason, PauseReasonType, SchedulingPause
 from core.workflow.enums import WorkflowExecutionStatus, WorkflowType
 from core.workflow.nodes.human_input.entities import FormDefinition
@@ -47,6 +49,7 @@ from models.human_input import HumanInputForm, HumanInputFormRecipient, Recipien
 from models.workflow import WorkflowAppLog, WorkflowArchiveLog, WorkflowPause, WorkflowPauseReason, WorkflowRun
 from repositories.api_workflow_run_repository import APIWorkflowRunRepository
 from repositories.entities.workflow_pause import WorkflowPauseEntity
+from repositories.sqlalchemy_app_statistic_rollup_repository import SQLAlchemyAppStatisticRollupRepository
 from repositories.types import (
     AverageInteractionStats,
     DailyRunsStats,
@@ -56,11 +59,28 @@ from repositories.types import (
 
 logger = logging.getLogger(__name__)
 
+_GZIP_MAGIC = b"\x1f\x8b"
+
 
 class _WorkflowRunError(Exception):
     pass
 
 
+def _encode_pause_state(state: str) -> tuple[str, bytes]:
+    """Return the storage key suffix and payload for a serialized pause state, gzip-compressed unless disabled."""
+    level = dify_config.WORKFLOW_PAUSE_STATE_COMPRESSION_LEVEL
+    if level == 0:
+        return ".json", state.encode()
+    return ".json.gz", gzip.compress(state.encode(), compresslevel=level, mtime=0)
+
+
+def _decode_pause_state(data: bytes) -> bytes:
+    """Decompress a stored pause state, states written without compression are returned unchanged."""
+    if data[:2] == _GZIP_MAGIC:
+        return gzip.decompress(data)
+    return data
+
+
 def _select_recipient_token(
     recipients: Sequence[HumanInputFormRecipient],
     recipient_type: RecipientType,
@@ -142,6 +162,7 @@ class DifyAPISQLAlchemyWorkflowRunRepository(APIWorkflowRunRepository):
             session_maker: SQLAlchemy sessionmaker for database connections
         """
         self._session_maker = session_maker
+        self._app_statistic_rollup_repository = SQLAlchemyAppStatisticRollupRepository(session_maker)
 
     def get_paginated_workflow_runs(
         self,
@@ -759,9 +780,10 @@ class DifyAPISQLAlchemyWorkflowRunRepository(APIWorkflowRunRepository):
                 # we need to flush here to ensure that the old one is actually deleted.
                 session.flush()
 
-            state_obj_key = f"workflow-state-{uuid.uuid4()}.json"
-            storage.save(state_obj_key, state.encode())
             # Upload the state file
+            suffix, state_data = _encode_pause_state(state)
+            state_obj_key = f"workflow-state-{uuid.uuid4()}{suffix}"
+            storage.save(state_obj_key, state_data)
 
             # Create the pause record
             pause_model = WorkflowPause()
@@ -1069,43 +1091,17 @@ class DifyAPISQLAlchemyWorkflowRunRepository(APIWorkflowRunRepository):
         timezone: str = "UTC",
     ) -> list[DailyRunsStats]:
         """
-        Get daily runs statistics using raw SQL for optimal performance.
+        Get daily runs statistics, served from the hourly rollups where available.
         """
-        converted_created_at = convert_datetime_to_date("created_at")
-        sql_query = f"""SELECT
-    {converted_created_at} AS date,
-    COUNT(id) AS runs
-FROM
-    workflow_runs
-WHERE
-    tenant_id = :tenant_id
-    AND app_id = :app_id
-    AND triggered_from = :triggered_from"""
-
-        arg_dict: dict[str, Any] = {
-            "tz": timezone,
-            "tenant_id": tenant_id,
-            "app_id": app_id,
-            "triggered_from": triggered_from,
-        }
-
-        if start_date:
-            sql_query += " AND created_at >= :start_date"
-            arg_dict["start_date"] = start_date
-
-        if end_date:
-            sql_query += " AND created_at < :end_date"
-            arg_dict["end_date"] = end_date
-
-        sql_query += " GROUP BY date ORDER BY date"
-
-        response_data = []
-        with self._session_maker() as session:
-            rs = session.execute(sa.text(sql_query), arg_dict)
-            for row in rs:
-                response_data.append({"date": str(row.date), "runs": row.runs})
-
-        return cast(list[DailyRunsStats], response_data)
+        daily_totals = self._app_statistic_rollup_repository.get_daily_workflow_run_totals(
+            tenant_id=tenant_id,
+            app_id=app_id,
+            triggered_from=triggered_from,
+            start_date=start_date,
+            end_date=end_date,
+            timezone=timezone,
+        )
+        return [{"date": totals["date"], "runs": totals["runs"]} for totals in daily_totals]
 
     def get_daily_terminals_statistics(
         self,
@@ -1165,48 +1161,17 @@ WHERE
         timezone: str = "UTC",
     ) -> list[DailyTokenCostStats]:
         """
-        Get daily token cost statistics using raw SQL for optimal performance.
+        Get daily token cost statistics, served from the hourly rollups where available.
         """
-        converted_created_at = convert_datetime_to_date("created_at")
-        sql_query = f"""SELECT
-    {converted_created_at} AS date,
-    SUM(total_tokens) AS token_count
-FROM
-    workflow_runs
-WHERE
-    tenant_id = :tenant_id
-    AND app_id = :app_id
-    AND triggered_from = :triggered_from"""
-
-        arg_dict: dict[str, Any] = {
-            "tz": timezone,
-            "tenant_id": tenant_id,
-            "app_id": app_id,
-            "triggered_from": triggered_from,
-        }
-
-        if start_date:
-            sql_query += " AND created_at >= :start_date"
-            arg_dict["start_date"] = start_date
-
-        if end_date:
-            sql_query += " AND created_at < :end_date"
-            arg_dict["end_date"] = end_date
-
-        sql_query += " GROUP BY date ORDER BY date"
-
-        response_data = []
-        with self._session_maker() as session:
-            rs = session.execute(sa.text(sql_query), arg_dict)
-            for row in rs:
-                response_data.append(
-                    {
-                        "date": str(row.date),
-                        "token_count": row.token_count,
-                    }
-                )
-
-        return cast(list[DailyTokenCostStats], response_data)
+        daily_totals = self._app_statistic_rollup_repository.get_daily_workflow_run_totals(
+            tenant_id=tenant_id,
+            app_id=app_id,
+            triggered_from=triggered_from,
+            start_date=start_date,
+            end_date=end_date,
+            timezone=timezone,
+        )
+        return [{"date": totals["date"], "token_count": totals["token_count"]} for totals in daily_totals]
 
     def get_average_app_interaction_statistics(
         self,
@@ -1315,7 +1280,7 @@ class _PrivateWorkflowPauseEntity(WorkflowPauseEntity):
 
     def get_state(self) -> bytes:
         """
-        Retrieve the serialized workflow state from storage.
+        Retrieve the serialized workflow state from storage, decompressing it if needed.
 
         Returns:
             Mapping[str, Any]: The workflow state as a dictionary
@@ -1329,7 +1294,7 @@ class _PrivateWorkflowPauseEntity(WorkflowPauseEntity):
             return self._cached_state
 
         # Load the state from storage
-        state_data = storage.load(self._pause_model.state_object_key)
+        state_data = _decode_pause_state(storage.load(self._pause_model.state_object_key))
         self._cached_state = state_data
         return state_data
 
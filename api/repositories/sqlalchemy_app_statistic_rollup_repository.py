@@ -0,0 +1,323 @@
+"""
+SQLAlchemy implementation of the app statistic rollups.
+
+Rollups are UTC hour buckets of additive totals. A daily statistics query is split into the rolled up hours,
+which are regrouped into days of the requested timezone in Python, and the partial hours and days outside the
+rolled up range (usually the current day), which run the original live `GROUP BY date` query.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from datetime import UTC, date, datetime, timedelta
+from typing import Any, cast
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import sqlalchemy as sa
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from core.app.entities.app_invoke_entities import InvokeFrom
+from libs.helper import convert_datetime_to_date
+from models.model import Message
+from models.statistic import AppStatisticRollup, AppStatisticRollupCursor, AppStatisticSource
+from models.workflow import WorkflowRun
+from repositories.app_statistic_rollup_repository import AppStatisticRollupRepository
+from repositories.types import DailyMessageTotals, DailyWorkflowRunTotals
+
+_HOUR = timedelta(hours=1)
+
+_MESSAGE_TOTALS = ("message_count", "message_tokens", "answer_tokens", "total_price", "total_latency")
+_WORKFLOW_RUN_TOTALS = ("runs", "token_count")
+
+# (lower, upper) bounds of a live query, None for unbounded
+_TimeRange = tuple[datetime | None, datetime | None]
+
+
+def _to_naive_utc(value: datetime | None) -> datetime | None:
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(UTC).replace(tzinfo=None)
+
+
+def _floor_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _ceil_hour(value: datetime) -> datetime:
+    floored = _floor_hour(value)
+    return floored if floored == value else floored + _HOUR
+
+
+def _local_date(bucket_start: datetime, zone: ZoneInfo) -> date:
+    return bucket_start.replace(tzinfo=UTC).astimezone(zone).date()
+
+
+def _whole_hour_zone(timezone: str, *moments: datetime) -> ZoneInfo | None:
+    """Return the zone if its UTC offset is a whole number of hours at all moments, so hour buckets map to days."""
+    try:
+        zone = ZoneInfo(timezone)
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+    for moment in moments:
+        offset = moment.replace(tzinfo=UTC).astimezone(zone).utcoffset()
+        if offset is None or offset.total_seconds() % 3600:
+            return None
+    return zone
+
+
+def _add_totals(daily: dict[str, dict[str, Any]], day: str, fields: tuple[str, ...], row: Mapping[str, Any]):
+    totals = daily.setdefault(day, dict.fromkeys(fields))
+    for field in fields:
+        value = row[field]
+        if value is None:
+            continue
+        totals[field] = value if totals[field] is None else totals[field] + value
+
+
+class SQLAlchemyAppStatisticRollupRepository(AppStatisticRollupRepository):
+    def __init__(self, session_maker: sessionmaker[Session]):
+        self._session_maker = session_maker
+
+    def get_rolled_up_range(self, source: AppStatisticSource) -> tuple[datetime, datetime] | None:
+        with self._session_maker() as session:
+            return self._get_rolled_up_range(session, source)
+
+    def roll_up_hour(self, source: AppStatisticSource, bucket_start: datetime) -> int:
+        bucket_start = _floor_hour(cast(datetime, _to_naive_utc(bucket_start)))
+        bucket_end = bucket_start + _HOUR
+
+        with self._session_maker() as session, session.begin():
+            cursor = session.scalar(
+                select(AppStatisticRollupCursor).where(AppStatisticRollupCursor.source == source).with_for_update()
+            )
+            if cursor is None:
+                session.add(AppStatisticRollupCursor(source=source, start_at=bucket_start, end_at=bucket_end))
+            elif bucket_start == cursor.end_at:
+                cursor.end_at = bucket_end
+            elif bucket_end == cursor.start_at:
+                cursor.start_at = bucket_start
+            elif not cursor.start_at <= bucket_start < cursor.end_at:
+                raise ValueError(
+                    f"Hour {bucket_start} is not next to the rolled up {source} range "
+                    f"[{cursor.start_at}, {cursor.end_at})"
+                )
+
+            if source == AppStatisticSource.MESSAGE:
+                rollups = self._aggregate_messages(session, bucket_start, bucket_end)
+            else:
+                rollups = self._aggregate_workflow_runs(session, bucket_start, bucket_end)
+
+            session.execute(
+                delete(AppStatisticRollup).where(
+                    AppStatisticRollup.source == source,
+                    AppStatisticRollup.bucket_start == bucket_start,
+                )
+            )
+            if rollups:
+                session.execute(
+                    insert(AppStatisticRollup),
+                    [{"source": source, "bucket_start": bucket_start, **rollup} for rollup in rollups],
+                )
+
+        return len(rollups)
+
+    def get_daily_message_totals(
+        self,
+        app_id: str,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        timezone: str = "UTC",
+    ) -> list[DailyMessageTotals]:
+        def _live_query(session: Session, lower: datetime | None, upper: datetime | None) -> list[Mapping[str, Any]]:
+            converted_created_at = convert_datetime_to_date("created_at")
+            sql_query = f"""SELECT
+    {converted_created_at} AS date,
+    COUNT(*) AS message_count,
+    SUM(message_tokens) AS message_tokens,
+    SUM(answer_tokens) AS answer_tokens,
+    SUM(total_price) AS total_price,
+    SUM(provider_response_latency) AS total_latency
+FROM
+    messages
+WHERE
+    app_id = :app_id
+    AND invoke_from != :invoke_from"""
+            arg_dict: dict[str, Any] = {"tz": timezone, "app_id": app_id, "invoke_from": InvokeFrom.DEBUGGER}
+            sql_query += self._time_range_clause(arg_dict, lower, upper)
+            sql_query += " GROUP BY date ORDER BY date"
+            # type the price so it adds up with the rolled up Numeric on every dialect
+            text_query = sa.text(sql_query).columns(total_price=sa.Numeric(20, 7))
+            return list(session.execute(text_query, arg_dict).mappings())
+
+        rolled_up_query = select(
+            AppStatisticRollup.bucket_start,
+            AppStatisticRollup.record_count.label("message_count"),
+            AppStatisticRollup.message_tokens,
+            AppStatisticRollup.answer_tokens,
+            AppStatisticRollup.total_price,
+            AppStatisticRollup.total_latency,
+        ).where(
+            AppStatisticRollup.app_id == app_id,
+            AppStatisticRollup.source == AppStatisticSource.MESSAGE,
+        )
+
+        daily = self._get_daily_totals(
+            AppStatisticSource.MESSAGE, _MESSAGE_TOTALS, rolled_up_query, _live_query, start_date, end_date, timezone
+        )
+        return cast(list[DailyMessageTotals], daily)
+
+    def get_daily_workflow_run_totals(
+        self,
+        tenant_id: str,
+        app_id: str,
+        triggered_from: str,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        timezone: str = "UTC",
+    ) -> list[DailyWorkflowRunTotals]:
+        def _live_query(session: Session, lower: datetime | None, upper: datetime | None) -> list[Mapping[str, Any]]:
+            converted_created_at = convert_datetime_to_date("created_at")
+            sql_query = f"""SELECT
+    {converted_created_at} AS date,
+    COUNT(id) AS runs,
+    SUM(total_tokens) AS token_count
+FROM
+    workflow_runs
+WHERE
+    tenant_id = :tenant_id
+    AND app_id = :app_id
+    AND triggered_from = :triggered_from"""
+            arg_dict: dict[str, Any] = {
+                "tz": timezone,
+                "tenant_id": tenant_id,
+                "app_id": app_id,
+                "triggered_from": triggered_from,
+            }
+            sql_query += self._time_range_clause(arg_dict, lower, upper)
+            sql_query += " GROUP BY date ORDER BY date"
+            return list(session.execute(sa.text(sql_query), arg_dict).mappings())
+
+        rolled_up_query = select(
+            AppStatisticRollup.bucket_start,
+            AppStatisticRollup.record_count.label("runs"),
+            AppStatisticRollup.total_tokens.label("token_count"),
+        ).where(
+            AppStatisticRollup.app_id == app_id,
+            AppStatisticRollup.source == AppStatisticSource.WORKFLOW_RUN,
+            AppStatisticRollup.triggered_from == triggered_from,
+        )
+
+        daily = self._get_daily_totals(
+            AppStatisticSource.WORKFLOW_RUN,
+            _WORKFLOW_RUN_TOTALS,
+            rolled_up_query,
+            _live_query,
+            start_date,
+            end_date,
+            timezone,
+        )
+        return cast(list[DailyWorkflowRunTotals], daily)
+
+    def _get_daily_totals(
+        self,
+        source: AppStatisticSource,
+        fields: tuple[str, ...],
+        rolled_up_query: sa.Select,
+        live_query: Callable[[Session, datetime | None, datetime | None], list[Mapping[str, Any]]],
+        start_date: datetime | None,
+        end_date: datetime | None,
+        timezone: str,
+    ) -> list[dict[str, Any]]:
+        start_date = _to_naive_utc(start_date)
+        end_date = _to_naive_utc(end_date)
+        daily: dict[str, dict[str, Any]] = {}
+
+        with self._session_maker() as session:
+            live_ranges: list[_TimeRange] = [(start_date, end_date)]
+            rolled_up_range = self._get_rolled_up_range(session, source)
+            if rolled_up_range is not None:
+                rolled_start = max(_ceil_hour(start_date), rolled_up_range[0]) if start_date else rolled_up_range[0]
+                rolled_end = min(_floor_hour(end_date), rolled_up_range[1]) if end_date else rolled_up_range[1]
+                zone = _whole_hour_zone(timezone, rolled_start, rolled_end)
+                if rolled_start < rolled_end and zone is not None:
+                    live_ranges = [
+                        time_range
+                        for time_range in ((start_date, rolled_start), (rolled_end, end_date))
+                        if time_range[0] is None or time_range[1] is None or time_range[0] < time_range[1]
+                    ]
+                    rows = session.execute(
+                        rolled_up_query.where(
+                            AppStatisticRollup.bucket_start >= rolled_start,
+                            AppStatisticRollup.bucket_start < rolled_end,
+                        )
+                    ).mappings()
+                    for row in rows:
+                        _add_totals(daily, str(_local_date(row["bucket_start"], zone)), fields, row)
+
+            for lower, upper in live_ranges:
+                for row in live_query(session, lower, upper):
+                    _add_totals(daily, str(row["date"]), fields, row)
+
+        return [{"date": day, **daily[day]} for day in sorted(daily)]
+
+    @staticmethod
+    def _get_rolled_up_range(session: Session, source: AppStatisticSource) -> tuple[datetime, datetime] | None:
+        cursor = session.scalar(select(AppStatisticRollupCursor).where(AppStatisticRollupCursor.source == source))
+        if cursor is None or cursor.start_at >= cursor.end_at:
+            return None
+        return cursor.start_at, cursor.end_at
+
+    @staticmethod
+    def _time_range_clause(arg_dict: dict[str, Any], lower: datetime | None, upper: datetime | None) -> str:
+        clause = ""
+        if lower:
+            clause += " AND created_at >= :start"
+            arg_dict["start"] = lower
+        if upper:
+            clause += " AND created_at < :end"
+            arg_dict["end"] = upper
+        return clause
+
+    @staticmethod
+    def _aggregate_messages(session: Session, bucket_start: datetime, bucket_end: datetime) -> list[dict[str, Any]]:
+        stmt = (
+            select(
+                Message.app_id,
+                func.count(Message.id).label("record_count"),
+                func.coalesce(func.sum(Message.message_tokens), 0).label("message_tokens"),
+                func.coalesce(func.sum(Message.answer_tokens), 0).label("answer_tokens"),
+                func.sum(Message.total_price).label("total_price"),
+                func.coalesce(func.sum(Message.provider_response_latency), 0).label("total_latency"),
+            )
+            .where(
+                Message.created_at >= bucket_start,
+                Message.created_at < bucket_end,
+                Message.invoke_from != InvokeFrom.DEBUGGER,
+            )
+            .group_by(Message.app_id)
+        )
+        return [
+            {
+                **row,
+                "triggered_from": "",
+                "total_tokens": row["message_tokens"] + row["answer_tokens"],
+            }
+            for row in session.execute(stmt).mappings()
+        ]
+
+    @staticmethod
+    def _aggregate_workflow_runs(
+        session: Session, bucket_start: datetime, bucket_end: datetime
+    ) -> list[dict[str, Any]]:
+        stmt = (
+            select(
+                WorkflowRun.app_id,
+                WorkflowRun.triggered_from,
+                func.count(WorkflowRun.id).label("record_count"),
+                func.coalesce(func.sum(WorkflowRun.total_tokens), 0).label("total_tokens"),
+            )
+            .where(WorkflowRun.created_at >= bucket_start, WorkflowRun.created_at < bucket_end)
+            .group_by(WorkflowRun.app_id, WorkflowRun.triggered_from)
+        )
+        return [dict(row) for row in session.execute(stmt).mappings()]
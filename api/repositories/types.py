@@ -1,3 +1,4 @@
+from decimal import Decimal
 from typing import TypedDict
 
 
@@ -19,3 +20,18 @@ class DailyTokenCostStats(TypedDict):
 class AverageInteractionStats(TypedDict):
     date: str
     interactions: float
+
+
+class DailyMessageTotals(TypedDict):
+    date: str
+    message_count: int
+    message_tokens: int
+    answer_tokens: int
+    total_price: Decimal | None
+    total_latency: float
+
+
+class DailyWorkflowRunTotals(TypedDict):
+    date: str
+    runs: int
+    token_count: int
@@ -0,0 +1,39 @@
+import logging
+import time
+
+import click
+from redis.exceptions import LockError
+
+import app
+from configs import dify_config
+from extensions.ext_redis import redis_client
+from services.app_statistic_rollup_service import AppStatisticRollupService
+
+logger = logging.getLogger(__name__)
+
+
+@app.celery.task(queue="retention")
+def roll_up_app_statistics():
+    """
+    Roll up the settled hours of app messages and workflow runs for the statistics dashboards.
+    """
+    click.echo(click.style("roll_up_app_statistics: start.", fg="green"))
+    start_at = time.perf_counter()
+
+    try:
+        with redis_client.lock(
+            "statistics:roll_up_app_statistics",
+            timeout=dify_config.APP_STATISTIC_ROLLUP_INTERVAL * 60,
+            blocking=False,
+        ):
+            rolled_up_hours = AppStatisticRollupService().roll_up_pending()
+    except LockError:
+        click.echo(click.style("roll_up_app_statistics: skipped, lock already held.", fg="yellow"))
+        return
+    except Exception:
+        logger.exception("roll_up_app_statistics failed")
+        raise
+
+    end_at = time.perf_counter()
+    summary = ", ".join(f"{source}: {hours} hours" for source, hours in rolled_up_hours.items())
+    click.echo(click.style(f"roll_up_app_statistics: {summary}, latency: {end_at - start_at:.2f}s", fg="green"))
@@ -0,0 +1,97 @@
+"""
+Scheduled task to batch-update document segment hit counts.
+
+Instead of updating the database after every knowledge retrieval, the hits of
+the retrieved segments are added up in a Redis hash (segment_hit_count:pending,
+segment id -> hits). This task runs periodically (default every minute) and
+flushes the hash into the database with one UPDATE per distinct hit count.
+"""
+
+import logging
+import time
+from collections import defaultdict
+
+import click
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+import app
+from core.rag.datasource.segment_cache import PENDING_HIT_COUNT_KEY
+from extensions.ext_database import db
+from extensions.ext_redis import redis_client
+from models.dataset import DocumentSegment
+
+logger = logging.getLogger(__name__)
+
+FLUSHING_HIT_COUNT_KEY = "segment_hit_count:flushing"
+UPDATE_BATCH_SIZE = 1000
+
+
+@app.celery.task(queue="dataset")
+def batch_update_segment_hit_count():
+    """
+    Add the pending hit counts recorded by knowledge retrieval to DocumentSegment.hit_count.
+
+    The pending hash is renamed before it is read, so hits recorded meanwhile go
+    to a new hash. If the update fails, the hits are added back to the pending
+    hash for the next run.
+    """
+    click.echo(click.style("batch_update_segment_hit_count: start.", fg="green"))
+    start_at = time.perf_counter()
+
+    segment_count = 0
+    hit_count = 0
+
+    try:
+        # a leftover flushing hash means the previous run was interrupted; flush it before taking new hits
+        if not redis_client.exists(FLUSHING_HIT_COUNT_KEY):
+            if not redis_client.exists(PENDING_HIT_COUNT_KEY):
+                click.echo(click.style("batch_update_segment_hit_count: no segment hits found.", fg="yellow"))
+                return
+            redis_client.rename(PENDING_HIT_COUNT_KEY, FLUSHING_HIT_COUNT_KEY)
+
+        pending: dict[str, int] = {}
+        for segment_id, hits in redis_client.hgetall(FLUSHING_HIT_COUNT_KEY).items():
+            if isinstance(segment_id, bytes):
+                segment_id = segment_id.decode("utf-8")
+            pending[segment_id] = int(hits)
+
+        # segments with the same number of hits are updated by one statement
+        segments_by_hits: dict[int, list[str]] = defaultdict(list)
+        for segment_id, hits in pending.items():
+            if hits > 0:
+                segments_by_hits[hits].append(segment_id)
+
+        try:
+            with Session(db.engine) as session, session.begin():
+                for hits, segment_ids in segments_by_hits.items():
+                    for i in range(0, len(segment_ids), UPDATE_BATCH_SIZE):
+                        stmt = (
+                            update(DocumentSegment)
+                            .where(DocumentSegment.id.in_(segment_ids[i : i + UPDATE_BATCH_SIZE]))
+                            .values(hit_count=DocumentSegment.hit_count + hits)
+                        )
+                        session.execute(stmt)
+        except Exception:
+            # keep the hits for the next run
+            pipe = redis_client.pipeline(transaction=False)
+            for segment_id, hits in pending.items():
+                pipe.hincrby(PENDING_HIT_COUNT_KEY, segment_id, hits)
+            pipe.delete(FLUSHING_HIT_COUNT_KEY)
+            pipe.execute()
+            raise
+
+        redis_client.delete(FLUSHING_HIT_COUNT_KEY)
+        segment_count = len(pending)
+        hit_count = sum(pending.values())
+
+    except Exception:
+        logger.exception("batch_update_segment_hit_count failed")
+
+    elapsed = time.perf_counter() - start_at
+    click.echo(
+        click.style(
+            f"batch_update_segment_hit_count: done. segments={segment_count}, hits={hit_count}, elapsed={elapsed:.2f}s",
+            fg="green",
+        )
+    )
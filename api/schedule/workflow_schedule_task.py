@@ -1,6 +1,8 @@
 import logging
 
 from celery import group, shared_task
+from celery.canvas import Signature
+from redis import RedisError
 from sqlalchemy import and_, select
 from sqlalchemy.orm import Session, sessionmaker
 
@@ -9,6 +11,7 @@ from extensions.ext_database import db
 from libs.datetime_utils import naive_utc_now
 from libs.schedule_utils import calculate_next_run_at
 from models.trigger import AppTrigger, AppTriggerStatus, AppTriggerType, WorkflowSchedulePlan
+from services.trigger.schedule_dispatch_index import schedule_dispatch_index
 from tasks.workflow_schedule_tasks import run_schedule_trigger
 
 logger = logging.getLogger(__name__)
@@ -20,7 +23,7 @@ def poll_workflow_schedules() -> None:
     Poll and process due workflow schedules.
 
     Streaming flow:
-    1. Fetch due schedules in batches
+    1. Fetch due schedules in batches, from the Redis schedule index when enabled, else from the database
     2. Process each batch until all due schedules are handled
     3. Optional: Limit total dispatches per tick as a circuit breaker
     """
@@ -29,9 +32,19 @@ def poll_workflow_schedules() -> None:
     with session_factory() as session:
         total_dispatched = 0
 
+        fetch_due_schedules = _fetch_due_schedules
+        if schedule_dispatch_index.enabled:
+            try:
+                if not schedule_dispatch_index.is_ready():
+                    schedule_dispatch_index.rebuild(session)
+                fetch_due_schedules = _fetch_indexed_due_schedules
+            except RedisError:
+                logger.exception("Workflow schedule index unavailable, falling back to polling the database")
+                session.rollback()
+
         # Process in batches until we've handled all due schedules or hit the limit
         while True:
-            due_schedules = _fetch_due_schedules(session)
+            due_schedules = fetch_due_schedules(session)
 
             if not due_schedules:
                 break
@@ -90,6 +103,44 @@ def _fetch_due_schedules(session: Session) -> list[WorkflowSchedulePlan]:
     return list(due_schedules)
 
 
+def _fetch_indexed_due_schedules(session: Session) -> list[WorkflowSchedulePlan]:
+    """
+    Claim a batch of due schedules from the schedule index, most overdue first.
+
+    Claimed ids are checked against the database: plans whose next run moved since they were indexed go back into
+    the index at their current due time, deleted plans and plans whose trigger is not enabled are dropped until
+    the next index rebuild.
+    """
+    now = naive_utc_now()
+
+    while schedule_ids := schedule_dispatch_index.pop_due(now, dify_config.WORKFLOW_SCHEDULE_POLLER_BATCH_SIZE):
+        schedules = session.scalars(
+            select(WorkflowSchedulePlan)
+            .join(
+                AppTrigger,
+                and_(
+                    AppTrigger.app_id == WorkflowSchedulePlan.app_id,
+                    AppTrigger.node_id == WorkflowSchedulePlan.node_id,
+                    AppTrigger.trigger_type == AppTriggerType.TRIGGER_SCHEDULE,
+                ),
+            )
+            .where(
+                WorkflowSchedulePlan.id.in_(schedule_ids),
+                AppTrigger.status == AppTriggerStatus.ENABLED,
+            )
+            .with_for_update(skip_locked=True)
+        ).all()
+
+        due_schedules = [s for s in schedules if s.next_run_at is not None and s.next_run_at <= now]
+        schedule_dispatch_index.add(
+            (s.id, s.next_run_at) for s in schedules if s.next_run_at is not None and s.next_run_at > now
+        )
+        if due_schedules:
+            return due_schedules
+
+    return []
+
+
 def _process_schedules(session: Session, schedules: list[WorkflowSchedulePlan]) -> int:
     """Process schedules: check quota, update next run time and dispatch to Celery in parallel."""
     if not schedules:
@@ -106,11 +157,18 @@ def _process_schedules(session: Session, schedules: list[WorkflowSchedulePlan])
         tasks_to_dispatch.append(schedule.id)
 
     if tasks_to_dispatch:
-        job = group(run_schedule_trigger.s(schedule_id) for schedule_id in tasks_to_dispatch)
+        job = group(_schedule_trigger_signature(schedule_id) for schedule_id in tasks_to_dispatch)
         job.apply_async()
 
         logger.debug("Dispatched %d tasks in parallel", len(tasks_to_dispatch))
 
     session.commit()
+    schedule_dispatch_index.add((schedule.id, schedule.next_run_at) for schedule in schedules)
 
     return len(tasks_to_dispatch)
+
+
+def _schedule_trigger_signature(schedule_id: str) -> Signature:
+    signature = run_schedule_trigger.s(schedule_id)
+    delay = schedule_dispatch_index.dispatch_delay(schedule_id)
+    return signature.set(countdown=delay) if delay else signature
@@ -0,0 +1,86 @@
+"""
+Maintenance of the hourly app statistic rollups.
+
+The scheduled rollup moves the rolled up range of each source forward hour by hour, once an hour is settled:
+messages and workflow runs get their tokens, prices and latencies when they finish, so an hour is only rolled up
+`APP_STATISTIC_ROLLUP_DELAY` minutes after it ended. Backfilling moves the range back into the history.
+"""
+
+import logging
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import sessionmaker
+
+from configs import dify_config
+from extensions.ext_database import db
+from libs.datetime_utils import naive_utc_now
+from models.statistic import AppStatisticSource
+from repositories.app_statistic_rollup_repository import AppStatisticRollupRepository
+from repositories.sqlalchemy_app_statistic_rollup_repository import SQLAlchemyAppStatisticRollupRepository
+
+logger = logging.getLogger(__name__)
+
+_HOUR = timedelta(hours=1)
+
+
+class AppStatisticRollupService:
+    def __init__(self, repository: AppStatisticRollupRepository | None = None):
+        self._repository = repository or SQLAlchemyAppStatisticRollupRepository(
+            sessionmaker(bind=db.engine, expire_on_commit=False)
+        )
+
+    @staticmethod
+    def settled_until(now: datetime | None = None) -> datetime:
+        """Return the end of the last hour that is settled enough to be rolled up."""
+        now = now or naive_utc_now()
+        settled = now - timedelta(minutes=dify_config.APP_STATISTIC_ROLLUP_DELAY)
+        return settled.replace(minute=0, second=0, microsecond=0)
+
+    def roll_up_pending(self, now: datetime | None = None) -> dict[AppStatisticSource, int]:
+        """
+        Roll up the settled hours after the rolled up range of each source.
+
+        The first rollup of a source starts at the last settled hour, older hours are left to `backfill`.
+        At most `APP_STATISTIC_ROLLUP_MAX_HOURS_PER_RUN` hours are rolled up per source.
+        :return: number of hours rolled up per source
+        """
+        settled_until = self.settled_until(now)
+        rolled_up_hours: dict[AppStatisticSource, int] = {}
+        for source in AppStatisticSource:
+            rolled_up_range = self._repository.get_rolled_up_range(source)
+            bucket_start = rolled_up_range[1] if rolled_up_range else settled_until - _HOUR
+            hours = 0
+            while bucket_start < settled_until and hours < dify_config.APP_STATISTIC_ROLLUP_MAX_HOURS_PER_RUN:
+                self._repository.roll_up_hour(source, bucket_start)
+                bucket_start += _HOUR
+                hours += 1
+            rolled_up_hours[source] = hours
+        return rolled_up_hours
+
+    def backfill(
+        self,
+        source: AppStatisticSource,
+        since: datetime,
+        on_progress: Callable[[datetime, int], None] | None = None,
+    ) -> int:
+        """
+        Roll up the hours from `since` up to the rolled up range of the source, newest first.
+
+        The range stays contiguous after every hour, so an interrupted backfill can simply be run again.
+        :param source: source to backfill
+        :param since: UTC time to backfill from
+        :param on_progress: called with each rolled up hour and the number of rollup rows written for it
+        :return: number of hours rolled up
+        """
+        since = since.replace(minute=0, second=0, microsecond=0)
+        rolled_up_range = self._repository.get_rolled_up_range(source)
+        bucket_start = (rolled_up_range[0] if rolled_up_range else self.settled_until()) - _HOUR
+        hours = 0
+        while bucket_start >= since:
+            rows = self._repository.roll_up_hour(source, bucket_start)
+            if on_progress:
+                on_progress(bucket_start, rows)
+            bucket_start -= _HOUR
+            hours += 1
+        return hours
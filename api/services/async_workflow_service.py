@@ -30,6 +30,8 @@ from tasks.async_workflow_tasks import (
     execute_workflow_sandbox,
     execute_workflow_team,
 )
+from tasks.workflow_cfs_scheduler.cfs_scheduler import AsyncWorkflowCFSPlanScheduler, build_async_workflow_cfs_plan
+from tasks.workflow_cfs_scheduler.entities import AsyncWorkflowQueue
 
 
 class AsyncWorkflowService:
@@ -153,13 +155,16 @@ class AsyncWorkflowService:
         # 9. Dispatch to appropriate queue
         task_data_dict = task_data.model_dump(mode="json")
 
-        task: AsyncResult[Any] | None = None
         if queue_name == QueuePriority.PROFESSIONAL:
-            task = execute_workflow_professional.delay(task_data_dict)
+            execute_task, queue = execute_workflow_professional, AsyncWorkflowQueue.PROFESSIONAL_QUEUE
         elif queue_name == QueuePriority.TEAM:
-            task = execute_workflow_team.delay(task_data_dict)
+            execute_task, queue = execute_workflow_team, AsyncWorkflowQueue.TEAM_QUEUE
         else:  # SANDBOX
-            task = execute_workflow_sandbox.delay(task_data_dict)
+            execute_task, queue = execute_workflow_sandbox, AsyncWorkflowQueue.SANDBOX_QUEUE
+
+        # Count the run as waiting for the tenant, so the fair share scheduler makes room for it
+        AsyncWorkflowCFSPlanScheduler(plan=build_async_workflow_cfs_plan(queue, trigger_data.tenant_id)).enqueue()
+        task: AsyncResult[Any] = execute_task.delay(task_data_dict)
 
         # 10. Update trigger log with task info
         trigger_log.status = WorkflowTriggerStatus.QUEUED
@@ -23,6 +23,7 @@ from core.helper.name_generator import generate_incremental_name
 from core.model_manager import ModelManager
 from core.model_runtime.entities.model_entities import ModelFeature, ModelType
 from core.model_runtime.model_providers.__base.text_embedding_model import TextEmbeddingModel
+from core.rag.datasource.segment_cache import segment_hydration_cache
 from core.rag.index_processor.constant.built_in_field import BuiltInField
 from core.rag.index_processor.constant.index_type import IndexStructureType
 from core.rag.retrieval.retrieval_methods import RetrievalMethod
@@ -1481,6 +1482,54 @@ class DocumentService:
                 # Return null if summary index is not enabled or document doesn't need summary
                 document.summary_index_status = None  # type: ignore[attr-defined]
 
+    @staticmethod
+    def get_segment_counts(document_ids: Sequence[str]) -> dict[str, tuple[int, int]]:
+        """
+        Count the completed and total segments of many documents in a single grouped query.
+
+        Segments being re-segmented are not counted.
+
+        Args:
+            document_ids: IDs of the documents to count segments for
+
+        Returns:
+            Mapping of document ID to `(completed_segments, total_segments)`, documents without
+            segments map to `(0, 0)`
+        """
+        segment_counts = dict.fromkeys(document_ids, (0, 0))
+        if not segment_counts:
+            return segment_counts
+
+        rows = db.session.execute(
+            select(
+                DocumentSegment.document_id,
+                func.count(sa.case((DocumentSegment.completed_at.isnot(None), 1))),
+                func.count(DocumentSegment.id),
+            )
+            .where(
+                DocumentSegment.document_id.in_(list(segment_counts)),
+                DocumentSegment.status != "re_segment",
+            )
+            .group_by(DocumentSegment.document_id)
+        ).all()
+        for document_id, completed_segments, total_segments in rows:
+            segment_counts[str(document_id)] = (completed_segments, total_segments)
+        return segment_counts
+
+    @staticmethod
+    def enrich_documents_with_segment_counts(documents: Sequence[Document]) -> None:
+        """
+        Set `completed_segments` and `total_segments` on each document, with one query for all of them.
+
+        Args:
+            documents: List of Document instances to enrich
+        """
+        segment_counts = DocumentService.get_segment_counts([str(document.id) for document in documents])
+        for document in documents:
+            completed_segments, total_segments = segment_counts[str(document.id)]
+            document.completed_segments = completed_segments  # type: ignore[attr-defined]
+            document.total_segments = total_segments  # type: ignore[attr-defined]
+
     @staticmethod
     def prepare_document_batch_download_zip(
         *,
@@ -3523,6 +3572,7 @@ class SegmentService:
             segment.status = "error"
             segment.error = str(e)
             db.session.commit()
+        segment_hydration_cache.invalidate([dataset.id])
         new_segment = db.session.query(DocumentSegment).where(DocumentSegment.id == segment.id).first()
         if not new_segment:
             raise ValueError("new_segment is not found")
@@ -206,6 +206,7 @@ class OpsService:
         )
         db.session.add(trace_config_data)
         db.session.commit()
+        OpsTraceManager.invalidate_ops_trace_instance_cache(app_id)
 
         return {"result": "success"}
 
@@ -250,6 +251,7 @@ class OpsService:
 
         current_trace_config.tracing_config = tracing_config
         db.session.commit()
+        OpsTraceManager.invalidate_ops_trace_instance_cache(app_id)
 
         return current_trace_config.to_dict()
 
@@ -272,5 +274,6 @@ class OpsService:
 
         db.session.delete(trace_config)
         db.session.commit()
+        OpsTraceManager.invalidate_ops_trace_instance_cache(app_id)
 
         return True
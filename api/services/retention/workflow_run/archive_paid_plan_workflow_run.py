@@ -16,15 +16,17 @@ Archived tables:
 """
 
 import datetime
+import hashlib
 import io
 import json
 import logging
+import tempfile
 import time
 import zipfile
-from collections.abc import Sequence
+from collections.abc import Iterable, Iterator, Mapping, Sequence
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any
+from typing import IO, Any
 
 import click
 from sqlalchemy import inspect
@@ -44,7 +46,13 @@ from repositories.api_workflow_node_execution_repository import DifyAPIWorkflowN
 from repositories.api_workflow_run_repository import APIWorkflowRunRepository
 from repositories.sqlalchemy_workflow_trigger_log_repository import SQLAlchemyWorkflowTriggerLogRepository
 from services.billing_service import BillingService
-from services.retention.workflow_run.constants import ARCHIVE_BUNDLE_NAME, ARCHIVE_SCHEMA_VERSION
+from services.retention.workflow_run.constants import (
+    ARCHIVE_BUNDLE_NAME,
+    ARCHIVE_BUNDLE_SPOOL_MAX_SIZE,
+    ARCHIVE_MEMBER_BUFFER_SIZE,
+    ARCHIVE_ROWS_BATCH_SIZE,
+    ARCHIVE_SCHEMA_VERSION,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -88,7 +96,7 @@ class WorkflowRunArchiver:
 
     Storage Layout:
     {tenant_id}/app_id={app_id}/year={YYYY}/month={MM}/workflow_run_id={run_id}/
-        └── archive.v1.0.zip
+        └── archive.v1.0.zip (built in a spooled temporary file and uploaded in parts)
             ├── manifest.json
             ├── workflow_runs.jsonl
             ├── workflow_app_logs.jsonl
@@ -343,17 +351,17 @@ class WorkflowRunArchiver:
         result = ArchiveResult(run_id=run.id, tenant_id=run.tenant_id, success=False)
 
         try:
-            # Extract data from all tables
+            # Extract data from all tables, node executions are streamed from the database
             table_data, app_logs, trigger_metadata = self._extract_data(session, run)
 
             if self.dry_run:
                 # In dry run, just report what would be archived
                 for table_name in self.ARCHIVED_TABLES:
-                    records = table_data.get(table_name, [])
+                    row_count = sum(1 for _ in table_data.get(table_name, []))
                     result.tables.append(
                         TableStats(
                             table_name=table_name,
-                            row_count=len(records),
+                            row_count=row_count,
                             checksum="",
                             size_bytes=0,
                         )
@@ -364,29 +372,10 @@ class WorkflowRunArchiver:
                     raise ArchiveStorageNotConfiguredError("Archive storage not configured")
                 archive_key = self._get_archive_key(run)
 
-                # Serialize tables for the archive bundle
-                table_stats: list[TableStats] = []
-                table_payloads: dict[str, bytes] = {}
-                for table_name in self.ARCHIVED_TABLES:
-                    records = table_data.get(table_name, [])
-                    data = ArchiveStorage.serialize_to_jsonl(records)
-                    table_payloads[table_name] = data
-                    checksum = ArchiveStorage.compute_checksum(data)
-
-                    table_stats.append(
-                        TableStats(
-                            table_name=table_name,
-                            row_count=len(records),
-                            checksum=checksum,
-                            size_bytes=len(data),
-                        )
-                    )
-
-                # Generate and upload archive bundle
-                manifest = self._generate_manifest(run, table_stats)
-                manifest_data = json.dumps(manifest, indent=2, default=str).encode("utf-8")
-                archive_data = self._build_archive_bundle(manifest_data, table_payloads)
-                storage.put_object(archive_key, archive_data)
+                # Build the bundle in a file that only spills to disk once it gets large, then upload it in parts
+                with tempfile.SpooledTemporaryFile(max_size=ARCHIVE_BUNDLE_SPOOL_MAX_SIZE) as bundle:
+                    table_stats = self._write_archive_bundle(bundle, run, table_data)
+                    storage.put_object_stream(archive_key, bundle)
 
                 repo = self._get_workflow_run_repo()
                 archived_log_count = repo.create_archive_logs(session, run, app_logs, trigger_metadata)
@@ -423,23 +412,38 @@ class WorkflowRunArchiver:
         self,
         session: Session,
         run: WorkflowRun,
-    ) -> tuple[dict[str, list[dict[str, Any]]], Sequence[WorkflowAppLog], str | None]:
-        table_data: dict[str, list[dict[str, Any]]] = {}
+    ) -> tuple[dict[str, Iterable[dict[str, Any]]], Sequence[WorkflowAppLog], str | None]:
+        """
+        Collect the rows of every archived table of a run.
+
+        Node executions and their offloads are lazy iterables reading from `session`,
+        they must be consumed once and in `ARCHIVED_TABLES` order.
+        """
+        table_data: dict[str, Iterable[dict[str, Any]]] = {}
         table_data["workflow_runs"] = [self._row_to_dict(run)]
         repo = self._get_workflow_run_repo()
         app_logs = repo.get_app_logs_by_run_id(session, run.id)
         table_data["workflow_app_logs"] = [self._row_to_dict(row) for row in app_logs]
         node_exec_repo = self._get_workflow_node_execution_repo(session)
-        node_exec_records = node_exec_repo.get_executions_by_workflow_run(
-            tenant_id=run.tenant_id,
-            app_id=run.app_id,
-            workflow_run_id=run.id,
-        )
-        node_exec_ids = [record.id for record in node_exec_records]
-        offload_records = node_exec_repo.get_offloads_by_execution_ids(session, node_exec_ids)
-        table_data["workflow_node_executions"] = [self._row_to_dict(row) for row in node_exec_records]
-        table_data["workflow_node_execution_offload"] = [self._row_to_dict(row) for row in offload_records]
-        repo = self._get_workflow_run_repo()
+        node_exec_ids: list[str] = []
+
+        def _iter_node_executions() -> Iterator[dict[str, Any]]:
+            for record in node_exec_repo.iter_executions_by_workflow_run(
+                session,
+                tenant_id=run.tenant_id,
+                app_id=run.app_id,
+                workflow_run_id=run.id,
+                batch_size=ARCHIVE_ROWS_BATCH_SIZE,
+            ):
+                node_exec_ids.append(record.id)
+                yield self._row_to_dict(record)
+
+        def _iter_offloads() -> Iterator[dict[str, Any]]:
+            for record in node_exec_repo.get_offloads_by_execution_ids(session, node_exec_ids):
+                yield self._row_to_dict(record)
+
+        table_data["workflow_node_executions"] = _iter_node_executions()
+        table_data["workflow_node_execution_offload"] = _iter_offloads()
         pause_records = repo.get_pause_records_by_run_id(session, run.id)
         pause_ids = [pause.id for pause in pause_records]
         pause_reason_records = repo.get_pause_reason_records_by_run_id(
@@ -492,16 +496,45 @@ class WorkflowRunArchiver:
             },
         }
 
-    def _build_archive_bundle(self, manifest_data: bytes, table_payloads: dict[str, bytes]) -> bytes:
-        buffer = io.BytesIO()
-        with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
-            archive.writestr("manifest.json", manifest_data)
+    def _write_archive_bundle(
+        self,
+        bundle: IO[bytes],
+        run: WorkflowRun,
+        table_data: Mapping[str, Iterable[dict[str, Any]]],
+    ) -> list[TableStats]:
+        """
+        Stream the tables of a run into a zip bundle with one JSONL member per table.
+
+        Rows are compressed as they are serialized. The manifest is written last, once the
+        row counts and checksums of all tables are known.
+        """
+        table_stats: list[TableStats] = []
+        with zipfile.ZipFile(bundle, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
             for table_name in self.ARCHIVED_TABLES:
-                data = table_payloads.get(table_name)
-                if data is None:
+                records = table_data.get(table_name)
+                if records is None:
                     raise ValueError(f"Missing archive payload for {table_name}")
-                archive.writestr(f"{table_name}.jsonl", data)
-        return buffer.getvalue()
+                checksum = hashlib.md5()
+                row_count = 0
+                size_bytes = 0
+                member_file = archive.open(f"{table_name}.jsonl", mode="w", force_zip64=True)
+                with io.BufferedWriter(member_file, buffer_size=ARCHIVE_MEMBER_BUFFER_SIZE) as member:  # type: ignore[arg-type]
+                    for line in ArchiveStorage.iter_jsonl(records):
+                        member.write(line)
+                        checksum.update(line)
+                        row_count += 1
+                        size_bytes += len(line)
+                table_stats.append(
+                    TableStats(
+                        table_name=table_name,
+                        row_count=row_count,
+                        checksum=checksum.hexdigest(),
+                        size_bytes=size_bytes,
+                    )
+                )
+            manifest = self._generate_manifest(run, table_stats)
+            archive.writestr("manifest.json", json.dumps(manifest, indent=2, default=str).encode("utf-8"))
+        return table_stats
 
     def _delete_trigger_logs(self, session: Session, run_ids: Sequence[str]) -> int:
         trigger_repo = SQLAlchemyWorkflowTriggerLogRepository(session)
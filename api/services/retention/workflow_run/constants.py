@@ -1,2 +1,8 @@
 ARCHIVE_SCHEMA_VERSION = "1.0"
 ARCHIVE_BUNDLE_NAME = f"archive.v{ARCHIVE_SCHEMA_VERSION}.zip"
+# Bundles are built and read in temporary files that only spill to disk above this size
+ARCHIVE_BUNDLE_SPOOL_MAX_SIZE = 32 * 1024 * 1024
+# Rows fetched per database round trip while archiving, and inserted per statement while restoring
+ARCHIVE_ROWS_BATCH_SIZE = 500
+# Bundle members are read and written through buffers of this size instead of line by line
+ARCHIVE_MEMBER_BUFFER_SIZE = 1024 * 1024
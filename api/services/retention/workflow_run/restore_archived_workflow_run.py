@@ -8,12 +8,15 @@ back to the database.
 import io
 import json
 import logging
+import tempfile
 import time
 import zipfile
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator
 from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
+from itertools import islice
 from typing import Any, cast
 
 import click
@@ -39,7 +42,12 @@ from models.workflow import (
 )
 from repositories.api_workflow_run_repository import APIWorkflowRunRepository
 from repositories.factory import DifyAPIRepositoryFactory
-from services.retention.workflow_run.constants import ARCHIVE_BUNDLE_NAME
+from services.retention.workflow_run.constants import (
+    ARCHIVE_BUNDLE_NAME,
+    ARCHIVE_BUNDLE_SPOOL_MAX_SIZE,
+    ARCHIVE_MEMBER_BUFFER_SIZE,
+    ARCHIVE_ROWS_BATCH_SIZE,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -105,7 +113,6 @@ class WorkflowRunRestore:
     ) -> RestoreResult:
         start_time = time.time()
         run_id = run.workflow_run_id if isinstance(run, WorkflowArchiveLog) else run.id
-        created_at = run.run_created_at if isinstance(run, WorkflowArchiveLog) else run.created_at
         result = RestoreResult(
             run_id=run_id,
             tenant_id=run.tenant_id,
@@ -129,22 +136,10 @@ class WorkflowRunRestore:
             result.elapsed_time = time.time() - start_time
             return result
 
-        prefix = (
-            f"{run.tenant_id}/app_id={run.app_id}/year={created_at.strftime('%Y')}/"
-            f"month={created_at.strftime('%m')}/workflow_run_id={run_id}"
-        )
-        archive_key = f"{prefix}/{ARCHIVE_BUNDLE_NAME}"
+        archive_key = self._get_archive_key(run)
         try:
-            archive_data = storage.get_object(archive_key)
-        except FileNotFoundError:
-            result.error = f"Archive bundle not found: {archive_key}"
-            click.echo(click.style(result.error, fg="red"))
-            result.elapsed_time = time.time() - start_time
-            return result
-
-        with session_maker() as session:
-            try:
-                with zipfile.ZipFile(io.BytesIO(archive_data), mode="r") as archive:
+            with self._open_archive_bundle(storage, archive_key) as archive, session_maker() as session:
+                try:
                     try:
                         manifest = self._load_manifest_from_zip(archive)
                     except ValueError as e:
@@ -166,7 +161,7 @@ class WorkflowRunRestore:
 
                         member_path = f"{table_name}.jsonl"
                         try:
-                            data = archive.read(member_path)
+                            member = self._open_archive_member(archive, member_path)
                         except KeyError:
                             click.echo(
                                 click.style(
@@ -177,54 +172,61 @@ class WorkflowRunRestore:
                             result.restored_counts[table_name] = 0
                             continue
 
-                        records = ArchiveStorage.deserialize_from_jsonl(data)
-                        restored = self._restore_table_records(
-                            session,
-                            table_name,
-                            records,
-                            schema_version=schema_version,
-                        )
+                        with member:
+                            restored, record_count = self._restore_table_stream(
+                                session,
+                                table_name,
+                                ArchiveStorage.iter_jsonl_records(member),
+                                schema_version=schema_version,
+                            )
                         result.restored_counts[table_name] = restored
                         if not self.dry_run:
                             click.echo(
                                 click.style(
-                                    f"  Restored {restored}/{len(records)} records to {table_name}",
+                                    f"  Restored {restored}/{record_count} records to {table_name}",
                                     fg="white",
                                 )
                             )
 
-                # Verify row counts match manifest
-                manifest_total = sum(info.get("row_count", 0) for info in tables.values())
-                restored_total = sum(result.restored_counts.values())
-
-                if not self.dry_run:
-                    # Note: restored count might be less than manifest count if records already exist
-                    logger.info(
-                        "Restore verification: manifest_total=%d, restored_total=%d",
-                        manifest_total,
-                        restored_total,
-                    )
-
-                    # Delete the archive log record after successful restore
-                    repo = self._get_workflow_run_repo()
-                    repo.delete_archive_log_by_run_id(session, run_id)
-
-                    session.commit()
-
-                result.success = True
-                if not self.dry_run:
-                    click.echo(
-                        click.style(
-                            f"Completed restore for workflow run {run_id}: restored={result.restored_counts}",
-                            fg="green",
+                    # Verify row counts match manifest
+                    manifest_total = sum(info.get("row_count", 0) for info in tables.values())
+                    restored_total = sum(result.restored_counts.values())
+
+                    if not self.dry_run:
+                        # Note: restored count might be less than manifest count if records already exist
+                        logger.info(
+                            "Restore verification: manifest_total=%d, restored_total=%d",
+                            manifest_total,
+                            restored_total,
                         )
-                    )
 
-            except Exception as e:
-                logger.exception("Failed to restore workflow run %s", run_id)
-                result.error = str(e)
-                session.rollback()
-                click.echo(click.style(f"Restore failed: {e}", fg="red"))
+                        # Delete the archive log record after successful restore
+                        repo = self._get_workflow_run_repo()
+                        repo.delete_archive_log_by_run_id(session, run_id)
+
+                        session.commit()
+
+                    result.success = True
+                    if not self.dry_run:
+                        click.echo(
+                            click.style(
+                                f"Completed restore for workflow run {run_id}: restored={result.restored_counts}",
+                                fg="green",
+                            )
+                        )
+
+                except Exception as e:
+                    logger.exception("Failed to restore workflow run %s", run_id)
+                    result.error = str(e)
+                    session.rollback()
+                    click.echo(click.style(f"Restore failed: {e}", fg="red"))
+
+        except FileNotFoundError:
+            result.error = f"Archive bundle not found: {archive_key}"
+            click.echo(click.style(result.error, fg="red"))
+        except zipfile.BadZipFile as e:
+            result.error = f"Archive bundle invalid: {e}"
+            click.echo(click.style(result.error, fg="red"))
 
         result.elapsed_time = time.time() - start_time
         return result
@@ -238,6 +240,40 @@ class WorkflowRunRestore:
         )
         return self.workflow_run_repo
 
+    @staticmethod
+    def _get_archive_key(run: WorkflowRun | WorkflowArchiveLog) -> str:
+        run_id = run.workflow_run_id if isinstance(run, WorkflowArchiveLog) else run.id
+        created_at = run.run_created_at if isinstance(run, WorkflowArchiveLog) else run.created_at
+        prefix = (
+            f"{run.tenant_id}/app_id={run.app_id}/year={created_at.strftime('%Y')}/"
+            f"month={created_at.strftime('%m')}/workflow_run_id={run_id}"
+        )
+        return f"{prefix}/{ARCHIVE_BUNDLE_NAME}"
+
+    @staticmethod
+    @contextmanager
+    def _open_archive_bundle(storage: ArchiveStorage, archive_key: str) -> Iterator[zipfile.ZipFile]:
+        """
+        Download a bundle into a temporary file that only spills to disk once it gets large, and open it.
+
+        Raises:
+            FileNotFoundError: If the bundle does not exist
+        """
+        with tempfile.SpooledTemporaryFile(max_size=ARCHIVE_BUNDLE_SPOOL_MAX_SIZE) as bundle:
+            storage.download_object(archive_key, bundle)
+            with zipfile.ZipFile(bundle, mode="r") as archive:
+                yield archive
+
+    @staticmethod
+    def _open_archive_member(archive: zipfile.ZipFile, member_path: str) -> io.BufferedReader:
+        """
+        Open a bundle member for reading line by line through a large buffer.
+
+        Raises:
+            KeyError: If the member does not exist
+        """
+        return io.BufferedReader(archive.open(member_path), buffer_size=ARCHIVE_MEMBER_BUFFER_SIZE)  # type: ignore[arg-type]
+
     @staticmethod
     def _load_manifest_from_zip(archive: zipfile.ZipFile) -> dict[str, Any]:
         try:
@@ -246,6 +282,28 @@ class WorkflowRunRestore:
             raise ValueError("manifest.json missing from archive bundle") from e
         return json.loads(data.decode("utf-8"))
 
+    def _restore_table_stream(
+        self,
+        session: Session,
+        table_name: str,
+        records: Iterable[dict[str, Any]],
+        *,
+        schema_version: str,
+    ) -> tuple[int, int]:
+        """
+        Restore a stream of records to a table, `ARCHIVE_ROWS_BATCH_SIZE` records per statement.
+
+        Returns:
+            Number of records actually inserted, and number of records read
+        """
+        restored = 0
+        record_count = 0
+        iterator = iter(records)
+        while batch := list(islice(iterator, ARCHIVE_ROWS_BATCH_SIZE)):
+            restored += self._restore_table_records(session, table_name, batch, schema_version=schema_version)
+            record_count += len(batch)
+        return restored, record_count
+
     def _restore_table_records(
         self,
         session: Session,
@@ -479,3 +537,38 @@ class WorkflowRunRestore:
                 )
             )
         return result
+
+    def iter_archived_records(self, run_id: str, table_name: str) -> Iterator[dict[str, Any]]:
+        """
+        Read the archived records of one table of a workflow run without restoring them.
+
+        Only the requested table is decompressed, one record at a time, so large tables
+        of a bundle can be inspected without loading them.
+
+        Args:
+            run_id: Workflow run ID
+            table_name: Archived table to read, e.g. "workflow_node_executions"
+
+        Yields:
+            Records mapped to the current schema, with datetimes left as ISO strings
+
+        Raises:
+            ValueError: If the table is unknown or the run is not archived
+            FileNotFoundError: If the archive bundle is missing
+        """
+        if table_name not in TABLE_MODELS:
+            raise ValueError(f"Unknown table: {table_name}")
+        archive_log = self._get_workflow_run_repo().get_archived_log_by_run_id(run_id)
+        if not archive_log:
+            raise ValueError(f"Workflow run archive {run_id} not found")
+
+        storage = get_archive_storage()
+        with self._open_archive_bundle(storage, self._get_archive_key(archive_log)) as archive:
+            schema_version = self._get_schema_version(self._load_manifest_from_zip(archive))
+            try:
+                member = self._open_archive_member(archive, f"{table_name}.jsonl")
+            except KeyError:
+                return
+            with member:
+                for record in ArchiveStorage.iter_jsonl_records(member):
+                    yield self._apply_schema_mapping(table_name, schema_version, record)
@@ -3,15 +3,21 @@
 import logging
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import UTC, datetime
 from typing import Any
 
+from flask import Flask, current_app
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
+from configs import dify_config
 from core.db.session_factory import session_factory
+from core.errors.error import ProviderTokenNotInitError
 from core.model_manager import ModelManager
 from core.model_runtime.entities.llm_entities import LLMUsage
 from core.model_runtime.entities.model_entities import ModelType
+from core.model_runtime.errors.invoke import InvokeRateLimitError
 from core.rag.datasource.vdb.vector_factory import Vector
 from core.rag.index_processor.constant.doc_type import DocType
 from core.rag.models.document import Document
@@ -21,6 +27,11 @@ from models.dataset import Document as DatasetDocument
 
 logger = logging.getLogger(__name__)
 
+# Backoff for summary generation once the model (and all of its load balancing configs) is rate limited.
+# With load balancing, each retry waits out the remaining cooldown; the delay is only used without it.
+SUMMARY_RATE_LIMIT_MAX_RETRIES = 5
+SUMMARY_RATE_LIMIT_RETRY_DELAY = 2.0
+
 
 class SummaryIndexService:
     """Service for generating and managing summary indexes."""
@@ -30,6 +41,7 @@ class SummaryIndexService:
         segment: DocumentSegment,
         dataset: Dataset,
         summary_index_setting: dict,
+        document: DatasetDocument | None = None,
     ) -> tuple[str, LLMUsage]:
         """
         Generate summary for a single segment.
@@ -38,6 +50,7 @@ class SummaryIndexService:
             segment: DocumentSegment to generate summary for
             dataset: Dataset containing the segment
             summary_index_setting: Summary index configuration
+            document: Document containing the segment; loaded through the segment if not given
 
         Returns:
             Tuple of (summary_content, llm_usage) where llm_usage is LLMUsage object
@@ -51,9 +64,10 @@ class SummaryIndexService:
 
         # Get document language to ensure summary is generated in the correct language
         # This is especially important for image-only chunks where text is empty or minimal
+        document = document or segment.document
         document_language = None
-        if segment.document and segment.document.doc_language:
-            document_language = segment.document.doc_language
+        if document and document.doc_language:
+            document_language = document.doc_language
 
         summary_content, usage = ParagraphIndexProcessor.generate_summary(
             tenant_id=dataset.tenant_id,
@@ -700,6 +714,251 @@ class SummaryIndexService:
                     session.commit()
                 raise
 
+    @staticmethod
+    def generate_summary_with_backoff(
+        segment: DocumentSegment,
+        dataset: Dataset,
+        summary_index_setting: dict,
+        document: DatasetDocument | None = None,
+    ) -> tuple[str, LLMUsage]:
+        """
+        Generate summary for a single segment, backing off while the summary model is rate limited.
+
+        The model instance already rotates through load balancing configs and puts rate limited ones
+        into cooldown, so a rate limit error reaching this point means every config is cooling down.
+        When other workers have put every config into cooldown first, the model instance finds no usable
+        config and raises ProviderTokenNotInitError instead, which is treated as rate limited as well.
+        Each retry waits for the first config to leave cooldown.
+
+        Args:
+            segment: DocumentSegment to generate summary for
+            dataset: Dataset containing the segment
+            summary_index_setting: Summary index configuration
+            document: Document containing the segment
+
+        Returns:
+            Tuple of (summary_content, llm_usage)
+
+        Raises:
+            ValueError: If the generated summary is empty
+            InvokeRateLimitError: If the model is still rate limited after all retries
+        """
+        attempt = 0
+        while True:
+            try:
+                return SummaryIndexService.generate_summary_for_segment(
+                    segment, dataset, summary_index_setting, document
+                )
+            except (InvokeRateLimitError, ProviderTokenNotInitError) as e:
+                cooldown_ttl = SummaryIndexService._summary_model_cooldown_ttl(dataset.tenant_id, summary_index_setting)
+                if isinstance(e, ProviderTokenNotInitError) and cooldown_ttl is None:
+                    # No load balancing, so the credentials are genuinely missing
+                    raise
+                attempt += 1
+                if attempt >= SUMMARY_RATE_LIMIT_MAX_RETRIES:
+                    raise
+                wait_time = cooldown_ttl or SUMMARY_RATE_LIMIT_RETRY_DELAY * (2 ** (attempt - 1))
+                logger.warning(
+                    "Summary model rate limited for segment %s, retrying in %.1f seconds", segment.id, wait_time
+                )
+                time.sleep(wait_time)
+
+    @staticmethod
+    def _summary_model_cooldown_ttl(tenant_id: str, summary_index_setting: dict) -> int | None:
+        """
+        Get the remaining cooldown of the summary model's load balancing configs.
+
+        Returns:
+            Seconds until a config leaves cooldown (0 if one is available now),
+            or None if the model does not use load balancing
+        """
+        try:
+            model_instance = ModelManager().get_model_instance(
+                tenant_id=tenant_id,
+                provider=summary_index_setting["model_provider_name"],
+                model_type=ModelType.LLM,
+                model=summary_index_setting["model_name"],
+            )
+        except Exception:
+            logger.warning("Failed to resolve summary model for tenant %s", tenant_id, exc_info=True)
+            return None
+
+        if not model_instance.load_balancing_manager:
+            return None
+        return model_instance.load_balancing_manager.cooldown_ttl()
+
+    @staticmethod
+    def batch_vectorize_summaries(
+        generated_summaries: list[tuple[DocumentSegment, str]],
+        dataset: Dataset,
+    ) -> list[DocumentSegmentSummary]:
+        """
+        Vectorize a batch of generated summaries with one embedding call and write their records in bulk.
+        Assumes summary records already exist (created by batch_create_summary_records).
+
+        Args:
+            generated_summaries: List of (segment, summary_content) pairs
+            dataset: Dataset containing the segments
+
+        Returns:
+            List of completed DocumentSegmentSummary instances
+        """
+        if not generated_summaries:
+            return []
+
+        segment_ids = [segment.id for segment, _ in generated_summaries]
+        with session_factory.create_session() as session:
+            summary_record_map = {
+                summary.chunk_id: summary
+                for summary in session.query(DocumentSegmentSummary).filter(
+                    DocumentSegmentSummary.chunk_id.in_(segment_ids),
+                    DocumentSegmentSummary.dataset_id == dataset.id,
+                )
+            }
+            summary_records = []
+            summary_documents = []
+            old_summary_node_ids = []
+            for segment, summary_content in generated_summaries:
+                summary_record = summary_record_map.get(segment.id)
+                if not summary_record:
+                    logger.warning("Summary record not found for segment %s, creating one", segment.id)
+                    summary_record = DocumentSegmentSummary(
+                        dataset_id=dataset.id,
+                        document_id=segment.document_id,
+                        chunk_id=segment.id,
+                        enabled=True,
+                    )
+                    session.add(summary_record)
+                summary_record.summary_content = summary_content
+                if summary_record.summary_index_node_id:
+                    old_summary_node_ids.append(summary_record.summary_index_node_id)
+                else:
+                    summary_record.summary_index_node_id = str(uuid.uuid4())
+                summary_record.summary_index_node_hash = helper.generate_text_hash(summary_content)
+                summary_records.append(summary_record)
+                summary_documents.append(
+                    Document(
+                        page_content=summary_content,
+                        metadata={
+                            "doc_id": summary_record.summary_index_node_id,
+                            "doc_hash": summary_record.summary_index_node_hash,
+                            "dataset_id": dataset.id,
+                            "document_id": segment.document_id,
+                            "original_chunk_id": segment.id,
+                            "doc_type": DocType.TEXT,
+                            "is_summary": True,
+                        },
+                    )
+                )
+
+            tokens_list = [0] * len(summary_records)
+            try:
+                embedding_model = ModelManager().get_model_instance(
+                    tenant_id=dataset.tenant_id,
+                    provider=dataset.embedding_model_provider,
+                    model_type=ModelType.TEXT_EMBEDDING,
+                    model=dataset.embedding_model,
+                )
+                tokens_list = embedding_model.get_text_embedding_num_tokens(
+                    [document.page_content for document in summary_documents]
+                )
+            except Exception as e:
+                logger.warning("Failed to calculate embedding tokens for summaries: %s", str(e))
+
+            try:
+                vector = Vector(dataset)
+                # Existing index node ids are reused, so drop their old vectors before adding the new ones
+                if old_summary_node_ids:
+                    vector.delete_by_ids(old_summary_node_ids)
+                vector.add_texts(summary_documents, duplicate_check=False)
+            except Exception as e:
+                logger.exception("Failed to vectorize summaries for %s segments", len(summary_records))
+                now = datetime.now(UTC).replace(tzinfo=None)
+                for summary_record in summary_records:
+                    summary_record.status = "error"
+                    summary_record.error = f"Vectorization failed: {str(e)}"
+                    summary_record.updated_at = now
+                session.commit()
+                return []
+
+            now = datetime.now(UTC).replace(tzinfo=None)
+            for summary_record, tokens in zip(summary_records, tokens_list):
+                summary_record.tokens = tokens
+                summary_record.status = "completed"
+                summary_record.error = None  # type: ignore[assignment]
+                summary_record.updated_at = now
+            session.commit()
+            return summary_records
+
+    @staticmethod
+    def _generate_and_vectorize_summaries(
+        segments: list[DocumentSegment],
+        dataset: Dataset,
+        document: DatasetDocument,
+        summary_index_setting: dict,
+    ) -> list[DocumentSegmentSummary]:
+        """
+        Generate summaries concurrently with a bounded worker pool and vectorize them in batches
+        as they complete, so embedding overlaps with the remaining LLM calls.
+        """
+        flask_app: Flask | None = None
+        try:
+            flask_app = current_app._get_current_object()  # type: ignore
+        except RuntimeError:
+            logger.warning("No Flask application context available, summary generation may fail")
+
+        def generate(segment: DocumentSegment) -> tuple[str, LLMUsage]:
+            if flask_app:
+                with flask_app.app_context():
+                    return SummaryIndexService.generate_summary_with_backoff(
+                        segment, dataset, summary_index_setting, document
+                    )
+            return SummaryIndexService.generate_summary_with_backoff(segment, dataset, summary_index_setting, document)
+
+        # Mark all pending records as generating in one statement
+        with session_factory.create_session() as session:
+            session.execute(
+                update(DocumentSegmentSummary)
+                .where(
+                    DocumentSegmentSummary.chunk_id.in_([segment.id for segment in segments]),
+                    DocumentSegmentSummary.dataset_id == dataset.id,
+                )
+                .values(status="generating")
+            )
+            session.commit()
+
+        summary_records: list[DocumentSegmentSummary] = []
+        generated: list[tuple[DocumentSegment, str]] = []
+        batch_size = dify_config.SUMMARY_INDEX_VECTORIZE_BATCH_SIZE
+        max_workers = min(dify_config.SUMMARY_INDEX_MAX_WORKERS, len(segments))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(generate, segment): segment for segment in segments}
+            for future in as_completed(futures):
+                segment = futures[future]
+                try:
+                    summary_content, llm_usage = future.result()
+                except Exception as e:
+                    logger.exception("Failed to generate summary for segment %s", segment.id)
+                    SummaryIndexService.update_summary_record_error(segment=segment, dataset=dataset, error=str(e))
+                    continue
+
+                if llm_usage and llm_usage.total_tokens > 0:
+                    logger.info(
+                        "Summary generation for segment %s used %s tokens (prompt: %s, completion: %s)",
+                        segment.id,
+                        llm_usage.total_tokens,
+                        llm_usage.prompt_tokens,
+                        llm_usage.completion_tokens,
+                    )
+                generated.append((segment, summary_content))
+                if len(generated) >= batch_size:
+                    summary_records.extend(SummaryIndexService.batch_vectorize_summaries(generated, dataset))
+                    generated = []
+
+        if generated:
+            summary_records.extend(SummaryIndexService.batch_vectorize_summaries(generated, dataset))
+        return summary_records
+
     @staticmethod
     def generate_summaries_for_document(
         dataset: Dataset,
@@ -707,16 +966,22 @@ class SummaryIndexService:
         summary_index_setting: dict,
         segment_ids: list[str] | None = None,
         only_parent_chunks: bool = False,
+        skip_completed: bool = False,
     ) -> list[DocumentSegmentSummary]:
         """
         Generate summaries for all segments in a document including vectorization.
 
+        Summaries are generated concurrently (up to SUMMARY_INDEX_MAX_WORKERS LLM calls at a time) and
+        vectorized in batches of SUMMARY_INDEX_VECTORIZE_BATCH_SIZE. The status of each summary record
+        tracks progress, so a partial run can be resumed with skip_completed.
+
         Args:
             dataset: Dataset containing the document
             document: DatasetDocument to generate summaries for
             summary_index_setting: Summary index configuration
             segment_ids: Optional list of specific segment IDs to process
             only_parent_chunks: If True, only process parent chunks (for parent-child mode)
+            skip_completed: If True, segments whose summary is already completed are not regenerated
 
         Returns:
             List of created DocumentSegmentSummary instances
@@ -765,6 +1030,20 @@ class SummaryIndexService:
                 logger.info("No segments found for document %s", document.id)
                 return []
 
+            if skip_completed:
+                completed_segment_ids = {
+                    chunk_id
+                    for (chunk_id,) in session.query(DocumentSegmentSummary.chunk_id).filter(
+                        DocumentSegmentSummary.chunk_id.in_([segment.id for segment in segments]),
+                        DocumentSegmentSummary.dataset_id == dataset.id,
+                        DocumentSegmentSummary.status == "completed",
+                    )
+                }
+                segments = [segment for segment in segments if segment.id not in completed_segment_ids]
+                if not segments:
+                    logger.info("All summaries of document %s are already completed", document.id)
+                    return []
+
             # Batch create summary records with "not_started" status before processing
             # This ensures all records exist upfront, allowing status tracking
             SummaryIndexService.batch_create_summary_records(
@@ -773,35 +1052,11 @@ class SummaryIndexService:
                 status="not_started",
             )
 
-            summary_records = []
-
-            for segment in segments:
-                # For parent-child mode, only process parent chunks
-                # In parent-child mode, all DocumentSegments are parent chunks,
-                # so we process all of them. Child chunks are stored in ChildChunk table
-                # and are not DocumentSegments, so they won't be in the segments list.
-                # This check is mainly for clarity and future-proofing.
-                if only_parent_chunks:
-                    # In parent-child mode, all segments in the query are parent chunks
-                    # Child chunks are not DocumentSegments, so they won't appear here
-                    # We can process all segments
-                    pass
-
-                try:
-                    summary_record = SummaryIndexService.generate_and_vectorize_summary(
-                        segment, dataset, summary_index_setting
-                    )
-                    summary_records.append(summary_record)
-                except Exception as e:
-                    logger.exception("Failed to generate summary for segment %s", segment.id)
-                    # Update summary record with error status
-                    SummaryIndexService.update_summary_record_error(
-                        segment=segment,
-                        dataset=dataset,
-                        error=str(e),
-                    )
-                    # Continue with other segments
-                    continue
+            # In parent-child mode, all DocumentSegments are parent chunks (child chunks are stored in
+            # the ChildChunk table), so only_parent_chunks needs no extra filtering here.
+            summary_records = SummaryIndexService._generate_and_vectorize_summaries(
+                segments, dataset, document, summary_index_setting
+            )
 
             logger.info(
                 "Completed summary generation for document %s: %s summaries generated and vectorized",
@@ -13,6 +13,7 @@ from sqlalchemy.orm import Session
 from extensions.ext_database import db
 from models.enums import AppTriggerStatus
 from models.trigger import AppTrigger
+from services.trigger.webhook_routing_cache import webhook_routing_cache
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +42,7 @@ class AppTriggerService:
                     .values(status=AppTriggerStatus.RATE_LIMITED)
                 )
                 session.commit()
+                webhook_routing_cache.invalidate_tenant(tenant_id)
                 logger.info("Marked all enabled triggers as rate limited for tenant %s", tenant_id)
         except Exception:
             logger.exception("Failed to mark all enabled triggers as rate limited for tenant %s", tenant_id)
@@ -0,0 +1,138 @@
+"""
+Redis index of workflow schedule plans by next run time.
+
+The schedule poller used to scan `workflow_schedule_plans` on every tick to find due plans. The index keeps the id
+of every plan whose trigger is enabled in a sorted set scored by `next_run_at`, so the poller claims due plans with
+an O(log n) range pop and only loads those rows. The database stays the source of truth: the index is rebuilt from
+it when the rebuild marker expires or Redis lost it, and the poller re-checks every claimed plan against its row.
+"""
+
+import logging
+import zlib
+from collections.abc import Iterable
+from datetime import UTC, datetime
+
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session
+
+from configs import dify_config
+from extensions.ext_redis import redis_client
+from models.trigger import AppTrigger, AppTriggerStatus, AppTriggerType, WorkflowSchedulePlan
+
+logger = logging.getLogger(__name__)
+
+DUE_KEY = "workflow_schedule:due"
+REBUILD_KEY = "workflow_schedule:due:rebuild"
+READY_KEY = "workflow_schedule:due:ready"
+
+REBUILD_CHUNK_SIZE = 1000
+
+
+def _score(next_run_at: datetime) -> float:
+    if next_run_at.tzinfo is None:
+        next_run_at = next_run_at.replace(tzinfo=UTC)
+    return next_run_at.timestamp()
+
+
+class ScheduleDispatchIndex:
+    # LUA_POP_DUE: claim up to ARGV[2] plans due at or before ARGV[1], most overdue first
+    LUA_POP_DUE = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+for _, id in ipairs(ids) do redis.call('ZREM', KEYS[1], id) end
+return ids
+"""
+
+    def __init__(self, enabled: bool, rebuild_interval: int, jitter: int):
+        self.enabled = enabled
+        self.rebuild_interval = rebuild_interval
+        self.jitter = jitter
+
+    @classmethod
+    def from_config(cls) -> "ScheduleDispatchIndex":
+        return cls(
+            enabled=dify_config.WORKFLOW_SCHEDULE_INDEX_ENABLED,
+            rebuild_interval=dify_config.WORKFLOW_SCHEDULE_INDEX_REBUILD_INTERVAL,
+            jitter=dify_config.WORKFLOW_SCHEDULE_DISPATCH_JITTER,
+        )
+
+    def is_ready(self) -> bool:
+        return bool(redis_client.exists(READY_KEY))
+
+    def rebuild(self, session: Session) -> int:
+        """
+        Replace the index with the due times of all plans whose trigger is enabled, returns the number indexed.
+        """
+        rows = session.execute(
+            select(WorkflowSchedulePlan.id, WorkflowSchedulePlan.next_run_at)
+            .join(
+                AppTrigger,
+                and_(
+                    AppTrigger.app_id == WorkflowSchedulePlan.app_id,
+                    AppTrigger.node_id == WorkflowSchedulePlan.node_id,
+                    AppTrigger.trigger_type == AppTriggerType.TRIGGER_SCHEDULE,
+                ),
+            )
+            .where(
+                WorkflowSchedulePlan.next_run_at.isnot(None),
+                AppTrigger.status == AppTriggerStatus.ENABLED,
+            )
+            .execution_options(yield_per=REBUILD_CHUNK_SIZE)
+        )
+
+        redis_client.delete(REBUILD_KEY)
+        total = 0
+        for chunk in rows.partitions():
+            redis_client.zadd(REBUILD_KEY, {schedule_id: _score(next_run_at) for schedule_id, next_run_at in chunk})
+            total += len(chunk)
+
+        pipe = redis_client.pipeline()
+        if total:
+            pipe.rename(REBUILD_KEY, DUE_KEY)
+        else:
+            pipe.delete(DUE_KEY)
+        pipe.set(READY_KEY, 1, ex=self.rebuild_interval * 60)
+        pipe.execute()
+        logger.info("Rebuilt workflow schedule index with %d plans", total)
+        return total
+
+    def pop_due(self, now: datetime, limit: int) -> list[str]:
+        """
+        Remove and return up to `limit` plans due at or before `now`. A claimed plan is indexed again with its
+        next due time once it has been dispatched.
+        """
+        ids = redis_client.eval(self.LUA_POP_DUE, 1, DUE_KEY, _score(now), limit)
+        return [schedule_id.decode() if isinstance(schedule_id, bytes) else schedule_id for schedule_id in ids]
+
+    def add(self, schedules: Iterable[tuple[str, datetime | None]]) -> None:
+        """
+        Index plans by their next run time, best effort: a plan missed here is indexed by the next rebuild.
+        """
+        if not self.enabled:
+            return
+        due_times = [(schedule_id, next_run_at) for schedule_id, next_run_at in schedules if next_run_at]
+        if not due_times:
+            return
+        try:
+            redis_client.zadd(DUE_KEY, {schedule_id: _score(next_run_at) for schedule_id, next_run_at in due_times})
+        except Exception:
+            logger.warning("Failed to index %d workflow schedules", len(due_times), exc_info=True)
+
+    def remove(self, schedule_id: str) -> None:
+        if not self.enabled:
+            return
+        try:
+            redis_client.zrem(DUE_KEY, schedule_id)
+        except Exception:
+            logger.warning("Failed to remove workflow schedule %s from index", schedule_id, exc_info=True)
+
+    def dispatch_delay(self, schedule_id: str) -> int:
+        """
+        Seconds to delay the dispatch of a due plan, spreading plans due at the same instant over the jitter
+        window. The delay is derived from the plan id, so every run of a plan gets the same offset.
+        """
+        if self.jitter <= 0:
+            return 0
+        return zlib.crc32(schedule_id.encode()) % self.jitter
+
+
+schedule_dispatch_index = ScheduleDispatchIndex.from_config()
@@ -15,6 +15,7 @@ from models.account import Account, TenantAccountJoin
 from models.trigger import WorkflowSchedulePlan
 from models.workflow import Workflow
 from services.errors.account import AccountNotFoundError
+from services.trigger.schedule_dispatch_index import schedule_dispatch_index
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +56,7 @@ class ScheduleService:
 
         session.add(schedule)
         session.flush()
+        schedule_dispatch_index.add([(schedule.id, schedule.next_run_at)])
 
         return schedule
 
@@ -103,6 +105,7 @@ class ScheduleService:
             )
 
         session.flush()
+        schedule_dispatch_index.add([(schedule.id, schedule.next_run_at)])
         return schedule
 
     @staticmethod
@@ -123,6 +126,7 @@ class ScheduleService:
 
         session.delete(schedule)
         session.flush()
+        schedule_dispatch_index.remove(schedule_id)
 
     @staticmethod
     def get_tenant_owner(session: Session, tenant_id: str) -> Account:
@@ -173,6 +177,7 @@ class ScheduleService:
 
         schedule.next_run_at = next_run_at
         session.flush()
+        schedule_dispatch_index.add([(schedule.id, next_run_at)])
         return next_run_at
 
     @staticmethod
@@ -0,0 +1,113 @@
+"""
+Process-local cache of resolved webhook routes (webhook trigger, workflow and node config).
+
+Every webhook call used to resolve its route with three queries. Routes change only when a workflow draft is
+synced or published, a trigger is enabled or disabled, or a tenant is rate limited, so each process caches them
+and validates a cached route against per-app and per-tenant version counters in Redis with a single `MGET`.
+Bumping a counter invalidates the routes of that app or tenant in every process.
+"""
+
+import logging
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from cachetools import TTLCache
+
+from configs import dify_config
+from extensions.ext_redis import redis_client
+from models.trigger import WorkflowWebhookTrigger
+from models.workflow import Workflow
+
+logger = logging.getLogger(__name__)
+
+APP_VERSION_KEY = "webhook_routing:app:{app_id}:version"
+TENANT_VERSION_KEY = "webhook_routing:tenant:{tenant_id}:version"
+
+RouteVersions = tuple[bytes | str | None, bytes | str | None]
+
+
+@dataclass(frozen=True)
+class WebhookRoute:
+    webhook_trigger: WorkflowWebhookTrigger
+    workflow: Workflow
+    node_config: Mapping[str, Any]
+    versions: RouteVersions
+
+
+class WebhookRoutingCache:
+    def __init__(self, enabled: bool, max_size: int, ttl: int):
+        self.enabled = enabled
+        self._routes: TTLCache[tuple[str, bool], WebhookRoute] = TTLCache(maxsize=max_size, ttl=ttl)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls) -> "WebhookRoutingCache":
+        return cls(
+            enabled=dify_config.WEBHOOK_ROUTING_CACHE_ENABLED,
+            max_size=dify_config.WEBHOOK_ROUTING_CACHE_MAX_SIZE,
+            ttl=dify_config.WEBHOOK_ROUTING_CACHE_TTL,
+        )
+
+    def get(self, webhook_id: str, is_debug: bool) -> WebhookRoute | None:
+        if not self.enabled:
+            return None
+        with self._lock:
+            route = self._routes.get((webhook_id, is_debug))
+        if route is None:
+            return None
+
+        versions = self.versions(route.webhook_trigger.app_id, route.webhook_trigger.tenant_id)
+        if versions is None or versions != route.versions:
+            with self._lock:
+                self._routes.pop((webhook_id, is_debug), None)
+            return None
+        return route
+
+    def versions(self, app_id: str, tenant_id: str) -> RouteVersions | None:
+        """
+        Current versions of an app's routes, read before resolving a route so that a concurrent invalidation
+        is not lost. None if Redis is unavailable, in which case routes are neither served nor cached.
+        """
+        if not self.enabled:
+            return None
+        try:
+            app_version, tenant_version = redis_client.mget(
+                [APP_VERSION_KEY.format(app_id=app_id), TENANT_VERSION_KEY.format(tenant_id=tenant_id)]
+            )
+        except Exception:
+            logger.warning("Failed to read webhook routing versions from Redis", exc_info=True)
+            return None
+        return app_version, tenant_version
+
+    def set(
+        self,
+        webhook_id: str,
+        is_debug: bool,
+        webhook_trigger: WorkflowWebhookTrigger,
+        workflow: Workflow,
+        node_config: Mapping[str, Any],
+        versions: RouteVersions | None,
+    ):
+        if not self.enabled or versions is None:
+            return
+        with self._lock:
+            self._routes[(webhook_id, is_debug)] = WebhookRoute(webhook_trigger, workflow, node_config, versions)
+
+    @staticmethod
+    def invalidate_app(app_id: str):
+        try:
+            redis_client.incr(APP_VERSION_KEY.format(app_id=app_id))
+        except Exception:
+            logger.warning("Failed to invalidate webhook routes of app %s", app_id, exc_info=True)
+
+    @staticmethod
+    def invalidate_tenant(tenant_id: str):
+        try:
+            redis_client.incr(TENANT_VERSION_KEY.format(tenant_id=tenant_id))
+        except Exception:
+            logger.warning("Failed to invalidate webhook routes of tenant %s", tenant_id, exc_info=True)
+
+
+webhook_routing_cache = WebhookRoutingCache.from_config()
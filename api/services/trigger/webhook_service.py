@@ -31,6 +31,7 @@ from services.async_workflow_service import AsyncWorkflowService
 from services.end_user_service import EndUserService
 from services.errors.app import QuotaExceededError
 from services.trigger.app_trigger_service import AppTriggerService
+from services.trigger.webhook_routing_cache import webhook_routing_cache
 from services.workflow.entities import WebhookTriggerData
 
 try:
@@ -73,6 +74,10 @@ class WebhookService:
         Raises:
             ValueError: If webhook not found, app trigger not found, trigger disabled, or workflow not found
         """
+        route = webhook_routing_cache.get(webhook_id, is_debug)
+        if route is not None:
+            return route.webhook_trigger, route.workflow, route.node_config
+
         with Session(db.engine) as session:
             # Get webhook trigger
             webhook_trigger = (
@@ -81,6 +86,9 @@ class WebhookService:
             if not webhook_trigger:
                 raise ValueError(f"Webhook not found: {webhook_id}")
 
+            # Read the route versions before the status and workflow so a concurrent invalidation is not lost
+            versions = webhook_routing_cache.versions(webhook_trigger.app_id, webhook_trigger.tenant_id)
+
             if is_debug:
                 workflow = (
                     session.query(Workflow)
@@ -131,6 +139,7 @@ class WebhookService:
 
             node_config = workflow.get_node_config_by_id(webhook_trigger.node_id)
 
+            webhook_routing_cache.set(webhook_id, is_debug, webhook_trigger, workflow, node_config, versions)
             return webhook_trigger, workflow, node_config
 
     @classmethod
@@ -911,6 +920,9 @@ class WebhookService:
                         session.delete(nodes_id_in_db[node_id])
                         redis_client.delete(f"{cls.__WEBHOOK_NODE_CACHE_KEY__}:{app.id}:{node_id}")
                 session.commit()
+
+            # The draft graph changed, so cached debug routes are stale
+            webhook_routing_cache.invalidate_app(app.id)
         except Exception:
             logger.exception("Failed to sync webhook relationships for app %s", app.id)
             raise
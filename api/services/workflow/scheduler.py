@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 from enum import StrEnum
+from typing import Self
 
 from services.workflow.entities import WorkflowScheduleCFSPlanEntity
 
@@ -32,3 +34,16 @@ class CFSPlanScheduler(ABC):
         """
         Whether a workflow run can be scheduled.
         """
+
+    @classmethod
+    def can_schedule_batch(cls, schedulers: Sequence[Self]) -> list[SchedulerCommand]:
+        """
+        Whether each of the given workflow runs can be scheduled, override to answer them in one round trip.
+        """
+        return [scheduler.can_schedule() for scheduler in schedulers]
+
+    @abstractmethod
+    def release(self) -> None:
+        """
+        Called when the workflow run stops running.
+        """
@@ -1,6 +1,8 @@
 import dataclasses
+import hashlib
 import json
 import logging
+import threading
 from collections.abc import Mapping, Sequence
 from concurrent.futures import ThreadPoolExecutor
 from enum import StrEnum
@@ -28,6 +30,7 @@ from core.workflow.enums import SystemVariableKey
 from core.workflow.nodes import NodeType
 from core.workflow.nodes.variable_assigner.common.helpers import get_updated_variables
 from core.workflow.variable_loader import VariableLoader
+from extensions.ext_database import db
 from extensions.ext_storage import storage
 from factories.file_factory import StorageKeyLoader
 from factories.variable_factory import build_segment, segment_to_variable
@@ -703,6 +706,61 @@ def _model_to_insertion_dict(model: WorkflowDraftVariable) -> dict[str, Any]:
     return d
 
 
+def _draft_variable_content_hash(draft_var: WorkflowDraftVariable) -> str:
+    content = (
+        draft_var.value_type,
+        draft_var.value,
+        draft_var.visible,
+        draft_var.editable,
+        draft_var.node_execution_id,
+        draft_var.file_id,
+        draft_var.description,
+    )
+    return hashlib.blake2b(repr(content).encode(), digest_size=16).hexdigest()
+
+
+class DraftVariableBatch:
+    """
+    Buffers the draft variables saved during one debug run and upserts them with
+    `_batch_upsert_draft_variable` when the run finishes or the buffer reaches `flush_threshold`
+    variables, instead of one transaction per node.
+
+    A variable saved several times keeps only its latest value, and a value identical to the one
+    already written by this batch is not written again.
+    """
+
+    def __init__(self, engine: Engine | None = None, flush_threshold: int | None = None):
+        self._engine = engine
+        self._flush_threshold = flush_threshold or dify_config.WORKFLOW_DRAFT_VARIABLE_FLUSH_THRESHOLD
+        self._pending: dict[tuple[str, str, str], WorkflowDraftVariable] = {}
+        self._written_hashes: dict[tuple[str, str, str], str] = {}
+        self._lock = threading.Lock()
+
+    def add(self, draft_vars: Sequence[WorkflowDraftVariable]):
+        with self._lock:
+            for draft_var in draft_vars:
+                key = (draft_var.app_id, draft_var.node_id, draft_var.name)
+                if self._written_hashes.get(key) == _draft_variable_content_hash(draft_var):
+                    self._pending.pop(key, None)
+                    continue
+                self._pending[key] = draft_var
+            should_flush = len(self._pending) >= self._flush_threshold
+        if should_flush:
+            self.flush()
+
+    def flush(self):
+        # The lock is held while writing so that batches are written in the order they were saved.
+        with self._lock:
+            if not self._pending:
+                return
+            pending = self._pending
+            self._pending = {}
+            with Session(bind=self._engine or db.engine) as session, session.begin():
+                _batch_upsert_draft_variable(session, list(pending.values()))
+            for key, draft_var in pending.items():
+                self._written_hashes[key] = _draft_variable_content_hash(draft_var)
+
+
 def _build_segment_for_serialized_values(v: Any) -> Segment:
     """
     Reconstructs Segment objects from serialized values, with special handling
@@ -791,6 +849,7 @@ class DraftVariableSaver:
         node_execution_id: str,
         user: Account,
         enclosing_node_id: str | None = None,
+        batch: DraftVariableBatch | None = None,
     ):
         # Important: `node_execution_id` parameter refers to the primary key (`id`) of the
         # WorkflowNodeExecutionModel/WorkflowNodeExecution, not their `node_execution_id`
@@ -802,6 +861,8 @@ class DraftVariableSaver:
         self._node_execution_id = node_execution_id
         self._user = user
         self._enclosing_node_id = enclosing_node_id
+        # When set, variables are buffered in the run's batch instead of being upserted in `session`.
+        self._batch = batch
 
     def _create_dummy_output_variable(self):
         return WorkflowDraftVariable.new_node_variable(
@@ -900,7 +961,7 @@ class DraftVariableSaver:
         return SYSTEM_VARIABLE_NODE_ID, name_
 
     def _build_variables_from_mapping(self, output: Mapping[str, Any]) -> list[WorkflowDraftVariable]:
-        draft_vars = []
+        values: list[tuple[str, Segment]] = []
         for name, value in output.items():
             if not self._should_variable_be_saved(name):
                 logger.debug(
@@ -913,23 +974,25 @@ class DraftVariableSaver:
                 value_seg = value
             else:
                 value_seg = _build_segment_for_serialized_values(value)
-            draft_vars.append(
-                self._create_draft_variable(
-                    name=name,
-                    value=value_seg,
-                    visible=True,
-                    editable=True,
-                ),
-                # WorkflowDraftVariable.new_node_variable(
-                #     app_id=self._app_id,
-                #     node_id=self._node_id,
-                #     name=name,
-                #     node_execution_id=self._node_execution_id,
-                #     value=value_seg,
-                #     visible=self._should_variable_be_visible(self._node_id, self._node_type, name),
-                # )
-            )
-        return draft_vars
+            values.append((name, value_seg))
+
+        offload_results = self._try_offload_large_variables(values)
+        return [
+            self._new_node_variable(name=name, value=value_seg, offload_result=offload_result)
+            for (name, value_seg), offload_result in zip(values, offload_results)
+        ]
+
+    def _try_offload_large_variables(
+        self, values: Sequence[tuple[str, Segment]]
+    ) -> list[tuple[Segment, WorkflowDraftVariableFile] | None]:
+        names = [name for name, _ in values]
+        value_segs = [value_seg for _, value_seg in values]
+        max_workers = min(dify_config.WORKFLOW_DRAFT_VARIABLE_OFFLOAD_CONCURRENCY, len(values))
+        if max_workers <= 1:
+            return list(map(self._try_offload_large_variable, names, value_segs))
+        # Upload large variables to storage concurrently.
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self._try_offload_large_variable, names, value_segs))
 
     def _generate_filename(self, name: str):
         node_id_escaped = self._node_id.translate(_FILENAME_TRANS_TABLE)
@@ -1010,10 +1073,23 @@ class DraftVariableSaver:
         editable: bool = True,
     ) -> WorkflowDraftVariable:
         """Create a draft variable with large variable handling and truncation."""
-        # Handle Segment values
-
-        offload_result = self._try_offload_large_variable(name, value)
+        return self._new_node_variable(
+            name=name,
+            value=value,
+            visible=visible,
+            editable=editable,
+            offload_result=self._try_offload_large_variable(name, value),
+        )
 
+    def _new_node_variable(
+        self,
+        *,
+        name: str,
+        value: Segment,
+        offload_result: tuple[Segment, WorkflowDraftVariableFile] | None,
+        visible: bool = True,
+        editable: bool = True,
+    ) -> WorkflowDraftVariable:
         if offload_result is None:
             # Create the draft variable
             draft_var = WorkflowDraftVariable.new_node_variable(
@@ -1059,7 +1135,10 @@ class DraftVariableSaver:
             draft_vars = self._build_variables_from_start_mapping(outputs)
         else:
             draft_vars = self._build_variables_from_mapping(outputs)
-        _batch_upsert_draft_variable(self._session, draft_vars)
+        if self._batch is not None:
+            self._batch.add(draft_vars)
+        else:
+            _batch_upsert_draft_variable(self._session, draft_vars)
 
     @staticmethod
     def _should_variable_be_editable(node_id: str, name: str) -> bool:
@@ -1082,3 +1161,37 @@ class DraftVariableSaver:
         if exclude_var_names is None:
             return True
         return name not in exclude_var_names
+
+
+class BufferedDraftVariableSaverFactory:
+    """
+    Creates the draft variable savers of one debug run. The savers share a `DraftVariableBatch`,
+    which is written when the run ends (`flush`) or when it reaches its threshold.
+    """
+
+    def __init__(self, account: Account, batch: DraftVariableBatch | None = None):
+        self._account = account
+        self._batch = batch or DraftVariableBatch()
+
+    def __call__(
+        self,
+        session: Session,
+        app_id: str,
+        node_id: str,
+        node_type: NodeType,
+        node_execution_id: str,
+        enclosing_node_id: str | None = None,
+    ) -> DraftVariableSaver:
+        return DraftVariableSaver(
+            session=session,
+            app_id=app_id,
+            node_id=node_id,
+            node_type=node_type,
+            node_execution_id=node_execution_id,
+            enclosing_node_id=enclosing_node_id,
+            user=self._account,
+            batch=self._batch,
+        )
+
+    def flush(self):
+        self._batch.flush()
@@ -13,6 +13,7 @@ from sqlalchemy.orm import Session, sessionmaker
 
 from core.app.apps.advanced_chat.app_generator import AdvancedChatAppGenerator
 from core.app.apps.message_based_app_generator import MessageBasedAppGenerator
+from core.app.apps.stream_event_encoder import EncodedStreamEvent
 from core.app.apps.workflow.app_generator import WorkflowAppGenerator
 from core.app.entities.app_invoke_entities import (
     AdvancedChatAppGenerateEntity,
@@ -239,10 +240,15 @@ def _resolve_user_for_run(session: Session, workflow_run: WorkflowRun) -> Accoun
 
 
 def _publish_streaming_response(
-    response_stream: Generator[str | Mapping[str, Any], None, None], workflow_run_id: str, app_mode: AppMode
+    response_stream: Generator[str | Mapping[str, Any] | EncodedStreamEvent, None, None],
+    workflow_run_id: str,
+    app_mode: AppMode,
 ) -> None:
     topic = MessageBasedAppGenerator.get_response_topic(app_mode, workflow_run_id)
     for event in response_stream:
+        if isinstance(event, EncodedStreamEvent):
+            topic.publish(event.data.encode())
+            continue
         try:
             payload = json.dumps(event)
         except TypeError:
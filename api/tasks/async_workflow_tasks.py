@@ -9,7 +9,7 @@ import logging
 from datetime import UTC, datetime
 from typing import Any
 
-from celery import shared_task
+from celery import Task, shared_task
 from sqlalchemy import select
 from sqlalchemy.orm import Session, sessionmaker
 
@@ -36,8 +36,13 @@ from services.workflow.entities import (
     WorkflowResumeTaskData,
     WorkflowTaskData,
 )
-from tasks.workflow_cfs_scheduler.cfs_scheduler import AsyncWorkflowCFSPlanEntity, AsyncWorkflowCFSPlanScheduler
-from tasks.workflow_cfs_scheduler.entities import AsyncWorkflowQueue, AsyncWorkflowSystemStrategy
+from services.workflow.scheduler import SchedulerCommand
+from tasks.workflow_cfs_scheduler.cfs_scheduler import (
+    AsyncWorkflowCFSPlanEntity,
+    AsyncWorkflowCFSPlanScheduler,
+    build_async_workflow_cfs_plan,
+)
+from tasks.workflow_cfs_scheduler.entities import AsyncWorkflowQueue
 
 logger = logging.getLogger(__name__)
 
@@ -46,15 +51,10 @@ logger = logging.getLogger(__name__)
 def execute_workflow_professional(task_data_dict: dict[str, Any]):
     """Execute workflow for professional tier with highest priority"""
     task_data = WorkflowTaskData.model_validate(task_data_dict)
-    cfs_plan_scheduler_entity = AsyncWorkflowCFSPlanEntity(
-        queue=AsyncWorkflowQueue.PROFESSIONAL_QUEUE,
-        schedule_strategy=AsyncWorkflowSystemStrategy,
-        granularity=dify_config.ASYNC_WORKFLOW_SCHEDULER_GRANULARITY,
-    )
     _execute_workflow_common(
         task_data,
-        AsyncWorkflowCFSPlanScheduler(plan=cfs_plan_scheduler_entity),
-        cfs_plan_scheduler_entity,
+        build_async_workflow_cfs_plan(AsyncWorkflowQueue.PROFESSIONAL_QUEUE),
+        execute_workflow_professional,
     )
 
 
@@ -62,15 +62,10 @@ def execute_workflow_professional(task_data_dict: dict[str, Any]):
 def execute_workflow_team(task_data_dict: dict[str, Any]):
     """Execute workflow for team tier"""
     task_data = WorkflowTaskData.model_validate(task_data_dict)
-    cfs_plan_scheduler_entity = AsyncWorkflowCFSPlanEntity(
-        queue=AsyncWorkflowQueue.TEAM_QUEUE,
-        schedule_strategy=AsyncWorkflowSystemStrategy,
-        granularity=dify_config.ASYNC_WORKFLOW_SCHEDULER_GRANULARITY,
-    )
     _execute_workflow_common(
         task_data,
-        AsyncWorkflowCFSPlanScheduler(plan=cfs_plan_scheduler_entity),
-        cfs_plan_scheduler_entity,
+        build_async_workflow_cfs_plan(AsyncWorkflowQueue.TEAM_QUEUE),
+        execute_workflow_team,
     )
 
 
@@ -78,15 +73,10 @@ def execute_workflow_team(task_data_dict: dict[str, Any]):
 def execute_workflow_sandbox(task_data_dict: dict[str, Any]):
     """Execute workflow for free tier with lower retry limit"""
     task_data = WorkflowTaskData.model_validate(task_data_dict)
-    cfs_plan_scheduler_entity = AsyncWorkflowCFSPlanEntity(
-        queue=AsyncWorkflowQueue.SANDBOX_QUEUE,
-        schedule_strategy=AsyncWorkflowSystemStrategy,
-        granularity=dify_config.ASYNC_WORKFLOW_SCHEDULER_GRANULARITY,
-    )
     _execute_workflow_common(
         task_data,
-        AsyncWorkflowCFSPlanScheduler(plan=cfs_plan_scheduler_entity),
-        cfs_plan_scheduler_entity,
+        build_async_workflow_cfs_plan(AsyncWorkflowQueue.SANDBOX_QUEUE),
+        execute_workflow_sandbox,
     )
 
 
@@ -103,8 +93,8 @@ def _build_generator_args(trigger_data: TriggerData) -> dict[str, Any]:
 
 def _execute_workflow_common(
     task_data: WorkflowTaskData,
-    cfs_plan_scheduler: AsyncWorkflowCFSPlanScheduler,
     cfs_plan_scheduler_entity: AsyncWorkflowCFSPlanEntity,
+    task: Task,
 ):
     """Execute workflow with common logic and trigger log updates."""
 
@@ -118,6 +108,16 @@ def _execute_workflow_common(
             # This should not happen, but handle gracefully
             return
 
+        # Let tenants behind on their fair share of the queue go first
+        cfs_plan_scheduler_entity.tenant_id = trigger_log.tenant_id
+        cfs_plan_scheduler = AsyncWorkflowCFSPlanScheduler(plan=cfs_plan_scheduler_entity)
+        if cfs_plan_scheduler.admit() == SchedulerCommand.RESOURCE_LIMIT_REACHED:
+            task.apply_async(
+                args=(task_data.model_dump(mode="json"),),
+                countdown=dify_config.ASYNC_WORKFLOW_SCHEDULER_ADMISSION_DELAY,
+            )
+            return
+
         # Reconstruct execution data from trigger log
         trigger_data = TriggerData.model_validate_json(trigger_log.trigger_data)
 
@@ -127,6 +127,7 @@ def _execute_workflow_common(
         session.commit()
 
         start_time = datetime.now(UTC)
+        time_slice_layer: TimeSliceLayer | None = None
 
         try:
             # Get app and workflow models
@@ -156,6 +157,8 @@ def _execute_workflow_common(
                 state_owner_user_id=workflow.created_by,
             )
 
+            time_slice_layer = TimeSliceLayer(cfs_plan_scheduler)
+
             # Execute the workflow with the trigger type
             generator.generate(
                 app_model=app_model,
@@ -168,13 +171,22 @@ def _execute_workflow_common(
                 triggered_from=trigger_data.trigger_from,
                 root_node_id=trigger_data.root_node_id,
                 graph_engine_layers=[
-                    # TODO: Re-enable TimeSliceLayer after the HITL release.
+                    time_slice_layer,
                     TriggerPostLayer(cfs_plan_scheduler_entity, start_time, trigger_log.id),
                 ],
                 pause_state_config=pause_config,
             )
+            if time_slice_layer.preempted:
+                _requeue_preempted_run(
+                    time_slice_layer.graph_runtime_state.system_variable.workflow_execution_id,
+                    cfs_plan_scheduler_entity.queue,
+                )
 
         except Exception as e:
+            # the layer frees the run's share once the graph ran, otherwise it is freed here
+            if time_slice_layer is None or not time_slice_layer.stopped:
+                cfs_plan_scheduler.release()
+
             # Calculate elapsed time for failed execution
             elapsed_time = (datetime.now(UTC) - start_time).total_seconds()
 
@@ -258,17 +270,25 @@ def resume_workflow_execution(task_data_dict: dict[str, Any]) -> None:
     graph_engine_layers = []
     trigger_log = _query_trigger_log_info(session_factory, task_data.workflow_run_id)
 
+    time_slice_layer: TimeSliceLayer | None = None
+
     if trigger_log:
-        cfs_plan_scheduler_entity = AsyncWorkflowCFSPlanEntity(
-            queue=AsyncWorkflowQueue(trigger_log.queue_name),
-            schedule_strategy=AsyncWorkflowSystemStrategy,
-            granularity=dify_config.ASYNC_WORKFLOW_SCHEDULER_GRANULARITY,
+        cfs_plan_scheduler_entity = build_async_workflow_cfs_plan(
+            AsyncWorkflowQueue(trigger_log.queue_name), trigger_log.tenant_id
         )
         cfs_plan_scheduler = AsyncWorkflowCFSPlanScheduler(plan=cfs_plan_scheduler_entity)
+        if cfs_plan_scheduler.admit() == SchedulerCommand.RESOURCE_LIMIT_REACHED:
+            resume_workflow_execution.apply_async(
+                args=(task_data_dict,),
+                queue=cfs_plan_scheduler_entity.queue,
+                countdown=dify_config.ASYNC_WORKFLOW_SCHEDULER_ADMISSION_DELAY,
+            )
+            return
+        time_slice_layer = TimeSliceLayer(cfs_plan_scheduler)
 
         graph_engine_layers.extend(
             [
-                TimeSliceLayer(cfs_plan_scheduler),
+                time_slice_layer,
                 TriggerPostLayer(cfs_plan_scheduler_entity, start_time, trigger_log.id),
             ]
         )
@@ -286,9 +306,25 @@ def resume_workflow_execution(task_data_dict: dict[str, Any]) -> None:
         graph_engine_layers=graph_engine_layers,
         pause_state_config=pause_config,
     )
+    if trigger_log and time_slice_layer and time_slice_layer.preempted:
+        # the new pause replaced the resumed one
+        _requeue_preempted_run(task_data.workflow_run_id, AsyncWorkflowQueue(trigger_log.queue_name))
+        return
     workflow_run_repo.delete_workflow_pause(pause_entity)
 
 
+def _requeue_preempted_run(workflow_run_id: str | None, queue: AsyncWorkflowQueue):
+    """Queue the resumption of a run paused by the fair share scheduler."""
+    if not workflow_run_id:
+        logger.error("Preempted workflow run has no id, it cannot be resumed")
+        return
+    resume_workflow_execution.apply_async(
+        args=(WorkflowResumeTaskData(workflow_run_id=workflow_run_id).model_dump(),),
+        queue=queue,
+        countdown=dify_config.ASYNC_WORKFLOW_SCHEDULER_ADMISSION_DELAY,
+    )
+
+
 def _get_user(session: Session, workflow_run: WorkflowRun | WorkflowTriggerLog) -> Account | EndUser:
     """Compose user from trigger log"""
     tenant = session.scalar(select(Tenant).where(Tenant.id == workflow_run.tenant_id))
@@ -6,6 +6,7 @@ from celery import shared_task
 from sqlalchemy import delete, select
 
 from core.db.session_factory import session_factory
+from core.rag.datasource.segment_cache import segment_hydration_cache
 from core.rag.index_processor.index_processor_factory import IndexProcessorFactory
 from core.tools.utils.web_reader_tool import get_image_upload_file_ids
 from extensions.ext_storage import storage
@@ -33,6 +34,7 @@ def batch_clean_document_task(document_ids: list[str], dataset_id: str, doc_form
     start_at = time.perf_counter()
     if not doc_form:
         raise ValueError("doc_form is required")
+    segment_hydration_cache.invalidate([dataset_id])
 
     storage_keys_to_delete: list[str] = []
     index_node_ids: list[str] = []
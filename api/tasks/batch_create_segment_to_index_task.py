@@ -3,14 +3,16 @@ import tempfile
 import time
 import uuid
 from pathlib import Path
+from typing import Any
 
 import click
 import pandas as pd
 from celery import shared_task
-from sqlalchemy import func
+from sqlalchemy import func, select, update
 
+from configs import dify_config
 from core.db.session_factory import session_factory
-from core.model_manager import ModelManager
+from core.model_manager import ModelInstance, ModelManager
 from core.model_runtime.entities.model_entities import ModelType
 from extensions.ext_redis import redis_client
 from extensions.ext_storage import storage
@@ -22,8 +24,11 @@ from services.vector_service import VectorService
 
 logger = logging.getLogger(__name__)
 
+# Progress checkpoints outlive the job status key so that a redelivered task can resume
+PROGRESS_CHECKPOINT_TTL = 24 * 60 * 60
 
-@shared_task(queue="dataset")
+
+@shared_task(queue="dataset", acks_late=True)
 def batch_create_segment_to_index_task(
     job_id: str,
     upload_file_id: str,
@@ -41,12 +46,17 @@ def batch_create_segment_to_index_task(
     :param tenant_id:
     :param user_id:
 
+    The CSV file is streamed in chunks of SEGMENT_BATCH_IMPORT_CHUNK_SIZE rows. Each chunk is inserted
+    and indexed before the next one is read, and the number of imported rows is checkpointed in Redis,
+    so a task redelivered after a worker restart resumes after the last imported chunk.
+
     Usage: batch_create_segment_to_index_task.delay(job_id, upload_file_id, dataset_id, document_id, tenant_id, user_id)
     """
     logger.info(click.style(f"Start batch create segment jobId: {job_id}", fg="green"))
     start_at = time.perf_counter()
 
     indexing_cache_key = f"segment_batch_import_{job_id}"
+    progress_cache_key = f"segment_batch_import_{job_id}_progress"
 
     # Initialize variables with default values
     upload_file_key: str | None = None
@@ -101,23 +111,6 @@ def batch_create_segment_to_index_task(
         redis_client.setex(indexing_cache_key, 600, "error")
         return
 
-    with tempfile.TemporaryDirectory() as temp_dir:
-        suffix = Path(upload_file_key).suffix
-        file_path = f"{temp_dir}/{next(tempfile._get_candidate_names())}{suffix}"  # type: ignore
-        storage.download(upload_file_key, file_path)
-
-        df = pd.read_csv(file_path)
-        content = []
-        for _, row in df.iterrows():
-            if document_config["doc_form"] == "qa_model":
-                data = {"content": row.iloc[0], "answer": row.iloc[1]}
-            else:
-                data = {"content": row.iloc[0]}
-            content.append(data)
-        if len(content) == 0:
-            raise ValueError("The CSV file is empty.")
-
-    document_segments = []
     embedding_model = None
     if dataset_config["indexing_technique"] == "high_quality":
         model_manager = ModelManager()
@@ -128,61 +121,151 @@ def batch_create_segment_to_index_task(
             model=dataset_config["embedding_model"],
         )
 
-    word_count_change = 0
-    if embedding_model:
-        tokens_list = embedding_model.get_text_embedding_num_tokens(texts=[segment["content"] for segment in content])
-    else:
-        tokens_list = [0] * len(content)
+    checkpoint = redis_client.get(progress_cache_key)
+    imported_rows = int(checkpoint) if checkpoint else 0
+    if imported_rows:
+        logger.info(click.style(f"Resume batch create segment jobId: {job_id} after row {imported_rows}", fg="green"))
+
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            suffix = Path(upload_file_key).suffix
+            file_path = f"{temp_dir}/{next(tempfile._get_candidate_names())}{suffix}"  # type: ignore
+            storage.download(upload_file_key, file_path)
+
+            total_rows = 0
+            for df in pd.read_csv(file_path, chunksize=dify_config.SEGMENT_BATCH_IMPORT_CHUNK_SIZE):
+                chunk_start = total_rows
+                total_rows += len(df)
+                if total_rows <= imported_rows:
+                    continue
+
+                skip = max(imported_rows - chunk_start, 0)
+                contents = df.iloc[skip:, 0].tolist()
+                answers = df.iloc[skip:, 1].tolist() if document_config["doc_form"] == "qa_model" else None
+                _import_segment_chunk(
+                    job_id=job_id,
+                    first_row=chunk_start + skip,
+                    contents=contents,
+                    answers=answers,
+                    embedding_model=embedding_model,
+                    dataset_id=dataset_id,
+                    document_id=document_id,
+                    doc_form=document_config["doc_form"],
+                    tenant_id=tenant_id,
+                    user_id=user_id,
+                )
+                imported_rows = total_rows
+                redis_client.setex(progress_cache_key, PROGRESS_CHECKPOINT_TTL, imported_rows)
+
+            if total_rows == 0:
+                raise ValueError("The CSV file is empty.")
+    except Exception:
+        # The progress checkpoint is kept, so rows imported before the failure are not inserted again on retry
+        logger.exception("Segments batch created index failed")
+        redis_client.setex(indexing_cache_key, 600, "error")
+        raise
+
+    redis_client.setex(indexing_cache_key, 600, "completed")
+    redis_client.delete(progress_cache_key)
+    end_at = time.perf_counter()
+    logger.info(
+        click.style(
+            f"Segment batch created job: {job_id} rows: {total_rows} latency: {end_at - start_at}",
+            fg="green",
+        )
+    )
+
+
+def _import_segment_chunk(
+    *,
+    job_id: str,
+    first_row: int,
+    contents: list[Any],
+    answers: list[Any] | None,
+    embedding_model: ModelInstance | None,
+    dataset_id: str,
+    document_id: str,
+    doc_form: str,
+    tenant_id: str,
+    user_id: str,
+):
+    """
+    Insert and index one chunk of CSV rows.
+
+    Segment index node ids are derived from the job id and the CSV row number, so rows inserted by an
+    interrupted run are recognized on resume: they are not inserted again, and are only re-indexed if
+    the interrupted run did not get to mark them as completed.
+    """
+    index_node_ids = [str(uuid.uuid5(uuid.NAMESPACE_OID, f"{job_id}:{first_row + i}")) for i in range(len(contents))]
 
     with session_factory.create_session() as session, session.begin():
-        for segment, tokens in zip(content, tokens_list):
-            content = segment["content"]
-            doc_id = str(uuid.uuid4())
-            segment_hash = helper.generate_text_hash(content)
-            max_position = (
-                session.query(func.max(DocumentSegment.position))
-                .where(DocumentSegment.document_id == document_config["id"])
-                .scalar()
+        existing_segments = {
+            segment.index_node_id: segment
+            for segment in session.scalars(
+                select(DocumentSegment).where(
+                    DocumentSegment.document_id == document_id,
+                    DocumentSegment.index_node_id.in_(index_node_ids),
+                )
             )
+        }
+        pending = [i for i, index_node_id in enumerate(index_node_ids) if index_node_id not in existing_segments]
+
+        if embedding_model and pending:
+            tokens_list = embedding_model.get_text_embedding_num_tokens(texts=[contents[i] for i in pending])
+        else:
+            tokens_list = [0] * len(pending)
+
+        max_position = (
+            session.query(func.max(DocumentSegment.position)).where(DocumentSegment.document_id == document_id).scalar()
+        ) or 0
+
+        new_segments = []
+        word_count_change = 0
+        for offset, (i, tokens) in enumerate(zip(pending, tokens_list)):
+            content = contents[i]
             segment_document = DocumentSegment(
                 tenant_id=tenant_id,
                 dataset_id=dataset_id,
                 document_id=document_id,
-                index_node_id=doc_id,
-                index_node_hash=segment_hash,
-                position=max_position + 1 if max_position else 1,
+                index_node_id=index_node_ids[i],
+                index_node_hash=helper.generate_text_hash(content),
+                position=max_position + offset + 1,
                 content=content,
                 word_count=len(content),
                 tokens=tokens,
                 created_by=user_id,
                 indexing_at=naive_utc_now(),
-                status="completed",
-                completed_at=naive_utc_now(),
+                status="indexing",
             )
-            if document_config["doc_form"] == "qa_model":
-                segment_document.answer = segment["answer"]
-                segment_document.word_count += len(segment["answer"])
+            if answers is not None:
+                segment_document.answer = answers[i]
+                segment_document.word_count += len(answers[i])
             word_count_change += segment_document.word_count
-            session.add(segment_document)
-            document_segments.append(segment_document)
+            new_segments.append(segment_document)
+        session.add_all(new_segments)
 
-    with session_factory.create_session() as session, session.begin():
-        dataset_document = session.get(Document, document_id)
-        if dataset_document:
-            assert dataset_document.word_count is not None
-            dataset_document.word_count += word_count_change
-            session.add(dataset_document)
+        if word_count_change:
+            session.execute(
+                update(Document)
+                .where(Document.id == document_id)
+                .values(word_count=func.coalesce(Document.word_count, 0) + word_count_change)
+            )
+
+    segments_to_index = [
+        segment for segment in existing_segments.values() if segment.status != "completed"
+    ] + new_segments
+    if not segments_to_index:
+        return
 
     with session_factory.create_session() as session:
         dataset = session.get(Dataset, dataset_id)
         if dataset:
-            VectorService.create_segments_vector(None, document_segments, dataset, document_config["doc_form"])
+            VectorService.create_segments_vector(None, segments_to_index, dataset, doc_form)
 
-    redis_client.setex(indexing_cache_key, 600, "completed")
-    end_at = time.perf_counter()
-    logger.info(
-        click.style(
-            f"Segment batch created job: {job_id} latency: {end_at - start_at}",
-            fg="green",
+    with session_factory.create_session() as session, session.begin():
+        completed_at = naive_utc_now()
+        session.execute(
+            update(DocumentSegment)
+            .where(DocumentSegment.id.in_([segment.id for segment in segments_to_index]))
+            .values(status="completed", completed_at=completed_at)
         )
-    )
@@ -6,6 +6,7 @@ from celery import shared_task
 from sqlalchemy import delete, select
 
 from core.db.session_factory import session_factory
+from core.rag.datasource.segment_cache import segment_hydration_cache
 from core.rag.index_processor.index_processor_factory import IndexProcessorFactory
 from core.tools.utils.web_reader_tool import get_image_upload_file_ids
 from extensions.ext_storage import storage
@@ -29,6 +30,7 @@ def clean_document_task(document_id: str, dataset_id: str, doc_form: str, file_i
     logger.info(click.style(f"Start clean document when document deleted: {document_id}", fg="green"))
     start_at = time.perf_counter()
     total_attachment_files = []
+    segment_hydration_cache.invalidate([dataset_id])
 
     with session_factory.create_session() as session:
         try:
@@ -6,6 +6,7 @@ from celery import shared_task
 from sqlalchemy import delete
 
 from core.db.session_factory import session_factory
+from core.rag.datasource.segment_cache import segment_hydration_cache
 from core.rag.index_processor.index_processor_factory import IndexProcessorFactory
 from models.dataset import Dataset, Document, SegmentAttachmentBinding
 from models.model import UploadFile
@@ -27,6 +28,7 @@ def delete_segment_from_index_task(
     """
     logger.info(click.style("Start delete segment from index", fg="green"))
     start_at = time.perf_counter()
+    segment_hydration_cache.invalidate([dataset_id])
     with session_factory.create_session() as session:
         try:
             dataset = session.query(Dataset).where(Dataset.id == dataset_id).first()
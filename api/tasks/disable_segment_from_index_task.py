@@ -5,6 +5,7 @@ import click
 from celery import shared_task
 
 from core.db.session_factory import session_factory
+from core.rag.datasource.segment_cache import segment_hydration_cache
 from core.rag.index_processor.index_processor_factory import IndexProcessorFactory
 from extensions.ext_redis import redis_client
 from models.dataset import DocumentSegment
@@ -28,6 +29,7 @@ def disable_segment_from_index_task(segment_id: str):
         if not segment:
             logger.info(click.style(f"Segment not found: {segment_id}", fg="red"))
             return
+        segment_hydration_cache.invalidate([segment.dataset_id])
 
         if segment.status != "completed":
             logger.info(click.style(f"Segment is not completed, disable is not allowed: {segment_id}", fg="red"))
@@ -83,5 +85,6 @@ def disable_segment_from_index_task(segment_id: str):
             logger.exception("remove segment from index failed")
             segment.enabled = True
             session.commit()
+            segment_hydration_cache.invalidate([segment.dataset_id])
         finally:
             redis_client.delete(indexing_cache_key)
@@ -6,6 +6,7 @@ from celery import shared_task
 from sqlalchemy import select
 
 from core.db.session_factory import session_factory
+from core.rag.datasource.segment_cache import segment_hydration_cache
 from core.rag.index_processor.index_processor_factory import IndexProcessorFactory
 from extensions.ext_redis import redis_client
 from models.dataset import Dataset, DocumentSegment, SegmentAttachmentBinding
@@ -25,6 +26,7 @@ def disable_segments_from_index_task(segment_ids: list, dataset_id: str, documen
     Usage: disable_segments_from_index_task.delay(segment_ids, dataset_id, document_id)
     """
     start_at = time.perf_counter()
+    segment_hydration_cache.invalidate([dataset_id])
 
     with session_factory.create_session() as session:
         dataset = session.query(Dataset).where(Dataset.id == dataset_id).first()
@@ -99,6 +101,7 @@ def disable_segments_from_index_task(segment_ids: list, dataset_id: str, documen
                 }
             )
             session.commit()
+            segment_hydration_cache.invalidate([dataset_id])
         finally:
             for segment in segments:
                 indexing_cache_key = f"segment_{segment.id}_indexing"
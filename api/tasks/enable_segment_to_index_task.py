@@ -5,6 +5,7 @@ import click
 from celery import shared_task
 
 from core.db.session_factory import session_factory
+from core.rag.datasource.segment_cache import segment_hydration_cache
 from core.rag.index_processor.constant.doc_type import DocType
 from core.rag.index_processor.constant.index_type import IndexStructureType
 from core.rag.index_processor.index_processor_factory import IndexProcessorFactory
@@ -32,6 +33,7 @@ def enable_segment_to_index_task(segment_id: str):
         if not segment:
             logger.info(click.style(f"Segment not found: {segment_id}", fg="red"))
             return
+        segment_hydration_cache.invalidate([segment.dataset_id])
 
         if segment.status != "completed":
             logger.info(click.style(f"Segment is not completed, enable is not allowed: {segment_id}", fg="red"))
@@ -126,5 +128,6 @@ def enable_segment_to_index_task(segment_id: str):
             segment.status = "error"
             segment.error = str(e)
             session.commit()
+            segment_hydration_cache.invalidate([segment.dataset_id])
         finally:
             redis_client.delete(indexing_cache_key)
@@ -14,8 +14,8 @@ from services.summary_index_service import SummaryIndexService
 logger = logging.getLogger(__name__)
 
 
-@shared_task(queue="dataset")
-def generate_summary_index_task(dataset_id: str, document_id: str, segment_ids: list[str] | None = None):
+@shared_task(queue="dataset", bind=True, acks_late=True)
+def generate_summary_index_task(self, dataset_id: str, document_id: str, segment_ids: list[str] | None = None):
     """
     Async generate summary index for document segments.
 
@@ -24,6 +24,9 @@ def generate_summary_index_task(dataset_id: str, document_id: str, segment_ids:
         document_id: Document ID
         segment_ids: Optional list of specific segment IDs to process. If None, process all segments.
 
+    When a task processing a whole document is redelivered after a worker restart, segments whose
+    summary was already completed by the interrupted run are skipped.
+
     Usage:
         generate_summary_index_task.delay(dataset_id, document_id)
         generate_summary_index_task.delay(dataset_id, document_id, segment_ids)
@@ -35,6 +38,7 @@ def generate_summary_index_task(dataset_id: str, document_id: str, segment_ids:
         )
     )
     start_at = time.perf_counter()
+    redelivered = bool((self.request.delivery_info or {}).get("redelivered"))
 
     try:
         with session_factory.create_session() as session:
@@ -90,6 +94,7 @@ def generate_summary_index_task(dataset_id: str, document_id: str, segment_ids:
                 summary_index_setting=summary_index_setting,
                 segment_ids=segment_ids,
                 only_parent_chunks=only_parent_chunks,
+                skip_completed=redelivered and segment_ids is None,
             )
 
             end_at = time.perf_counter()
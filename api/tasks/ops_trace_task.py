@@ -1,11 +1,12 @@
 import json
 import logging
+from typing import Any
 
 from celery import shared_task
 from flask import current_app
 
-from core.ops.entities.config_entity import OPS_FILE_PATH, OPS_TRACE_FAILED_KEY
-from core.ops.entities.trace_entity import trace_info_info_map
+from core.ops.entities.config_entity import OPS_BATCH_FILE_EXTENSION, OPS_FILE_PATH, OPS_TRACE_FAILED_KEY
+from core.ops.entities.trace_entity import BaseTraceInfo, trace_info_info_map
 from core.rag.models.document import Document
 from extensions.ext_redis import redis_client
 from extensions.ext_storage import storage
@@ -15,40 +16,61 @@ from models.workflow import WorkflowRun
 logger = logging.getLogger(__name__)
 
 
+def _load_trace_info(file_data: dict[str, Any]) -> BaseTraceInfo | None:
+    trace_info = file_data.get("trace_info")
+    if not trace_info:
+        return None
+
+    if trace_info.get("message_data"):
+        trace_info["message_data"] = Message.from_dict(data=trace_info["message_data"])
+    if trace_info.get("workflow_data"):
+        trace_info["workflow_data"] = WorkflowRun.from_dict(data=trace_info["workflow_data"])
+    if trace_info.get("documents"):
+        trace_info["documents"] = [Document.model_validate(doc) for doc in trace_info["documents"]]
+
+    trace_type = trace_info_info_map.get(file_data.get("trace_info_type", ""))
+    if trace_type:
+        return trace_type(**trace_info)
+    return trace_info
+
+
 @shared_task(queue="ops_trace")
 def process_trace_tasks(file_info):
     """
     Async process trace tasks
     Usage: process_trace_tasks.delay(tasks_data)
+
+    The file is either a single trace task in JSON, or a batch of trace tasks in NDJSON when
+    file_info["batch"] is set.
     """
     from core.ops.ops_trace_manager import OpsTraceManager
 
     app_id = file_info.get("app_id")
     file_id = file_info.get("file_id")
-    file_path = f"{OPS_FILE_PATH}{app_id}/{file_id}.json"
-    file_data = json.loads(storage.load(file_path))
-    trace_info = file_data.get("trace_info")
-    trace_info_type = file_data.get("trace_info_type")
-    trace_instance = OpsTraceManager.get_ops_trace_instance(app_id)
-
-    if trace_info.get("message_data"):
-        trace_info["message_data"] = Message.from_dict(data=trace_info["message_data"])
-    if trace_info.get("workflow_data"):
-        trace_info["workflow_data"] = WorkflowRun.from_dict(data=trace_info["workflow_data"])
-    if trace_info.get("documents"):
-        trace_info["documents"] = [Document.model_validate(doc) for doc in trace_info["documents"]]
+    is_batch = file_info.get("batch", False)
+    file_extension = OPS_BATCH_FILE_EXTENSION if is_batch else "json"
+    file_path = f"{OPS_FILE_PATH}{app_id}/{file_id}.{file_extension}"
+    failed_key = f"{OPS_TRACE_FAILED_KEY}_{app_id}"
 
     try:
+        content = storage.load(file_path)
+        if is_batch:
+            files_data = [json.loads(line) for line in content.splitlines() if line.strip()]
+        else:
+            files_data = [json.loads(content)]
+
+        trace_instance = OpsTraceManager.get_cached_ops_trace_instance(app_id)
         if trace_instance:
+            trace_infos = [trace_info for trace_info in map(_load_trace_info, files_data) if trace_info]
             with current_app.app_context():
-                trace_type = trace_info_info_map.get(trace_info_type)
-                if trace_type:
-                    trace_info = trace_type(**trace_info)
-                trace_instance.trace(trace_info)
+                failed = trace_instance.batch_trace(trace_infos)
+            if failed:
+                redis_client.incrby(failed_key, failed)
+                logger.info("Processing trace tasks partially failed, app_id: %s, failed: %s", app_id, failed)
+                return
         logger.info("Processing trace tasks success, app_id: %s", app_id)
     except Exception as e:
         logger.info("error:\n\n\n%s\n\n\n\n", e)
-        failed_key = f"{OPS_TRACE_FAILED_KEY}_{app_id}"
         redis_client.incr(failed_key)
         logger.info("Processing trace tasks failed, app_id: %s", app_id)
     finally:
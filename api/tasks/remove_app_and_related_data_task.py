@@ -49,6 +49,7 @@ from models.workflow import (
 )
 from repositories.factory import DifyAPIRepositoryFactory
 from services.api_token_service import ApiTokenCache
+from services.trigger.webhook_routing_cache import webhook_routing_cache
 
 logger = logging.getLogger(__name__)
 
@@ -581,6 +582,7 @@ def _delete_workflow_webhook_triggers(tenant_id: str, app_id: str):
         del_webhook_trigger,
         "workflow webhook trigger",
     )
+    webhook_routing_cache.invalidate_app(app_id)
 
 
 def _delete_workflow_schedule_plans(tenant_id: str, app_id: str):
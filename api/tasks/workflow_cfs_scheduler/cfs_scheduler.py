@@ -1,6 +1,18 @@
+import logging
+import time
+from collections.abc import Sequence
+from typing import Any, Self
+
+from pydantic import Field
+from redis import RedisError
+
+from configs import dify_config
+from extensions.ext_redis import redis_client
 from services.workflow.entities import WorkflowScheduleCFSPlanEntity
 from services.workflow.scheduler import CFSPlanScheduler, SchedulerCommand
-from tasks.workflow_cfs_scheduler.entities import AsyncWorkflowQueue
+from tasks.workflow_cfs_scheduler.entities import AsyncWorkflowQueue, AsyncWorkflowSystemStrategy
+
+logger = logging.getLogger(__name__)
 
 
 class AsyncWorkflowCFSPlanEntity(WorkflowScheduleCFSPlanEntity):
@@ -9,24 +21,239 @@ class AsyncWorkflowCFSPlanEntity(WorkflowScheduleCFSPlanEntity):
     """
 
     queue: AsyncWorkflowQueue
+    tenant_id: str | None = None
+    # share of the queue a tenant receives relative to the other tenants in it
+    weight: float = Field(default=1.0, gt=0)
+
+
+def build_async_workflow_cfs_plan(
+    queue: AsyncWorkflowQueue, tenant_id: str | None = None
+) -> AsyncWorkflowCFSPlanEntity:
+    """
+    Build the CFS plan of an async workflow run in the given queue.
+    """
+    return AsyncWorkflowCFSPlanEntity(
+        queue=queue,
+        tenant_id=tenant_id,
+        schedule_strategy=AsyncWorkflowSystemStrategy,
+        granularity=dify_config.ASYNC_WORKFLOW_SCHEDULER_GRANULARITY,
+    )
 
 
 class AsyncWorkflowCFSPlanScheduler(CFSPlanScheduler):
     """
     Trigger workflow CFS plan scheduler.
+
+    Tenants sharing a queue are scheduled by weighted fair share. Each tenant has a virtual runtime in Redis:
+    the wall time of its runs divided by its weight, plus one time slice per run in flight. A run is deferred
+    at admission, or paused at a time slice boundary, when its tenant is more than one slice ahead of a tenant
+    that has runs waiting in the queue.
     """
 
     plan: AsyncWorkflowCFSPlanEntity
 
+    # LUA_FAIR_SHARE: update the tenant's fair share state and return 1 when the run must yield its worker
+    # KEYS[1] = workflow_cfs:{<queue>}:vruntime  (zset, tenant -> weighted runtime)
+    # KEYS[2] = workflow_cfs:{<queue>}:inflight  (hash, tenant -> weighted cost of admitted runs)
+    # KEYS[3] = workflow_cfs:{<queue>}:waiting   (hash, tenant -> runs queued but not admitted)
+    # KEYS[4] = workflow_cfs:{<queue>}:seen      (zset, tenant -> last activity timestamp)
+    # KEYS[5] = workflow_cfs:{<queue>}:reserved  (workers freed by preemption and not taken yet)
+    # ARGV[1] = operation: enqueue / admit / tick / release
+    # ARGV[2] = tenant_id
+    # ARGV[3] = now, ARGV[4] = runtime to charge, ARGV[5] = in-flight cost of one run
+    # ARGV[6] = slack, ARGV[7] = seconds of inactivity after which a tenant's state is dropped
+    LUA_FAIR_SHARE = """
+local op, tenant = ARGV[1], ARGV[2]
+local now, charge, cost = tonumber(ARGV[3]), tonumber(ARGV[4]), tonumber(ARGV[5])
+local slack, ttl = tonumber(ARGV[6]), tonumber(ARGV[7])
+for _, t in ipairs(redis.call('ZRANGEBYSCORE', KEYS[4], '-inf', now - ttl)) do
+  redis.call('ZREM', KEYS[1], t)
+  redis.call('HDEL', KEYS[2], t)
+  redis.call('HDEL', KEYS[3], t)
+  redis.call('ZREM', KEYS[4], t)
+end
+redis.call('ZADD', KEYS[4], now, tenant)
+
+local function vruntime(t) return tonumber(redis.call('ZSCORE', KEYS[1], t) or 0) end
+local function inflight(t) return tonumber(redis.call('HGET', KEYS[2], t) or 0) end
+local function add_inflight(t, delta)
+  if inflight(t) + delta <= 1e-9 then
+    redis.call('HDEL', KEYS[2], t)
+  else
+    redis.call('HINCRBYFLOAT', KEYS[2], t, delta)
+  end
+end
+local function add_waiting(t, delta)
+  if redis.call('HINCRBY', KEYS[3], t, delta) <= 0 then redis.call('HDEL', KEYS[3], t) end
+end
+
+-- a tenant becoming active starts with the others, it does not bank credit for the time it was idle
+local idle = redis.call('HEXISTS', KEYS[2], tenant) == 0 and redis.call('HEXISTS', KEYS[3], tenant) == 0
+local floor
+for _, key in ipairs({KEYS[2], KEYS[3]}) do
+  for _, t in ipairs(redis.call('HKEYS', key)) do
+    if t ~= tenant then
+      local v = vruntime(t)
+      if floor == nil or v < floor then floor = v end
+    end
+  end
+end
+local own = redis.call('ZSCORE', KEYS[1], tenant)
+if own then
+  own = tonumber(own)
+else
+  local lowest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+  own = floor or tonumber(lowest[2] or 0)
+end
+if idle and floor and own < floor - slack then own = floor - slack end
+own = own + charge
+redis.call('ZADD', KEYS[1], own, tenant)
+
+local result = 0
+if op == 'enqueue' then
+  add_waiting(tenant, 1)
+elseif op == 'release' then
+  add_inflight(tenant, -cost)
+else
+  -- waiting runs of tenants more than one slice behind this one
+  local lead = own + inflight(tenant)
+  if op == 'admit' then lead = lead + cost end
+  local behind = 0
+  local waiting = redis.call('HGETALL', KEYS[3])
+  for i = 1, #waiting, 2 do
+    local t = waiting[i]
+    if t ~= tenant and lead - vruntime(t) - inflight(t) > slack then behind = behind + tonumber(waiting[i + 1]) end
+  end
+  local reserved = tonumber(redis.call('GET', KEYS[5]) or 0)
+  if op == 'admit' then
+    if behind > 0 then
+      result = 1
+    else
+      add_waiting(tenant, -1)
+      add_inflight(tenant, cost)
+      if reserved > 0 then redis.call('DECR', KEYS[5]) end
+    end
+  elseif behind > reserved then
+    -- preempt only as many runs as there are waiting runs to take the freed workers, the furthest ahead first
+    local leader = true
+    for _, t in ipairs(redis.call('HKEYS', KEYS[2])) do
+      if t ~= tenant and vruntime(t) + inflight(t) > lead then leader = false end
+    end
+    if leader then
+      add_inflight(tenant, -cost)
+      add_waiting(tenant, 1)
+      redis.call('INCR', KEYS[5])
+      result = 1
+    end
+  end
+end
+for i = 1, 5 do redis.call('EXPIRE', KEYS[i], ttl) end
+return result
+"""
+
+    def __init__(self, plan: AsyncWorkflowCFSPlanEntity):
+        super().__init__(plan)
+        self._charged_at: float | None = None
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Whether runs of this plan are fair-share scheduled.
+        """
+        return (
+            self.plan.schedule_strategy == WorkflowScheduleCFSPlanEntity.Strategy.TimeSlice
+            and self.plan.granularity > 0
+            and self.plan.tenant_id is not None
+        )
+
+    def enqueue(self) -> None:
+        """
+        Record a run of the tenant queued for execution, so running tenants yield to it.
+        """
+        self._call("enqueue")
+
+    def admit(self) -> SchedulerCommand:
+        """
+        Whether a queued run can start now, RESOURCE_LIMIT_REACHED means it should be deferred.
+        """
+        command = self._call("admit")
+        if command == SchedulerCommand.NONE:
+            self._charged_at = time.monotonic()
+        return command
+
     def can_schedule(self) -> SchedulerCommand:
         """
-        Check if the workflow can be scheduled.
+        Charge the runtime since the last check and decide whether the run keeps its worker.
+        """
+        return self._call("tick", charge=self._take_runtime())
+
+    def release(self) -> None:
+        """
+        Charge the remaining runtime and free the run's share.
+        """
+        self._call("release", charge=self._take_runtime())
+        self._charged_at = None
+
+    @classmethod
+    def can_schedule_batch(cls, schedulers: Sequence[Self]) -> list[SchedulerCommand]:
         """
-        if self.plan.queue in [AsyncWorkflowQueue.PROFESSIONAL_QUEUE, AsyncWorkflowQueue.TEAM_QUEUE]:
-            """
-            permitted all paid users to schedule the workflow any time
-            """
+        Charge and check the time slices of many runs with one Redis pipeline.
+        """
+        commands = [SchedulerCommand.NONE] * len(schedulers)
+        enabled = [index for index, scheduler in enumerate(schedulers) if scheduler.enabled]
+        if not enabled:
+            return commands
+
+        # EVALSHA keeps the script body out of every command of the pipeline
+        script = redis_client.register_script(cls.LUA_FAIR_SHARE)
+        pipe = redis_client.pipeline(transaction=False)
+        for index in enabled:
+            scheduler = schedulers[index]
+            script(keys=scheduler._keys(), args=scheduler._args("tick", scheduler._take_runtime()), client=pipe)
+        try:
+            results = pipe.execute(raise_on_error=False)
+        except RedisError:
+            logger.exception("Failed to update fair share of %d workflow runs", len(enabled))
+            return commands
+
+        for index, result in zip(enabled, results):
+            if isinstance(result, Exception):
+                logger.error("Failed to update fair share of tenant %s: %s", schedulers[index].plan.tenant_id, result)
+            elif int(result):
+                commands[index] = SchedulerCommand.RESOURCE_LIMIT_REACHED
+        return commands
+
+    def _take_runtime(self) -> float:
+        now = time.monotonic()
+        elapsed = now - self._charged_at if self._charged_at is not None else 0.0
+        self._charged_at = now
+        return elapsed / self.plan.weight
+
+    def _keys(self) -> list[str]:
+        prefix = f"workflow_cfs:{{{self.plan.queue.value}}}"
+        return [f"{prefix}:{key}" for key in ("vruntime", "inflight", "waiting", "seen", "reserved")]
+
+    def _args(self, operation: str, charge: float) -> list[Any]:
+        granularity = self.plan.granularity
+        return [
+            operation,
+            self.plan.tenant_id,
+            time.time(),
+            charge,
+            granularity / self.plan.weight,
+            granularity,
+            dify_config.ASYNC_WORKFLOW_SCHEDULER_TENANT_TTL,
+        ]
+
+    def _call(self, operation: str, charge: float = 0.0) -> SchedulerCommand:
+        if not self.enabled:
             return SchedulerCommand.NONE
 
-        # FIXME: avoid the sandbox user's workflow at a running state for ever
-        return SchedulerCommand.RESOURCE_LIMIT_REACHED
+        try:
+            keys = self._keys()
+            result = redis_client.eval(self.LUA_FAIR_SHARE, len(keys), *keys, *self._args(operation, charge))
+        except RedisError:
+            # scheduling is best effort, a Redis outage must not stop workflow runs
+            logger.exception("Failed to update fair share of tenant %s", self.plan.tenant_id)
+            return SchedulerCommand.NONE
+        return SchedulerCommand.RESOURCE_LIMIT_REACHED if int(result) else SchedulerCommand.NONE
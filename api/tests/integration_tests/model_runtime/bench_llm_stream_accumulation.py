@@ -0,0 +1,142 @@
+"""
+Benchmark: LargeLanguageModel._invoke_result_generator throughput on a stubbed plugin stream, building a
+TextPromptMessageContent per delta and dispatching chunk callbacks unconditionally (previous behaviour) versus
+coalescing text deltas and skipping per-chunk work when no callbacks are registered.
+
+The stub stream replays pre-built chunks, so the numbers cover only the work done per chunk by the generator.
+
+Usage:
+    uv run --project api python -m tests.integration_tests.model_runtime.bench_llm_stream_accumulation
+"""
+
+import time
+from unittest.mock import MagicMock
+
+from core.model_runtime.callbacks.base_callback import Callback
+from core.model_runtime.entities.llm_entities import LLMResult, LLMResultChunk, LLMResultChunkDelta, LLMUsage
+from core.model_runtime.entities.message_entities import (
+    AssistantPromptMessage,
+    TextPromptMessageContent,
+    UserPromptMessage,
+)
+from core.model_runtime.entities.model_entities import ModelType
+from core.model_runtime.model_providers.__base.large_language_model import LargeLanguageModel
+
+# ---------------------------------------------------------------------------
+# Config
+# ---------------------------------------------------------------------------
+TOKENS = 4096  # one text delta per token
+ROUNDS = 5
+PROMPT_MESSAGES = [UserPromptMessage(content="Write a long answer.")]
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+class _NoopCallback(Callback):
+    def on_before_invoke(self, *args, **kwargs):
+        pass
+
+    def on_new_chunk(self, *args, **kwargs):
+        pass
+
+    def on_after_invoke(self, *args, **kwargs):
+        pass
+
+    def on_invoke_error(self, *args, **kwargs):
+        pass
+
+
+def _chunks() -> list[LLMResultChunk]:
+    return [
+        LLMResultChunk(
+            model="bench-model",
+            delta=LLMResultChunkDelta(index=i, message=AssistantPromptMessage(content=f"tok{i % 100} ")),
+        )
+        for i in range(TOKENS)
+    ]
+
+
+def _legacy_result_generator(llm: LargeLanguageModel, result, callbacks: list[Callback]):
+    message_content = []
+    real_model = "bench-model"
+    usage = None
+    for chunk in result:
+        chunk.prompt_messages = PROMPT_MESSAGES
+        yield chunk
+        llm._trigger_new_chunk_callbacks(
+            chunk=chunk,
+            model="bench-model",
+            credentials={},
+            prompt_messages=PROMPT_MESSAGES,
+            model_parameters={},
+            callbacks=callbacks,
+        )
+        content = chunk.delta.message.content
+        if isinstance(content, str) and content:
+            message_content.append(TextPromptMessageContent(data=content))
+        real_model = chunk.model
+        if chunk.delta.usage:
+            usage = chunk.delta.usage
+    llm._trigger_after_invoke_callbacks(
+        model="bench-model",
+        result=LLMResult(
+            model=real_model,
+            prompt_messages=PROMPT_MESSAGES,
+            message=AssistantPromptMessage(content=message_content),
+            usage=usage or LLMUsage.empty_usage(),
+        ),
+        credentials={},
+        prompt_messages=PROMPT_MESSAGES,
+        model_parameters={},
+        callbacks=callbacks,
+    )
+
+
+def _result_generator(llm: LargeLanguageModel, result, callbacks: list[Callback]):
+    return llm._invoke_result_generator(
+        model="bench-model",
+        result=result,
+        credentials={},
+        prompt_messages=PROMPT_MESSAGES,
+        model_parameters={},
+        callbacks=callbacks,
+    )
+
+
+def _tokens_per_second(generator, llm: LargeLanguageModel, chunks: list[LLMResultChunk], callbacks) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        t0 = time.perf_counter()
+        for _ in generator(llm, iter(chunks), callbacks):
+            pass
+        best = min(best, time.perf_counter() - t0)
+    return TOKENS / best
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+def main():
+    llm = LargeLanguageModel.model_construct(
+        tenant_id="tenant",
+        model_type=ModelType.LLM,
+        plugin_id="plugin",
+        provider_name="provider",
+        plugin_model_provider=MagicMock(),
+    )
+    chunks = _chunks()
+
+    print("=" * 70)
+    print("LLM stream accumulation benchmark")
+    print(f"  Stream : {TOKENS} text deltas, best of {ROUNDS}")
+    print("=" * 70)
+
+    for label, callbacks in (("no callbacks  ", []), ("with callback ", [_NoopCallback()])):
+        legacy = _tokens_per_second(_legacy_result_generator, llm, chunks, callbacks)
+        current = _tokens_per_second(_result_generator, llm, chunks, callbacks)
+        print(f"  {label}: {legacy:12,.0f} -> {current:12,.0f} tokens/s  ({current / legacy:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
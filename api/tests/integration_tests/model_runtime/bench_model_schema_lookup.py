@@ -0,0 +1,135 @@
+"""
+Benchmark: per-invoke overhead of AIModel.get_model_schema on a warm cache, deriving the key from one MD5 per
+credential and validating the schema JSON from Redis on every call (previous behaviour) versus a single
+credential digest and the per-process cache of validated schemas.
+
+Redis is replaced by an in-memory stub that sleeps for a configurable round-trip time.
+
+Usage:
+    uv run --project api python -m tests.integration_tests.model_runtime.bench_model_schema_lookup
+"""
+
+import hashlib
+import time
+from unittest.mock import MagicMock, patch
+
+from core.model_runtime.entities.common_entities import I18nObject
+from core.model_runtime.entities.model_entities import (
+    AIModelEntity,
+    FetchFrom,
+    ModelPropertyKey,
+    ModelType,
+    ParameterRule,
+    ParameterType,
+    PriceConfig,
+)
+from core.model_runtime.model_providers.__base.large_language_model import LargeLanguageModel
+from core.model_runtime.model_providers.model_schema_cache import ModelSchemaCache
+
+# ---------------------------------------------------------------------------
+# Config
+# ---------------------------------------------------------------------------
+REDIS_ROUND_TRIP = 0.0002  # seconds per command
+CALLS = 5000
+CREDENTIALS = {
+    "api_key": "sk-" + "x" * 48,
+    "endpoint_url": "https://api.example.com/v1",
+    "organization": "org-benchmark",
+    "api_version": "2024-06-01",
+    "mode": "chat",
+}
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+class _StubRedis:
+    def __init__(self):
+        self.data: dict[str, str] = {}
+
+    def get(self, key):
+        time.sleep(REDIS_ROUND_TRIP)
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        time.sleep(REDIS_ROUND_TRIP)
+        self.data[key] = value
+
+
+def _schema() -> AIModelEntity:
+    return AIModelEntity(
+        model="gpt-bench",
+        label=I18nObject(en_US="gpt-bench"),
+        model_type=ModelType.LLM,
+        fetch_from=FetchFrom.PREDEFINED_MODEL,
+        model_properties={ModelPropertyKey.MODE: "chat", ModelPropertyKey.CONTEXT_SIZE: 128000},
+        parameter_rules=[
+            ParameterRule(
+                name=name,
+                label=I18nObject(en_US=name, zh_Hans=name),
+                type=ParameterType.FLOAT,
+                help=I18nObject(en_US=f"Help text for {name}. " * 4),
+                min=0,
+                max=2,
+            )
+            for name in ("temperature", "top_p", "presence_penalty", "frequency_penalty", "max_tokens", "seed")
+        ],
+        pricing=PriceConfig(input=0.0025, output=0.01, unit=0.001, currency="USD"),
+    )
+
+
+def _legacy_cache_key(llm: LargeLanguageModel, model: str, credentials: dict) -> str:
+    cache_key = f"{llm.tenant_id}:{llm.plugin_id}:{llm.provider_name}:{llm.model_type.value}:{model}"
+    sorted_credentials = sorted(credentials.items()) if credentials else []
+    cache_key += ":".join([hashlib.md5(f"{k}:{v}".encode()).hexdigest() for k, v in sorted_credentials])
+    return cache_key
+
+
+def _legacy_get_model_schema(llm: LargeLanguageModel, redis: _StubRedis, model: str, credentials: dict):
+    return AIModelEntity.model_validate_json(redis.get(_legacy_cache_key(llm, model, credentials)))
+
+
+def _measure(step) -> float:
+    step()
+    t0 = time.perf_counter()
+    for _ in range(CALLS):
+        step()
+    return (time.perf_counter() - t0) / CALLS
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+def main():
+    llm = LargeLanguageModel.model_construct(
+        tenant_id="tenant",
+        model_type=ModelType.LLM,
+        plugin_id="langgenius/openai",
+        provider_name="openai",
+        plugin_model_provider=MagicMock(),
+    )
+    redis = _StubRedis()
+    redis.data[_legacy_cache_key(llm, "gpt-bench", CREDENTIALS)] = _schema().model_dump_json()
+    cache = ModelSchemaCache(local_max_size=1024, local_ttl=60)
+
+    print("=" * 70)
+    print("AIModel.get_model_schema warm lookup benchmark")
+    print(f"  Calls        : {CALLS}, {len(CREDENTIALS)} credential fields")
+    print(f"  Redis RTT    : {REDIS_ROUND_TRIP * 1000:.1f} ms")
+    print("=" * 70)
+
+    with (
+        patch("core.model_runtime.model_providers.model_schema_cache.redis_client", redis),
+        patch("core.model_runtime.model_providers.__base.ai_model.model_schema_cache", cache),
+        patch("core.plugin.impl.model.PluginModelClient") as client_cls,
+    ):
+        client_cls.return_value.get_model_schema.return_value = _schema()
+        legacy = _measure(lambda: _legacy_get_model_schema(llm, redis, "gpt-bench", CREDENTIALS))
+        cached = _measure(lambda: llm.get_model_schema("gpt-bench", CREDENTIALS))
+
+    print(f"  Redis + validate per call : {legacy * 1e6:9.1f} us/call")
+    print(f"  Per-process cache         : {cached * 1e6:9.1f} us/call  ({legacy / cached:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
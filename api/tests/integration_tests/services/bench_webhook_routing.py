@@ -0,0 +1,139 @@
+"""
+Load test: webhook route resolution (WebhookService.get_webhook_trigger_and_workflow) under concurrent calls,
+resolving every call from the database (previous behaviour) versus the per-process routing cache.
+
+The database session and Redis are replaced by stubs that sleep for a configurable round-trip time, so the
+numbers reflect how many round trips a webhook call pays rather than the speed of a particular database.
+
+Usage:
+    uv run --project api python -m tests.integration_tests.services.bench_webhook_routing
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from models.enums import AppTriggerStatus
+from models.trigger import AppTrigger, WorkflowWebhookTrigger
+from services.trigger.webhook_routing_cache import WebhookRoutingCache
+from services.trigger.webhook_service import WebhookService
+
+# ---------------------------------------------------------------------------
+# Config
+# ---------------------------------------------------------------------------
+DB_ROUND_TRIP = 0.002  # seconds per query
+REDIS_ROUND_TRIP = 0.0003  # seconds per command
+WEBHOOKS = 200
+CALLS = 5000
+CONCURRENCY = 32
+
+
+# ---------------------------------------------------------------------------
+# Stubs
+# ---------------------------------------------------------------------------
+class _StubWorkflow:
+    def __init__(self, app_id: str):
+        self.id = f"workflow-{app_id}"
+        self.app_id = app_id
+
+    def get_node_config_by_id(self, node_id: str):
+        return {"id": node_id, "data": {"type": "trigger-webhook"}}
+
+
+class _StubQuery:
+    def __init__(self, result):
+        self._result = result
+
+    def where(self, *args):
+        return self
+
+    filter = where
+
+    def order_by(self, *args):
+        return self
+
+    def first(self):
+        time.sleep(DB_ROUND_TRIP)
+        return self._result
+
+
+class _StubSession:
+    queries = 0
+    _lock = threading.Lock()
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def query(self, model):
+        with _StubSession._lock:
+            _StubSession.queries += 1
+        if model is WorkflowWebhookTrigger:
+            return _StubQuery(SimpleNamespace(webhook_id="hook", app_id="app", tenant_id="tenant", node_id="node"))
+        if model is AppTrigger:
+            return _StubQuery(SimpleNamespace(status=AppTriggerStatus.ENABLED))
+        return _StubQuery(_StubWorkflow("app"))
+
+
+class _StubRedis:
+    def mget(self, keys):
+        time.sleep(REDIS_ROUND_TRIP)
+        return [None] * len(keys)
+
+    def incr(self, key):
+        time.sleep(REDIS_ROUND_TRIP)
+        return 1
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+def _run(cache: WebhookRoutingCache) -> tuple[float, int]:
+    _StubSession.queries = 0
+    with (
+        patch("services.trigger.webhook_service.Session", _StubSession),
+        patch("services.trigger.webhook_service.db"),
+        patch("services.trigger.webhook_service.webhook_routing_cache", cache),
+        patch("services.trigger.webhook_routing_cache.redis_client", _StubRedis()),
+        ThreadPoolExecutor(max_workers=CONCURRENCY) as executor,
+    ):
+        t0 = time.perf_counter()
+        list(
+            executor.map(
+                lambda i: WebhookService.get_webhook_trigger_and_workflow(f"hook-{i % WEBHOOKS}"),
+                range(CALLS),
+            )
+        )
+        elapsed = time.perf_counter() - t0
+    return elapsed, _StubSession.queries
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+def main():
+    print("=" * 70)
+    print("Webhook routing load test")
+    print(f"  Calls       : {CALLS} over {WEBHOOKS} webhooks, {CONCURRENCY} threads")
+    print(f"  Round trips : DB {DB_ROUND_TRIP * 1000:.1f} ms, Redis {REDIS_ROUND_TRIP * 1000:.1f} ms")
+    print("=" * 70)
+
+    baseline = None
+    for label, cache in (
+        ("Uncached", WebhookRoutingCache(enabled=False, max_size=WEBHOOKS, ttl=300)),
+        ("Cached  ", WebhookRoutingCache(enabled=True, max_size=WEBHOOKS, ttl=300)),
+    ):
+        elapsed, queries = _run(cache)
+        baseline = baseline or elapsed
+        print(f"  {label} : {CALLS / elapsed:9.0f} lookups/s, {queries:6d} DB queries  ({baseline / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Benchmark: building and reading a workflow run archive bundle fully in memory (previous behaviour) versus
+streaming rows into a spooled bundle and restoring them in batches.
+
+Rows are synthetic node executions with large inputs / outputs, so the numbers show how peak memory follows
+the size of the run rather than the speed of a particular database or object storage.
+
+Usage:
+    uv run --project api python -m tests.integration_tests.services.bench_workflow_run_archive
+"""
+
+import io
+import json
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from collections.abc import Callable, Iterator
+from datetime import datetime, timedelta
+from itertools import islice
+from types import SimpleNamespace
+from typing import Any
+
+from libs.archive_storage import ArchiveStorage
+from services.retention.workflow_run.archive_paid_plan_workflow_run import WorkflowRunArchiver
+from services.retention.workflow_run.constants import ARCHIVE_BUNDLE_SPOOL_MAX_SIZE, ARCHIVE_ROWS_BATCH_SIZE
+from services.retention.workflow_run.restore_archived_workflow_run import WorkflowRunRestore
+
+# ---------------------------------------------------------------------------
+# Config
+# ---------------------------------------------------------------------------
+NODE_EXECUTIONS = 5000
+PAYLOAD_BYTES = 8 * 1024  # size of inputs and of outputs per node execution
+ROUNDS = 3
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+RUN = SimpleNamespace(
+    id="run-1", tenant_id="tenant-1", app_id="app-1", workflow_id="workflow-1", created_at=datetime(2024, 1, 1)
+)
+
+
+def _iter_node_executions() -> Iterator[dict[str, Any]]:
+    payload = json.dumps({"text": "x" * PAYLOAD_BYTES})
+    for index in range(NODE_EXECUTIONS):
+        yield {
+            "id": f"node-execution-{index}",
+            "workflow_run_id": RUN.id,
+            "index": index,
+            "inputs": payload,
+            "outputs": payload,
+            "created_at": RUN.created_at + timedelta(milliseconds=index),
+        }
+
+
+def _table_data(rows: Iterator[dict[str, Any]] | list[dict[str, Any]]) -> dict[str, Any]:
+    table_data: dict[str, Any] = {table_name: [] for table_name in WorkflowRunArchiver.ARCHIVED_TABLES}
+    table_data["workflow_node_executions"] = rows
+    return table_data
+
+
+def _archive_in_memory() -> int:
+    # previous behaviour: materialize all rows, serialize each table to bytes, zip everything in memory
+    table_data = _table_data(list(_iter_node_executions()))
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for table_name in WorkflowRunArchiver.ARCHIVED_TABLES:
+            data = ArchiveStorage.serialize_to_jsonl(table_data[table_name])
+            ArchiveStorage.compute_checksum(data)
+            archive.writestr(f"{table_name}.jsonl", data)
+    return len(buffer.getvalue())
+
+
+def _archive_streaming() -> int:
+    archiver = WorkflowRunArchiver.__new__(WorkflowRunArchiver)
+    with tempfile.SpooledTemporaryFile(max_size=ARCHIVE_BUNDLE_SPOOL_MAX_SIZE) as bundle:
+        archiver._write_archive_bundle(bundle, RUN, _table_data(_iter_node_executions()))  # type: ignore[arg-type]
+        return bundle.tell()
+
+
+def _build_bundle() -> bytes:
+    buffer = io.BytesIO()
+    archiver = WorkflowRunArchiver.__new__(WorkflowRunArchiver)
+    archiver._write_archive_bundle(buffer, RUN, _table_data(_iter_node_executions()))  # type: ignore[arg-type]
+    return buffer.getvalue()
+
+
+def _restore_in_memory(bundle: bytes) -> int:
+    with zipfile.ZipFile(io.BytesIO(bundle)) as archive:
+        records = ArchiveStorage.deserialize_from_jsonl(archive.read("workflow_node_executions.jsonl"))
+    return len(records)
+
+
+def _restore_streaming(bundle: bytes) -> int:
+    restored = 0
+    with (
+        zipfile.ZipFile(io.BytesIO(bundle)) as archive,
+        WorkflowRunRestore._open_archive_member(archive, "workflow_node_executions.jsonl") as member,
+    ):
+        records = ArchiveStorage.iter_jsonl_records(member)
+        while batch := list(islice(records, ARCHIVE_ROWS_BATCH_SIZE)):
+            restored += len(batch)
+    return restored
+
+
+def _measure(func: Callable[[], int]) -> tuple[float, float]:
+    """Return the best wall time over ROUNDS and the peak traced memory in MiB of one extra round."""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / (1024 * 1024)
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+def main():
+    raw_mib = NODE_EXECUTIONS * PAYLOAD_BYTES * 2 / (1024 * 1024)
+    print("=" * 70)
+    print("Workflow run archive benchmark")
+    print(f"  Node executions : {NODE_EXECUTIONS}, {PAYLOAD_BYTES // 1024} KiB inputs and outputs each")
+    print(f"  Raw payload     : {raw_mib:.0f} MiB, best of {ROUNDS} rounds")
+    print("=" * 70)
+
+    bundle = _build_bundle()
+    for title, cases in (
+        ("Archive", (("In memory", _archive_in_memory), ("Streaming", _archive_streaming))),
+        (
+            "Restore",
+            (("In memory", lambda: _restore_in_memory(bundle)), ("Streaming", lambda: _restore_streaming(bundle))),
+        ),
+    ):
+        print(f"{title}:")
+        for label, func in cases:
+            elapsed, peak_mib = _measure(func)
+            print(
+                f"  {label} : {NODE_EXECUTIONS / elapsed:9.0f} rows/s, {raw_mib / elapsed:7.1f} MiB/s, "
+                f"peak memory {peak_mib:7.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Benchmark: finding due workflow schedules by polling the schedule table (previous behaviour) versus claiming them
+from the Redis schedule index (ScheduleDispatchIndex), with 1M schedule plans.
+
+The schedule table is simulated in an in-memory SQLite database with the same shape as the poller's query: plans
+indexed by next_run_at and joined to their trigger's status. Plans of disabled triggers keep a next_run_at in the
+past, so the polling query walks over them on every batch, while the index drops them once. Dispatch smoothing is
+measured as the peak number of runs dispatched in one second, with and without a jitter window.
+
+Requires a Redis server, configured with REDIS_HOST / REDIS_PORT / REDIS_DB (default localhost:6379/0).
+
+Usage:
+    uv run --project api python -m tests.integration_tests.tasks.bench_schedule_dispatch
+"""
+
+import os
+import random
+import sqlite3
+import time
+from collections import Counter
+from datetime import UTC, datetime, timedelta
+from unittest import mock
+
+import redis
+
+from services.trigger.schedule_dispatch_index import DUE_KEY, ScheduleDispatchIndex
+
+# ---------------------------------------------------------------------------
+# Config
+# ---------------------------------------------------------------------------
+SCHEDULES = 1_000_000
+DISABLED_RATIO = 0.01  # plans whose trigger is disabled or rate limited
+HOURLY_RATIO = 0.1  # plans due at the top of the hour, the rest are spread over the minutes of the hour
+TICKS = 10  # poller ticks, one per simulated minute
+BATCH_SIZE = 100
+JITTER = 30
+START = datetime(2025, 1, 1, 12, 0)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+def _redis() -> redis.Redis:
+    return redis.Redis(
+        host=os.environ.get("REDIS_HOST", "localhost"),
+        port=int(os.environ.get("REDIS_PORT", "6379")),
+        db=int(os.environ.get("REDIS_DB", "0")),
+    )
+
+
+def _ts(value: datetime) -> float:
+    return value.replace(tzinfo=UTC).timestamp()
+
+
+def _plans() -> list[tuple[str, str, float]]:
+    rng = random.Random(42)  # noqa: S311
+    plans = []
+    for i in range(SCHEDULES):
+        if rng.random() < DISABLED_RATIO:
+            due = START - timedelta(days=rng.randint(1, 30))
+        elif rng.random() < HOURLY_RATIO:
+            due = START
+        else:
+            due = START + timedelta(minutes=rng.randrange(60))
+        plans.append((f"plan-{i:07d}", "enabled" if due >= START else "disabled", _ts(due)))
+    return plans
+
+
+def _database(plans: list[tuple[str, str, float]]) -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE app_triggers (id TEXT PRIMARY KEY, status TEXT)")
+    conn.execute("CREATE TABLE workflow_schedule_plans (id TEXT PRIMARY KEY, trigger_id TEXT, next_run_at REAL)")
+    conn.execute("CREATE INDEX workflow_schedule_plan_next_idx ON workflow_schedule_plans (next_run_at)")
+    conn.executemany("INSERT INTO app_triggers VALUES (?, ?)", ((plan_id, status) for plan_id, status, _ in plans))
+    conn.executemany(
+        "INSERT INTO workflow_schedule_plans VALUES (?, ?, ?)", ((plan_id, plan_id, due) for plan_id, _, due in plans)
+    )
+    conn.commit()
+    return conn
+
+
+def _advance(conn: sqlite3.Connection, ids: list[str]) -> None:
+    conn.executemany(
+        "UPDATE workflow_schedule_plans SET next_run_at = next_run_at + 3600 WHERE id = ?", [(i,) for i in ids]
+    )
+
+
+def _poll_database(conn: sqlite3.Connection, now: float) -> list[str]:
+    dispatched = []
+    while True:
+        ids = [
+            row[0]
+            for row in conn.execute(
+                "SELECT p.id FROM workflow_schedule_plans p JOIN app_triggers t ON t.id = p.trigger_id "
+                "WHERE p.next_run_at <= ? AND t.status = 'enabled' ORDER BY p.next_run_at LIMIT ?",
+                (now, BATCH_SIZE),
+            )
+        ]
+        if not ids:
+            return dispatched
+        _advance(conn, ids)
+        dispatched.extend(ids)
+
+
+def _poll_index(conn: sqlite3.Connection, index: ScheduleDispatchIndex, client: redis.Redis, now: float) -> list[str]:
+    dispatched = []
+    while ids := index.pop_due(datetime.fromtimestamp(now, UTC), BATCH_SIZE):
+        placeholders = ",".join("?" * len(ids))
+        rows = conn.execute(
+            "SELECT p.id, p.next_run_at FROM workflow_schedule_plans p JOIN app_triggers t ON t.id = p.trigger_id "
+            f"WHERE p.id IN ({placeholders}) AND t.status = 'enabled'",
+            ids,
+        ).fetchall()
+        due = [plan_id for plan_id, next_run_at in rows if next_run_at <= now]
+        _advance(conn, due)
+        client.zadd(DUE_KEY, {plan_id: next_run_at + 3600 for plan_id, next_run_at in rows if next_run_at <= now})
+        dispatched.extend(due)
+    return dispatched
+
+
+def _peak_per_second(index: ScheduleDispatchIndex, ticks: list[list[str]]) -> int:
+    per_second: Counter[int] = Counter()
+    for tick, ids in enumerate(ticks):
+        for plan_id in ids:
+            per_second[tick * 60 + index.dispatch_delay(plan_id)] += 1
+    return max(per_second.values())
+
+
+def _run(label: str, poll) -> list[list[str]]:
+    ticks, elapsed = [], []
+    for tick in range(TICKS):
+        started = time.perf_counter()
+        ticks.append(poll(_ts(START + timedelta(minutes=tick))))
+        elapsed.append(time.perf_counter() - started)
+    dispatched = sum(len(ids) for ids in ticks)
+    print(
+        f"  {label:<22}: {dispatched:>7} runs dispatched, per tick avg {sum(elapsed) / TICKS * 1000:>8.1f} ms"
+        f"  max {max(elapsed) * 1000:>8.1f} ms  (per dispatched run {sum(elapsed) / dispatched * 1e6:.0f} us)"
+    )
+    return ticks
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+def main(client: redis.Redis | None = None):
+    client = client or _redis()
+    plans = _plans()
+
+    print("=" * 70)
+    print("Workflow schedule dispatch benchmark")
+    print(f"  Schedule plans  : {SCHEDULES:,}, {DISABLED_RATIO:.0%} disabled and overdue")
+    print(f"  Poller          : {TICKS} ticks of one minute, batches of {BATCH_SIZE}")
+    print("=" * 70)
+
+    conn = _database(plans)
+    database_ticks = _run("Database polling", lambda now: _poll_database(conn, now))
+
+    conn = _database(plans)
+    index = ScheduleDispatchIndex(enabled=True, rebuild_interval=60, jitter=0)
+    with mock.patch("services.trigger.schedule_dispatch_index.redis_client", client):
+        client.delete(DUE_KEY)
+        started = time.perf_counter()
+        for offset in range(0, SCHEDULES, 10_000):
+            chunk = plans[offset : offset + 10_000]
+            client.zadd(DUE_KEY, {plan_id: due for plan_id, status, due in chunk if status == "enabled"})
+        print(f"  Index rebuild         : {client.zcard(DUE_KEY):>7} plans in {time.perf_counter() - started:.1f} s")
+        index_ticks = _run("Redis schedule index", lambda now: _poll_index(conn, index, client, now))
+        client.delete(DUE_KEY)
+
+    assert [sorted(ids) for ids in database_ticks] == [sorted(ids) for ids in index_ticks]
+    print("Peak runs dispatched in one second")
+    for jitter in (0, JITTER):
+        peak = _peak_per_second(ScheduleDispatchIndex(enabled=True, rebuild_interval=60, jitter=jitter), index_ticks)
+        print(f"  jitter window {jitter:>3}s    : {peak:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Benchmark: per-tenant latency of async workflow runs sharing one Celery queue, first-in first-out (previous
+behaviour) versus the weighted fair share scheduler of AsyncWorkflowCFSPlanScheduler.
+
+A load generator drives a simulated worker pool on a simulated clock: one noisy tenant submits a burst of runs,
+while quiet tenants submit a run at a steady pace. The scheduler itself runs for real against Redis, so the
+numbers show how the admission, time slicing and preemption decisions spread the queue's workers across tenants.
+
+Requires a Redis server, configured with REDIS_HOST / REDIS_PORT / REDIS_DB (default localhost:6379/0).
+
+Usage:
+    uv run --project api python -m tests.integration_tests.tasks.bench_workflow_fair_share
+"""
+
+import os
+import statistics
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from types import SimpleNamespace
+from unittest import mock
+
+import redis
+
+from services.workflow.entities import WorkflowScheduleCFSPlanEntity
+from services.workflow.scheduler import SchedulerCommand
+from tasks.workflow_cfs_scheduler.cfs_scheduler import AsyncWorkflowCFSPlanEntity, AsyncWorkflowCFSPlanScheduler
+from tasks.workflow_cfs_scheduler.entities import AsyncWorkflowQueue
+
+# ---------------------------------------------------------------------------
+# Config
+# ---------------------------------------------------------------------------
+WORKERS = 8
+GRANULARITY = 10  # seconds per time slice
+ADMISSION_DELAY = 5  # seconds a deferred or preempted run waits before it is retried
+PAUSE_OVERHEAD = 1  # seconds of extra work to persist and restore a preempted run
+NOISY_RUNS = 300  # submitted at once by the noisy tenant
+QUIET_TENANTS = 4
+QUIET_INTERVAL = 30  # seconds between two runs of a quiet tenant
+QUIET_UNTIL = 600
+RUN_SECONDS = 20
+QUEUE = AsyncWorkflowQueue.PROFESSIONAL_QUEUE
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+def _redis() -> redis.Redis:
+    return redis.Redis(
+        host=os.environ.get("REDIS_HOST", "localhost"),
+        port=int(os.environ.get("REDIS_PORT", "6379")),
+        db=int(os.environ.get("REDIS_DB", "0")),
+    )
+
+
+@dataclass
+class _Run:
+    tenant_id: str
+    submitted_at: int
+    remaining: int = RUN_SECONDS
+    started_at: int = 0
+    finished_at: int = 0
+    preemptions: int = 0
+    scheduler: AsyncWorkflowCFSPlanScheduler | None = None
+
+
+def _submissions() -> dict[int, list[_Run]]:
+    submissions: dict[int, list[_Run]] = defaultdict(list)
+    submissions[0] = [_Run("noisy", 0) for _ in range(NOISY_RUNS)]
+    for index in range(QUIET_TENANTS):
+        for at in range(index * 5, QUIET_UNTIL, QUIET_INTERVAL):
+            submissions[at].append(_Run(f"quiet-{index}", at))
+    return submissions
+
+
+def _scheduler(run: _Run, fair: bool) -> AsyncWorkflowCFSPlanScheduler:
+    strategy = WorkflowScheduleCFSPlanEntity.Strategy.TimeSlice if fair else WorkflowScheduleCFSPlanEntity.Strategy.Nop
+    plan = AsyncWorkflowCFSPlanEntity(
+        queue=QUEUE, tenant_id=run.tenant_id, schedule_strategy=strategy, granularity=GRANULARITY
+    )
+    return AsyncWorkflowCFSPlanScheduler(plan=plan)
+
+
+def _simulate(client: redis.Redis, fair: bool) -> dict[str, list[_Run]]:
+    prefix = f"workflow_cfs:{{{QUEUE.value}}}"
+    client.delete(*(f"{prefix}:{key}" for key in ("vruntime", "inflight", "waiting", "seen", "reserved")))
+    clock = SimpleNamespace(now=0)
+    fake_time = SimpleNamespace(time=lambda: 1_700_000_000 + clock.now, monotonic=lambda: clock.now)
+    submissions = _submissions()
+    total = sum(len(runs) for runs in submissions.values())
+    queue: deque[_Run] = deque()
+    delayed: list[tuple[int, _Run]] = []
+    workers: list[_Run | None] = [None] * WORKERS
+    finished: dict[str, list[_Run]] = defaultdict(list)
+
+    with (
+        mock.patch("tasks.workflow_cfs_scheduler.cfs_scheduler.redis_client", client),
+        mock.patch("tasks.workflow_cfs_scheduler.cfs_scheduler.time", fake_time),
+        mock.patch(
+            "tasks.workflow_cfs_scheduler.cfs_scheduler.dify_config",
+            SimpleNamespace(ASYNC_WORKFLOW_SCHEDULER_TENANT_TTL=3600),
+        ),
+    ):
+        while sum(len(runs) for runs in finished.values()) < total:
+            for run in submissions.get(clock.now, []):
+                _scheduler(run, fair).enqueue()
+                queue.append(run)
+            queue.extend(run for due, run in delayed if due <= clock.now)
+            delayed = [(due, run) for due, run in delayed if due > clock.now]
+
+            for slot, run in enumerate(workers):
+                if run is None:
+                    continue
+                assert run.scheduler is not None
+                run.remaining -= 1
+                if run.remaining <= 0:
+                    run.scheduler.release()
+                    run.finished_at = clock.now
+                    finished[run.tenant_id].append(run)
+                    workers[slot] = None
+                elif (clock.now - run.started_at) % GRANULARITY == 0:
+                    if run.scheduler.can_schedule() == SchedulerCommand.RESOURCE_LIMIT_REACHED:
+                        run.remaining += PAUSE_OVERHEAD
+                        run.preemptions += 1
+                        delayed.append((clock.now + ADMISSION_DELAY, run))
+                        workers[slot] = None
+
+            for slot in range(WORKERS):
+                while workers[slot] is None and queue:
+                    run = queue.popleft()
+                    run.scheduler = _scheduler(run, fair)
+                    if run.scheduler.admit() == SchedulerCommand.RESOURCE_LIMIT_REACHED:
+                        delayed.append((clock.now + ADMISSION_DELAY, run))
+                        continue
+                    run.started_at = clock.now
+                    workers[slot] = run
+            clock.now += 1
+    return finished
+
+
+def _latencies(runs: list[_Run]) -> list[int]:
+    return sorted(run.finished_at - run.submitted_at for run in runs)
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+def main(client: redis.Redis | None = None):
+    client = client or _redis()
+    print("=" * 70)
+    print("Async workflow fair share benchmark")
+    print(f"  Workers         : {WORKERS}, {GRANULARITY}s time slices, {RUN_SECONDS}s runs")
+    print(f"  Noisy tenant    : {NOISY_RUNS} runs submitted at once")
+    print(f"  Quiet tenants   : {QUIET_TENANTS}, one run every {QUIET_INTERVAL}s for {QUIET_UNTIL}s")
+    print("=" * 70)
+    for label, fair in (("FIFO (previous)", False), ("Fair share", True)):
+        finished = _simulate(client, fair)
+        runs = [run for tenant_runs in finished.values() for run in tenant_runs]
+        makespan = max(run.finished_at for run in runs)
+        utilization = len(runs) * RUN_SECONDS / (makespan * WORKERS)
+        print(f"{label}: all runs done after {makespan}s, worker utilization {utilization:.0%}")
+        for tenant_id in sorted(finished):
+            latencies = _latencies(finished[tenant_id])
+            p95 = latencies[int(len(latencies) * 0.95) - 1]
+            preemptions = sum(run.preemptions for run in finished[tenant_id])
+            print(
+                f"  {tenant_id:<8} runs {len(latencies):>4}  latency p50 {statistics.median(latencies):>6.0f}s"
+                f"  p95 {p95:>6.0f}s  max {latencies[-1]:>6.0f}s  preemptions {preemptions:>4}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: one function-calling agent turn with several independent tool calls, invoked sequentially
+(max_parallel_tool_calls=1, previous behaviour) versus concurrently.
+
+ToolEngine.agent_invoke is replaced by a stub that sleeps for the tool's latency, standing in for HTTP / plugin
+tools, so the timings reflect the scheduling of FunctionCallAgentRunner._invoke_tool_calls only.
+
+Usage:
+    uv run --project api python -m tests.integration_tests.tools.bench_agent_parallel_tool_calls
+"""
+
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from flask import Flask
+
+from core.agent.fc_agent_runner import FunctionCallAgentRunner
+from core.tools.entities.tool_entities import ToolInvokeMeta
+
+# ---------------------------------------------------------------------------
+# Config
+# ---------------------------------------------------------------------------
+TOOL_LATENCIES = [0.12, 0.08, 0.2, 0.05, 0.1]  # seconds per stub tool call
+PARALLELISM = [1, 2, 4, 8]
+ROUNDS = 3
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+class _StubToolEngine:
+    @staticmethod
+    def agent_invoke(tool, tool_parameters, **kwargs):
+        time.sleep(tool_parameters["latency"])
+        return "ok", [], ToolInvokeMeta.empty()
+
+
+def _runner(max_parallel_tool_calls: int) -> FunctionCallAgentRunner:
+    runner = FunctionCallAgentRunner.__new__(FunctionCallAgentRunner)
+    runner.app_config = SimpleNamespace(agent=SimpleNamespace(max_parallel_tool_calls=max_parallel_tool_calls))  # type: ignore
+    runner.application_generate_entity = MagicMock()
+    runner.message = MagicMock()
+    runner.conversation = MagicMock()
+    runner.agent_callback = MagicMock()
+    runner.user_id = "user"
+    runner.tenant_id = "tenant"
+    return runner
+
+
+def _run(max_parallel_tool_calls: int) -> float:
+    runner = _runner(max_parallel_tool_calls)
+    tool_instances = {f"tool_{i}": MagicMock() for i in range(len(TOOL_LATENCIES))}
+    tool_calls = [(f"call_{i}", f"tool_{i}", {"latency": latency}) for i, latency in enumerate(TOOL_LATENCIES)]
+    best = float("inf")
+    for _ in range(ROUNDS):
+        t0 = time.perf_counter()
+        runner._invoke_tool_calls(tool_instances, tool_calls, None)  # type: ignore
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+def main():
+    print("=" * 70)
+    print("Function-calling agent tool call benchmark")
+    print(f"  Tool calls : {len(TOOL_LATENCIES)} ({', '.join(f'{t * 1000:.0f} ms' for t in TOOL_LATENCIES)})")
+    print(f"  Rounds     : best of {ROUNDS}")
+    print("=" * 70)
+
+    with Flask(__name__).app_context(), patch("core.agent.fc_agent_runner.ToolEngine", _StubToolEngine):
+        baseline = _run(1)
+        for max_parallel_tool_calls in PARALLELISM:
+            elapsed = baseline if max_parallel_tool_calls == 1 else _run(max_parallel_tool_calls)
+            print(
+                f"  max_parallel_tool_calls={max_parallel_tool_calls}: {elapsed * 1000:8.2f} ms"
+                f"  ({baseline / elapsed:.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmark: repeated MCP tool calls against a local stub streamable-HTTP MCP server, with a new client per call
+(previous behaviour of MCPTool.invoke_remote_mcp_tool) versus sessions checked out of MCPSessionPool.
+
+The stub server answers `initialize`, `ping` and `tools/call` with JSON responses and adds a fixed delay to every
+request to stand in for network round trips, so the difference reflects the connect / handshake / teardown
+requests that pooling saves.
+
+Usage:
+    uv run --project api python -m tests.integration_tests.tools.bench_mcp_session_pool
+"""
+
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import cast
+
+from core.entities.mcp_provider import MCPProviderEntity
+from core.mcp.mcp_client import MCPClient
+from core.mcp.session_pool import MCPSessionPool
+from core.mcp.types import LATEST_PROTOCOL_VERSION
+
+# ---------------------------------------------------------------------------
+# Config
+# ---------------------------------------------------------------------------
+CALLS = 50
+LATENCY = 0.005  # seconds added to every request
+PROVIDER = cast(MCPProviderEntity, SimpleNamespace(tenant_id="tenant", id="provider"))
+
+
+# ---------------------------------------------------------------------------
+# Stub MCP server
+# ---------------------------------------------------------------------------
+class _StubMCPHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: dict | None = None, headers: dict[str, str] | None = None):
+        payload = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        time.sleep(LATENCY)
+        message = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if "id" not in message:
+            self._send(202)
+            return
+
+        method = message["method"]
+        if method == "initialize":
+            result = {
+                "protocolVersion": LATEST_PROTOCOL_VERSION,
+                "capabilities": {"tools": {}},
+                "serverInfo": {"name": "stub", "version": "1.0"},
+            }
+            self._send(
+                200, {"jsonrpc": "2.0", "id": message["id"], "result": result}, {"mcp-session-id": uuid.uuid4().hex}
+            )
+        elif method == "tools/call":
+            result = {"content": [{"type": "text", "text": "ok"}], "isError": False}
+            self._send(200, {"jsonrpc": "2.0", "id": message["id"], "result": result})
+        else:
+            self._send(200, {"jsonrpc": "2.0", "id": message["id"], "result": {}})
+
+    def do_GET(self):
+        self._send(405)
+
+    def do_DELETE(self):
+        time.sleep(LATENCY)
+        self._send(200)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+def _call_unpooled(server_url: str):
+    with MCPClient(server_url=server_url) as client:
+        client.invoke_tool("echo", {})
+
+
+def _call_pooled(pool: MCPSessionPool, server_url: str):
+    with pool.session(provider_entity=PROVIDER, server_url=server_url, headers={}) as client:
+        client.invoke_tool("echo", {})
+
+
+def _run(step) -> float:
+    t0 = time.perf_counter()
+    for _ in range(CALLS):
+        step()
+    return time.perf_counter() - t0
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubMCPHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server_url = f"http://127.0.0.1:{server.server_address[1]}/mcp"
+    pool = MCPSessionPool(max_idle_per_key=4, max_sessions=64, idle_timeout=300, health_check_interval=30)
+
+    print("=" * 70)
+    print("MCP session pool benchmark")
+    print(f"  Calls   : {CALLS}")
+    print(f"  Latency : {LATENCY * 1000:.1f} ms per request")
+    print("=" * 70)
+
+    try:
+        t_unpooled = _run(lambda: _call_unpooled(server_url))
+        t_pooled = _run(lambda: _call_pooled(pool, server_url))
+    finally:
+        pool.close_all()
+        server.shutdown()
+
+    print(f"\n  Unpooled : {t_unpooled * 1000:8.2f} ms ({t_unpooled / CALLS * 1000:.2f} ms/call)")
+    print(f"  Pooled   : {t_pooled * 1000:8.2f} ms ({t_pooled / CALLS * 1000:.2f} ms/call)")
+    print(f"  Speedup  : {t_unpooled / t_pooled:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark: merging the semantic and full-text results of hybrid search, with deduplication plus WeightRerankRunner
+(previous behaviour of the weighted_score mode) versus rank fusion over NumPy arrays (reciprocal_rank_fusion and
+weighted_fusion modes).
+
+Every dataset returns top_k semantic and top_k full-text hits that partly overlap. The embedding model is replaced
+by a stand-in, keyword extraction runs with jieba as in production. The overlap column is how many of the top 10
+documents of a fusion mode are also in the top 10 of weighted_score.
+
+Usage:
+    uv run --project api python -m tests.integration_tests.vdb.bench_hybrid_fusion
+"""
+
+import random
+import statistics
+import time
+from itertools import starmap
+from unittest.mock import MagicMock, patch
+
+from core.rag.datasource.retrieval_service import RetrievalService
+from core.rag.models.document import Document
+from core.rag.rerank.entity.weight import KeywordSetting, VectorSetting, Weights
+from core.rag.rerank.fusion_rerank import fuse_documents
+from core.rag.rerank.rerank_type import RerankMode
+from core.rag.rerank.weight_rerank import WeightRerankRunner
+
+# ---------------------------------------------------------------------------
+# Config
+# ---------------------------------------------------------------------------
+DATASETS = 5
+TOP_K = 100
+OVERLAP = 0.4  # share of full-text hits also found by the semantic search
+REPEATS = 20
+QUERY = "how do I rotate the api keys of a workspace without downtime"
+# segment text mixes the query terms into a larger vocabulary
+WORDS = [*QUERY.split(), *(f"term{index}" for index in range(200))]
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+def _document(rng: random.Random, dataset: int, index: int, score: float) -> Document:
+    content = " ".join(rng.choices(WORDS, k=60))
+    return Document(
+        page_content=content,
+        metadata={"doc_id": f"{dataset}-{index}", "dataset_id": f"dataset-{dataset}", "score": score},
+        provider="dify",
+    )
+
+
+def _fixtures(seed: int = 0) -> list[tuple[list[Document], list[Document]]]:
+    rng = random.Random(seed)  # noqa: S311
+    datasets = []
+    for dataset in range(DATASETS):
+        pool = [_document(rng, dataset, index, 0.0) for index in range(TOP_K * 2)]
+        semantic = [
+            Document(page_content=d.page_content, metadata={**d.metadata, "score": 0.9 - rank * 0.004}, provider="dify")
+            for rank, d in enumerate(pool[:TOP_K])
+        ]
+        shared = rng.sample(pool[:TOP_K], int(TOP_K * OVERLAP))
+        full_text_pool = shared + pool[TOP_K : TOP_K * 2 - len(shared)]
+        rng.shuffle(full_text_pool)
+        full_text = [
+            Document(page_content=d.page_content, metadata={**d.metadata, "score": 25.0 - rank * 0.2}, provider="dify")
+            for rank, d in enumerate(full_text_pool)
+        ]
+        datasets.append((semantic, full_text))
+    return datasets
+
+
+def _copy(documents: list[Document]) -> list[Document]:
+    # the merge paths write scores into metadata
+    return [Document(page_content=d.page_content, metadata=dict(d.metadata), provider=d.provider) for d in documents]
+
+
+WEIGHTS = Weights(
+    vector_setting=VectorSetting(vector_weight=0.7, embedding_provider_name="stub", embedding_model_name="stub"),
+    keyword_setting=KeywordSetting(keyword_weight=0.3),
+)
+
+
+def _weighted_score(semantic: list[Document], full_text: list[Document]) -> list[Document]:
+    documents = RetrievalService._deduplicate_documents([*semantic, *full_text])
+    return WeightRerankRunner("tenant", WEIGHTS).run(QUERY, documents, top_n=TOP_K)
+
+
+def _rrf(semantic: list[Document], full_text: list[Document]) -> list[Document]:
+    return fuse_documents([semantic, full_text], RerankMode.RECIPROCAL_RANK_FUSION, top_n=TOP_K)
+
+
+def _weighted_fusion(semantic: list[Document], full_text: list[Document]) -> list[Document]:
+    return fuse_documents([semantic, full_text], RerankMode.WEIGHTED_FUSION, weights=[0.7, 0.3], top_n=TOP_K)
+
+
+def _run(merge, datasets) -> tuple[list[float], list[list[Document]]]:
+    timings = []
+    results: list[list[Document]] = []
+    for _ in range(REPEATS):
+        inputs = [(_copy(semantic), _copy(full_text)) for semantic, full_text in datasets]
+        started = time.perf_counter()
+        results = list(starmap(merge, inputs))
+        timings.append(time.perf_counter() - started)
+    return timings, results
+
+
+def _top_ids(results: list[list[Document]]) -> list[set[str]]:
+    return [{d.metadata["doc_id"] for d in result[:10]} for result in results]
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+def main():
+    print("=" * 70)
+    print("Hybrid search fusion benchmark")
+    print(f"  Datasets        : {DATASETS}, top_k {TOP_K} semantic and full-text hits each, {OVERLAP:.0%} overlap")
+    print(f"  Repeats         : {REPEATS}")
+    print("=" * 70)
+    datasets = _fixtures()
+    embedding = MagicMock()
+    embedding.embed_query.return_value = [0.1] * 8
+    with (
+        patch("core.rag.rerank.weight_rerank.ModelManager"),
+        patch("core.rag.rerank.weight_rerank.CacheEmbedding", return_value=embedding),
+    ):
+        # load the jieba dictionary before measuring
+        _weighted_score(*_fixtures(seed=1)[0])
+        baseline_timings, baseline = _run(_weighted_score, datasets)
+    baseline_top = _top_ids(baseline)
+    print(f"  {'weighted_score':<22}: median {statistics.median(baseline_timings) * 1000:>8.2f} ms")
+    for label, merge in (("reciprocal_rank_fusion", _rrf), ("weighted_fusion", _weighted_fusion)):
+        timings, results = _run(merge, datasets)
+        overlap = statistics.mean(len(a & b) for a, b in zip(_top_ids(results), baseline_top))
+        print(
+            f"  {label:<22}: median {statistics.median(timings) * 1000:>8.2f} ms"
+            f"  ({statistics.median(baseline_timings) / statistics.median(timings):>5.1f}x)"
+            f"  top 10 overlap {overlap:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark: semantic search of an app bound to many datasets of one embedding model, with one thread per dataset
+that embeds the query and searches (previous behaviour), one thread per dataset sharing the query embedding, and one
+batched search per vector store.
+
+The embedding model and the vector store are replaced by stand-ins with a fixed latency per call and per new
+connection, so only the number and concurrency of the calls are measured.
+
+Usage:
+    uv run --project api python -m tests.integration_tests.vdb.bench_multi_dataset_retrieval
+"""
+
+import threading
+import time
+from collections.abc import Callable
+from unittest.mock import MagicMock, patch
+
+from core.model_runtime.entities.text_embedding_entities import EmbeddingResult, EmbeddingUsage
+from core.rag.embedding.cached_embedding import CacheEmbedding
+
+# ---------------------------------------------------------------------------
+# Config
+# ---------------------------------------------------------------------------
+DATASET_COUNTS = [10, 20]
+EMBEDDING_LATENCY = 0.15  # seconds per embedding model call
+CONNECT_LATENCY = 0.005  # seconds to open a vector store connection
+SEARCH_LATENCY = 0.02  # seconds per vector store request
+QUERY = "how do I rotate the api keys of a workspace"
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+class _Counters:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.embeddings = 0
+        self.connections = 0
+        self.requests = 0
+
+    def count(self, name: str) -> None:
+        with self.lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+def _model_instance(counters: _Counters) -> MagicMock:
+    def invoke_text_embedding(**kwargs):
+        counters.count("embeddings")
+        time.sleep(EMBEDDING_LATENCY)
+        usage = EmbeddingUsage(
+            tokens=8,
+            total_tokens=8,
+            unit_price=0,
+            price_unit=0,
+            total_price=0,
+            currency="USD",
+            latency=EMBEDDING_LATENCY,
+        )
+        return EmbeddingResult(model="stub", embeddings=[[0.6, 0.8]], usage=usage)
+
+    model_instance = MagicMock(provider="stub", model="stub")
+    model_instance.invoke_text_embedding.side_effect = invoke_text_embedding
+    return model_instance
+
+
+def _search(counters: _Counters) -> None:
+    counters.count("connections")
+    time.sleep(CONNECT_LATENCY)
+    counters.count("requests")
+    time.sleep(SEARCH_LATENCY)
+
+
+def _per_dataset(embedding: CacheEmbedding, counters: _Counters, datasets: int) -> None:
+    def retrieve():
+        # previous behaviour: every dataset thread missed the Redis cache and called the model
+        embedding._embed_query(QUERY, f"stub_stub_{QUERY}")
+        _search(counters)
+
+    _run_threads(retrieve, datasets)
+
+
+def _shared_embedding(embedding: CacheEmbedding, counters: _Counters, datasets: int) -> None:
+    def retrieve():
+        embedding.embed_query(QUERY)
+        _search(counters)
+
+    _run_threads(retrieve, datasets)
+
+
+def _batched(embedding: CacheEmbedding, counters: _Counters, datasets: int) -> None:
+    embedding.embed_query(QUERY)
+    _search(counters)
+
+
+def _run_threads(target: Callable[[], None], count: int) -> None:
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+def main():
+    print("=" * 70)
+    print("Multi-dataset retrieval benchmark")
+    print(
+        f"  Latency         : embedding {EMBEDDING_LATENCY * 1000:.0f} ms, connect {CONNECT_LATENCY * 1000:.0f} ms,"
+        f" search {SEARCH_LATENCY * 1000:.0f} ms"
+    )
+    print("=" * 70)
+    for datasets in DATASET_COUNTS:
+        print(f"{datasets} datasets")
+        for label, run in (
+            ("thread per dataset", _per_dataset),
+            ("shared embedding", _shared_embedding),
+            ("batched search", _batched),
+        ):
+            counters = _Counters()
+            with patch("core.rag.embedding.cached_embedding.redis_client") as redis_client:
+                redis_client.get.return_value = None
+                embedding = CacheEmbedding(_model_instance(counters))
+                started = time.perf_counter()
+                run(embedding, counters, datasets)
+                elapsed = time.perf_counter() - started
+            print(
+                f"  {label:<20}: {elapsed * 1000:>6.0f} ms  model calls {counters.embeddings:>3}"
+                f"  connections {counters.connections:>3}  vector store requests {counters.requests:>3}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark: peak memory of multimodal embedding — materializing base64 for a whole batch
+(previous behaviour) vs size-bounded sub-batches with cached-embedding reuse (Vector.create_multimodal).
+
+Storage, database and the embedding model are replaced by in-memory stand-ins, so only the
+memory held by the indexing path itself is measured.
+
+Usage:
+    uv run --project api python -m tests.integration_tests.vdb.bench_multimodal_embedding
+"""
+
+import base64
+import time
+import tracemalloc
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from core.rag.datasource.vdb.vector_factory import Vector
+from core.rag.models.document import AttachmentDocument
+
+# ---------------------------------------------------------------------------
+# Config
+# ---------------------------------------------------------------------------
+FILE_SIZE = 512 * 1024
+FILE_COUNTS = [50, 200]
+CACHED_RATIO = 0.5
+BATCH_MAX_BYTES = 8 * 1024 * 1024
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+def _fixtures(n_files: int):
+    upload_files = [
+        SimpleNamespace(id=f"file-{i}", key=f"files/{i}", size=FILE_SIZE, hash=f"hash-{i}") for i in range(n_files)
+    ]
+    documents = [
+        AttachmentDocument(page_content="", metadata={"doc_id": f.id, "doc_type": "image"}) for f in upload_files
+    ]
+    cached = {f"hash-{i}": [0.0] * 8 for i in range(int(n_files * CACHED_RATIO))}
+    return upload_files, documents, cached
+
+
+def _load_once(key: str) -> bytes:
+    return b"\x00" * FILE_SIZE
+
+
+def _embed(documents: list[dict]) -> list[list[float]]:
+    return [[0.0] * 8 for _ in documents]
+
+
+def bench_full_batch(upload_files, documents) -> tuple[float, int]:
+    """Previous behaviour: load and encode every file of the batch before embedding."""
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    file_base64_list = [
+        {
+            "content": base64.b64encode(_load_once(f.key)).decode(),
+            "content_type": "image",
+            "file_id": f.id,
+        }
+        for f in upload_files
+    ]
+    _embed(file_base64_list)
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+class _StubEmbeddings:
+    # A plain object rather than a mock, so no call arguments (and their base64 payloads) are retained
+    def __init__(self, cached: dict[str, list[float]]):
+        self.cached = cached
+
+    def get_cached_multimodal_embeddings(self, cache_keys: list[str]) -> dict[str, list[float]]:
+        return self.cached
+
+    def embed_multimodal_documents(
+        self, documents: list[dict], cache_keys: list[str] | None = None
+    ) -> list[list[float]]:
+        return _embed(documents)
+
+
+def bench_sub_batches(upload_files, documents, cached) -> tuple[float, int, int]:
+    vector = Vector.__new__(Vector)
+    vector._embeddings = _StubEmbeddings(cached)
+    vector._vector_processor = MagicMock()
+
+    with (
+        patch("core.rag.datasource.vdb.vector_factory.db") as mock_db,
+        patch("core.rag.datasource.vdb.vector_factory.storage") as mock_storage,
+        patch(
+            "core.rag.datasource.vdb.vector_factory.dify_config.MULTIMODAL_EMBEDDING_BATCH_MAX_BYTES", BATCH_MAX_BYTES
+        ),
+    ):
+        mock_db.session.scalars.return_value.all.return_value = upload_files
+        mock_storage.load_once.side_effect = _load_once
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        vector.create_multimodal(documents)
+        elapsed = time.perf_counter() - t0
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return elapsed, peak, mock_storage.load_once.call_count
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+def main():
+    print("=" * 70)
+    print("Multimodal embedding — peak memory benchmark")
+    print(f"  File size        : {FILE_SIZE // 1024} KiB")
+    print(f"  Cached ratio     : {CACHED_RATIO:.0%}")
+    print(f"  Sub-batch budget : {BATCH_MAX_BYTES // (1024 * 1024)} MiB")
+    print("=" * 70)
+
+    for n_files in FILE_COUNTS:
+        upload_files, documents, cached = _fixtures(n_files)
+        t_full, peak_full = bench_full_batch(upload_files, documents)
+        t_sub, peak_sub, loads = bench_sub_batches(upload_files, documents, cached)
+
+        print(f"\n[{n_files} files]")
+        print(f"  Full batch  : peak {peak_full / 1024 / 1024:.1f} MiB, {t_full * 1000:.0f} ms, {n_files} loads")
+        print(f"  Sub-batches : peak {peak_sub / 1024 / 1024:.1f} MiB, {t_sub * 1000:.0f} ms, {loads} loads")
+        print(f"  Reduction   : {peak_full / peak_sub:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
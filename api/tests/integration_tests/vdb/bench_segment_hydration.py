@@ -0,0 +1,178 @@
+"""
+Benchmark: loading the segments of retrieval results for a popular dataset, with one database query per request
+(previous behaviour) versus the segment hydration cache, and hit_count updates written per request versus buffered
+in Redis and flushed by the batch_update_segment_hit_count task.
+
+The database and Redis are replaced by stand-ins with a fixed latency per round trip, so only the number of round
+trips and the (de)serialization of the cached segments are measured. Queries pick top_k segments with a skewed
+popularity, as the questions asked of a knowledge base repeat.
+
+Usage:
+    uv run --project api python -m tests.integration_tests.vdb.bench_segment_hydration
+"""
+
+import random
+import time
+from collections import defaultdict
+from datetime import datetime
+from unittest.mock import patch
+
+from core.rag.datasource.segment_cache import PENDING_HIT_COUNT_KEY, SegmentHydrationCache, record_segment_hits
+from models.dataset import DocumentSegment
+
+# ---------------------------------------------------------------------------
+# Config
+# ---------------------------------------------------------------------------
+SEGMENTS = 500
+REQUESTS = 2000
+TOP_K = 10
+DB_LATENCY = 0.004  # seconds per database round trip
+REDIS_LATENCY = 0.0003  # seconds per Redis round trip
+CONTENT = "Rotate the API keys of a workspace from the settings page without downtime. " * 12
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+class _Counters:
+    def __init__(self) -> None:
+        self.db = 0
+        self.redis = 0
+
+
+class _Database:
+    def __init__(self, counters: _Counters) -> None:
+        self.counters = counters
+        self.segments = {f"node-{index}": _segment(index) for index in range(SEGMENTS)}
+
+    def load(self, index_node_ids: list[str]) -> list[DocumentSegment]:
+        self.counters.db += 1
+        time.sleep(DB_LATENCY)
+        return [self.segments[index_node_id] for index_node_id in index_node_ids]
+
+    def update_hit_count(self) -> None:
+        self.counters.db += 1
+        time.sleep(DB_LATENCY)
+
+
+class _Redis:
+    """Dict-backed Redis with a round-trip latency per command or pipeline."""
+
+    def __init__(self, counters: _Counters) -> None:
+        self.counters = counters
+        self.data: dict[str, object] = {}
+        self.queued = 0
+
+    def _round_trip(self) -> None:
+        self.counters.redis += 1
+        time.sleep(REDIS_LATENCY)
+
+    def pipeline(self, transaction: bool = True):
+        self.queued = 0
+        return self
+
+    def execute(self):
+        if self.queued:
+            self._round_trip()
+        return []
+
+    def mget(self, keys):
+        self._round_trip()
+        return [self.data.get(key) for key in keys]
+
+    def set(self, key, value, ex=None):
+        self.queued += 1
+        self.data[key] = value.encode()
+
+    def setex(self, key, ttl, value):
+        self.set(key, value)
+
+    def hincrby(self, key, field, amount):
+        self.queued += 1
+        values = self.data.setdefault(key, defaultdict(int))
+        values[field] += amount
+
+
+def _segment(index: int) -> DocumentSegment:
+    return DocumentSegment(
+        id=f"segment-{index}",
+        tenant_id="tenant-1",
+        dataset_id="dataset-1",
+        document_id=f"document-{index // 50}",
+        position=index % 50,
+        content=CONTENT,
+        word_count=len(CONTENT.split()),
+        tokens=len(CONTENT.split()),
+        keywords=["api", "keys", "workspace"],
+        index_node_id=f"node-{index}",
+        index_node_hash=f"hash-{index}",
+        hit_count=0,
+        enabled=True,
+        status="completed",
+        created_by="account-1",
+        created_at=datetime(2025, 1, 1, 12, 0),
+        updated_at=datetime(2025, 1, 1, 12, 0),
+        indexing_at=datetime(2025, 1, 1, 12, 0),
+        completed_at=datetime(2025, 1, 1, 12, 1),
+    )
+
+
+def _queries(seed: int = 0) -> list[list[str]]:
+    rng = random.Random(seed)  # noqa: S311
+    weights = [1 / (rank + 1) for rank in range(SEGMENTS)]
+    queries = []
+    for _ in range(REQUESTS):
+        nodes = rng.choices(range(SEGMENTS), weights=weights, k=TOP_K)
+        queries.append([f"node-{node}" for node in dict.fromkeys(nodes)])
+    return queries
+
+
+def _per_request(queries: list[list[str]]) -> tuple[float, _Counters]:
+    counters = _Counters()
+    database = _Database(counters)
+    started = time.perf_counter()
+    for index_node_ids in queries:
+        database.load(index_node_ids)
+        database.update_hit_count()
+    return time.perf_counter() - started, counters
+
+
+def _cached(queries: list[list[str]]) -> tuple[float, _Counters]:
+    counters = _Counters()
+    database = _Database(counters)
+    redis = _Redis(counters)
+    cache = SegmentHydrationCache(ttl=600)
+    with patch("core.rag.datasource.segment_cache.redis_client", redis):
+        started = time.perf_counter()
+        for index_node_ids in queries:
+            segments = cache.load(dict.fromkeys(index_node_ids, "dataset-1"), database.load)
+            record_segment_hits({segment.id for segment in segments})
+        # one run of the flush task: one UPDATE per distinct hit count
+        pending = redis.data.get(PENDING_HIT_COUNT_KEY, {})
+        assert isinstance(pending, dict)
+        for _ in set(pending.values()):
+            database.update_hit_count()
+        elapsed = time.perf_counter() - started
+    return elapsed, counters
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+def main():
+    print("=" * 70)
+    print("Segment hydration benchmark")
+    print(f"  Dataset         : {SEGMENTS} segments, {REQUESTS} requests of top_k {TOP_K}")
+    print(f"  Latency         : database {DB_LATENCY * 1000:.1f} ms, redis {REDIS_LATENCY * 1000:.1f} ms")
+    print("=" * 70)
+    queries = _queries()
+    for label, run in (("query per request", _per_request), ("hydration cache", _cached)):
+        elapsed, counters = run(queries)
+        print(
+            f"  {label:<18}: {elapsed * 1000:>7.0f} ms  ({elapsed / REQUESTS * 1000:.2f} ms/request)"
+            f"  database round trips {counters.db:>5}  redis round trips {counters.redis:>5}"
+        )
+
+
+if __name__ == "__main__":
+    main()
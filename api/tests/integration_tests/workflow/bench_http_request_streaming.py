@@ -0,0 +1,122 @@
+"""
+Benchmark: peak memory of the HTTP Request node executor when a server returns a body larger than
+HTTP_REQUEST_NODE_MAX_BINARY_SIZE, buffering the whole body before the size check (previous behaviour) versus
+streaming it and aborting once the limit is crossed.
+
+A local HTTP server sends the oversized body in chunks without a Content-Length header, so the streamed read
+cannot reject it up front. Peak memory is measured with tracemalloc, which covers the bytes buffered by httpx.
+
+Usage:
+    uv run --project api python -m tests.integration_tests.workflow.bench_http_request_streaming
+"""
+
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from configs import dify_config
+from core.helper.ssrf_proxy import ssrf_proxy
+from core.workflow.nodes.http_request import HttpRequestNodeAuthorization, HttpRequestNodeData
+from core.workflow.nodes.http_request.entities import HttpRequestNodeTimeout, Response
+from core.workflow.nodes.http_request.exc import ResponseSizeError
+from core.workflow.nodes.http_request.executor import Executor
+from core.workflow.runtime import VariablePool
+from core.workflow.system_variable import SystemVariable
+
+# ---------------------------------------------------------------------------
+# Config
+# ---------------------------------------------------------------------------
+BODY_SIZE = 256 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+CHUNK = b"\0" * CHUNK_SIZE
+
+
+# ---------------------------------------------------------------------------
+# Stub server
+# ---------------------------------------------------------------------------
+class _LargeBodyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for _ in range(BODY_SIZE // CHUNK_SIZE):
+                self.wfile.write(f"{CHUNK_SIZE:x}\r\n".encode() + CHUNK + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+def _executor(url: str) -> Executor:
+    node_data = HttpRequestNodeData(
+        title="bench",
+        method="get",
+        url=url,
+        authorization=HttpRequestNodeAuthorization(type="no-auth"),
+        headers="",
+        params="",
+    )
+    return Executor(
+        node_data=node_data,
+        timeout=HttpRequestNodeTimeout(connect=10, read=60, write=60),
+        variable_pool=VariablePool(system_variables=SystemVariable.default(), user_inputs={}),
+    )
+
+
+def _buffered(url: str):
+    response = ssrf_proxy.get(url, timeout=(10, 60, 60), max_retries=0)
+    if Response(response).size > dify_config.HTTP_REQUEST_NODE_MAX_BINARY_SIZE:
+        raise ResponseSizeError("File size is too large")
+
+
+def _streamed(url: str):
+    _executor(url).invoke()
+
+
+def _measure(step, url: str) -> tuple[float, float]:
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    try:
+        step(url)
+    except ResponseSizeError:
+        pass
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _LargeBodyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/large"
+
+    print("=" * 70)
+    print("HTTP Request node oversized response benchmark")
+    print(f"  Body size  : {BODY_SIZE / 1024 / 1024:.0f} MB")
+    print(f"  Limit      : {dify_config.HTTP_REQUEST_NODE_MAX_BINARY_SIZE / 1024 / 1024:.0f} MB")
+    print("=" * 70)
+
+    try:
+        for label, step in (("Buffered", _buffered), ("Streamed", _streamed)):
+            elapsed, peak = _measure(step, url)
+            print(f"  {label} : {elapsed * 1000:9.2f} ms, peak {peak / 1024 / 1024:8.2f} MB")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
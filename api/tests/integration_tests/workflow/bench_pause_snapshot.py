@@ -0,0 +1,129 @@
+"""
+Benchmark: size of a persisted workflow pause state and the latency of pausing (GraphRuntimeState.dumps plus the
+storage encoding) and resuming (storage decoding plus GraphRuntimeState.from_snapshot) for a run with large
+intermediate node outputs.
+
+The previous behaviour is reproduced by serializing the snapshot with the standard library json encoder and its
+default separators and storing it uncompressed. Object storage round trips are not included, the stored size is
+what they would transfer.
+
+Usage:
+    uv run --project api python -m tests.integration_tests.workflow.bench_pause_snapshot
+"""
+
+import json
+import random
+import string
+import time
+from collections.abc import Callable
+from types import SimpleNamespace
+from unittest import mock
+
+from core.workflow.runtime import GraphRuntimeState, VariablePool
+from repositories.sqlalchemy_api_workflow_run_repository import _decode_pause_state, _encode_pause_state
+
+# ---------------------------------------------------------------------------
+# Config
+# ---------------------------------------------------------------------------
+NODES = 20
+TEXT_BYTES = 64 * 1024  # LLM / code node text output per node
+ROWS = 200  # rows of the structured output per node (e.g. an HTTP or knowledge retrieval result)
+COMPRESSION_LEVELS = (1, 6, 9)
+ROUNDS = 5
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+_VOCABULARY_RNG = random.Random(0)  # noqa: S311
+VOCABULARY = [
+    "".join(_VOCABULARY_RNG.choices(string.ascii_lowercase, k=_VOCABULARY_RNG.randint(2, 9))) for _ in range(2000)
+]
+
+
+def _text(rng: random.Random, size: int) -> str:
+    chunks: list[str] = []
+    length = 0
+    while length < size:
+        word = rng.choice(VOCABULARY)
+        chunks.append(word)
+        length += len(word) + 1
+    return " ".join(chunks)
+
+
+def _runtime_state() -> GraphRuntimeState:
+    rng = random.Random(42)  # noqa: S311
+    pool = VariablePool()
+    pool.add(["sys", "query"], "summarize the quarterly reports")
+    for index in range(NODES):
+        node_id = f"node_{index}"
+        pool.add([node_id, "text"], _text(rng, TEXT_BYTES))
+        pool.add(
+            [node_id, "result"],
+            [
+                {"id": row, "title": _text(rng, 40), "score": rng.random(), "content": _text(rng, 200)}
+                for row in range(ROWS)
+            ],
+        )
+    state = GraphRuntimeState(variable_pool=pool, start_at=time.perf_counter())
+    state.set_output("answer", _text(rng, TEXT_BYTES))
+    return state
+
+
+# previous encoder: the standard library with its default separators
+_LEGACY_ENCODER = SimpleNamespace(dumps=lambda obj, default: json.dumps(obj, default=default).encode())
+
+
+def _legacy_dumps(state: GraphRuntimeState) -> str:
+    with mock.patch("core.workflow.runtime.graph_runtime_state.orjson", _LEGACY_ENCODER):
+        return state.dumps()
+
+
+def _best(func: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+def main():
+    state = _runtime_state()
+    legacy = _legacy_dumps(state).encode()
+
+    print("=" * 70)
+    print("Workflow pause snapshot benchmark")
+    print(f"  Nodes           : {NODES}, {TEXT_BYTES // 1024} KiB text and {ROWS} structured rows each")
+    print(f"  Best of         : {ROUNDS} rounds")
+    print("=" * 70)
+    print(f"{'Format':<22}{'stored KiB':>12}{'pause ms':>12}{'resume ms':>12}")
+
+    def _report(label: str, stored: bytes, pause: Callable[[], object], resume: Callable[[], object]):
+        print(f"{label:<22}{len(stored) / 1024:>12.0f}{_best(pause) * 1000:>12.1f}{_best(resume) * 1000:>12.1f}")
+
+    _report(
+        "Plain JSON (previous)",
+        legacy,
+        lambda: _legacy_dumps(state).encode(),
+        lambda: GraphRuntimeState.from_snapshot(legacy.decode()),
+    )
+    for level in (0, *COMPRESSION_LEVELS):
+        with mock.patch(
+            "repositories.sqlalchemy_api_workflow_run_repository.dify_config.WORKFLOW_PAUSE_STATE_COMPRESSION_LEVEL",
+            level,
+        ):
+            _, stored = _encode_pause_state(state.dumps())
+            _report(
+                "Compact JSON" if level == 0 else f"Compact gzip -{level}",
+                stored,
+                lambda: _encode_pause_state(state.dumps()),
+                lambda stored=stored: GraphRuntimeState.from_snapshot(_decode_pause_state(stored).decode()),
+            )
+
+
+if __name__ == "__main__":
+    main()
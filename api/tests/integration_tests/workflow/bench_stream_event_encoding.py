@@ -0,0 +1,180 @@
+"""
+Benchmark: events/sec per worker for encoding app streams into SSE frames, building a dict per event with
+`model_dump(mode="json")` and encoding it with orjson (previous behaviour) versus the per-task StreamEventEncoder,
+which encodes everything but the text of token deltas once per task.
+
+Two streams are measured through the full-response converters and `convert_to_event_stream`:
+  - message stream : advanced chat answer deltas, one `message` event per token
+  - workflow stream: workflow `text_chunk` events interleaved with `node_finished` events
+
+Usage:
+    uv run --project api python -m tests.integration_tests.workflow.bench_stream_event_encoding
+"""
+
+import time
+from collections.abc import Generator
+from typing import Any, cast
+
+from core.app.apps.advanced_chat.generate_response_converter import AdvancedChatAppGenerateResponseConverter
+from core.app.apps.base_app_generator import BaseAppGenerator
+from core.app.apps.workflow.generate_response_converter import WorkflowAppGenerateResponseConverter
+from core.app.entities.task_entities import (
+    AppStreamResponse,
+    ChatbotAppStreamResponse,
+    ErrorStreamResponse,
+    MessageStreamResponse,
+    NodeFinishStreamResponse,
+    PingStreamResponse,
+    TextChunkStreamResponse,
+    WorkflowAppStreamResponse,
+)
+from core.workflow.enums import WorkflowNodeExecutionStatus
+
+# ---------------------------------------------------------------------------
+# Config
+# ---------------------------------------------------------------------------
+EVENTS = 20000
+NODE_FINISHED_EVERY = 50  # workflow stream: one node_finished per N text chunks
+ROUNDS = 5
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+def _message_stream() -> list[AppStreamResponse]:
+    return [
+        ChatbotAppStreamResponse(
+            conversation_id="4f1c2f7e-7a55-4d0e-9d51-0c7c5f0f6a11",
+            message_id="a6d1b0a2-5f9e-4a55-8c3f-1f4d1b2e9c77",
+            created_at=1735689600,
+            stream_response=MessageStreamResponse(
+                task_id="0b8e5c3a-2d7f-4c1e-9a6b-3e2f1d0c9b88",
+                id="a6d1b0a2-5f9e-4a55-8c3f-1f4d1b2e9c77",
+                answer=f"tok{i % 100} ",
+            ),
+        )
+        for i in range(EVENTS)
+    ]
+
+
+def _workflow_stream() -> list[AppStreamResponse]:
+    workflow_run_id = "7c9e6679-7425-40de-944b-e07fc1f90ae7"
+    stream: list[AppStreamResponse] = []
+    for i in range(EVENTS):
+        if i % NODE_FINISHED_EVERY == 0:
+            stream_response: Any = NodeFinishStreamResponse(
+                task_id="task",
+                workflow_run_id=workflow_run_id,
+                data=NodeFinishStreamResponse.Data(
+                    id=f"exec-{i}",
+                    node_id="llm",
+                    node_type="llm",
+                    title="LLM",
+                    index=i,
+                    inputs={"query": "What is the weather like today?"},
+                    outputs={"text": "It is sunny. " * 20},
+                    status=WorkflowNodeExecutionStatus.SUCCEEDED,
+                    elapsed_time=1.25,
+                    created_at=1735689600,
+                    finished_at=1735689601,
+                ),
+            )
+        else:
+            stream_response = TextChunkStreamResponse(
+                task_id="task", data=TextChunkStreamResponse.Data(text=f"tok{i % 100} ", from_variable_selector=["llm"])
+            )
+        stream.append(WorkflowAppStreamResponse(workflow_run_id=workflow_run_id, stream_response=stream_response))
+    return stream
+
+
+def _legacy_message_converter(stream: list[AppStreamResponse]) -> Generator[dict | str, None, None]:
+    for chunk in stream:
+        chunk = cast(ChatbotAppStreamResponse, chunk)
+        sub_stream_response = chunk.stream_response
+        if isinstance(sub_stream_response, PingStreamResponse):
+            yield "ping"
+            continue
+        response_chunk: dict[str, Any] = {
+            "event": sub_stream_response.event.value,
+            "conversation_id": chunk.conversation_id,
+            "message_id": chunk.message_id,
+            "created_at": chunk.created_at,
+        }
+        if isinstance(sub_stream_response, ErrorStreamResponse):
+            continue
+        response_chunk.update(sub_stream_response.model_dump(mode="json"))
+        yield response_chunk
+
+
+def _legacy_workflow_converter(stream: list[AppStreamResponse]) -> Generator[dict | str, None, None]:
+    for chunk in stream:
+        chunk = cast(WorkflowAppStreamResponse, chunk)
+        sub_stream_response = chunk.stream_response
+        if isinstance(sub_stream_response, PingStreamResponse):
+            yield "ping"
+            continue
+        response_chunk: dict[str, Any] = {
+            "event": sub_stream_response.event.value,
+            "workflow_run_id": chunk.workflow_run_id,
+        }
+        if isinstance(sub_stream_response, ErrorStreamResponse):
+            continue
+        response_chunk.update(sub_stream_response.model_dump(mode="json"))
+        yield response_chunk
+
+
+def _legacy_message_frames(stream: list[AppStreamResponse]):
+    return BaseAppGenerator.convert_to_event_stream(_legacy_message_converter(stream))
+
+
+def _legacy_workflow_frames(stream: list[AppStreamResponse]):
+    return BaseAppGenerator.convert_to_event_stream(_legacy_workflow_converter(stream))
+
+
+def _message_frames(stream: list[AppStreamResponse]):
+    return BaseAppGenerator.convert_to_event_stream(
+        AdvancedChatAppGenerateResponseConverter.convert_stream_full_response(iter(stream))  # type: ignore[arg-type]
+    )
+
+
+def _workflow_frames(stream: list[AppStreamResponse]):
+    return BaseAppGenerator.convert_to_event_stream(
+        WorkflowAppGenerateResponseConverter.convert_stream_full_response(iter(stream))  # type: ignore[arg-type]
+    )
+
+
+def _events_per_second(frames, stream: list[AppStreamResponse]) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        t0 = time.perf_counter()
+        for _ in frames(stream):
+            pass
+        best = min(best, time.perf_counter() - t0)
+    return len(stream) / best
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+def main():
+    message_stream = _message_stream()
+    workflow_stream = _workflow_stream()
+    assert list(_legacy_message_frames(message_stream)) == list(_message_frames(message_stream))
+    assert list(_legacy_workflow_frames(workflow_stream)) == list(_workflow_frames(workflow_stream))
+
+    print("=" * 70)
+    print("SSE stream encoding benchmark (single worker)")
+    print(f"  Stream : {EVENTS} events, best of {ROUNDS}")
+    print("=" * 70)
+
+    for label, legacy_frames, frames, stream in (
+        ("message stream ", _legacy_message_frames, _message_frames, message_stream),
+        ("workflow stream", _legacy_workflow_frames, _workflow_frames, workflow_stream),
+    ):
+        legacy = _events_per_second(legacy_frames, stream)
+        current = _events_per_second(frames, stream)
+        print(f"  {label}: {legacy:12,.0f} -> {current:12,.0f} events/s  ({current / legacy:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
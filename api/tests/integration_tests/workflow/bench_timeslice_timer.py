@@ -0,0 +1,130 @@
+"""
+Benchmark: time slice checks of many concurrent workflow runs in one worker process, with one APScheduler interval
+job per run (previous behaviour of TimeSliceLayer) versus the shared TimeSliceTimer wheel.
+
+Each check pays a simulated Redis round trip: one per run with APScheduler, one per tick with the wheel, which hands
+all runs due in a tick to CFSPlanScheduler.can_schedule_batch. Check lag is how much later than its interval a run
+was checked again, CPU time is what the process spent scheduling and running the checks.
+
+Usage:
+    uv run --project api python -m tests.integration_tests.workflow.bench_timeslice_timer
+"""
+
+import statistics
+import time
+import uuid
+
+from apscheduler.schedulers.background import BackgroundScheduler  # type: ignore
+
+from core.app.layers.timeslice_timer import TimeSliceTimer
+from services.workflow.entities import WorkflowScheduleCFSPlanEntity
+from services.workflow.scheduler import CFSPlanScheduler, SchedulerCommand
+
+# ---------------------------------------------------------------------------
+# Config
+# ---------------------------------------------------------------------------
+RUNS = 20000
+GRANULARITY = 5  # seconds per time slice
+DURATION = 30  # seconds measured per mode
+REDIS_ROUND_TRIP = 0.0005  # seconds
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+class _Scheduler(CFSPlanScheduler):
+    def __init__(self) -> None:
+        super().__init__(
+            WorkflowScheduleCFSPlanEntity(
+                schedule_strategy=WorkflowScheduleCFSPlanEntity.Strategy.TimeSlice, granularity=GRANULARITY
+            )
+        )
+        self.last_check = time.monotonic()
+        self.lags: list[float] = []
+
+    def _record(self) -> None:
+        now = time.monotonic()
+        self.lags.append(now - self.last_check - GRANULARITY)
+        self.last_check = now
+
+    def can_schedule(self) -> SchedulerCommand:
+        time.sleep(REDIS_ROUND_TRIP)
+        self._record()
+        return SchedulerCommand.NONE
+
+    def release(self) -> None:
+        pass
+
+    @classmethod
+    def can_schedule_batch(cls, schedulers):
+        time.sleep(REDIS_ROUND_TRIP)
+        for scheduler in schedulers:
+            scheduler._record()
+        return [SchedulerCommand.NONE] * len(schedulers)
+
+
+def _start_runs(register) -> list[_Scheduler]:
+    # runs start spread over one time slice
+    schedulers = []
+    for index in range(RUNS):
+        scheduler = _Scheduler()
+        register(scheduler)
+        schedulers.append(scheduler)
+        if index % (RUNS // 100) == 0:
+            time.sleep(GRANULARITY / 100)
+    return schedulers
+
+
+def _apscheduler() -> list[_Scheduler]:
+    scheduler = BackgroundScheduler()
+    scheduler.start()
+
+    def register(cfs_plan_scheduler: _Scheduler):
+        scheduler.add_job(cfs_plan_scheduler.can_schedule, "interval", seconds=GRANULARITY, id=uuid.uuid4().hex)
+
+    schedulers = _start_runs(register)
+    time.sleep(DURATION)
+    scheduler.shutdown(wait=False)
+    return schedulers
+
+
+def _wheel() -> list[_Scheduler]:
+    timer = TimeSliceTimer()
+    handles = []
+
+    def register(cfs_plan_scheduler: _Scheduler):
+        handles.append(timer.schedule(cfs_plan_scheduler, GRANULARITY, lambda: None))
+
+    schedulers = _start_runs(register)
+    time.sleep(DURATION)
+    for handle in handles:
+        handle.cancel()
+    return schedulers
+
+
+def _report(label: str, schedulers: list[_Scheduler], cpu_time: float) -> None:
+    lags = sorted(lag for scheduler in schedulers for lag in scheduler.lags)
+    expected = RUNS * (DURATION // GRANULARITY)
+    print(
+        f"  {label:<18}: checks {len(lags):>6}/{expected}  lag p50 {statistics.median(lags) * 1000:>7.1f} ms"
+        f"  p99 {lags[int(len(lags) * 0.99)] * 1000:>7.1f} ms  cpu {cpu_time:>5.1f} s"
+    )
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+def main():
+    print("=" * 70)
+    print("Time slice timer benchmark")
+    print(f"  Concurrent runs : {RUNS}, {GRANULARITY}s time slices, measured for {DURATION}s")
+    print(f"  Redis round trip: {REDIS_ROUND_TRIP * 1000:.1f} ms")
+    print("=" * 70)
+    for label, run in (("APScheduler jobs", _apscheduler), ("TimeSliceTimer", _wheel)):
+        started = time.process_time()
+        schedulers = run()
+        _report(label, schedulers, time.process_time() - started)
+
+
+if __name__ == "__main__":
+    main()
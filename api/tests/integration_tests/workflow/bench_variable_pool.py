@@ -0,0 +1,107 @@
+"""
+Benchmark: VariablePool lookups, template rendering and ConditionProcessor.process_conditions in a hot loop,
+as exercised by if-else / variable-aggregator / list-operator nodes inside iterations and loops.
+
+Each scenario is timed with the compiled selectors, memoized lookups and parsed-template cache enabled, and
+again with the caches bypassed (nested-selector memo cleared, selector and template caches emptied before every
+iteration) to approximate the previous behaviour.
+
+Usage:
+    uv run --project api python -m tests.integration_tests.workflow.bench_variable_pool
+"""
+
+import time
+
+from core.workflow.runtime import VariablePool
+from core.workflow.runtime.variable_pool import _compile_selector, _parse_template
+from core.workflow.utils.condition.entities import Condition
+from core.workflow.utils.condition.processor import ConditionProcessor
+
+# ---------------------------------------------------------------------------
+# Config
+# ---------------------------------------------------------------------------
+ITERATIONS = 1_000
+ROUNDS = 5
+PROCESSOR = ConditionProcessor()
+TEMPLATE = (
+    "User {{#start.user.profile.name#}} asked {{#sys.query#}} about {{#llm.text#}} "
+    "(score {{#start.user.profile.score#}}, lang {{#start.user.profile.lang#}})"
+)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+def _pool() -> VariablePool:
+    pool = VariablePool()
+    pool.add(["sys", "query"], "how do I configure retrieval?")
+    pool.add(["llm", "text"], "knowledge bases")
+    pool.add(["start", "user"], {"profile": {"name": "alice", "score": 42, "lang": "en"}})
+    return pool
+
+
+CONDITIONS = [
+    Condition(variable_selector=["start", "user", "profile", "score"], comparison_operator="≥", value="10"),
+    Condition(variable_selector=["start", "user", "profile", "lang"], comparison_operator="is", value="en"),
+    Condition(variable_selector=["llm", "text"], comparison_operator="contains", value="{{#start.user.profile.lang#}}"),
+    Condition(variable_selector=["sys", "query"], comparison_operator="not empty"),
+]
+
+
+def _reset_caches(pool: VariablePool):
+    pool._nested_segments.clear()
+    _compile_selector.cache_clear()
+    _parse_template.cache_clear()
+
+
+def _run(step, pool: VariablePool, cached: bool) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        t0 = time.perf_counter()
+        for _ in range(ITERATIONS):
+            if not cached:
+                _reset_caches(pool)
+            step(pool)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _nested_get(pool: VariablePool):
+    pool.get(["start", "user", "profile", "name"])
+    pool.get(["start", "user", "profile", "score"])
+    pool.get(["start", "user", "profile", "lang"])
+
+
+def _render(pool: VariablePool):
+    _ = pool.convert_template(TEMPLATE).text
+
+
+def _conditions(pool: VariablePool):
+    PROCESSOR.process_conditions(variable_pool=pool, conditions=CONDITIONS, operator="and")
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+def main():
+    print("=" * 70)
+    print("VariablePool hot-loop benchmark")
+    print(f"  Iterations : {ITERATIONS} (best of {ROUNDS})")
+    print("=" * 70)
+
+    for label, step in (
+        ("VariablePool.get (nested)", _nested_get),
+        ("convert_template", _render),
+        ("process_conditions", _conditions),
+    ):
+        pool = _pool()
+        t_uncached = _run(step, pool, cached=False)
+        t_cached = _run(step, pool, cached=True)
+        print(f"\n[{label}]")
+        print(f"  Uncached : {t_uncached * 1000:8.2f} ms")
+        print(f"  Cached   : {t_cached * 1000:8.2f} ms")
+        print(f"  Speedup  : {t_uncached / t_cached:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
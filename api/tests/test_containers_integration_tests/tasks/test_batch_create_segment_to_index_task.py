@@ -729,3 +729,173 @@ class TestBatchCreateSegmentToIndexTask:
         cache_key = f"segment_batch_import_{job_id}"
         cache_value = redis_client.get(cache_key)
         assert cache_value == b"completed"
+
+    def test_batch_create_segment_to_index_task_imports_in_chunks(
+        self, db_session_with_containers, mock_external_service_dependencies
+    ):
+        """
+        Test that the CSV file is imported and indexed chunk by chunk.
+
+        This test verifies that the task:
+        1. Indexes each chunk of rows separately
+        2. Assigns contiguous positions across chunks
+        3. Clears the progress checkpoint once the job completes
+        """
+        account, tenant = self._create_test_account_and_tenant(db_session_with_containers)
+        dataset = self._create_test_dataset(db_session_with_containers, account, tenant)
+        document = self._create_test_document(db_session_with_containers, account, tenant, dataset)
+        upload_file = self._create_test_upload_file(db_session_with_containers, account, tenant)
+
+        csv_content = self._create_test_csv_content("text_model")
+        mock_storage = mock_external_service_dependencies["storage"]
+
+        def mock_download(key, file_path):
+            Path(file_path).write_text(csv_content, encoding="utf-8")
+
+        mock_storage.download.side_effect = mock_download
+
+        job_id = str(uuid.uuid4())
+        with patch("tasks.batch_create_segment_to_index_task.dify_config.SEGMENT_BATCH_IMPORT_CHUNK_SIZE", 2):
+            batch_create_segment_to_index_task(
+                job_id=job_id,
+                upload_file_id=upload_file.id,
+                dataset_id=dataset.id,
+                document_id=document.id,
+                tenant_id=tenant.id,
+                user_id=account.id,
+            )
+
+        from extensions.ext_database import db
+        from extensions.ext_redis import redis_client
+
+        segments = (
+            db.session.query(DocumentSegment)
+            .filter_by(document_id=document.id)
+            .order_by(DocumentSegment.position)
+            .all()
+        )
+        assert [segment.position for segment in segments] == [1, 2, 3]
+        assert all(segment.status == "completed" for segment in segments)
+
+        mock_vector_service = mock_external_service_dependencies["vector_service"]
+        assert mock_vector_service.create_segments_vector.call_count == 2
+
+        assert redis_client.get(f"segment_batch_import_{job_id}") == b"completed"
+        assert redis_client.get(f"segment_batch_import_{job_id}_progress") is None
+
+    def test_batch_create_segment_to_index_task_resumes_from_checkpoint(
+        self, db_session_with_containers, mock_external_service_dependencies
+    ):
+        """
+        Test that a redelivered task resumes after the last checkpointed chunk.
+
+        This test verifies that the task:
+        1. Skips rows already recorded in the progress checkpoint
+        2. Does not insert segments again for rows imported before the restart
+        """
+        account, tenant = self._create_test_account_and_tenant(db_session_with_containers)
+        dataset = self._create_test_dataset(db_session_with_containers, account, tenant)
+        document = self._create_test_document(db_session_with_containers, account, tenant, dataset)
+        upload_file = self._create_test_upload_file(db_session_with_containers, account, tenant)
+
+        csv_content = self._create_test_csv_content("text_model")
+        mock_storage = mock_external_service_dependencies["storage"]
+
+        def mock_download(key, file_path):
+            Path(file_path).write_text(csv_content, encoding="utf-8")
+
+        mock_storage.download.side_effect = mock_download
+
+        from extensions.ext_database import db
+        from extensions.ext_redis import redis_client
+
+        job_id = str(uuid.uuid4())
+        with patch("tasks.batch_create_segment_to_index_task.dify_config.SEGMENT_BATCH_IMPORT_CHUNK_SIZE", 2):
+            batch_create_segment_to_index_task(
+                job_id=job_id,
+                upload_file_id=upload_file.id,
+                dataset_id=dataset.id,
+                document_id=document.id,
+                tenant_id=tenant.id,
+                user_id=account.id,
+            )
+            # Simulate a redelivery of the task after the first chunk was checkpointed
+            redis_client.setex(f"segment_batch_import_{job_id}_progress", 600, 2)
+            batch_create_segment_to_index_task(
+                job_id=job_id,
+                upload_file_id=upload_file.id,
+                dataset_id=dataset.id,
+                document_id=document.id,
+                tenant_id=tenant.id,
+                user_id=account.id,
+            )
+
+        segments = db.session.query(DocumentSegment).filter_by(document_id=document.id).all()
+        assert len(segments) == 3
+
+        mock_vector_service = mock_external_service_dependencies["vector_service"]
+        assert mock_vector_service.create_segments_vector.call_count == 2
+
+    def test_batch_create_segment_to_index_task_resumes_after_indexing_failure(
+        self, db_session_with_containers, mock_external_service_dependencies
+    ):
+        """
+        Test a job interrupted after a chunk was committed but before it was indexed.
+
+        This test verifies that the task:
+        1. Marks the job as failed and keeps the progress checkpoint when indexing a chunk raises
+        2. Leaves the committed rows of the failed chunk in "indexing" status
+        3. On resume, indexes those rows again without inserting them a second time
+        """
+        account, tenant = self._create_test_account_and_tenant(db_session_with_containers)
+        dataset = self._create_test_dataset(db_session_with_containers, account, tenant)
+        document = self._create_test_document(db_session_with_containers, account, tenant, dataset)
+        upload_file = self._create_test_upload_file(db_session_with_containers, account, tenant)
+
+        csv_content = self._create_test_csv_content("text_model")
+        mock_storage = mock_external_service_dependencies["storage"]
+
+        def mock_download(key, file_path):
+            Path(file_path).write_text(csv_content, encoding="utf-8")
+
+        mock_storage.download.side_effect = mock_download
+
+        from extensions.ext_database import db
+        from extensions.ext_redis import redis_client
+
+        mock_vector_service = mock_external_service_dependencies["vector_service"]
+        mock_vector_service.create_segments_vector.side_effect = [None, RuntimeError("vector store down")]
+
+        job_id = str(uuid.uuid4())
+        task_kwargs = {
+            "job_id": job_id,
+            "upload_file_id": upload_file.id,
+            "dataset_id": dataset.id,
+            "document_id": document.id,
+            "tenant_id": tenant.id,
+            "user_id": account.id,
+        }
+        with patch("tasks.batch_create_segment_to_index_task.dify_config.SEGMENT_BATCH_IMPORT_CHUNK_SIZE", 2):
+            with pytest.raises(RuntimeError, match="vector store down"):
+                batch_create_segment_to_index_task(**task_kwargs)
+
+            assert redis_client.get(f"segment_batch_import_{job_id}") == b"error"
+            assert redis_client.get(f"segment_batch_import_{job_id}_progress") == b"2"
+            statuses = sorted(
+                segment.status for segment in db.session.query(DocumentSegment).filter_by(document_id=document.id)
+            )
+            assert statuses == ["completed", "completed", "indexing"]
+
+            mock_vector_service.create_segments_vector.side_effect = None
+            batch_create_segment_to_index_task(**task_kwargs)
+
+        db.session.expire_all()
+        segments = db.session.query(DocumentSegment).filter_by(document_id=document.id).all()
+        assert len(segments) == 3
+        assert all(segment.status == "completed" for segment in segments)
+
+        # One call per chunk on the first run, then the failed chunk again on resume
+        assert mock_vector_service.create_segments_vector.call_count == 3
+        resumed_segments = mock_vector_service.create_segments_vector.call_args.args[1]
+        assert len(resumed_segments) == 1
+        assert redis_client.get(f"segment_batch_import_{job_id}") == b"completed"
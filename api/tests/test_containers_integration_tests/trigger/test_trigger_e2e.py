@@ -36,6 +36,7 @@ from schedule import workflow_schedule_task
 from schedule.workflow_schedule_task import poll_workflow_schedules
 from services import feature_service as feature_service_module
 from services.trigger import webhook_service
+from services.trigger.schedule_dispatch_index import schedule_dispatch_index
 from services.trigger.schedule_service import ScheduleService
 from services.workflow_service import WorkflowService
 from tasks import trigger_processing_tasks
@@ -257,6 +258,7 @@ def test_schedule_poll_dispatches_due_plan(
     )
     db_session_with_containers.add_all([app_trigger, plan])
     db_session_with_containers.commit()
+    schedule_dispatch_index.add([(plan.id, plan.next_run_at)])
 
     next_time = naive_utc_now() + timedelta(hours=1)
     monkeypatch.setattr(workflow_schedule_task, "calculate_next_run_at", lambda *_args, **_kwargs: next_time)
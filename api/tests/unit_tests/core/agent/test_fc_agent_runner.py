@@ -0,0 +1,75 @@
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from core.agent.fc_agent_runner import FunctionCallAgentRunner
+from core.tools.entities.tool_entities import ToolInvokeMeta
+
+
+def _runner(max_parallel_tool_calls: int) -> FunctionCallAgentRunner:
+    runner = FunctionCallAgentRunner.__new__(FunctionCallAgentRunner)
+    runner.app_config = SimpleNamespace(agent=SimpleNamespace(max_parallel_tool_calls=max_parallel_tool_calls))  # type: ignore
+    runner.application_generate_entity = MagicMock()
+    runner.message = MagicMock()
+    runner.conversation = MagicMock()
+    runner.agent_callback = MagicMock()
+    runner.user_id = "user"
+    runner.tenant_id = "tenant"
+    return runner
+
+
+class _StubToolEngine:
+    """Sleeps for the requested delay and tracks how many calls overlap."""
+
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def agent_invoke(self, tool, tool_parameters, **kwargs):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(tool_parameters["delay"])
+        with self.lock:
+            self.active -= 1
+        return f"{tool}:{tool_parameters['delay']}", [f"file-{tool}"], ToolInvokeMeta.empty()
+
+
+TOOL_CALLS = [
+    ("call-1", "slow", {"delay": 0.2}),
+    ("call-2", "missing", {}),
+    ("call-3", "fast", {"delay": 0.0}),
+]
+
+
+def _invoke(max_parallel_tool_calls: int) -> tuple[list, _StubToolEngine]:
+    engine = _StubToolEngine()
+    with patch("core.agent.fc_agent_runner.ToolEngine", engine):
+        results = _runner(max_parallel_tool_calls)._invoke_tool_calls(
+            {"slow": "slow", "fast": "fast"},  # type: ignore
+            TOOL_CALLS,
+            None,
+        )
+    return results, engine
+
+
+def test_invoke_tool_calls_sequentially_by_default():
+    results, engine = _invoke(1)
+
+    assert engine.max_active == 1
+    assert [response["tool_call_id"] for response, _ in results] == ["call-1", "call-2", "call-3"]
+
+
+def test_invoke_tool_calls_concurrently_preserves_order():
+    results, engine = _invoke(4)
+
+    assert engine.max_active == 2
+    assert [response["tool_call_id"] for response, _ in results] == ["call-1", "call-2", "call-3"]
+    assert [response["tool_response"] for response, _ in results] == [
+        "slow:0.2",
+        "there is not a tool named missing",
+        "fast:0.0",
+    ]
+    assert [files for _, files in results] == [["file-slow"], [], ["file-fast"]]
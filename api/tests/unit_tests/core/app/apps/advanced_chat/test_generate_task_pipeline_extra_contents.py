@@ -11,6 +11,7 @@ from core.app.apps.advanced_chat import generate_task_pipeline as pipeline_modul
 from core.app.entities.app_invoke_entities import InvokeFrom
 from core.app.entities.queue_entities import QueueTextChunkEvent, QueueWorkflowPausedEvent
 from core.workflow.entities.pause_reason import HumanInputRequired
+from core.workflow.repositories.draft_variable_repository import NoopDraftVariableSaverFactory
 from models.enums import MessageStatus
 from models.execution_extra_content import HumanInputContent
 from models.model import EndUser
@@ -23,6 +24,7 @@ def _build_pipeline() -> pipeline_module.AdvancedChatAppGenerateTaskPipeline:
     pipeline._workflow_run_id = "run-1"
     pipeline._message_id = "message-1"
     pipeline._workflow_tenant_id = "tenant-1"
+    pipeline._draft_var_saver_factory = NoopDraftVariableSaverFactory()
     return pipeline
 
 
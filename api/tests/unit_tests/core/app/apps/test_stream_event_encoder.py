@@ -0,0 +1,128 @@
+import orjson
+
+from core.app.apps.advanced_chat.generate_response_converter import AdvancedChatAppGenerateResponseConverter
+from core.app.apps.base_app_generator import BaseAppGenerator
+from core.app.apps.stream_event_encoder import EncodedStreamEvent, StreamEventEncoder
+from core.app.apps.workflow.generate_response_converter import WorkflowAppGenerateResponseConverter
+from core.app.entities.task_entities import (
+    AgentMessageStreamResponse,
+    ChatbotAppStreamResponse,
+    MessageStreamResponse,
+    PingStreamResponse,
+    StreamResponse,
+    TextChunkStreamResponse,
+    WorkflowAppStreamResponse,
+    WorkflowStartStreamResponse,
+)
+from core.plugin.backwards_invocation.base import BaseBackwardsInvocation, BaseBackwardsInvocationResponse
+from libs.orjson import orjson_dumps
+
+
+def _legacy_encode(envelope: dict, stream_response: StreamResponse) -> str:
+    response_chunk = dict(envelope)
+    response_chunk.update(stream_response.model_dump(mode="json"))
+    return orjson_dumps(response_chunk)
+
+
+def _text_chunk(text: str) -> TextChunkStreamResponse:
+    return TextChunkStreamResponse(task_id="task-1", data=TextChunkStreamResponse.Data(text=text))
+
+
+def _workflow_started(workflow_run_id: str = "run-1") -> WorkflowStartStreamResponse:
+    return WorkflowStartStreamResponse(
+        task_id="task-1",
+        workflow_run_id=workflow_run_id,
+        data=WorkflowStartStreamResponse.Data(
+            id="run-1", workflow_id="wf-1", inputs={"query": "héllo", "n": 1.5}, created_at=1
+        ),
+    )
+
+
+class TestStreamEventEncoder:
+    def test_encodes_token_deltas_like_legacy_encoding(self):
+        encoder = StreamEventEncoder()
+        chat_envelope = {"event": "message", "conversation_id": "c-1", "message_id": "m-1", "created_at": 1}
+        workflow_envelope = {"event": "text_chunk", "workflow_run_id": "run-1"}
+
+        for envelope, stream_response in (
+            (chat_envelope, MessageStreamResponse(task_id="task-1", id="m-1", answer='say "hi" ✓')),
+            (
+                chat_envelope,
+                MessageStreamResponse(task_id="task-1", id="m-1", answer="\n", from_variable_selector=["a"]),
+            ),
+            (
+                {**chat_envelope, "event": "agent_message"},
+                AgentMessageStreamResponse(task_id="t", id="m-1", answer="é"),
+            ),
+            (workflow_envelope, _text_chunk("héllo")),
+            (workflow_envelope, _text_chunk("again")),
+        ):
+            encoded = encoder.encode(envelope, stream_response)
+
+            assert isinstance(encoded, EncodedStreamEvent)
+            assert encoded.event == envelope["event"]
+            assert encoded.data == _legacy_encode(envelope, stream_response)
+
+    def test_merges_other_responses(self):
+        envelope = {"event": "workflow_started", "workflow_run_id": "run-1"}
+
+        encoded = StreamEventEncoder().encode(envelope, _workflow_started())
+
+        assert isinstance(encoded, dict)
+        assert orjson_dumps(encoded) == _legacy_encode(envelope, _workflow_started())
+
+    def test_merges_token_delta_overriding_envelope(self):
+        envelope = {"event": "text_chunk", "task_id": "other-task"}
+
+        encoded = StreamEventEncoder().encode(envelope, _text_chunk("hi"))
+
+        assert isinstance(encoded, dict)
+        assert orjson_dumps(encoded) == _legacy_encode(envelope, _text_chunk("hi"))
+
+    def test_merges_token_delta_with_unhashable_envelope(self):
+        envelope = {"event": "text_chunk", "metadata": {"a": 1}}
+
+        encoded = StreamEventEncoder().encode(envelope, _text_chunk("hi"))
+
+        assert isinstance(encoded, dict)
+        assert orjson_dumps(encoded) == _legacy_encode(envelope, _text_chunk("hi"))
+
+
+def test_converter_stream_is_written_to_event_stream_as_before():
+    def _stream():
+        yield WorkflowAppStreamResponse(workflow_run_id="run-1", stream_response=PingStreamResponse(task_id="task-1"))
+        yield WorkflowAppStreamResponse(workflow_run_id="run-1", stream_response=_workflow_started())
+        yield WorkflowAppStreamResponse(workflow_run_id="run-1", stream_response=_text_chunk("hi"))
+
+    events = list(
+        BaseAppGenerator.convert_to_event_stream(
+            WorkflowAppGenerateResponseConverter.convert_stream_full_response(_stream())
+        )
+    )
+
+    assert events == [
+        "event: ping\n\n",
+        f"data: {_legacy_encode({'event': 'workflow_started', 'workflow_run_id': 'run-1'}, _workflow_started())}\n\n",
+        f"data: {_legacy_encode({'event': 'text_chunk', 'workflow_run_id': 'run-1'}, _text_chunk('hi'))}\n\n",
+    ]
+
+
+def test_plugin_backwards_invocation_wraps_encoded_events():
+    def _stream():
+        yield ChatbotAppStreamResponse(
+            conversation_id="c-1",
+            message_id="m-1",
+            created_at=1,
+            stream_response=MessageStreamResponse(task_id="task-1", id="m-1", answer="hi"),
+        )
+
+    chunks = AdvancedChatAppGenerateResponseConverter.convert_stream_full_response(_stream())
+    payloads = list(BaseBackwardsInvocation.convert_to_event_stream(chunks))
+
+    expected_data = orjson.loads(
+        _legacy_encode(
+            {"event": "message", "conversation_id": "c-1", "message_id": "m-1", "created_at": 1},
+            MessageStreamResponse(task_id="task-1", id="m-1", answer="hi"),
+        )
+    )
+    assert payloads == [BaseBackwardsInvocationResponse(data=expected_data).model_dump_json().encode()]
@@ -30,6 +30,9 @@ class MockReadOnlyVariablePool:
     def get_by_prefix(self, prefix: str) -> dict[str, object]:
         return {key: value for (nid, key), value in self._variables.items() if nid == prefix}
 
+    def size(self) -> int:
+        return len(self._variables)
+
 
 def _build_graph_runtime_state(
     variable_pool: MockReadOnlyVariablePool,
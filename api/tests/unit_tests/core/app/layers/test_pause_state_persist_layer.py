@@ -84,6 +84,9 @@ class MockReadOnlyVariablePool:
     def get_by_prefix(self, prefix: str) -> dict[str, object]:
         return {f"{nid}.{key}": value for (nid, key), value in self._variables.items() if nid.startswith(prefix)}
 
+    def size(self) -> int:
+        return len(self._variables)
+
 
 class MockReadOnlyGraphRuntimeState:
     """Mock implementation of ReadOnlyGraphRuntimeState for testing."""
@@ -0,0 +1,143 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.app.layers.timeslice_layer import TimeSliceLayer
+from core.app.layers.timeslice_timer import TimeSliceTimer
+from core.workflow.graph_engine.entities.commands import PauseCommand
+from services.workflow.entities import WorkflowScheduleCFSPlanEntity
+from services.workflow.scheduler import CFSPlanScheduler, SchedulerCommand
+
+
+class _Scheduler(CFSPlanScheduler):
+    batches: list[int] = []
+
+    def __init__(self, commands: list[SchedulerCommand] | None = None):
+        super().__init__(
+            WorkflowScheduleCFSPlanEntity(
+                schedule_strategy=WorkflowScheduleCFSPlanEntity.Strategy.TimeSlice, granularity=3
+            )
+        )
+        self.commands = commands or []
+        self.checks = 0
+
+    def can_schedule(self) -> SchedulerCommand:
+        self.checks += 1
+        return self.commands.pop(0) if self.commands else SchedulerCommand.NONE
+
+    def release(self) -> None:
+        pass
+
+    @classmethod
+    def can_schedule_batch(cls, schedulers):
+        cls.batches.append(len(schedulers))
+        return super().can_schedule_batch(schedulers)
+
+
+@pytest.fixture
+def timer():
+    timer = TimeSliceTimer(tick=1.0, slots=4)
+    # the wheel is advanced by the tests instead of the timer thread
+    timer._start = lambda: None
+    _Scheduler.batches = []
+    return timer
+
+
+def _advance(timer: TimeSliceTimer, ticks: int):
+    for _ in range(ticks):
+        timer._advance()
+
+
+class TestTimeSliceTimer:
+    def test_checks_runs_every_interval_in_one_batch(self, timer):
+        schedulers = [_Scheduler() for _ in range(3)]
+        for scheduler in schedulers:
+            timer.schedule(scheduler, 3, MagicMock())
+
+        _advance(timer, 2)
+        assert [scheduler.checks for scheduler in schedulers] == [0, 0, 0]
+
+        _advance(timer, 1)
+        assert [scheduler.checks for scheduler in schedulers] == [1, 1, 1]
+        assert _Scheduler.batches == [3]
+
+        _advance(timer, 3)
+        assert [scheduler.checks for scheduler in schedulers] == [2, 2, 2]
+
+    def test_intervals_longer_than_the_wheel_wait_for_more_turns(self, timer):
+        scheduler = _Scheduler()
+        timer.schedule(scheduler, 10, MagicMock())
+
+        _advance(timer, 9)
+        assert scheduler.checks == 0
+        _advance(timer, 1)
+        assert scheduler.checks == 1
+
+    def test_run_yields_once_and_is_no_longer_checked(self, timer):
+        scheduler = _Scheduler([SchedulerCommand.NONE, SchedulerCommand.RESOURCE_LIMIT_REACHED])
+        on_yield = MagicMock()
+        timer.schedule(scheduler, 1, on_yield)
+
+        _advance(timer, 5)
+
+        assert scheduler.checks == 2
+        on_yield.assert_called_once()
+
+    def test_cancelled_runs_are_not_checked(self, timer):
+        scheduler = _Scheduler()
+        timer.schedule(scheduler, 1, MagicMock()).cancel()
+
+        _advance(timer, 3)
+
+        assert scheduler.checks == 0
+
+    def test_failing_batch_keeps_runs_scheduled(self, timer):
+        scheduler = _Scheduler()
+        timer.schedule(scheduler, 1, MagicMock())
+
+        with patch.object(_Scheduler, "can_schedule_batch", side_effect=RuntimeError("boom")):
+            _advance(timer, 1)
+        _advance(timer, 1)
+
+        assert scheduler.checks == 1
+
+
+class TestTimeSliceLayer:
+    @pytest.fixture
+    def layer(self):
+        with patch("core.app.layers.timeslice_layer.time_slice_timer") as timer:
+            layer = TimeSliceLayer(MagicMock(spec=CFSPlanScheduler))
+            layer.cfs_plan_scheduler.plan = WorkflowScheduleCFSPlanEntity(
+                schedule_strategy=WorkflowScheduleCFSPlanEntity.Strategy.TimeSlice, granularity=10
+            )
+            layer.command_channel = MagicMock()
+            layer.on_graph_start()
+            yield layer, timer
+
+    def test_registers_run_with_timer(self, layer):
+        layer, timer = layer
+
+        timer.schedule.assert_called_once_with(layer.cfs_plan_scheduler, 10, layer._suspend)
+
+    def test_suspend_pauses_run_and_keeps_share(self, layer):
+        layer, timer = layer
+
+        layer._suspend()
+        layer.on_graph_end(None)
+
+        command = layer.command_channel.send_command.call_args.args[0]
+        assert isinstance(command, PauseCommand)
+        assert command.reason == SchedulerCommand.RESOURCE_LIMIT_REACHED
+        assert layer.preempted is True
+        layer.cfs_plan_scheduler.release.assert_not_called()
+
+    def test_graph_end_stops_timer_and_releases_share(self, layer):
+        layer, timer = layer
+
+        layer.on_graph_end(None)
+        layer._suspend()
+
+        timer.schedule.return_value.cancel.assert_called_once()
+        layer.command_channel.send_command.assert_not_called()
+        assert layer.preempted is False
+        layer.cfs_plan_scheduler.release.assert_called_once()
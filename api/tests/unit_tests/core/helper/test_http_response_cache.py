@@ -0,0 +1,174 @@
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from core.helper.http_response_cache import CachedResponse, HttpResponseCache
+
+URL = "https://api.example.com/reference"
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data: dict[str, str] = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def hincrby(self, key, field, amount):
+        pass
+
+
+@pytest.fixture
+def fake_redis():
+    redis = _FakeRedis()
+    with patch("core.helper.http_response_cache.redis_client", redis):
+        yield redis
+
+
+def _cache(**kwargs) -> HttpResponseCache:
+    config = {"max_entry_size": 1024, "local_max_size": 4096, "retention": 3600}
+    config.update(kwargs)
+    return HttpResponseCache(**config)
+
+
+def _server(*responses: httpx.Response) -> MagicMock:
+    for response in responses:
+        response.request = httpx.Request("GET", URL)
+    return MagicMock(side_effect=list(responses))
+
+
+def _fetch(cache: HttpResponseCache, send, *, tenant_id: str = "tenant-1", method: str = "GET", **kwargs):
+    headers = kwargs.pop("headers", {})
+    return cache.fetch(
+        tenant_id=tenant_id,
+        method=method,
+        url=URL,
+        headers=headers,
+        request_identity={"headers": headers},
+        send=send,
+        read_body=lambda response: response.read(),
+        **kwargs,
+    )
+
+
+class TestHttpResponseCache:
+    def test_serves_fresh_response_from_cache(self, fake_redis):
+        cache = _cache()
+        send = _server(httpx.Response(200, headers={"cache-control": "max-age=60"}, content=b"v1"))
+
+        first = _fetch(cache, send)
+        second = _fetch(cache, send)
+
+        assert first.content == second.content == b"v1"
+        assert send.call_count == 1
+        assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+    def test_does_not_cache_without_freshness_or_validators(self, fake_redis):
+        cache = _cache()
+        send = _server(httpx.Response(200, content=b"v1"), httpx.Response(200, content=b"v2"))
+
+        assert _fetch(cache, send).content == b"v1"
+        assert _fetch(cache, send).content == b"v2"
+
+    def test_default_ttl_applies_without_freshness_information(self, fake_redis):
+        cache = _cache()
+        send = _server(httpx.Response(200, content=b"v1"))
+
+        _fetch(cache, send, default_ttl=60)
+        assert _fetch(cache, send, default_ttl=60).content == b"v1"
+        assert send.call_count == 1
+
+    @pytest.mark.parametrize("cache_control", ["no-store", "max-age=60, no-store"])
+    def test_honors_no_store(self, fake_redis, cache_control):
+        cache = _cache()
+        send = _server(
+            httpx.Response(200, headers={"cache-control": cache_control}, content=b"v1"),
+            httpx.Response(200, content=b"v2"),
+        )
+
+        _fetch(cache, send, default_ttl=60)
+        assert _fetch(cache, send).content == b"v2"
+
+    def test_revalidates_stale_response_with_etag(self, fake_redis):
+        cache = _cache()
+        send = _server(
+            httpx.Response(200, headers={"cache-control": "no-cache", "etag": '"abc"'}, content=b"v1"),
+            httpx.Response(304, headers={"etag": '"abc"'}),
+        )
+
+        _fetch(cache, send)
+        response = _fetch(cache, send)
+
+        assert response.status_code == 200
+        assert response.content == b"v1"
+        assert send.call_args.args[0]["If-None-Match"] == '"abc"'
+        assert cache.stats.revalidations == 1
+
+    def test_replaces_entry_when_revalidation_returns_new_content(self, fake_redis):
+        cache = _cache()
+        send = _server(
+            httpx.Response(200, headers={"last-modified": "Mon, 01 Jan 2024 00:00:00 GMT"}, content=b"v1"),
+            httpx.Response(200, headers={"cache-control": "max-age=60"}, content=b"v2"),
+        )
+
+        _fetch(cache, send)
+        assert _fetch(cache, send).content == b"v2"
+        assert send.call_args.args[0]["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+        assert _fetch(cache, send).content == b"v2"
+
+    def test_keys_entries_per_tenant(self, fake_redis):
+        cache = _cache()
+        send = _server(
+            httpx.Response(200, headers={"cache-control": "max-age=60"}, content=b"tenant-1"),
+            httpx.Response(200, headers={"cache-control": "max-age=60"}, content=b"tenant-2"),
+        )
+
+        _fetch(cache, send, tenant_id="tenant-1")
+        assert _fetch(cache, send, tenant_id="tenant-2").content == b"tenant-2"
+
+    def test_skips_non_idempotent_methods_and_oversized_bodies(self, fake_redis):
+        cache = _cache(max_entry_size=4)
+        send = _server(
+            httpx.Response(200, headers={"cache-control": "max-age=60"}, content=b"post"),
+            httpx.Response(200, headers={"cache-control": "max-age=60"}, content=b"too large"),
+            httpx.Response(200, headers={"cache-control": "max-age=60"}, content=b"too large"),
+        )
+
+        _fetch(cache, send, method="POST")
+        _fetch(cache, send)
+        _fetch(cache, send)
+
+        assert send.call_count == 3
+        assert fake_redis.data == {}
+
+    def test_shares_entries_across_processes_through_redis(self, fake_redis):
+        send = _server(httpx.Response(200, headers={"cache-control": "max-age=60"}, content=b"v1"))
+
+        _fetch(_cache(), send)
+        response = _fetch(_cache(), send)
+
+        assert response.content == b"v1"
+        assert send.call_count == 1
+
+    def test_strips_content_encoding_of_decoded_body(self, fake_redis):
+        cache = _cache()
+        send = _server(
+            httpx.Response(
+                200,
+                headers={"cache-control": "max-age=60", "content-encoding": "identity", "x-source": "origin"},
+                content=b"v1",
+            )
+        )
+
+        _fetch(cache, send)
+        entry = CachedResponse.loads(next(iter(fake_redis.data.values())))
+
+        assert "content-encoding" not in entry.headers
+        assert entry.headers["x-source"] == "origin"
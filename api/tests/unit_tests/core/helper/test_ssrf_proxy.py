@@ -4,6 +4,7 @@ import pytest
 
 from core.helper.ssrf_proxy import (
     SSRF_DEFAULT_MAX_RETRIES,
+    MaxRetriesExceededError,
     _get_user_provided_host_header,
     make_request,
 )
@@ -35,6 +36,37 @@ def test_retry_exceed_max_retries(mock_get_client):
     assert str(e.value) == f"Reached maximum retries ({SSRF_DEFAULT_MAX_RETRIES - 1}) for URL http://example.com"
 
 
+@patch("core.helper.ssrf_proxy._get_ssrf_client")
+def test_streamed_request_is_sent_without_reading_body(mock_get_client):
+    mock_client = MagicMock()
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_client.send.return_value = mock_response
+    mock_get_client.return_value = mock_client
+
+    response = make_request("GET", "http://example.com", stream=True, follow_redirects=True)
+
+    assert response is mock_response
+    mock_client.request.assert_not_called()
+    assert "follow_redirects" not in mock_client.build_request.call_args.kwargs
+    send_kwargs = mock_client.send.call_args.kwargs
+    assert send_kwargs["stream"] is True
+    assert send_kwargs["follow_redirects"] is True
+
+
+@patch("core.helper.ssrf_proxy._get_ssrf_client")
+def test_streamed_request_closes_discarded_responses(mock_get_client):
+    mock_client = MagicMock()
+    mock_response = MagicMock()
+    mock_response.status_code = 500
+    mock_client.send.return_value = mock_response
+    mock_get_client.return_value = mock_client
+
+    with pytest.raises(MaxRetriesExceededError):
+        make_request("GET", "http://example.com", max_retries=1, stream=True)
+    assert mock_response.close.call_count == 2
+
+
 class TestGetUserProvidedHostHeader:
     """Tests for _get_user_provided_host_header function."""
 
@@ -0,0 +1,139 @@
+"""Unit tests for the MCP session pool."""
+
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from core.mcp.session_pool import MCPSessionPool
+
+SERVER_URL = "http://test.example.com/mcp"
+
+
+def _provider(tenant_id: str = "tenant-1", provider_id: str = "provider-1") -> Mock:
+    provider = Mock()
+    provider.tenant_id = tenant_id
+    provider.id = provider_id
+    return provider
+
+
+def _make_client(**kwargs) -> MagicMock:
+    client = MagicMock()
+    client.server_url = kwargs["server_url"]
+    client.headers = kwargs["headers"]
+    client._session = Mock()
+    return client
+
+
+@pytest.fixture
+def client_class():
+    with patch("core.mcp.session_pool.MCPClientWithAuthRetry", side_effect=_make_client) as mock_class:
+        yield mock_class
+
+
+def _pool(**kwargs) -> MCPSessionPool:
+    config = {"max_idle_per_key": 2, "max_sessions": 4, "idle_timeout": 300, "health_check_interval": 30}
+    config.update(kwargs)
+    return MCPSessionPool(**config)
+
+
+class TestMCPSessionPool:
+    def test_reuses_session_for_same_credentials(self, client_class):
+        pool = _pool()
+        headers = {"Authorization": "Bearer a"}
+
+        with pool.session(provider_entity=_provider(), server_url=SERVER_URL, headers=headers) as first:
+            pass
+        with pool.session(provider_entity=_provider(), server_url=SERVER_URL, headers=headers) as second:
+            pass
+
+        assert first is second
+        assert client_class.call_count == 1
+        first.__enter__.assert_called_once()
+        first.cleanup.assert_not_called()
+
+    def test_does_not_share_sessions_across_credentials_or_tenants(self, client_class):
+        pool = _pool()
+
+        with pool.session(provider_entity=_provider(), server_url=SERVER_URL, headers={"Authorization": "Bearer a"}):
+            pass
+        with pool.session(provider_entity=_provider(), server_url=SERVER_URL, headers={"Authorization": "Bearer b"}):
+            pass
+        with pool.session(provider_entity=_provider(tenant_id="tenant-2"), server_url=SERVER_URL, headers={}):
+            pass
+
+        assert client_class.call_count == 3
+
+    def test_discards_session_when_call_raises(self, client_class):
+        pool = _pool()
+
+        with pytest.raises(RuntimeError):
+            with pool.session(provider_entity=_provider(), server_url=SERVER_URL, headers={}) as client:
+                raise RuntimeError("transport closed")
+        with pool.session(provider_entity=_provider(), server_url=SERVER_URL, headers={}) as second:
+            pass
+
+        client.cleanup.assert_called_once()
+        assert second is not client
+
+    def test_returns_session_under_refreshed_credentials(self, client_class):
+        pool = _pool()
+
+        with pool.session(
+            provider_entity=_provider(), server_url=SERVER_URL, headers={"Authorization": "Bearer old"}
+        ) as client:
+            # The auth retry reconnects with the refreshed token
+            client.headers["Authorization"] = "Bearer new"
+        with pool.session(
+            provider_entity=_provider(), server_url=SERVER_URL, headers={"Authorization": "Bearer new"}
+        ) as second:
+            pass
+
+        assert second is client
+        assert client_class.call_count == 1
+
+    def test_pings_stale_session_and_replaces_it_when_unhealthy(self, client_class):
+        pool = _pool(health_check_interval=0)
+
+        with pool.session(provider_entity=_provider(), server_url=SERVER_URL, headers={}) as client:
+            pass
+        client._session.send_ping.side_effect = ConnectionError("gone")
+        with pool.session(provider_entity=_provider(), server_url=SERVER_URL, headers={}) as second:
+            pass
+
+        client._session.send_ping.assert_called_once()
+        client.cleanup.assert_called_once()
+        assert second is not client
+
+    def test_closes_sessions_idle_past_timeout(self, client_class):
+        pool = _pool(idle_timeout=0)
+
+        with pool.session(provider_entity=_provider(), server_url=SERVER_URL, headers={}) as client:
+            pass
+        with pool.session(provider_entity=_provider(), server_url=SERVER_URL, headers={}) as second:
+            pass
+
+        client.cleanup.assert_called_once()
+        assert second is not client
+
+    def test_evicts_least_recently_used_when_full(self, client_class):
+        pool = _pool(max_sessions=2)
+
+        clients = []
+        for provider_id in ("p1", "p2", "p3"):
+            with pool.session(
+                provider_entity=_provider(provider_id=provider_id), server_url=SERVER_URL, headers={}
+            ) as c:
+                clients.append(c)
+
+        clients[0].cleanup.assert_called_once()
+        clients[1].cleanup.assert_not_called()
+        clients[2].cleanup.assert_not_called()
+
+    def test_close_all(self, client_class):
+        pool = _pool()
+
+        with pool.session(provider_entity=_provider(), server_url=SERVER_URL, headers={}) as client:
+            pass
+        pool.close_all()
+
+        client.cleanup.assert_called_once()
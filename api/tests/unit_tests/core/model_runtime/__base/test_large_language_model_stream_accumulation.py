@@ -0,0 +1,75 @@
+from unittest.mock import MagicMock
+
+from core.model_runtime.callbacks.base_callback import Callback
+from core.model_runtime.entities.llm_entities import LLMResultChunk, LLMResultChunkDelta, LLMUsage
+from core.model_runtime.entities.message_entities import (
+    AssistantPromptMessage,
+    ImagePromptMessageContent,
+    TextPromptMessageContent,
+    UserPromptMessage,
+)
+from core.model_runtime.entities.model_entities import ModelType
+from core.model_runtime.model_providers.__base.large_language_model import LargeLanguageModel
+
+PROMPT_MESSAGES = [UserPromptMessage(content="hi")]
+IMAGE = ImagePromptMessageContent(format="png", mime_type="image/png", url="https://example.com/a.png")
+
+
+def _llm() -> LargeLanguageModel:
+    return LargeLanguageModel.model_construct(
+        tenant_id="tenant",
+        model_type=ModelType.LLM,
+        plugin_id="plugin",
+        provider_name="provider",
+        plugin_model_provider=MagicMock(),
+    )
+
+
+def _chunks() -> list[LLMResultChunk]:
+    usage = LLMUsage.empty_usage().model_copy(update={"completion_tokens": 3})
+    contents: list = ["Hel", "lo", [IMAGE], None, "!"]
+    return [
+        LLMResultChunk(
+            model="real-model",
+            delta=LLMResultChunkDelta(
+                index=i,
+                message=AssistantPromptMessage(content=content),
+                usage=usage if i == len(contents) - 1 else None,
+            ),
+        )
+        for i, content in enumerate(contents)
+    ]
+
+
+def _stream(callbacks: list[Callback]) -> list[LLMResultChunk]:
+    return list(
+        _llm()._invoke_result_generator(
+            model="test-model",
+            result=iter(_chunks()),
+            credentials={},
+            prompt_messages=PROMPT_MESSAGES,
+            model_parameters={},
+            callbacks=callbacks,
+        )
+    )
+
+
+def test_stream_coalesces_text_deltas_for_callbacks():
+    callback = MagicMock(spec=Callback)
+
+    chunks = _stream([callback])
+
+    assert len(chunks) == 5
+    assert all(chunk.prompt_messages == PROMPT_MESSAGES for chunk in chunks)
+    assert callback.on_new_chunk.call_count == 5
+    result = callback.on_after_invoke.call_args.kwargs["result"]
+    assert result.model == "real-model"
+    assert result.usage.completion_tokens == 3
+    assert result.message.content == [TextPromptMessageContent(data="Hello"), IMAGE, TextPromptMessageContent(data="!")]
+
+
+def test_stream_without_callbacks_yields_chunks():
+    chunks = _stream([])
+
+    assert [chunk.delta.message.content for chunk in chunks] == ["Hel", "lo", [IMAGE], None, "!"]
+    assert all(chunk.prompt_messages == PROMPT_MESSAGES for chunk in chunks)
@@ -0,0 +1,99 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.model_runtime.entities.common_entities import I18nObject
+from core.model_runtime.entities.model_entities import AIModelEntity, FetchFrom, ModelType
+from core.model_runtime.model_providers.__base.large_language_model import LargeLanguageModel
+from core.model_runtime.model_providers.model_schema_cache import ModelSchemaCache, model_schema_cache
+
+KEY = "tenant:plugin:provider:llm:gpt"
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data: dict[str, str] = {}
+        self.get_calls = 0
+
+    def get(self, key):
+        self.get_calls += 1
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+@pytest.fixture
+def fake_redis():
+    redis = _FakeRedis()
+    with patch("core.model_runtime.model_providers.model_schema_cache.redis_client", redis):
+        yield redis
+
+
+def _schema(model: str = "gpt") -> AIModelEntity:
+    return AIModelEntity(
+        model=model,
+        label=I18nObject(en_US=model),
+        model_type=ModelType.LLM,
+        fetch_from=FetchFrom.PREDEFINED_MODEL,
+        model_properties={},
+    )
+
+
+class TestModelSchemaCache:
+    def test_make_key_depends_on_credentials_but_not_their_order(self):
+        key = ModelSchemaCache.make_key("t", "p", "provider", "llm", "gpt", {"api_key": "a", "base_url": "b"})
+
+        assert key == ModelSchemaCache.make_key("t", "p", "provider", "llm", "gpt", {"base_url": "b", "api_key": "a"})
+        assert key != ModelSchemaCache.make_key("t", "p", "provider", "llm", "gpt", {"api_key": "c", "base_url": "b"})
+        assert "a" not in key.removeprefix("t:p:provider:llm:gpt")
+        assert ModelSchemaCache.make_key("t", "p", "provider", "llm", "gpt", None) == "t:p:provider:llm:gpt"
+
+    def test_serves_validated_schema_from_process_cache(self, fake_redis):
+        cache = ModelSchemaCache(local_max_size=8, local_ttl=60)
+        schema = _schema()
+        cache.set(KEY, "gpt", schema)
+
+        assert cache.get(KEY, "gpt") is schema
+        assert fake_redis.get_calls == 0
+
+    def test_falls_back_to_redis_and_fills_process_cache(self, fake_redis):
+        ModelSchemaCache(local_max_size=8, local_ttl=60).set(KEY, "gpt", _schema())
+        cache = ModelSchemaCache(local_max_size=8, local_ttl=60)
+
+        first = cache.get(KEY, "gpt")
+        second = cache.get(KEY, "gpt")
+
+        assert first == _schema()
+        assert second is first
+        assert fake_redis.get_calls == 1
+
+    def test_drops_invalid_redis_entry(self, fake_redis):
+        fake_redis.data[KEY] = '{"model": "gpt"}'
+        cache = ModelSchemaCache(local_max_size=8, local_ttl=60)
+
+        assert cache.get(KEY, "gpt") is None
+        assert KEY not in fake_redis.data
+
+
+def test_ai_model_fetches_schema_from_plugin_once(fake_redis):
+    model_schema_cache.clear()
+    llm = LargeLanguageModel.model_construct(
+        tenant_id="tenant",
+        model_type=ModelType.LLM,
+        plugin_id="plugin",
+        provider_name="provider",
+        plugin_model_provider=MagicMock(),
+    )
+    with patch("core.plugin.impl.model.PluginModelClient") as client_cls:
+        client_cls.return_value.get_model_schema.return_value = _schema()
+
+        schemas = [llm.get_model_schema("gpt", {"api_key": "key"}) for _ in range(3)]
+
+    assert schemas[0] == _schema()
+    assert schemas[1] is schemas[2] is schemas[0]
+    assert client_cls.return_value.get_model_schema.call_count == 1
+    model_schema_cache.clear()
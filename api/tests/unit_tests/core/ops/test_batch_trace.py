@@ -0,0 +1,84 @@
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from core.ops.base_trace_instance import BaseTraceInstance
+from core.ops.entities.trace_entity import BaseTraceInfo
+from core.ops.langsmith_trace.langsmith_trace import LangSmithDataTrace
+
+
+def _trace_info(message_id: str) -> BaseTraceInfo:
+    return BaseTraceInfo(message_id=message_id, inputs={}, outputs={}, metadata={})
+
+
+def _run(message_id: str, dotted_order: str | None = "20240101T000000000000Z"):
+    data = {"id": message_id, "name": "run", "trace_id": message_id, "dotted_order": dotted_order}
+    return SimpleNamespace(model_dump=lambda: data)
+
+
+def _langsmith_trace() -> LangSmithDataTrace:
+    instance = LangSmithDataTrace.__new__(LangSmithDataTrace)
+    instance.project_id = None
+    instance.project_name = "project"
+    instance.langsmith_client = MagicMock()
+    instance._pending_runs = threading.local()
+    instance.trace = lambda trace_info: instance.add_run(_run(trace_info.message_id))
+    return instance
+
+
+class _FlushingTraceInstance(BaseTraceInstance):
+    def __init__(self):
+        self.traced: list[str] = []
+        self.flushes = 0
+
+    def trace(self, trace_info: BaseTraceInfo):
+        self.traced.append(trace_info.message_id)
+
+    def flush(self):
+        self.flushes += 1
+
+
+class TestBaseBatchTrace:
+    def test_flushes_once_per_batch(self):
+        instance = _FlushingTraceInstance()
+
+        assert instance.batch_trace([_trace_info("m1"), _trace_info("m2")]) == 0
+
+        assert instance.traced == ["m1", "m2"]
+        assert instance.flushes == 1
+
+
+class TestLangSmithBatchTrace:
+    def test_runs_are_ingested_in_one_request(self):
+        instance = _langsmith_trace()
+
+        failed = instance.batch_trace([_trace_info("m1"), _trace_info("m2"), _trace_info("m3")])
+
+        assert failed == 0
+        instance.langsmith_client.create_run.assert_not_called()
+        instance.langsmith_client.batch_ingest_runs.assert_called_once()
+        runs = instance.langsmith_client.batch_ingest_runs.call_args.kwargs["create"]
+        assert [run["id"] for run in runs] == ["m1", "m2", "m3"]
+        assert all(run["session_name"] == "project" for run in runs)
+
+    def test_runs_without_dotted_order_are_created_directly(self):
+        instance = _langsmith_trace()
+        instance.trace = lambda trace_info: instance.add_run(_run(trace_info.message_id, dotted_order=None))
+
+        instance.batch_trace([_trace_info("m1")])
+
+        instance.langsmith_client.create_run.assert_called_once()
+        instance.langsmith_client.batch_ingest_runs.assert_not_called()
+
+    def test_failed_ingest_counts_every_trace_as_failed(self):
+        instance = _langsmith_trace()
+        instance.langsmith_client.batch_ingest_runs.side_effect = RuntimeError("langsmith down")
+
+        assert instance.batch_trace([_trace_info("m1"), _trace_info("m2")]) == 2
+
+    def test_single_trace_outside_batch_is_sent_immediately(self):
+        instance = _langsmith_trace()
+
+        instance.trace(_trace_info("m1"))
+
+        instance.langsmith_client.create_run.assert_called_once()
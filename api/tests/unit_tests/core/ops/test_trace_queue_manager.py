@@ -0,0 +1,169 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.ops.base_trace_instance import BaseTraceInstance
+from core.ops.entities.trace_entity import BaseTraceInfo
+from core.ops.ops_trace_manager import OpsTraceManager, TraceQueueManager
+from tasks.ops_trace_task import process_trace_tasks
+
+
+class _RecordingTraceInstance(BaseTraceInstance):
+    def __init__(self, fail_on: set[str] | None = None):
+        self.traced: list[BaseTraceInfo] = []
+        self.fail_on = fail_on or set()
+
+    def trace(self, trace_info: BaseTraceInfo):
+        if trace_info.message_id in self.fail_on:
+            raise RuntimeError("boom")
+        self.traced.append(trace_info)
+
+
+@pytest.fixture(autouse=True)
+def _clear_trace_instance_cache():
+    OpsTraceManager.app_trace_instances_cache.clear()
+    yield
+    OpsTraceManager.app_trace_instances_cache.clear()
+
+
+def _make_task(app_id: str | None, message_id: str):
+    task = MagicMock()
+    task.app_id = app_id
+    task.execute.return_value = BaseTraceInfo(message_id=message_id, inputs={}, outputs={}, metadata={})
+    return task
+
+
+class TestCachedOpsTraceInstance:
+    def test_resolves_once_per_app(self):
+        instance = _RecordingTraceInstance()
+        with patch.object(OpsTraceManager, "get_ops_trace_instance", return_value=instance) as mock_get:
+            assert OpsTraceManager.get_cached_ops_trace_instance("app-1") is instance
+            assert OpsTraceManager.get_cached_ops_trace_instance("app-1") is instance
+
+        mock_get.assert_called_once_with("app-1")
+
+    def test_caches_disabled_tracing(self):
+        with patch.object(OpsTraceManager, "get_ops_trace_instance", return_value=None) as mock_get:
+            assert OpsTraceManager.get_cached_ops_trace_instance("app-1") is None
+            assert OpsTraceManager.get_cached_ops_trace_instance("app-1") is None
+
+        mock_get.assert_called_once()
+
+    def test_invalidate_forces_reload(self):
+        instance = _RecordingTraceInstance()
+        with patch.object(OpsTraceManager, "get_ops_trace_instance", side_effect=[None, instance]) as mock_get:
+            assert OpsTraceManager.get_cached_ops_trace_instance("app-1") is None
+            OpsTraceManager.invalidate_ops_trace_instance_cache("app-1")
+            assert OpsTraceManager.get_cached_ops_trace_instance("app-1") is instance
+
+        assert mock_get.call_count == 2
+
+    def test_config_change_in_another_process_forces_reload(self):
+        instance = _RecordingTraceInstance()
+        with (
+            patch("core.ops.ops_trace_manager.redis_client") as mock_redis,
+            patch.object(OpsTraceManager, "get_ops_trace_instance", side_effect=[instance, None]) as mock_get,
+        ):
+            mock_redis.get.side_effect = [None, None, b"1"]
+            assert OpsTraceManager.get_cached_ops_trace_instance("app-1") is instance
+            assert OpsTraceManager.get_cached_ops_trace_instance("app-1") is instance
+            # Another process bumped the config version
+            assert OpsTraceManager.get_cached_ops_trace_instance("app-1") is None
+
+        assert mock_get.call_count == 2
+
+    def test_invalidate_publishes_new_version(self):
+        with patch("core.ops.ops_trace_manager.redis_client") as mock_redis:
+            OpsTraceManager.invalidate_ops_trace_instance_cache("app-1")
+
+        mock_redis.incr.assert_called_once_with("ops_trace_config_version:app-1")
+
+
+class TestSendToCelery:
+    def test_one_batch_file_and_celery_task_per_app(self, app):
+        manager = TraceQueueManager.__new__(TraceQueueManager)
+        manager.flask_app = app
+        tasks = [_make_task("app-1", "m1"), _make_task("app-2", "m2"), _make_task("app-1", "m3"), _make_task(None, "x")]
+
+        with (
+            patch("core.ops.ops_trace_manager.storage") as mock_storage,
+            patch("core.ops.ops_trace_manager.process_trace_tasks") as mock_process,
+        ):
+            manager.send_to_celery(tasks)
+
+        assert mock_storage.save.call_count == 2
+        assert mock_process.delay.call_count == 2
+        saved = {call.args[0].split("/")[1]: call.args[1] for call in mock_storage.save.call_args_list}
+        lines = saved["app-1"].decode("utf-8").split("\n")
+        assert [json.loads(line)["trace_info"]["message_id"] for line in lines] == ["m1", "m3"]
+        for call in mock_process.delay.call_args_list:
+            assert call.args[0]["batch"] is True
+
+    def test_failed_task_does_not_drop_batch(self, app):
+        manager = TraceQueueManager.__new__(TraceQueueManager)
+        manager.flask_app = app
+        broken = _make_task("app-1", "m1")
+        broken.execute.side_effect = RuntimeError("boom")
+
+        with (
+            patch("core.ops.ops_trace_manager.storage") as mock_storage,
+            patch("core.ops.ops_trace_manager.process_trace_tasks") as mock_process,
+        ):
+            manager.send_to_celery([broken, _make_task("app-1", "m2")])
+
+        mock_storage.save.assert_called_once()
+        mock_process.delay.assert_called_once()
+
+
+class TestProcessTraceTasks:
+    def _batch_content(self, message_ids: list[str]) -> bytes:
+        return "\n".join(
+            json.dumps(
+                {
+                    "app_id": "app-1",
+                    "trace_info_type": "GenerateNameTraceInfo",
+                    "trace_info": {"message_id": message_id, "tenant_id": "tenant-1", "metadata": {}},
+                }
+            )
+            for message_id in message_ids
+        ).encode("utf-8")
+
+    def test_batch_is_traced_with_a_single_instance_lookup(self):
+        instance = _RecordingTraceInstance()
+        with (
+            patch("tasks.ops_trace_task.storage") as mock_storage,
+            patch.object(OpsTraceManager, "get_cached_ops_trace_instance", return_value=instance) as mock_get,
+        ):
+            mock_storage.load.return_value = self._batch_content(["m1", "m2", "m3"])
+            process_trace_tasks({"app_id": "app-1", "file_id": "f1", "batch": True})
+
+        mock_get.assert_called_once_with("app-1")
+        assert len(instance.traced) == 3
+        mock_storage.load.assert_called_once_with("ops_trace/app-1/f1.ndjson")
+        mock_storage.delete.assert_called_once_with("ops_trace/app-1/f1.ndjson")
+
+    def test_partial_failures_are_counted(self):
+        instance = _RecordingTraceInstance(fail_on={"m2"})
+        with (
+            patch("tasks.ops_trace_task.storage") as mock_storage,
+            patch("tasks.ops_trace_task.redis_client") as mock_redis,
+            patch.object(OpsTraceManager, "get_cached_ops_trace_instance", return_value=instance),
+        ):
+            mock_storage.load.return_value = self._batch_content(["m1", "m2", "m3"])
+            process_trace_tasks({"app_id": "app-1", "file_id": "f1", "batch": True})
+
+        assert [info.message_id for info in instance.traced] == ["m1", "m3"]
+        mock_redis.incrby.assert_called_once_with("FAILED_OPS_TRACE_app-1", 1)
+
+    def test_legacy_single_file(self):
+        instance = _RecordingTraceInstance()
+        with (
+            patch("tasks.ops_trace_task.storage") as mock_storage,
+            patch.object(OpsTraceManager, "get_cached_ops_trace_instance", return_value=instance),
+        ):
+            mock_storage.load.return_value = self._batch_content(["m1"])
+            process_trace_tasks({"app_id": "app-1", "file_id": "f1"})
+
+        assert len(instance.traced) == 1
+        mock_storage.delete.assert_called_once_with("ops_trace/app-1/f1.json")
@@ -0,0 +1,172 @@
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.rag.datasource.segment_cache import PENDING_HIT_COUNT_KEY, SegmentHydrationCache, record_segment_hits
+from models.dataset import DocumentSegment
+from schedule import update_segment_hit_count_task
+
+MODULE = "core.rag.datasource.segment_cache"
+
+
+class _FakeRedis:
+    """The subset of the Redis client used by the segment cache, kept in a dict."""
+
+    def __init__(self):
+        self.data: dict[str, object] = {}
+
+    def pipeline(self, transaction: bool = True):
+        return self
+
+    def execute(self):
+        return []
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value.encode() if isinstance(value, str) else value
+
+    def setex(self, key, ttl, value):
+        self.set(key, value)
+
+    def hincrby(self, key, field, amount):
+        values = self.data.setdefault(key, {})
+        values[field.encode()] = str(int(values.get(field.encode(), 0)) + amount).encode()
+
+    def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    def exists(self, key):
+        return int(key in self.data)
+
+    def rename(self, src, dst):
+        self.data[dst] = self.data.pop(src)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+@pytest.fixture
+def redis_client():
+    client = _FakeRedis()
+    with (
+        patch(f"{MODULE}.redis_client", client),
+        patch.object(update_segment_hit_count_task, "redis_client", client),
+    ):
+        yield client
+
+
+def _segment(index: int, dataset_id: str = "dataset-1") -> DocumentSegment:
+    return DocumentSegment(
+        id=f"segment-{index}",
+        tenant_id="tenant-1",
+        dataset_id=dataset_id,
+        document_id="document-1",
+        position=index,
+        content=f"content {index}",
+        word_count=2,
+        tokens=2,
+        keywords=["content"],
+        index_node_id=f"node-{index}",
+        hit_count=3,
+        enabled=True,
+        status="completed",
+        created_by="account-1",
+        created_at=datetime(2025, 1, 1, 12, 0),
+        updated_at=datetime(2025, 1, 2, 12, 0),
+    )
+
+
+class TestSegmentHydrationCache:
+    def test_load_reads_through_and_serves_cached_segments(self, redis_client):
+        cache = SegmentHydrationCache(ttl=60)
+        loader = MagicMock(side_effect=lambda ids: [_segment(int(i.split("-")[1])) for i in ids])
+        index_nodes = {"node-1": "dataset-1", "node-2": "dataset-1"}
+
+        cache.load(index_nodes, loader)
+        segments = cache.load(index_nodes, loader)
+
+        loader.assert_called_once_with(["node-1", "node-2"])
+        assert [segment.id for segment in segments] == ["segment-1", "segment-2"]
+        assert segments[0].content == "content 1"
+        assert segments[0].keywords == ["content"]
+        assert segments[0].created_at == datetime(2025, 1, 1, 12, 0)
+        assert segments[0].disabled_at is None
+
+    def test_invalidate_only_drops_the_dataset(self, redis_client):
+        cache = SegmentHydrationCache(ttl=60)
+        loader = MagicMock(side_effect=lambda ids: [_segment(1), _segment(2, dataset_id="dataset-2")])
+        index_nodes = {"node-1": "dataset-1", "node-2": "dataset-2"}
+        cache.load(index_nodes, loader)
+
+        cache.invalidate(["dataset-1"])
+        loader.side_effect = lambda ids: [_segment(1)]
+        cache.load(index_nodes, loader)
+
+        assert loader.call_args.args == (["node-1"],)
+
+    def test_falls_back_to_loader_when_redis_fails(self):
+        client = MagicMock()
+        client.mget.side_effect = ConnectionError("down")
+        client.pipeline.side_effect = ConnectionError("down")
+        loader = MagicMock(return_value=[_segment(1)])
+
+        with patch(f"{MODULE}.redis_client", client):
+            segments = SegmentHydrationCache(ttl=60).load({"node-1": "dataset-1"}, loader)
+            SegmentHydrationCache(ttl=60).invalidate(["dataset-1"])
+
+        assert [segment.id for segment in segments] == ["segment-1"]
+
+
+class TestSegmentHitCounts:
+    def test_record_segment_hits_adds_up_pending_hits(self, redis_client):
+        assert record_segment_hits({"segment-1", "segment-2"})
+        assert record_segment_hits({"segment-1"})
+
+        assert redis_client.hgetall(PENDING_HIT_COUNT_KEY) == {b"segment-1": b"2", b"segment-2": b"1"}
+
+    def test_record_segment_hits_reports_failure(self):
+        client = MagicMock()
+        client.pipeline.return_value.execute.side_effect = ConnectionError("down")
+
+        with patch(f"{MODULE}.redis_client", client):
+            assert not record_segment_hits({"segment-1"})
+
+    def test_flush_updates_segments_by_hit_count(self, redis_client):
+        record_segment_hits({"segment-1", "segment-2"})
+        record_segment_hits({"segment-1", "segment-3"})
+        session = MagicMock()
+
+        with (
+            patch.object(update_segment_hit_count_task, "db"),
+            patch.object(update_segment_hit_count_task, "Session") as session_cls,
+        ):
+            session_cls.return_value.__enter__.return_value = session
+            update_segment_hit_count_task.batch_update_segment_hit_count()
+
+        statements = {
+            stmt.compile().params["hit_count_1"]: sorted(stmt.compile().params["id_1"])
+            for stmt in (call.args[0] for call in session.execute.call_args_list)
+        }
+        assert statements == {2: ["segment-1"], 1: ["segment-2", "segment-3"]}
+        assert redis_client.data == {}
+
+    def test_flush_keeps_hits_when_the_update_fails(self, redis_client):
+        record_segment_hits({"segment-1"})
+        session = MagicMock()
+        session.execute.side_effect = RuntimeError("database down")
+
+        with (
+            patch.object(update_segment_hit_count_task, "db"),
+            patch.object(update_segment_hit_count_task, "Session") as session_cls,
+        ):
+            session_cls.return_value.__enter__.return_value = session
+            update_segment_hit_count_task.batch_update_segment_hit_count()
+
+        assert redis_client.data == {PENDING_HIT_COUNT_KEY: {b"segment-1": b"1"}}
@@ -7,6 +7,7 @@ from core.rag.datasource.vdb.pgvector.pgvector import (
     PGVector,
     PGVectorConfig,
 )
+from core.rag.datasource.vdb.vector_base import CollectionSearch
 
 
 class TestPGVector(unittest.TestCase):
@@ -292,6 +293,45 @@ class TestPGVector(unittest.TestCase):
         mock_conn.commit.assert_called_once()
         mock_pool.putconn.assert_called_once_with(mock_conn)
 
+    @patch("core.rag.datasource.vdb.pgvector.pgvector.psycopg2.pool.SimpleConnectionPool")
+    def test_search_by_vector_batch(self, mock_pool_class):
+        """Test that several collections are searched with one UNION ALL query."""
+        mock_pool = MagicMock()
+        mock_pool_class.return_value = mock_pool
+        mock_cursor = MagicMock()
+        mock_pool.getconn.return_value.cursor.return_value = mock_cursor
+        mock_cursor.__iter__.return_value = iter(
+            [
+                (0, {"doc_id": "a"}, "text a", 0.1),
+                (1, {"doc_id": "b"}, "text b", 0.5),
+                (0, {"doc_id": "c"}, "text c", 0.05),
+            ]
+        )
+
+        pgvector = PGVector(self.collection_name, self.config)
+        results = pgvector.search_by_vector_batch(
+            [0.1, 0.2],
+            [
+                CollectionSearch(collection_name="first", group_id="dataset-1", top_k=2),
+                CollectionSearch(
+                    collection_name="second",
+                    group_id="dataset-2",
+                    top_k=3,
+                    score_threshold=0.6,
+                    document_ids_filter=["document-1"],
+                ),
+            ],
+        )
+
+        sql, params = mock_cursor.execute.call_args.args
+        assert mock_cursor.execute.call_count == 1
+        assert sql.count("UNION ALL") == 1
+        assert "FROM embedding_first ORDER BY distance LIMIT 2" in sql
+        assert "FROM embedding_second WHERE meta->>'document_id' = ANY(%s) ORDER BY distance LIMIT 3" in sql
+        assert params == ["[0.1, 0.2]", "[0.1, 0.2]", ["document-1"]]
+        assert [[doc.metadata["doc_id"] for doc in docs] for docs in results] == [["c", "a"], []]
+        assert results[0][0].metadata["score"] == pytest.approx(0.95)
+
 
 @pytest.mark.parametrize(
     "invalid_config_override",
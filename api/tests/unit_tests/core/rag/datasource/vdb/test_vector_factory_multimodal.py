@@ -0,0 +1,93 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from core.rag.datasource.vdb.vector_factory import Vector
+from core.rag.models.document import AttachmentDocument
+
+MODULE = "core.rag.datasource.vdb.vector_factory"
+
+
+def _vector(cached_embeddings: dict | None = None) -> Vector:
+    vector = Vector.__new__(Vector)
+    vector._embeddings = MagicMock()
+    vector._embeddings.get_cached_multimodal_embeddings.return_value = cached_embeddings or {}
+    vector._embeddings.embed_multimodal_documents.side_effect = lambda docs, cache_keys: [[0.1, 0.2] for _ in docs]
+    vector._vector_processor = MagicMock()
+    return vector
+
+
+def _attachment(file_id: str) -> AttachmentDocument:
+    return AttachmentDocument(page_content="", metadata={"doc_id": file_id, "doc_type": "image"})
+
+
+def _upload_file(file_id: str, size: int, file_hash: str | None = None):
+    return SimpleNamespace(id=file_id, key=f"files/{file_id}", size=size, hash=file_hash)
+
+
+class TestCreateMultimodal:
+    def test_cached_files_are_not_loaded_from_storage(self):
+        upload_files = [_upload_file("f1", 10, "h1"), _upload_file("f2", 10, "h2")]
+        vector = _vector(cached_embeddings={"h1": [1.0, 0.0]})
+
+        with (
+            patch(f"{MODULE}.db") as mock_db,
+            patch(f"{MODULE}.storage") as mock_storage,
+        ):
+            mock_db.session.scalars.return_value.all.return_value = upload_files
+            mock_storage.load_once.return_value = b"image-bytes"
+            vector.create_multimodal([_attachment("f1"), _attachment("f2")])
+
+        mock_storage.load_once.assert_called_once_with("files/f2")
+        call = vector._embeddings.embed_multimodal_documents.call_args
+        sent = call.args[0]
+        assert [doc["file_id"] for doc in sent] == ["f2"]
+        # Only the provider payload is sent; the cache key is passed separately
+        assert set(sent[0]) == {"content", "content_type", "file_id"}
+        assert call.kwargs["cache_keys"] == ["h2"]
+
+        create_kwargs = vector._vector_processor.create.call_args.kwargs
+        assert [doc.metadata["doc_id"] for doc in create_kwargs["texts"]] == ["f1", "f2"]
+        assert create_kwargs["embeddings"] == [[1.0, 0.0], [0.1, 0.2]]
+
+    def test_files_are_embedded_in_sub_batches_by_size(self):
+        upload_files = [_upload_file(f"f{i}", 40) for i in range(5)]
+        vector = _vector()
+
+        with (
+            patch(f"{MODULE}.db") as mock_db,
+            patch(f"{MODULE}.storage") as mock_storage,
+            patch(f"{MODULE}.dify_config.MULTIMODAL_EMBEDDING_BATCH_MAX_BYTES", 100),
+        ):
+            mock_db.session.scalars.return_value.all.return_value = upload_files
+            mock_storage.load_once.return_value = b"x" * 40
+            vector.create_multimodal([_attachment(f"f{i}") for i in range(5)])
+
+        sub_batch_sizes = [len(call.args[0]) for call in vector._embeddings.embed_multimodal_documents.call_args_list]
+        assert sub_batch_sizes == [2, 2, 1]
+        vector._vector_processor.create.assert_called_once()
+        assert len(vector._vector_processor.create.call_args.kwargs["texts"]) == 5
+
+    def test_oversized_file_is_sent_alone(self):
+        pending = [("a", _upload_file("a", 500)), ("b", _upload_file("b", 10)), ("c", _upload_file("c", 10))]
+
+        with patch(f"{MODULE}.dify_config.MULTIMODAL_EMBEDDING_BATCH_MAX_BYTES", 100):
+            sub_batches = list(Vector._split_by_byte_budget(pending))
+
+        assert [[document for document, _ in sub_batch] for sub_batch in sub_batches] == [["a"], ["b", "c"]]
+
+
+class TestSearchByFile:
+    def test_cached_query_embedding_skips_storage(self):
+        vector = _vector()
+        vector._embeddings.get_cached_multimodal_query_embedding.return_value = [0.5, 0.5]
+
+        with (
+            patch(f"{MODULE}.db") as mock_db,
+            patch(f"{MODULE}.storage") as mock_storage,
+        ):
+            mock_db.session.query.return_value.where.return_value.first.return_value = _upload_file("f1", 10)
+            vector.search_by_file("f1", top_k=3)
+
+        mock_storage.load_once.assert_not_called()
+        vector._embeddings.embed_multimodal_query.assert_not_called()
+        vector._vector_processor.search_by_vector.assert_called_once_with([0.5, 0.5], top_k=3)
@@ -44,6 +44,8 @@ Tests follow the Arrange-Act-Assert pattern for clarity.
 """
 
 import base64
+import threading
+import time
 from decimal import Decimal
 from unittest.mock import Mock, patch
 
@@ -59,6 +61,7 @@ from core.model_runtime.errors.invoke import (
     InvokeConnectionError,
     InvokeRateLimitError,
 )
+from core.rag.embedding import cached_embedding
 from core.rag.embedding.cached_embedding import CacheEmbedding
 from models.dataset import Embedding
 
@@ -812,6 +815,68 @@ class TestCacheEmbeddingQuery:
 
             assert "Redis connection failed" in str(exc_info.value)
 
+    def test_concurrent_queries_are_embedded_once(self, mock_model_instance):
+        """Test that threads embedding the same query wait for the first one.
+
+        Verifies:
+        - The model is invoked once for concurrent cache misses
+        - Every thread gets the embedding
+        """
+        # Arrange
+        query = "Test query"
+        normalized = [0.6, 0.8]
+        usage = EmbeddingUsage(
+            tokens=5,
+            total_tokens=5,
+            unit_price=Decimal("0.0001"),
+            price_unit=Decimal(1000),
+            total_price=Decimal("0.0000005"),
+            currency="USD",
+            latency=0.3,
+        )
+        release = threading.Event()
+
+        def invoke_text_embedding(**kwargs):
+            release.wait(timeout=5)
+            return EmbeddingResult(model="text-embedding-ada-002", embeddings=[normalized], usage=usage)
+
+        mock_model_instance.invoke_text_embedding.side_effect = invoke_text_embedding
+        results = []
+
+        def embed():
+            results.append(CacheEmbedding(mock_model_instance).embed_query(query))
+
+        with patch("core.rag.embedding.cached_embedding.redis_client") as mock_redis:
+            mock_redis.get.return_value = None
+            owner = threading.Thread(target=embed)
+            owner.start()
+            while not cached_embedding._pending_query_embeddings:
+                time.sleep(0.01)
+            (pending,) = cached_embedding._pending_query_embeddings.values()
+            waiting = threading.Semaphore(0)
+            result = pending.result
+
+            def counted_result(*args, **kwargs):
+                waiting.release()
+                return result(*args, **kwargs)
+
+            pending.result = counted_result  # type: ignore[method-assign]
+
+            # Act
+            waiters = [threading.Thread(target=embed) for _ in range(3)]
+            for waiter in waiters:
+                waiter.start()
+            for _ in waiters:
+                assert waiting.acquire(timeout=5)
+            release.set()
+            for thread in [owner, *waiters]:
+                thread.join(timeout=5)
+
+        # Assert
+        assert mock_model_instance.invoke_text_embedding.call_count == 1
+        assert results == [normalized] * 4
+        assert not cached_embedding._pending_query_embeddings
+
 
 class TestEmbeddingModelSwitching:
     """Test suite for embedding model switching functionality.
@@ -1919,3 +1984,51 @@ class TestEmbeddingCachePerformance:
             # Assert - TTL was extended
             mock_redis.expire.assert_called_once()
             assert mock_redis.expire.call_args[0][1] == 600
+
+
+class TestCacheEmbeddingMultimodalDocuments:
+    """Test suite for CacheEmbedding.embed_multimodal_documents cache keys."""
+
+    @pytest.fixture
+    def mock_model_instance(self):
+        model_instance = Mock()
+        model_instance.model = "multimodal-embedding"
+        model_instance.provider = "provider"
+        model_schema = Mock()
+        model_schema.model_properties = {ModelPropertyKey.MAX_CHUNKS: 10}
+        model_instance.model_type_instance.get_model_schema.return_value = model_schema
+        return model_instance
+
+    def _documents(self):
+        return [
+            {"content": "aGVsbG8=", "content_type": "image", "file_id": "file-1"},
+            {"content": "d29ybGQ=", "content_type": "image", "file_id": "file-2"},
+        ]
+
+    def test_cache_keys_are_not_sent_to_the_model(self, mock_model_instance):
+        cache_embedding = CacheEmbedding(mock_model_instance, user="test-user")
+        documents = self._documents()
+        mock_model_instance.invoke_multimodal_embedding.return_value = Mock(embeddings=[[3.0, 4.0], [0.0, 1.0]])
+
+        with patch.object(cache_embedding, "get_cached_multimodal_embeddings", return_value={}) as mock_lookup:
+            with patch("core.rag.embedding.cached_embedding.db.session") as mock_session:
+                result = cache_embedding.embed_multimodal_documents(documents, cache_keys=["hash-1", None])
+
+        assert result == [[0.6, 0.8], [0.0, 1.0]]
+        mock_lookup.assert_called_once_with(["hash-1", "file-2", "file-1", "file-2"])
+        sent = mock_model_instance.invoke_multimodal_embedding.call_args.kwargs["multimodel_documents"]
+        assert sent == self._documents()
+        assert [call.args[0].hash for call in mock_session.add.call_args_list] == ["hash-1", "file-2"]
+
+    def test_embeddings_cached_under_file_id_are_reused(self, mock_model_instance):
+        cache_embedding = CacheEmbedding(mock_model_instance, user="test-user")
+
+        with patch.object(
+            cache_embedding,
+            "get_cached_multimodal_embeddings",
+            return_value={"hash-1": [1.0, 0.0], "file-2": [0.0, 1.0]},
+        ):
+            result = cache_embedding.embed_multimodal_documents(self._documents(), cache_keys=["hash-1", "hash-2"])
+
+        assert result == [[1.0, 0.0], [0.0, 1.0]]
+        mock_model_instance.invoke_multimodal_embedding.assert_not_called()
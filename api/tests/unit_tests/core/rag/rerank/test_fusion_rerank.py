@@ -0,0 +1,109 @@
+import pytest
+
+from core.rag.data_post_processor.data_post_processor import DataPostProcessor
+from core.rag.models.document import Document
+from core.rag.rerank.fusion_rerank import RRF_K, FusionRerankRunner, fuse_documents
+from core.rag.rerank.rerank_factory import RerankRunnerFactory
+from core.rag.rerank.rerank_type import RerankMode
+
+
+def _doc(doc_id: str | None, score: float, dataset_id: str = "dataset-1", provider: str = "dify") -> Document:
+    metadata: dict = {"score": score, "dataset_id": dataset_id}
+    if doc_id:
+        metadata["doc_id"] = doc_id
+    return Document(page_content=f"content of {doc_id}", metadata=metadata, provider=provider)
+
+
+def _ids(documents: list[Document]) -> list[str]:
+    return [document.metadata["doc_id"] for document in documents]
+
+
+class TestReciprocalRankFusion:
+    def test_documents_found_by_both_searches_rank_first(self):
+        semantic = [_doc("a", 0.9), _doc("b", 0.8), _doc("c", 0.7)]
+        full_text = [_doc("c", 12.0), _doc("d", 9.0)]
+
+        fused = fuse_documents([semantic, full_text], RerankMode.RECIPROCAL_RANK_FUSION)
+
+        assert _ids(fused) == ["c", "a", "b", "d"]
+        expected_c = ((RRF_K + 1) / (RRF_K + 3) + 1.0) / 2
+        assert fused[0].metadata["score"] == pytest.approx(expected_c)
+        assert fused[1].metadata["score"] == pytest.approx(0.5)
+
+    def test_document_first_in_every_list_scores_one(self):
+        fused = fuse_documents([[_doc("a", 0.5)], [_doc("a", 3.0)]], RerankMode.RECIPROCAL_RANK_FUSION)
+
+        assert len(fused) == 1
+        assert fused[0].metadata["score"] == pytest.approx(1.0)
+
+    def test_duplicates_within_a_list_count_once(self):
+        fused = fuse_documents([[_doc("a", 0.9), _doc("a", 0.1)]], RerankMode.RECIPROCAL_RANK_FUSION)
+
+        assert len(fused) == 1
+        assert fused[0].metadata["score"] == pytest.approx(1.0)
+
+    def test_documents_without_doc_id_are_deduplicated_by_content(self):
+        first = _doc(None, 0.9, provider="external")
+        second = _doc(None, 0.4, provider="external")
+
+        fused = fuse_documents([[first], [second]], RerankMode.RECIPROCAL_RANK_FUSION)
+
+        assert fused == [first]
+
+    def test_threshold_and_top_n(self):
+        semantic = [_doc("a", 0.9), _doc("b", 0.8), _doc("c", 0.7)]
+        full_text = [_doc("a", 5.0)]
+
+        assert _ids(fuse_documents([semantic, full_text], RerankMode.RECIPROCAL_RANK_FUSION, top_n=2)) == ["a", "b"]
+        assert _ids(fuse_documents([semantic, full_text], RerankMode.RECIPROCAL_RANK_FUSION, score_threshold=0.6)) == [
+            "a"
+        ]
+
+    def test_empty_lists(self):
+        assert fuse_documents([[], []], RerankMode.RECIPROCAL_RANK_FUSION) == []
+
+
+class TestWeightedFusion:
+    def test_scores_are_min_max_normalized_per_list(self):
+        semantic = [_doc("a", 0.9), _doc("b", 0.5)]
+        full_text = [_doc("b", 30.0), _doc("c", 10.0)]
+
+        fused = fuse_documents([semantic, full_text], RerankMode.WEIGHTED_FUSION, weights=[3, 1])
+
+        scores = {document.metadata["doc_id"]: document.metadata["score"] for document in fused}
+        assert _ids(fused) == ["a", "b", "c"]
+        assert scores == pytest.approx({"a": 0.75, "b": 0.25, "c": 0.0})
+
+    def test_list_with_equal_scores_gets_full_weight(self):
+        fused = fuse_documents([[_doc("a", 0.4), _doc("b", 0.4)]], RerankMode.WEIGHTED_FUSION)
+
+        assert [document.metadata["score"] for document in fused] == [1.0, 1.0]
+
+    @pytest.mark.parametrize("weights", [[1.0], [-1.0, 2.0], [0.0, 0.0]])
+    def test_invalid_weights(self, weights):
+        with pytest.raises(ValueError):
+            fuse_documents([[_doc("a", 0.4)], [_doc("b", 0.4)]], RerankMode.WEIGHTED_FUSION, weights=weights)
+
+
+class TestFusionRerankRunner:
+    def test_each_dataset_is_one_ranked_list(self):
+        documents = [
+            _doc("a", 0.2, dataset_id="dataset-1"),
+            _doc("b", 0.9, dataset_id="dataset-1"),
+            _doc("c", 0.5, dataset_id="dataset-2"),
+        ]
+
+        fused = FusionRerankRunner(RerankMode.RECIPROCAL_RANK_FUSION).run("query", documents, top_n=2)
+
+        # b and c lead their datasets, a is second in dataset-1
+        assert sorted(_ids(fused)) == ["b", "c"]
+        assert all(document.metadata["score"] == pytest.approx(0.5) for document in fused)
+
+    @pytest.mark.parametrize("mode", [RerankMode.RECIPROCAL_RANK_FUSION, RerankMode.WEIGHTED_FUSION])
+    def test_created_by_factory_and_post_processor(self, mode):
+        runner = RerankRunnerFactory.create_rerank_runner(runner_type=mode)
+        assert isinstance(runner, FusionRerankRunner)
+        assert runner.mode == mode
+
+        processor = DataPostProcessor("tenant-1", mode, None, None, False)
+        assert isinstance(processor.rerank_runner, FusionRerankRunner)
@@ -1019,6 +1019,57 @@ class TestRetrievalService:
             # Weights might be in positional args (position 3)
             assert len(call_args.args) >= 4
 
+    @patch("core.rag.datasource.retrieval_service.DataPostProcessor")
+    @patch("core.rag.datasource.retrieval_service.RetrievalService.full_text_index_search")
+    @patch("core.rag.datasource.retrieval_service.RetrievalService.embedding_search")
+    @patch("core.rag.datasource.retrieval_service.RetrievalService._get_dataset")
+    def test_hybrid_search_reciprocal_rank_fusion(
+        self,
+        mock_get_dataset,
+        mock_embedding_search,
+        mock_fulltext_search,
+        mock_data_processor_class,
+        mock_dataset,
+        sample_documents,
+    ):
+        """
+        Test hybrid search fusing the semantic and full-text rankings by reciprocal rank.
+
+        Verifies:
+        - Documents found by both searches rank first
+        - Duplicates are merged without a post processor
+        - top_k is applied to the fused list
+        """
+        # Arrange
+        mock_get_dataset.return_value = mock_dataset
+
+        def side_effect_embedding(flask_app, dataset_id, query, top_k, all_documents, **kwargs):
+            all_documents.extend(sample_documents[:2])
+
+        mock_embedding_search.side_effect = side_effect_embedding
+
+        def side_effect_fulltext(flask_app, dataset_id, query, top_k, all_documents, **kwargs):
+            all_documents.extend([sample_documents[1], sample_documents[2]])
+
+        mock_fulltext_search.side_effect = side_effect_fulltext
+
+        # Act
+        results = RetrievalService.retrieve(
+            retrieval_method=RetrievalMethod.HYBRID_SEARCH,
+            dataset_id=mock_dataset.id,
+            query="test query",
+            top_k=2,
+            reranking_mode="reciprocal_rank_fusion",
+        )
+
+        # Assert
+        assert [doc.metadata["doc_id"] for doc in results] == [
+            sample_documents[1].metadata["doc_id"],
+            sample_documents[0].metadata["doc_id"],
+        ]
+        assert results[0].metadata["score"] > results[1].metadata["score"]
+        mock_data_processor_class.assert_not_called()
+
     # ==================== Full-Text Search Tests ====================
 
     @patch("core.rag.datasource.retrieval_service.RetrievalService.full_text_index_search")
@@ -1795,6 +1846,101 @@ class TestRetrievalService:
         assert len(all_documents) == 1
         assert all_documents[0].page_content == "Test content 1"
 
+    @staticmethod
+    def _vector_dataset(search_method: RetrievalMethod = RetrievalMethod.SEMANTIC_SEARCH) -> Dataset:
+        dataset = Mock(spec=Dataset)
+        dataset.id = str(uuid4())
+        dataset.provider = "vendor"
+        dataset.indexing_technique = "high_quality"
+        dataset.embedding_model_provider = "openai"
+        dataset.embedding_model = "text-embedding-3-small"
+        dataset.collection_binding_id = None
+        dataset.index_struct_dict = {"type": "pgvector", "vector_store": {"class_prefix": f"Vector_index_{dataset.id}"}}
+        dataset.retrieval_model = {
+            "search_method": search_method,
+            "reranking_enable": False,
+            "top_k": 3,
+            "score_threshold_enabled": False,
+        }
+        return dataset
+
+    def _run_multiple_retrieve_thread(self, flask_app, datasets: list[Dataset]) -> list[Document]:
+        all_documents: list[Document] = []
+        DatasetRetrieval()._multiple_retrieve_thread(
+            flask_app=flask_app,
+            available_datasets=datasets,
+            metadata_condition=None,
+            metadata_filter_document_ids=None,
+            all_documents=all_documents,
+            tenant_id=str(uuid4()),
+            reranking_enable=False,
+            reranking_mode="reranking_model",
+            reranking_model=None,
+            weights=None,
+            top_k=5,
+            score_threshold=0.0,
+            query="test query",
+            attachment_id=None,
+            dataset_count=len(datasets),
+        )
+        return all_documents
+
+    @patch("core.rag.retrieval.dataset_retrieval.Vector")
+    @patch("core.rag.retrieval.dataset_retrieval.DatasetRetrieval._retriever")
+    def test_multiple_retrieve_thread_batches_semantic_search_per_vector_store(
+        self, mock_retriever, mock_vector_class, mock_flask_app
+    ):
+        """
+        Test that semantic search datasets on the same vector store and embedding model share one search.
+
+        Verifies:
+        - One batched search runs for the semantic search datasets
+        - Other datasets are still retrieved one by one
+        """
+        # Arrange
+        first, second = self._vector_dataset(), self._vector_dataset()
+        hybrid = self._vector_dataset(RetrievalMethod.HYBRID_SEARCH)
+        doc1 = Document(page_content="Test content 1", metadata={"doc_id": "doc1", "score": 0.9}, provider="dify")
+        doc2 = Document(page_content="Test content 2", metadata={"doc_id": "doc2", "score": 0.8}, provider="dify")
+        vector = mock_vector_class.return_value
+        vector.supports_batch_search = True
+        vector.search_by_vector_batch.return_value = [[doc1], [doc2]]
+
+        # Act
+        all_documents = self._run_multiple_retrieve_thread(mock_flask_app, [first, hybrid, second])
+
+        # Assert
+        mock_vector_class.assert_called_once_with(dataset=first)
+        query, searches = vector.search_by_vector_batch.call_args.args
+        assert query == "test query"
+        assert [search.group_id for search in searches] == [first.id, second.id]
+        assert [search.top_k for search in searches] == [3, 3]
+        assert searches[0].collection_name == f"Vector_index_{first.id}"
+        assert [call.kwargs["dataset_id"] for call in mock_retriever.call_args_list] == [hybrid.id]
+        assert [doc.metadata["doc_id"] for doc in all_documents] == ["doc1", "doc2"]
+
+    @patch("core.rag.retrieval.dataset_retrieval.Vector")
+    @patch("core.rag.retrieval.dataset_retrieval.DatasetRetrieval._retriever")
+    def test_multiple_retrieve_thread_falls_back_when_batch_search_fails(
+        self, mock_retriever, mock_vector_class, mock_flask_app
+    ):
+        """
+        Test that datasets of a failed batched search are retrieved one by one.
+        """
+        # Arrange
+        datasets = [self._vector_dataset(), self._vector_dataset()]
+        vector = mock_vector_class.return_value
+        vector.supports_batch_search = True
+        vector.search_by_vector_batch.side_effect = RuntimeError("collection not found")
+
+        # Act
+        self._run_multiple_retrieve_thread(mock_flask_app, datasets)
+
+        # Assert
+        assert sorted(call.kwargs["dataset_id"] for call in mock_retriever.call_args_list) == sorted(
+            dataset.id for dataset in datasets
+        )
+
 
 class TestRetrievalMethods:
     """
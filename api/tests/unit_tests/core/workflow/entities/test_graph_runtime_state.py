@@ -235,6 +235,20 @@ class TestGraphRuntimeState:
 
         assert new_stub.state == "configured"
 
+    def test_dumps_is_compact_and_handles_large_integers(self):
+        variable_pool = VariablePool()
+        variable_pool.add(("node1", "value"), "payload")
+        state = GraphRuntimeState(variable_pool=variable_pool, start_at=time())
+        state.set_output("count", 1)
+
+        assert ", " not in state.dumps()
+        assert ": " not in state.dumps()
+
+        state.set_output("count", 2**70)
+        restored = GraphRuntimeState.from_snapshot(state.dumps())
+
+        assert restored.get_output("count") == 2**70
+
     def test_loads_rehydrates_existing_instance(self):
         variable_pool = VariablePool()
         variable_pool.add(("node", "key"), "value")
@@ -0,0 +1,151 @@
+"""
+Tests for ProfilingLayer.
+"""
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from opentelemetry.trace import get_tracer, use_span
+
+from core.app.workflow.layers.profiling import ProfilingLayer
+from core.workflow.enums import NodeType, WorkflowNodeExecutionStatus
+from core.workflow.graph_events import NodeRunStartedEvent, NodeRunStreamChunkEvent, NodeRunSucceededEvent
+from core.workflow.node_events import NodeRunResult
+from libs.datetime_utils import naive_utc_now
+
+
+def _build_layer(variable_pool_size: int = 3) -> ProfilingLayer:
+    layer = ProfilingLayer()
+    graph_runtime_state = MagicMock()
+    graph_runtime_state.variable_pool.size.return_value = variable_pool_size
+    layer.initialize(graph_runtime_state, MagicMock())
+    return layer
+
+
+def _started_event(node) -> NodeRunStartedEvent:
+    return NodeRunStartedEvent(
+        id=node.execution_id,
+        node_id=node.id,
+        node_type=node.node_type,
+        node_title=node.title,
+        start_at=naive_utc_now(),
+    )
+
+
+def _succeeded_event(node) -> NodeRunSucceededEvent:
+    return NodeRunSucceededEvent(
+        id=node.execution_id,
+        node_id=node.id,
+        node_type=node.node_type,
+        start_at=naive_utc_now(),
+        node_run_result=NodeRunResult(status=WorkflowNodeExecutionStatus.SUCCEEDED),
+    )
+
+
+def _chunk_event(node) -> NodeRunStreamChunkEvent:
+    return NodeRunStreamChunkEvent(
+        id=node.execution_id,
+        node_id=node.id,
+        node_type=node.node_type,
+        selector=[node.id, "text"],
+        chunk="hi",
+        is_final=False,
+    )
+
+
+@pytest.fixture
+def llm_node(mock_llm_node):
+    mock_llm_node.enqueued_at = time.perf_counter() - 0.5
+    return mock_llm_node
+
+
+class TestProfilingLayer:
+    def test_profiles_node_execution(self, llm_node):
+        layer = _build_layer(variable_pool_size=7)
+        layer.on_graph_start()
+
+        layer.on_node_run_start(llm_node)
+        layer.on_event(_started_event(llm_node))
+        layer.on_event(_chunk_event(llm_node))
+        time.sleep(0.01)
+        layer.on_node_run_end(llm_node, None, _succeeded_event(llm_node))
+        layer.on_event(_succeeded_event(llm_node))
+
+        (profile,) = layer.profiles
+        assert profile.node_id == llm_node.id
+        assert profile.node_type == NodeType.LLM
+        assert profile.ready_queue_wait is not None
+        assert profile.ready_queue_wait >= 0.5
+        assert profile.wall_time >= 0.01
+        assert profile.cpu_time >= 0.0
+        assert profile.event_count == 3
+        assert profile.variable_pool_size == 7
+        assert profile.event_lag is not None
+        assert profile.event_lag >= 0.0
+
+    def test_event_lag_when_result_event_is_handled_before_node_ends(self, llm_node):
+        layer = _build_layer()
+        layer.on_graph_start()
+
+        layer.on_node_run_start(llm_node)
+        layer.on_event(_succeeded_event(llm_node))
+        layer.on_node_run_end(llm_node, None, None)
+
+        (profile,) = layer.profiles
+        assert profile.event_lag == 0.0
+
+    def test_ignores_events_of_unknown_executions(self, llm_node, mock_start_node):
+        layer = _build_layer()
+        layer.on_graph_start()
+
+        layer.on_node_run_start(llm_node)
+        layer.on_event(_started_event(mock_start_node))
+        layer.on_node_run_end(mock_start_node, None, None)
+
+        (profile,) = layer.profiles
+        assert profile.node_id == llm_node.id
+        assert profile.event_count == 0
+
+    def test_summarizes_run_on_graph_end(self, llm_node, mock_start_node):
+        mock_start_node.enqueued_at = None
+        layer = _build_layer(variable_pool_size=4)
+        layer.on_graph_start()
+        for node in (mock_start_node, llm_node):
+            layer.on_node_run_start(node)
+            layer.on_node_run_end(node, None, None)
+            layer.on_event(_succeeded_event(node))
+
+        assert layer.summary is None
+        layer.on_graph_end(None)
+
+        summary = layer.summary
+        assert summary is not None
+        assert summary["node_count"] == 2
+        assert summary["event_count"] == 2
+        assert summary["peak_variable_pool_size"] == 4
+        assert summary["ready_queue_wait"] >= 0.5
+        assert set(summary["node_types"]) == {NodeType.START, NodeType.LLM}
+        assert summary["node_types"][NodeType.LLM]["count"] == 1
+        assert [node["node_id"] for node in summary["slowest_nodes"]] == sorted(
+            [mock_start_node.id, llm_node.id],
+            key=lambda node_id: next(p.wall_time for p in layer.profiles if p.node_id == node_id),
+            reverse=True,
+        )
+
+    def test_sets_profile_attributes_on_current_span(
+        self, tracer_provider_with_memory_exporter, memory_span_exporter, llm_node
+    ):
+        layer = _build_layer(variable_pool_size=5)
+        layer.on_graph_start()
+
+        with use_span(get_tracer(__name__).start_span("node"), end_on_exit=True):
+            layer.on_node_run_start(llm_node)
+            layer.on_node_run_end(llm_node, None, None)
+
+        (span,) = memory_span_exporter.get_finished_spans()
+        assert span.attributes is not None
+        assert span.attributes["workflow.node.profile.variable_pool_size"] == 5
+        assert span.attributes["workflow.node.profile.ready_queue_wait"] >= 0.5
+        assert "workflow.node.profile.wall_time" in span.attributes
+        assert "workflow.node.profile.cpu_time" in span.attributes
@@ -1,13 +1,18 @@
+from unittest.mock import MagicMock, patch
+
+import httpx
 import pytest
 
+from configs import dify_config
+from core.helper.http_response_cache import HttpResponseCache
 from core.workflow.nodes.http_request import (
     BodyData,
     HttpRequestNodeAuthorization,
     HttpRequestNodeBody,
     HttpRequestNodeData,
 )
-from core.workflow.nodes.http_request.entities import HttpRequestNodeTimeout
-from core.workflow.nodes.http_request.exc import AuthorizationConfigError
+from core.workflow.nodes.http_request.entities import HttpRequestNodeCache, HttpRequestNodeTimeout
+from core.workflow.nodes.http_request.exc import AuthorizationConfigError, ResponseSizeError
 from core.workflow.nodes.http_request.executor import Executor
 from core.workflow.runtime import VariablePool
 from core.workflow.system_variable import SystemVariable
@@ -602,3 +607,111 @@ def test_executor_with_json_body_preserves_numbers_and_strings():
 
     assert executor.json["count"] == 42
     assert executor.json["id"] == "abc-123"
+
+
+def _get_executor(http_client) -> Executor:
+    node_data = HttpRequestNodeData(
+        title="Test streamed response",
+        method="get",
+        url="https://api.example.com/download",
+        authorization=HttpRequestNodeAuthorization(type="no-auth"),
+        headers="",
+        params="",
+    )
+    return Executor(
+        node_data=node_data,
+        timeout=HttpRequestNodeTimeout(connect=10, read=30, write=30),
+        variable_pool=VariablePool(system_variables=SystemVariable.default(), user_inputs={}),
+        http_client=http_client,
+    )
+
+
+def test_invoke_aborts_oversized_streamed_response(monkeypatch):
+    monkeypatch.setattr(dify_config, "HTTP_REQUEST_NODE_MAX_BINARY_SIZE", 1024)
+    monkeypatch.setattr(dify_config, "HTTP_REQUEST_NODE_MAX_TEXT_SIZE", 512)
+    read_chunks = []
+
+    def body():
+        for _ in range(100):
+            read_chunks.append(1)
+            yield b"x" * 256
+
+    response = httpx.Response(200, headers={"content-type": "application/octet-stream"}, content=body())
+    http_client = MagicMock()
+    http_client.get.return_value = response
+
+    with pytest.raises(ResponseSizeError, match="aborted"):
+        _get_executor(http_client).invoke()
+
+    assert http_client.get.call_args.kwargs["stream"] is True
+    assert len(read_chunks) == 5
+    assert response.is_closed
+
+
+def test_invoke_rejects_response_by_content_length(monkeypatch):
+    monkeypatch.setattr(dify_config, "HTTP_REQUEST_NODE_MAX_BINARY_SIZE", 1024)
+    monkeypatch.setattr(dify_config, "HTTP_REQUEST_NODE_MAX_TEXT_SIZE", 512)
+    response = httpx.Response(
+        200, headers={"content-type": "application/zip", "content-length": str(10 * 1024 * 1024)}, content=iter([])
+    )
+    http_client = MagicMock()
+    http_client.get.return_value = response
+
+    with pytest.raises(ResponseSizeError, match="Content-Length"):
+        _get_executor(http_client).invoke()
+
+
+def test_invoke_reads_streamed_text_response(monkeypatch):
+    monkeypatch.setattr(dify_config, "HTTP_REQUEST_NODE_MAX_TEXT_SIZE", 512)
+    http_client = MagicMock()
+    http_client.get.return_value = httpx.Response(
+        200, headers={"content-type": "application/json"}, content=iter([b'{"hello": ', b'"world"}'])
+    )
+
+    response = _get_executor(http_client).invoke()
+
+    assert response.text == '{"hello": "world"}'
+    assert response.size == 18
+
+
+def test_invoke_applies_text_limit_after_read(monkeypatch):
+    monkeypatch.setattr(dify_config, "HTTP_REQUEST_NODE_MAX_BINARY_SIZE", 1024)
+    monkeypatch.setattr(dify_config, "HTTP_REQUEST_NODE_MAX_TEXT_SIZE", 16)
+    http_client = MagicMock()
+    http_client.get.return_value = httpx.Response(
+        200, headers={"content-type": "text/plain"}, content=iter([b"x" * 64])
+    )
+
+    with pytest.raises(ResponseSizeError, match="Text size is too large"):
+        _get_executor(http_client).invoke()
+
+
+def test_invoke_serves_cached_response_when_cache_enabled():
+    node_data = HttpRequestNodeData(
+        title="Test cached GET",
+        method="get",
+        url="https://api.example.com/reference",
+        authorization=HttpRequestNodeAuthorization(type="no-auth"),
+        headers="",
+        params="",
+        cache=HttpRequestNodeCache(enabled=True, ttl=60),
+    )
+    response = httpx.Response(200, headers={"content-type": "application/json"}, content=b'{"v": 1}')
+    response.request = httpx.Request("GET", "https://api.example.com/reference")
+    http_client = MagicMock()
+    http_client.get.return_value = response
+    cache = HttpResponseCache(max_entry_size=1024, local_max_size=4096, retention=60)
+
+    with patch("core.workflow.nodes.http_request.executor.http_response_cache", cache):
+        for _ in range(2):
+            executor = Executor(
+                node_data=node_data,
+                timeout=HttpRequestNodeTimeout(connect=10, read=30, write=30),
+                variable_pool=VariablePool(system_variables=SystemVariable.default(), user_inputs={}),
+                http_client=http_client,
+                tenant_id="tenant-1",
+            )
+            assert executor.invoke().text == '{"v": 1}'
+
+    assert http_client.get.call_count == 1
+    assert cache.stats.hits == 1
@@ -27,7 +27,8 @@ from core.variables.variables import (
     Variable,
 )
 from core.workflow.constants import CONVERSATION_VARIABLE_NODE_ID, ENVIRONMENT_VARIABLE_NODE_ID, SYSTEM_VARIABLE_NODE_ID
-from core.workflow.runtime import VariablePool
+from core.workflow.runtime import VariablePool, compile_selector
+from core.workflow.runtime.variable_pool import _parse_template
 from core.workflow.system_variable import SystemVariable
 from factories.variable_factory import build_segment, segment_to_variable
 
@@ -434,3 +435,45 @@ def test_get_attr():
     res = vp.get(["node", "name", "output"])
     assert res is not None
     assert res.value == "hello"
+
+
+def test_nested_lookup_is_refreshed_after_add():
+    vp = VariablePool()
+    vp.add(["node", "obj"], {"a": {"b": 1}})
+    assert vp.get(["node", "obj", "a", "b"]).value == 1
+    assert vp.get(["node", "obj", "missing"]) is None
+
+    vp.add(["node", "obj"], {"a": {"b": 2}, "missing": "now here"})
+    assert vp.get(["node", "obj", "a", "b"]).value == 2
+    assert vp.get(["node", "obj", "missing"]).value == "now here"
+
+    vp.remove(["node", "obj"])
+    assert vp.get(["node", "obj", "a", "b"]) is None
+
+
+def test_convert_template_reuses_parsed_template():
+    vp = VariablePool()
+    vp.add(["node", "name"], "dify")
+    template = "Hello {{#node.name#}}, {{#node.missing#}}!"
+
+    assert vp.convert_template(template).text == "Hello dify, node.missing!"
+    vp.add(["node", "name"], "world")
+    vp.add(["node", "missing"], "again")
+
+    hits = _parse_template.cache_info().hits
+    group = vp.convert_template(template)
+    assert _parse_template.cache_info().hits == hits + 1
+    assert group.text == "Hello world, again!"
+    assert [segment.value for segment in group.value] == ["Hello ", "world", ", ", "again", "!"]
+
+
+def test_compiled_selector_lookup():
+    vp = VariablePool()
+    vp.add(["node", "obj"], {"a": {"b": 1}})
+
+    compiled = compile_selector(["node", "obj", "a", "b"])
+    assert compiled is compile_selector(("node", "obj", "a", "b"))
+    assert compiled.attrs == ("a", "b")
+    assert vp.get(compiled).value == 1
+    assert vp.get(compile_selector(["node", "obj"])).value == {"a": {"b": 1}}
+    assert compile_selector(["node"]) is None
@@ -135,6 +135,10 @@ class TestCelerySSLConfiguration:
         mock_config.TRIGGER_PROVIDER_REFRESH_INTERVAL = 15
         mock_config.ENABLE_API_TOKEN_LAST_USED_UPDATE_TASK = False
         mock_config.API_TOKEN_LAST_USED_UPDATE_INTERVAL = 30
+        mock_config.ENABLE_APP_STATISTIC_ROLLUP_TASK = False
+        mock_config.APP_STATISTIC_ROLLUP_INTERVAL = 10
+        mock_config.ENABLE_SEGMENT_HIT_COUNT_UPDATE_TASK = False
+        mock_config.SEGMENT_HIT_COUNT_UPDATE_INTERVAL = 1
 
         with patch("extensions.ext_celery.dify_config", mock_config):
             from dify_app import DifyApp
@@ -1,5 +1,6 @@
 import base64
 import hashlib
+import io
 from datetime import datetime
 from unittest.mock import ANY, MagicMock
 
@@ -142,6 +143,52 @@ def test_put_object_raises_on_error(monkeypatch):
         storage.put_object("key", b"data")
 
 
+def test_put_object_stream_uploads_in_parts(monkeypatch):
+    _configure_storage(monkeypatch, ARCHIVE_STORAGE_MULTIPART_CHUNK_SIZE_MB=8)
+    client, _ = _mock_client(monkeypatch)
+    storage = ArchiveStorage(bucket=BUCKET_NAME)
+    fileobj = io.BytesIO(b"streamed payload")
+    fileobj.seek(5)
+
+    checksum = storage.put_object_stream("key", fileobj)
+
+    assert checksum == hashlib.md5(b"streamed payload").hexdigest()
+    client.upload_fileobj.assert_called_once_with(fileobj, BUCKET_NAME, "key", Config=storage.transfer_config)
+    assert storage.transfer_config.multipart_chunksize == 8 * 1024 * 1024
+
+
+def test_put_object_stream_raises_on_error(monkeypatch):
+    _configure_storage(monkeypatch)
+    client, _ = _mock_client(monkeypatch)
+    client.upload_fileobj.side_effect = _client_error("500")
+    storage = ArchiveStorage(bucket=BUCKET_NAME)
+
+    with pytest.raises(ArchiveStorageError, match="Failed to upload object"):
+        storage.put_object_stream("key", io.BytesIO(b"data"))
+
+
+def test_download_object_rewinds_file(monkeypatch):
+    _configure_storage(monkeypatch)
+    client, _ = _mock_client(monkeypatch)
+    client.download_fileobj.side_effect = lambda bucket, key, fileobj, **kwargs: fileobj.write(b"payload")
+    storage = ArchiveStorage(bucket=BUCKET_NAME)
+    fileobj = io.BytesIO()
+
+    storage.download_object("key", fileobj)
+
+    assert fileobj.read() == b"payload"
+
+
+def test_download_object_missing(monkeypatch):
+    _configure_storage(monkeypatch)
+    client, _ = _mock_client(monkeypatch)
+    client.download_fileobj.side_effect = _client_error("404")
+    storage = ArchiveStorage(bucket=BUCKET_NAME)
+
+    with pytest.raises(FileNotFoundError, match="Archive object not found"):
+        storage.download_object("missing", io.BytesIO())
+
+
 def test_get_object_returns_bytes(monkeypatch):
     _configure_storage(monkeypatch)
     client, _ = _mock_client(monkeypatch)
@@ -278,6 +325,19 @@ def test_serialization_roundtrip():
     assert decoded[1]["value"] == 123
 
 
+def test_streaming_serialization_matches_jsonl():
+    records = [{"id": str(index), "created_at": datetime(2024, 1, 1, 12, 0, index)} for index in range(3)]
+
+    lines = list(ArchiveStorage.iter_jsonl(iter(records)))
+
+    assert b"".join(lines) == ArchiveStorage.serialize_to_jsonl(records)
+    assert all(line.endswith(b"\n") for line in lines)
+    assert list(ArchiveStorage.iter_jsonl_records(io.BytesIO(b"".join(lines) + b"\n"))) == [
+        {"id": str(index), "created_at": f"2024-01-01T12:00:0{index}"} for index in range(3)
+    ]
+    assert ArchiveStorage.serialize_to_jsonl([]) == b""
+
+
 def test_content_md5_matches_checksum():
     data = b"checksum"
     expected = base64.b64encode(hashlib.md5(data).digest()).decode()
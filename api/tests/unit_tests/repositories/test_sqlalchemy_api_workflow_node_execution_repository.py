@@ -38,3 +38,23 @@ class TestDifyAPISQLAlchemyWorkflowNodeExecutionRepository:
         assert any("app_id" in clause for clause in where_strs)
         assert any("workflow_run_id" in clause for clause in where_strs)
         assert not any("paused" in clause for clause in where_strs)
+
+    def test_iter_executions_by_workflow_run_streams_in_batches(self):
+        mock_session = Mock(spec=Session)
+        mock_session.scalars.return_value = iter(["execution-1", "execution-2"])
+        repository = DifyAPISQLAlchemyWorkflowNodeExecutionRepository(Mock(spec=sessionmaker))
+
+        executions = repository.iter_executions_by_workflow_run(
+            mock_session,
+            tenant_id="tenant-123",
+            app_id="app-123",
+            workflow_run_id="workflow-run-123",
+            batch_size=50,
+        )
+
+        mock_session.scalars.assert_not_called()
+        assert list(executions) == ["execution-1", "execution-2"]
+        stmt = mock_session.scalars.call_args[0][0]
+        assert stmt.get_execution_options()["yield_per"] == 50
+        where_strs = [str(clause).lower() for clause in stmt._where_criteria]
+        assert any("workflow_run_id" in clause for clause in where_strs)
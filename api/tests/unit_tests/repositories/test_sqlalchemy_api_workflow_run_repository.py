@@ -19,6 +19,8 @@ from repositories.entities.workflow_pause import WorkflowPauseEntity
 from repositories.sqlalchemy_api_workflow_run_repository import (
     DifyAPISQLAlchemyWorkflowRunRepository,
     _build_human_input_required_reason,
+    _decode_pause_state,
+    _encode_pause_state,
     _PrivateWorkflowPauseEntity,
     _WorkflowRunError,
 )
@@ -188,6 +190,40 @@ class TestCreateWorkflowPause(TestDifyAPISQLAlchemyWorkflowRunRepository):
                 # When using session.begin() context manager, commit is handled automatically
                 # No explicit commit call is expected
 
+    @pytest.mark.parametrize(("level", "suffix"), [(1, ".json.gz"), (0, ".json")])
+    def test_create_workflow_pause_encodes_state(
+        self,
+        repository: DifyAPISQLAlchemyWorkflowRunRepository,
+        mock_session: Mock,
+        sample_workflow_run: Mock,
+        level: int,
+        suffix: str,
+    ):
+        """Test the stored state is gzip-compressed unless compression is disabled."""
+        state = '{"variable_pool":"' + "x" * 10_000 + '"}'
+        mock_session.get.return_value = sample_workflow_run
+
+        with (
+            patch(
+                "repositories.sqlalchemy_api_workflow_run_repository.dify_config.WORKFLOW_PAUSE_STATE_COMPRESSION_LEVEL",
+                level,
+            ),
+            patch("repositories.sqlalchemy_api_workflow_run_repository.storage") as mock_storage,
+        ):
+            result = repository.create_workflow_pause(
+                workflow_run_id="workflow-run-123",
+                state_owner_user_id="user-123",
+                state=state,
+                pause_reasons=[],
+            )
+
+            state_key, stored = mock_storage.save.call_args.args
+            mock_storage.load.return_value = stored
+
+            assert state_key.endswith(suffix)
+            assert (len(stored) < len(state)) == (level > 0)
+            assert result.get_state() == state.encode()
+
     def test_create_workflow_pause_not_found(
         self, repository: DifyAPISQLAlchemyWorkflowRunRepository, mock_session: Mock
     ):
@@ -464,6 +500,17 @@ class TestPrivateWorkflowPauseEntity(TestDifyAPISQLAlchemyWorkflowRunRepository)
             mock_storage.load.assert_called_once()  # Only called once due to caching
 
 
+class TestPauseStateEncoding:
+    def test_roundtrip(self):
+        _, stored = _encode_pause_state('{"test": "state"}')
+
+        assert stored[:2] == b"\x1f\x8b"
+        assert _decode_pause_state(stored) == b'{"test": "state"}'
+
+    def test_uncompressed_states_are_returned_unchanged(self):
+        assert _decode_pause_state(b'{"test": "state"}') == b'{"test": "state"}'
+
+
 class TestBuildHumanInputRequiredReason:
     def test_prefers_backstage_token_when_available(self):
         expiration_time = datetime.now(UTC)
@@ -0,0 +1,186 @@
+"""Unit tests for the app statistic rollups, run against an in-memory SQLite database."""
+
+import uuid
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from core.app.entities.app_invoke_entities import InvokeFrom
+from models.model import Message
+from models.statistic import AppStatisticRollup, AppStatisticRollupCursor, AppStatisticSource
+from models.workflow import WorkflowRun
+from repositories.sqlalchemy_app_statistic_rollup_repository import SQLAlchemyAppStatisticRollupRepository
+
+APP_ID = str(uuid.uuid4())
+OTHER_APP_ID = str(uuid.uuid4())
+TENANT_ID = str(uuid.uuid4())
+DAY = datetime(2026, 3, 1)
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    # the live queries group by a dialect specific date expression, SQLite only needs UTC dates here
+    monkeypatch.setattr(
+        "repositories.sqlalchemy_app_statistic_rollup_repository.convert_datetime_to_date",
+        lambda field, target_timezone=":tz": f"DATE({field})",
+    )
+    engine = sa.create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    for model in (Message, WorkflowRun, AppStatisticRollup, AppStatisticRollupCursor):
+        model.__table__.create(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def repository(engine) -> SQLAlchemyAppStatisticRollupRepository:
+    return SQLAlchemyAppStatisticRollupRepository(sessionmaker(bind=engine, expire_on_commit=False))
+
+
+def _insert_message(engine, created_at: datetime, *, app_id: str = APP_ID, invoke_from=InvokeFrom.WEB_APP):
+    with engine.begin() as conn:
+        conn.execute(
+            sa.insert(Message),
+            {
+                "id": str(uuid.uuid4()),
+                "app_id": app_id,
+                "conversation_id": str(uuid.uuid4()),
+                "query": "hi",
+                "inputs": {},
+                "message": {},
+                "message_tokens": 10,
+                "message_unit_price": Decimal("0.001"),
+                "answer": "hello",
+                "answer_tokens": 5,
+                "answer_unit_price": Decimal("0.002"),
+                "provider_response_latency": 0.5,
+                "total_price": Decimal("0.0000200"),
+                "currency": "USD",
+                "from_source": "api",
+                "invoke_from": invoke_from,
+                "created_at": created_at,
+            },
+        )
+
+
+def _insert_workflow_run(engine, created_at: datetime, *, triggered_from: str = "app-run"):
+    with engine.begin() as conn:
+        conn.execute(
+            sa.insert(WorkflowRun),
+            {
+                "id": str(uuid.uuid4()),
+                "tenant_id": TENANT_ID,
+                "app_id": APP_ID,
+                "workflow_id": str(uuid.uuid4()),
+                "type": "workflow",
+                "triggered_from": triggered_from,
+                "version": "draft",
+                "status": "succeeded",
+                "total_tokens": 7,
+                "created_by_role": "account",
+                "created_by": str(uuid.uuid4()),
+                "created_at": created_at,
+            },
+        )
+
+
+def _roll_up(repository, source: AppStatisticSource, start: datetime, hours: int):
+    for hour in range(hours):
+        repository.roll_up_hour(source, start + timedelta(hours=hour))
+
+
+class TestRollUpHour:
+    def test_aggregates_hour_per_app_and_extends_range(self, engine, repository):
+        _insert_message(engine, DAY + timedelta(minutes=5))
+        _insert_message(engine, DAY + timedelta(minutes=55))
+        _insert_message(engine, DAY + timedelta(minutes=30), app_id=OTHER_APP_ID)
+        _insert_message(engine, DAY + timedelta(minutes=30), invoke_from=InvokeFrom.DEBUGGER)
+        _insert_message(engine, DAY + timedelta(hours=1))
+
+        assert repository.roll_up_hour(AppStatisticSource.MESSAGE, DAY) == 2
+        assert repository.get_rolled_up_range(AppStatisticSource.MESSAGE) == (DAY, DAY + timedelta(hours=1))
+
+        with engine.connect() as conn:
+            rollup = conn.execute(sa.select(AppStatisticRollup).where(AppStatisticRollup.app_id == APP_ID)).one()
+        assert rollup.record_count == 2
+        assert rollup.message_tokens == 20
+        assert rollup.answer_tokens == 10
+        assert rollup.total_tokens == 30
+        assert rollup.total_price == Decimal("0.0000400")
+        assert rollup.total_latency == pytest.approx(1.0)
+
+    def test_recomputing_an_hour_replaces_its_rollups(self, engine, repository):
+        _insert_message(engine, DAY)
+        repository.roll_up_hour(AppStatisticSource.MESSAGE, DAY)
+        _insert_message(engine, DAY + timedelta(minutes=1))
+        repository.roll_up_hour(AppStatisticSource.MESSAGE, DAY)
+
+        with engine.connect() as conn:
+            counts = conn.execute(sa.select(AppStatisticRollup.record_count)).scalars().all()
+        assert counts == [2]
+
+    def test_range_grows_in_both_directions_but_stays_contiguous(self, repository):
+        repository.roll_up_hour(AppStatisticSource.MESSAGE, DAY)
+        repository.roll_up_hour(AppStatisticSource.MESSAGE, DAY + timedelta(hours=1))
+        repository.roll_up_hour(AppStatisticSource.MESSAGE, DAY - timedelta(hours=1))
+
+        assert repository.get_rolled_up_range(AppStatisticSource.MESSAGE) == (
+            DAY - timedelta(hours=1),
+            DAY + timedelta(hours=2),
+        )
+        with pytest.raises(ValueError):
+            repository.roll_up_hour(AppStatisticSource.MESSAGE, DAY + timedelta(hours=5))
+
+
+class TestDailyTotals:
+    def test_message_totals_match_live_query(self, engine, repository):
+        for hour in range(0, 48, 3):
+            _insert_message(engine, DAY + timedelta(hours=hour, minutes=10))
+        live = repository.get_daily_message_totals(APP_ID, timezone="UTC")
+
+        # roll up part of the first day, the rest is queried live
+        _roll_up(repository, AppStatisticSource.MESSAGE, DAY + timedelta(hours=2), 20)
+
+        assert repository.get_daily_message_totals(APP_ID, timezone="UTC") == live
+        start, end = DAY + timedelta(hours=1, minutes=30), DAY + timedelta(hours=40, minutes=30)
+        rolled_up = repository.get_daily_message_totals(APP_ID, start.replace(tzinfo=UTC), end, timezone="UTC")
+        assert [(totals["date"], totals["message_count"]) for totals in rolled_up] == [
+            ("2026-03-01", 7),
+            ("2026-03-02", 6),
+        ]
+        assert rolled_up[0]["total_price"] == Decimal("0.0001400")
+
+    def test_rolled_up_hours_are_grouped_by_timezone_day(self, engine, repository):
+        _insert_message(engine, DAY + timedelta(hours=15))
+        _insert_message(engine, DAY + timedelta(hours=17))
+        _roll_up(repository, AppStatisticSource.MESSAGE, DAY, 24)
+
+        totals = repository.get_daily_message_totals(APP_ID, DAY, DAY + timedelta(hours=24), timezone="Asia/Shanghai")
+
+        assert [(day["date"], day["message_count"]) for day in totals] == [("2026-03-01", 1), ("2026-03-02", 1)]
+
+    def test_timezone_with_partial_hour_offset_is_queried_live(self, engine, repository):
+        _insert_message(engine, DAY + timedelta(hours=20))
+        _roll_up(repository, AppStatisticSource.MESSAGE, DAY, 24)
+
+        totals = repository.get_daily_message_totals(APP_ID, DAY, DAY + timedelta(hours=24), timezone="Asia/Kolkata")
+
+        # the patched live query groups by UTC date, rollups would have been grouped by the Kolkata date
+        assert [(day["date"], day["message_count"]) for day in totals] == [("2026-03-01", 1)]
+
+    def test_workflow_run_totals_filter_triggered_from(self, engine, repository):
+        _insert_workflow_run(engine, DAY + timedelta(hours=1))
+        _insert_workflow_run(engine, DAY + timedelta(hours=2))
+        _insert_workflow_run(engine, DAY + timedelta(hours=2), triggered_from="debugging")
+        _insert_workflow_run(engine, DAY + timedelta(hours=30))
+        _roll_up(repository, AppStatisticSource.WORKFLOW_RUN, DAY, 24)
+
+        totals = repository.get_daily_workflow_run_totals(TENANT_ID, APP_ID, "app-run", timezone="UTC")
+
+        assert totals == [
+            {"date": "2026-03-01", "runs": 2, "token_count": 14},
+            {"date": "2026-03-02", "runs": 1, "token_count": 7},
+        ]
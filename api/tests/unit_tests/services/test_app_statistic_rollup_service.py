@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from models.statistic import AppStatisticSource
+from services.app_statistic_rollup_service import AppStatisticRollupService
+
+NOW = datetime(2026, 3, 1, 12, 30)
+
+
+@pytest.fixture
+def repository():
+    repository = MagicMock()
+    repository.roll_up_hour.return_value = 1
+    return repository
+
+
+@pytest.fixture(autouse=True)
+def rollup_config():
+    with patch("services.app_statistic_rollup_service.dify_config") as config:
+        config.APP_STATISTIC_ROLLUP_DELAY = 60
+        config.APP_STATISTIC_ROLLUP_MAX_HOURS_PER_RUN = 3
+        yield config
+
+
+def _rolled_up_hours(repository, source: AppStatisticSource) -> list[datetime]:
+    return [call.args[1] for call in repository.roll_up_hour.call_args_list if call.args[0] == source]
+
+
+def test_settled_until_waits_for_the_delay():
+    assert AppStatisticRollupService.settled_until(NOW) == datetime(2026, 3, 1, 11)
+
+
+def test_first_rollup_starts_at_the_last_settled_hour(repository):
+    repository.get_rolled_up_range.return_value = None
+
+    result = AppStatisticRollupService(repository).roll_up_pending(NOW)
+
+    assert result == {AppStatisticSource.MESSAGE: 1, AppStatisticSource.WORKFLOW_RUN: 1}
+    assert _rolled_up_hours(repository, AppStatisticSource.MESSAGE) == [datetime(2026, 3, 1, 10)]
+
+
+def test_pending_rollup_continues_the_range_up_to_the_per_run_limit(repository):
+    repository.get_rolled_up_range.return_value = (datetime(2026, 3, 1), datetime(2026, 3, 1, 5))
+
+    result = AppStatisticRollupService(repository).roll_up_pending(NOW)
+
+    assert result[AppStatisticSource.MESSAGE] == 3
+    assert _rolled_up_hours(repository, AppStatisticSource.MESSAGE) == [
+        datetime(2026, 3, 1, 5),
+        datetime(2026, 3, 1, 6),
+        datetime(2026, 3, 1, 7),
+    ]
+
+
+def test_backfill_rolls_up_hours_before_the_range_newest_first(repository):
+    range_start = datetime(2026, 3, 1, 5)
+    repository.get_rolled_up_range.return_value = (range_start, datetime(2026, 3, 1, 11))
+    progress = MagicMock()
+
+    hours = AppStatisticRollupService(repository).backfill(
+        AppStatisticSource.WORKFLOW_RUN, datetime(2026, 3, 1, 2, 45), on_progress=progress
+    )
+
+    expected = [range_start - timedelta(hours=hour) for hour in (1, 2, 3)]
+    assert hours == 3
+    assert _rolled_up_hours(repository, AppStatisticSource.WORKFLOW_RUN) == expected
+    assert [call.args[0] for call in progress.call_args_list] == expected
@@ -6,9 +6,14 @@ This module contains tests for:
 - Rollback service
 """
 
+import hashlib
+import io
+import json
+import zipfile
 from datetime import datetime
 from unittest.mock import MagicMock, patch
 
+from libs.archive_storage import ArchiveStorage
 from services.retention.workflow_run.constants import ARCHIVE_BUNDLE_NAME
 
 
@@ -52,3 +57,45 @@ class TestWorkflowRunArchiver:
         key = archiver._get_archive_key(mock_run)
 
         assert key == f"tenant-123/app_id=app-999/year=2024/month=01/workflow_run_id=run-456/{ARCHIVE_BUNDLE_NAME}"
+
+    def test_write_archive_bundle_streams_tables(self):
+        """Tables are streamed into the bundle, with the manifest describing each JSONL member."""
+        from services.retention.workflow_run.archive_paid_plan_workflow_run import WorkflowRunArchiver
+
+        archiver = WorkflowRunArchiver.__new__(WorkflowRunArchiver)
+        run = MagicMock(id="run-456", tenant_id="tenant-123", app_id="app-999", workflow_id="wf-1")
+        run.created_at = datetime(2024, 1, 15, 12, 0, 0)
+        consumed = []
+
+        def _node_executions():
+            for index in range(3):
+                consumed.append(index)
+                yield {"id": f"exec-{index}", "created_at": datetime(2024, 1, 15, 12, 0, index)}
+
+        table_data = {table_name: [] for table_name in WorkflowRunArchiver.ARCHIVED_TABLES}
+        table_data["workflow_runs"] = [{"id": "run-456"}]
+        table_data["workflow_node_executions"] = _node_executions()
+        bundle = io.BytesIO()
+
+        table_stats = archiver._write_archive_bundle(bundle, run, table_data)
+
+        assert consumed == [0, 1, 2]
+        stats = {stat.table_name: stat for stat in table_stats}
+        assert stats["workflow_node_executions"].row_count == 3
+        assert stats["workflow_pauses"].row_count == 0
+        with zipfile.ZipFile(bundle) as archive:
+            manifest = json.loads(archive.read("manifest.json"))
+            node_executions = archive.read("workflow_node_executions.jsonl")
+            assert sorted(archive.namelist()) == sorted(
+                ["manifest.json", *(f"{table_name}.jsonl" for table_name in WorkflowRunArchiver.ARCHIVED_TABLES)]
+            )
+        assert manifest["tables"]["workflow_node_executions"] == {
+            "row_count": 3,
+            "checksum": hashlib.md5(node_executions).hexdigest(),
+            "size_bytes": len(node_executions),
+        }
+        assert [record["id"] for record in ArchiveStorage.deserialize_from_jsonl(node_executions)] == [
+            "exec-0",
+            "exec-1",
+            "exec-2",
+        ]
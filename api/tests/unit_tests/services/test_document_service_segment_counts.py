@@ -0,0 +1,110 @@
+"""Unit tests for the grouped segment counts of DocumentService, run against an in-memory SQLite database."""
+
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from models.dataset import DocumentSegment
+from services.dataset_service import DocumentService
+
+DATASET_ID = str(uuid.uuid4())
+TENANT_ID = str(uuid.uuid4())
+
+
+@pytest.fixture
+def engine():
+    engine = sa.create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    DocumentSegment.__table__.create(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def statements(engine) -> list[str]:
+    executed: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            executed.append(statement)
+
+    sa.event.listen(engine, "before_cursor_execute", _record)
+    yield executed
+    sa.event.remove(engine, "before_cursor_execute", _record)
+
+
+@pytest.fixture
+def session(engine, monkeypatch):
+    with Session(engine) as session:
+        monkeypatch.setattr("services.dataset_service.db", SimpleNamespace(session=session))
+        yield session
+
+
+def _insert_segments(engine, document_id: str, *, completed: int, pending: int = 0, re_segment: int = 0):
+    rows = []
+    for position in range(completed + pending + re_segment):
+        rows.append(
+            {
+                "id": str(uuid.uuid4()),
+                "tenant_id": TENANT_ID,
+                "dataset_id": DATASET_ID,
+                "document_id": document_id,
+                "position": position,
+                "content": "chunk",
+                "word_count": 1,
+                "tokens": 1,
+                "status": "re_segment" if position >= completed + pending else "completed",
+                "created_by": str(uuid.uuid4()),
+                "completed_at": datetime(2026, 3, 1)
+                if position < completed or position >= completed + pending
+                else None,
+            }
+        )
+    with engine.begin() as conn:
+        conn.execute(sa.insert(DocumentSegment), rows)
+
+
+def test_counts_completed_and_total_segments_per_document(engine, session):
+    document_ids = [str(uuid.uuid4()) for _ in range(3)]
+    _insert_segments(engine, document_ids[0], completed=2, pending=1, re_segment=2)
+    _insert_segments(engine, document_ids[1], completed=0, pending=4)
+
+    assert DocumentService.get_segment_counts(document_ids) == {
+        document_ids[0]: (2, 3),
+        document_ids[1]: (0, 4),
+        document_ids[2]: (0, 0),
+    }
+
+
+def test_query_count_does_not_grow_with_page_size(engine, session, statements):
+    page = [str(uuid.uuid4()) for _ in range(100)]
+    for document_id in page:
+        _insert_segments(engine, document_id, completed=1, pending=1)
+
+    DocumentService.get_segment_counts(page[:1])
+    single_document_queries = len(statements)
+    statements.clear()
+    segment_counts = DocumentService.get_segment_counts(page)
+
+    assert single_document_queries == len(statements) == 1
+    assert set(segment_counts.values()) == {(1, 2)}
+
+
+def test_empty_page_runs_no_query(session, statements):
+    assert DocumentService.get_segment_counts([]) == {}
+    assert statements == []
+
+
+def test_enrich_documents_with_segment_counts(engine, session, statements):
+    documents = [SimpleNamespace(id=str(uuid.uuid4())) for _ in range(5)]
+    _insert_segments(engine, documents[0].id, completed=3, pending=2)
+
+    DocumentService.enrich_documents_with_segment_counts(documents)
+
+    assert len(statements) == 1
+    assert (documents[0].completed_segments, documents[0].total_segments) == (3, 5)
+    assert all((document.completed_segments, document.total_segments) == (0, 0) for document in documents[1:])
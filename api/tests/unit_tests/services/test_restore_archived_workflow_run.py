@@ -2,8 +2,10 @@
 Unit tests for workflow run restore functionality.
 """
 
+import io
+import zipfile
 from datetime import datetime
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 
 class TestWorkflowRunRestore:
@@ -63,3 +65,56 @@ class TestWorkflowRunRestore:
 
         assert restored == 0
         session.execute.assert_not_called()
+
+    def test_restore_table_stream_inserts_in_batches(self):
+        """Streamed records should be inserted in batches instead of one statement per table."""
+        from services.retention.workflow_run.restore_archived_workflow_run import WorkflowRunRestore
+
+        session = MagicMock()
+        session.execute.return_value = MagicMock(rowcount=2)
+        records = (
+            {"id": f"p{index}", "workflow_run_id": "r1", "created_at": "2024-01-01T00:00:00"} for index in range(5)
+        )
+
+        restore = WorkflowRunRestore()
+        with patch("services.retention.workflow_run.restore_archived_workflow_run.ARCHIVE_ROWS_BATCH_SIZE", 2):
+            restored, record_count = restore._restore_table_stream(
+                session, "workflow_pauses", records, schema_version="1.0"
+            )
+
+        assert (restored, record_count) == (6, 5)
+        assert session.execute.call_count == 3
+
+    def test_iter_archived_records_reads_one_table(self):
+        """A single table of an archived run can be read without restoring the bundle."""
+        from models.workflow import WorkflowArchiveLog
+        from services.retention.workflow_run.restore_archived_workflow_run import WorkflowRunRestore
+
+        bundle = io.BytesIO()
+        with zipfile.ZipFile(bundle, mode="w") as archive:
+            archive.writestr("manifest.json", '{"schema_version": "1.0", "tables": {}}')
+            archive.writestr("workflow_pauses.jsonl", b'{"id": "p1"}\n{"id": "p2"}\n')
+        storage = MagicMock()
+        storage.download_object.side_effect = lambda key, fileobj: (fileobj.write(bundle.getvalue()), fileobj.seek(0))
+        archive_log = MagicMock(spec=WorkflowArchiveLog)
+        archive_log.tenant_id = "t1"
+        archive_log.app_id = "a1"
+        archive_log.workflow_run_id = "r1"
+        archive_log.run_created_at = datetime(2024, 1, 1)
+
+        restore = WorkflowRunRestore()
+        restore.workflow_run_repo = MagicMock()
+        restore.workflow_run_repo.get_archived_log_by_run_id.return_value = archive_log
+        with patch(
+            "services.retention.workflow_run.restore_archived_workflow_run.get_archive_storage",
+            return_value=storage,
+        ):
+            records = list(restore.iter_archived_records("r1", "workflow_pauses"))
+            missing_table = list(restore.iter_archived_records("r1", "workflow_trigger_logs"))
+
+        assert records == [{"id": "p1"}, {"id": "p2"}]
+        assert missing_table == []
+        assert (
+            storage.download_object.call_args.args[0]
+            == "t1/app_id=a1/year=2024/month=01/workflow_run_id=r1/archive.v1.0.zip"
+        )
@@ -0,0 +1,106 @@
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from schedule import workflow_schedule_task
+from services.trigger.schedule_dispatch_index import DUE_KEY, ScheduleDispatchIndex
+
+MODULE = "services.trigger.schedule_dispatch_index"
+
+NOW = datetime(2025, 1, 1, 12, 0)
+
+
+@pytest.fixture
+def redis_client():
+    with patch(f"{MODULE}.redis_client") as client:
+        yield client
+
+
+def _index(enabled: bool = True, jitter: int = 0) -> ScheduleDispatchIndex:
+    return ScheduleDispatchIndex(enabled=enabled, rebuild_interval=60, jitter=jitter)
+
+
+class TestScheduleDispatchIndex:
+    def test_pop_due_claims_plans_due_before_now(self, redis_client):
+        redis_client.eval.return_value = [b"plan-1", b"plan-2"]
+
+        assert _index().pop_due(NOW, 100) == ["plan-1", "plan-2"]
+
+        _, numkeys, key, score, limit = redis_client.eval.call_args.args
+        assert (numkeys, key, limit) == (1, DUE_KEY, 100)
+        assert score == NOW.replace(tzinfo=UTC).timestamp()
+
+    def test_add_scores_plans_by_next_run_time(self, redis_client):
+        _index().add([("plan-1", NOW), ("plan-2", None), ("plan-3", NOW.replace(tzinfo=UTC) + timedelta(hours=1))])
+
+        redis_client.zadd.assert_called_once_with(
+            DUE_KEY,
+            {
+                "plan-1": NOW.replace(tzinfo=UTC).timestamp(),
+                "plan-3": NOW.replace(tzinfo=UTC).timestamp() + 3600,
+            },
+        )
+
+    def test_writes_are_best_effort(self, redis_client):
+        redis_client.zadd.side_effect = ConnectionError("down")
+        redis_client.zrem.side_effect = ConnectionError("down")
+
+        _index().add([("plan-1", NOW)])
+        _index().remove("plan-1")
+
+    def test_disabled_index_is_not_written(self, redis_client):
+        _index(enabled=False).add([("plan-1", NOW)])
+        _index(enabled=False).remove("plan-1")
+
+        redis_client.zadd.assert_not_called()
+        redis_client.zrem.assert_not_called()
+
+    def test_dispatch_delay_is_stable_and_within_window(self):
+        index = _index(jitter=30)
+
+        delays = [index.dispatch_delay(f"plan-{i}") for i in range(200)]
+
+        assert delays == [index.dispatch_delay(f"plan-{i}") for i in range(200)]
+        assert all(0 <= delay < 30 for delay in delays)
+        assert len(set(delays)) > 10
+        assert _index().dispatch_delay("plan-1") == 0
+
+
+class TestPollerWithIndex:
+    @pytest.fixture
+    def index(self):
+        index = MagicMock()
+        with (
+            patch.object(workflow_schedule_task, "schedule_dispatch_index", index),
+            patch.object(workflow_schedule_task, "naive_utc_now", return_value=NOW),
+        ):
+            yield index
+
+    def test_claimed_plans_are_checked_against_database(self, index):
+        due = SimpleNamespace(id="due", next_run_at=NOW - timedelta(minutes=1))
+        moved = SimpleNamespace(id="moved", next_run_at=NOW + timedelta(hours=1))
+        index.pop_due.side_effect = [["due", "moved", "deleted"]]
+        session = MagicMock()
+        session.scalars.return_value.all.return_value = [due, moved]
+
+        assert workflow_schedule_task._fetch_indexed_due_schedules(session) == [due]
+
+        assert list(index.add.call_args.args[0]) == [("moved", moved.next_run_at)]
+
+    def test_keeps_claiming_past_batches_without_due_plans(self, index):
+        due = SimpleNamespace(id="due", next_run_at=NOW)
+        moved = SimpleNamespace(id="moved", next_run_at=NOW + timedelta(hours=1))
+        index.pop_due.side_effect = [["moved"], ["due"], []]
+        session = MagicMock()
+        session.scalars.return_value.all.side_effect = [[moved], [due]]
+
+        assert workflow_schedule_task._fetch_indexed_due_schedules(session) == [due]
+        assert index.pop_due.call_count == 2
+
+    def test_dispatch_is_spread_over_jitter_window(self, index):
+        index.dispatch_delay.side_effect = lambda schedule_id: 7 if schedule_id == "late" else 0
+
+        assert workflow_schedule_task._schedule_trigger_signature("late").options["countdown"] == 7
+        assert "countdown" not in workflow_schedule_task._schedule_trigger_signature("now").options
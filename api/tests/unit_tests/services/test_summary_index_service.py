@@ -0,0 +1,185 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.errors.error import ProviderTokenNotInitError
+from core.model_runtime.entities.llm_entities import LLMUsage
+from core.model_runtime.errors.invoke import InvokeRateLimitError
+from services.summary_index_service import (
+    SUMMARY_RATE_LIMIT_MAX_RETRIES,
+    SUMMARY_RATE_LIMIT_RETRY_DELAY,
+    SummaryIndexService,
+)
+
+MODULE = "services.summary_index_service"
+
+
+def _segment(segment_id: str):
+    return SimpleNamespace(id=segment_id, document_id="doc-1", content=f"content of {segment_id}")
+
+
+def _dataset():
+    return SimpleNamespace(
+        id="dataset-1",
+        tenant_id="tenant-1",
+        embedding_model_provider="provider",
+        embedding_model="embedding",
+        indexing_technique="high_quality",
+    )
+
+
+class TestGenerateSummaryWithBackoff:
+    def test_retries_while_rate_limited(self):
+        usage = LLMUsage.empty_usage()
+        with (
+            patch.object(
+                SummaryIndexService,
+                "generate_summary_for_segment",
+                side_effect=[InvokeRateLimitError("limited"), ("summary", usage)],
+            ) as mock_generate,
+            patch.object(SummaryIndexService, "_summary_model_cooldown_ttl", return_value=None),
+            patch(f"{MODULE}.time.sleep") as mock_sleep,
+        ):
+            result = SummaryIndexService.generate_summary_with_backoff(_segment("seg-1"), _dataset(), {"enable": True})
+
+        assert result == ("summary", usage)
+        assert mock_generate.call_count == 2
+        mock_sleep.assert_called_once_with(SUMMARY_RATE_LIMIT_RETRY_DELAY)
+
+    def test_gives_up_after_max_retries(self):
+        with (
+            patch.object(
+                SummaryIndexService, "generate_summary_for_segment", side_effect=InvokeRateLimitError("limited")
+            ) as mock_generate,
+            patch.object(SummaryIndexService, "_summary_model_cooldown_ttl", return_value=None),
+            patch(f"{MODULE}.time.sleep"),
+        ):
+            with pytest.raises(InvokeRateLimitError):
+                SummaryIndexService.generate_summary_with_backoff(_segment("seg-1"), _dataset(), {"enable": True})
+
+        assert mock_generate.call_count == SUMMARY_RATE_LIMIT_MAX_RETRIES
+
+    def test_waits_for_cooldown_when_all_configs_are_cooling_down(self):
+        usage = LLMUsage.empty_usage()
+        with (
+            patch.object(
+                SummaryIndexService,
+                "generate_summary_for_segment",
+                side_effect=[ProviderTokenNotInitError("Model credentials is not initialized."), ("summary", usage)],
+            ),
+            patch.object(SummaryIndexService, "_summary_model_cooldown_ttl", return_value=42),
+            patch(f"{MODULE}.time.sleep") as mock_sleep,
+        ):
+            result = SummaryIndexService.generate_summary_with_backoff(_segment("seg-1"), _dataset(), {"enable": True})
+
+        assert result == ("summary", usage)
+        mock_sleep.assert_called_once_with(42)
+
+    def test_missing_credentials_without_load_balancing_are_not_retried(self):
+        with (
+            patch.object(
+                SummaryIndexService,
+                "generate_summary_for_segment",
+                side_effect=ProviderTokenNotInitError("Model credentials is not initialized."),
+            ) as mock_generate,
+            patch.object(SummaryIndexService, "_summary_model_cooldown_ttl", return_value=None),
+            patch(f"{MODULE}.time.sleep") as mock_sleep,
+        ):
+            with pytest.raises(ProviderTokenNotInitError):
+                SummaryIndexService.generate_summary_with_backoff(_segment("seg-1"), _dataset(), {"enable": True})
+
+        mock_generate.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    def test_empty_summary_is_an_error(self):
+        with patch(
+            "core.rag.index_processor.processor.paragraph_index_processor.ParagraphIndexProcessor.generate_summary",
+            return_value=("", LLMUsage.empty_usage()),
+        ):
+            with pytest.raises(ValueError, match="Generated summary is empty"):
+                SummaryIndexService.generate_summary_with_backoff(
+                    _segment("seg-1"), _dataset(), {"enable": True}, SimpleNamespace(doc_language="English")
+                )
+
+
+class TestGenerateAndVectorizeSummaries:
+    def test_vectorizes_in_batches_and_records_errors(self):
+        segments = [_segment(f"seg-{i}") for i in range(5)]
+        document = SimpleNamespace(doc_language="English")
+
+        def fake_generate(segment, dataset, setting, document):
+            if segment.id == "seg-2":
+                raise ValueError("boom")
+            return f"summary of {segment.id}", LLMUsage.empty_usage()
+
+        with (
+            patch(f"{MODULE}.session_factory"),
+            patch(f"{MODULE}.dify_config.SUMMARY_INDEX_VECTORIZE_BATCH_SIZE", 2),
+            patch.object(SummaryIndexService, "generate_summary_with_backoff", side_effect=fake_generate),
+            patch.object(
+                SummaryIndexService, "batch_vectorize_summaries", side_effect=lambda pairs, dataset: pairs
+            ) as mock_vectorize,
+            patch.object(SummaryIndexService, "update_summary_record_error") as mock_error,
+        ):
+            results = SummaryIndexService._generate_and_vectorize_summaries(
+                segments, _dataset(), document, {"enable": True}
+            )
+
+        assert len(results) == 4
+        assert sorted(segment.id for segment, _ in results) == ["seg-0", "seg-1", "seg-3", "seg-4"]
+        batch_sizes = [len(call.args[0]) for call in mock_vectorize.call_args_list]
+        assert batch_sizes == [2, 2]
+        mock_error.assert_called_once()
+        assert mock_error.call_args.kwargs["segment"].id == "seg-2"
+
+
+class TestBatchVectorizeSummaries:
+    def test_single_embedding_and_vector_call_per_batch(self):
+        segments = [_segment(f"seg-{i}") for i in range(3)]
+        existing = SimpleNamespace(chunk_id="seg-0", summary_index_node_id="node-0")
+        records = [existing] + [SimpleNamespace(chunk_id=s.id, summary_index_node_id=None) for s in segments[1:]]
+
+        session = MagicMock()
+        session.query.return_value.filter.return_value = records
+        embedding_model = MagicMock()
+        embedding_model.get_text_embedding_num_tokens.return_value = [3, 4, 5]
+
+        with (
+            patch(f"{MODULE}.session_factory") as mock_session_factory,
+            patch(f"{MODULE}.ModelManager") as mock_model_manager,
+            patch(f"{MODULE}.Vector") as mock_vector_cls,
+        ):
+            mock_session_factory.create_session.return_value.__enter__.return_value = session
+            mock_model_manager.return_value.get_model_instance.return_value = embedding_model
+            result = SummaryIndexService.batch_vectorize_summaries(
+                [(segment, f"summary of {segment.id}") for segment in segments], _dataset()
+            )
+
+        embedding_model.get_text_embedding_num_tokens.assert_called_once()
+        mock_vector = mock_vector_cls.return_value
+        mock_vector.delete_by_ids.assert_called_once_with(["node-0"])
+        mock_vector.add_texts.assert_called_once()
+        assert len(mock_vector.add_texts.call_args.args[0]) == 3
+        assert [record.tokens for record in result] == [3, 4, 5]
+        assert all(record.status == "completed" for record in result)
+        session.commit.assert_called_once()
+
+    def test_marks_batch_as_error_when_vectorization_fails(self):
+        segments = [_segment("seg-0")]
+        record = SimpleNamespace(chunk_id="seg-0", summary_index_node_id=None)
+        session = MagicMock()
+        session.query.return_value.filter.return_value = [record]
+
+        with (
+            patch(f"{MODULE}.session_factory") as mock_session_factory,
+            patch(f"{MODULE}.ModelManager"),
+            patch(f"{MODULE}.Vector") as mock_vector_cls,
+        ):
+            mock_session_factory.create_session.return_value.__enter__.return_value = session
+            mock_vector_cls.return_value.add_texts.side_effect = RuntimeError("vector store down")
+            result = SummaryIndexService.batch_vectorize_summaries([(segments[0], "summary")], _dataset())
+
+        assert result == []
+        assert record.status == "error"
+        assert "vector store down" in record.error
@@ -0,0 +1,90 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from services.trigger.webhook_routing_cache import WebhookRoutingCache
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data: dict[str, int] = {}
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def incr(self, key):
+        self.data[key] = self.data.get(key, 0) + 1
+        return self.data[key]
+
+
+@pytest.fixture
+def fake_redis():
+    redis = _FakeRedis()
+    with patch("services.trigger.webhook_routing_cache.redis_client", redis):
+        yield redis
+
+
+def _cache(**kwargs) -> WebhookRoutingCache:
+    config = {"enabled": True, "max_size": 100, "ttl": 300}
+    config.update(kwargs)
+    return WebhookRoutingCache(**config)
+
+
+def _store(cache: WebhookRoutingCache, webhook_id: str = "hook", is_debug: bool = False, versions=None):
+    trigger = SimpleNamespace(webhook_id=webhook_id, app_id="app-1", tenant_id="tenant-1", node_id="node")
+    workflow = SimpleNamespace(id="workflow-1")
+    versions = versions if versions is not None else cache.versions("app-1", "tenant-1")
+    cache.set(webhook_id, is_debug, trigger, workflow, {"id": "node"}, versions)  # type: ignore
+    return trigger, workflow
+
+
+class TestWebhookRoutingCache:
+    def test_serves_cached_route(self, fake_redis):
+        cache = _cache()
+        trigger, workflow = _store(cache)
+
+        route = cache.get("hook", False)
+
+        assert route is not None
+        assert (route.webhook_trigger, route.workflow, route.node_config) == (trigger, workflow, {"id": "node"})
+        assert cache.get("hook", True) is None
+
+    def test_app_invalidation_evicts_route(self, fake_redis):
+        cache = _cache()
+        _store(cache)
+
+        cache.invalidate_app("app-2")
+        assert cache.get("hook", False) is not None
+
+        cache.invalidate_app("app-1")
+        assert cache.get("hook", False) is None
+
+    def test_tenant_invalidation_evicts_route(self, fake_redis):
+        cache = _cache()
+        _store(cache)
+
+        cache.invalidate_tenant("tenant-1")
+
+        assert cache.get("hook", False) is None
+
+    def test_invalidation_during_resolution_is_not_lost(self, fake_redis):
+        cache = _cache()
+        versions = cache.versions("app-1", "tenant-1")
+        cache.invalidate_app("app-1")
+        _store(cache, versions=versions)
+
+        assert cache.get("hook", False) is None
+
+    def test_does_not_cache_without_redis(self):
+        cache = _cache()
+        with patch("services.trigger.webhook_routing_cache.redis_client.mget", side_effect=ConnectionError):
+            _store(cache)
+
+        assert len(cache._routes) == 0
+
+    def test_disabled(self, fake_redis):
+        cache = _cache(enabled=False)
+        _store(cache, versions=(None, None))
+
+        assert cache.get("hook", False) is None
@@ -1,5 +1,6 @@
 import dataclasses
 import secrets
+import threading
 import uuid
 from unittest.mock import MagicMock, Mock, patch
 
@@ -22,6 +23,8 @@ from models.workflow import (
     is_system_variable_editable,
 )
 from services.workflow_draft_variable_service import (
+    BufferedDraftVariableSaverFactory,
+    DraftVariableBatch,
     DraftVariableSaver,
     VariableResetError,
     WorkflowDraftVariableService,
@@ -182,6 +185,81 @@ class TestDraftVariableSaver:
         draft_vars = mock_batch_upsert.call_args[0][1]
         assert len(draft_vars) == 2
 
+    @patch("services.workflow_draft_variable_service._batch_upsert_draft_variable")
+    def test_save_offloads_large_variables_concurrently(self, mock_batch_upsert, draft_saver):
+        barrier = threading.Barrier(2, timeout=5)
+        var_files = {name: WorkflowDraftVariableFile(id=str(uuidv7())) for name in ("a", "b")}
+
+        def _offload(name, value):
+            # Both uploads must be in flight at the same time to pass the barrier
+            barrier.wait()
+            return StringSegment(value="truncated"), var_files[name]
+
+        with patch.object(DraftVariableSaver, "_try_offload_large_variable", side_effect=_offload):
+            draft_saver.save(outputs={"a": "x" * 10, "b": "y" * 10})
+
+        draft_vars = mock_batch_upsert.call_args[0][1]
+        assert [(v.name, v.file_id) for v in draft_vars] == [("a", var_files["a"].id), ("b", var_files["b"].id)]
+
+
+def _conversation_variable(name: str, value: str) -> WorkflowDraftVariable:
+    return WorkflowDraftVariable.new_conversation_variable(app_id="app", name=name, value=StringSegment(value=value))
+
+
+@patch("services.workflow_draft_variable_service.Session")
+@patch("services.workflow_draft_variable_service._batch_upsert_draft_variable")
+class TestDraftVariableBatch:
+    def test_buffers_until_flush_and_keeps_latest_value(self, mock_batch_upsert, mock_session_cls, mock_engine):
+        batch = DraftVariableBatch(mock_engine, flush_threshold=10)
+
+        batch.add([_conversation_variable("counter", "1"), _conversation_variable("name", "a")])
+        batch.add([_conversation_variable("counter", "2")])
+        mock_batch_upsert.assert_not_called()
+
+        batch.flush()
+        batch.flush()
+
+        mock_batch_upsert.assert_called_once()
+        written = {v.name: v.get_value().value for v in mock_batch_upsert.call_args[0][1]}
+        assert written == {"counter": "2", "name": "a"}
+
+    def test_flushes_at_threshold(self, mock_batch_upsert, mock_session_cls, mock_engine):
+        batch = DraftVariableBatch(mock_engine, flush_threshold=2)
+
+        batch.add([_conversation_variable("a", "1")])
+        mock_batch_upsert.assert_not_called()
+        batch.add([_conversation_variable("b", "1")])
+
+        mock_batch_upsert.assert_called_once()
+
+    def test_skips_values_unchanged_since_last_write(self, mock_batch_upsert, mock_session_cls, mock_engine):
+        batch = DraftVariableBatch(mock_engine, flush_threshold=10)
+        batch.add([_conversation_variable("a", "1"), _conversation_variable("b", "1")])
+        batch.flush()
+
+        batch.add([_conversation_variable("a", "1"), _conversation_variable("b", "2")])
+        batch.flush()
+
+        assert [v.name for v in mock_batch_upsert.call_args[0][1]] == ["b"]
+
+    def test_factory_savers_share_the_batch(self, mock_batch_upsert, mock_session_cls, mock_engine):
+        factory = BufferedDraftVariableSaverFactory(MagicMock(spec=Account), DraftVariableBatch(mock_engine))
+        for node_id in ("node-1", "node-2"):
+            saver = factory(
+                session=MagicMock(spec=Session),
+                app_id="app",
+                node_id=node_id,
+                node_type=NodeType.LLM,
+                node_execution_id=f"{node_id}-execution",
+            )
+            saver.save(outputs={"text": "hello"})
+        mock_batch_upsert.assert_not_called()
+
+        factory.flush()
+
+        mock_batch_upsert.assert_called_once()
+        assert {v.node_id for v in mock_batch_upsert.call_args[0][1]} == {"node-1", "node-2"}
+
 
 class TestWorkflowDraftVariableService:
     def _get_test_app_id(self):
@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from tasks.generate_summary_index_task import generate_summary_index_task
+
+MODULE = "tasks.generate_summary_index_task"
+
+
+@pytest.fixture
+def mock_session():
+    session = MagicMock()
+    session.query.return_value.where.return_value.first.side_effect = [
+        SimpleNamespace(
+            id="dataset-1",
+            indexing_technique="high_quality",
+            summary_index_setting={"enable": True},
+            chunk_structure="text_model",
+        ),
+        SimpleNamespace(id="doc-1", need_summary=True),
+    ]
+    with patch(f"{MODULE}.session_factory") as mock_session_factory:
+        mock_session_factory.create_session.return_value.__enter__.return_value = session
+        yield session
+
+
+def _run(delivery_info: dict | None, segment_ids: list[str] | None = None) -> dict:
+    generate_summary_index_task.push_request(delivery_info=delivery_info)
+    try:
+        with patch(f"{MODULE}.SummaryIndexService.generate_summaries_for_document", return_value=[]) as mock_generate:
+            generate_summary_index_task.run("dataset-1", "doc-1", segment_ids)
+    finally:
+        generate_summary_index_task.pop_request()
+    return mock_generate.call_args.kwargs
+
+
+@pytest.mark.usefixtures("mock_session")
+class TestGenerateSummaryIndexTask:
+    def test_first_delivery_regenerates_all_summaries(self):
+        assert _run({"redelivered": False})["skip_completed"] is False
+
+    def test_redelivered_task_skips_completed_summaries(self):
+        assert _run({"redelivered": True})["skip_completed"] is True
+
+    def test_redelivered_task_for_selected_segments_regenerates_them(self):
+        assert _run({"redelivered": True}, segment_ids=["seg-1"])["skip_completed"] is False
@@ -0,0 +1,123 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from redis import RedisError
+
+from services.workflow.entities import WorkflowScheduleCFSPlanEntity
+from services.workflow.scheduler import SchedulerCommand
+from tasks.workflow_cfs_scheduler.cfs_scheduler import AsyncWorkflowCFSPlanEntity, AsyncWorkflowCFSPlanScheduler
+from tasks.workflow_cfs_scheduler.entities import AsyncWorkflowQueue
+
+MODULE = "tasks.workflow_cfs_scheduler.cfs_scheduler"
+
+
+def _scheduler(
+    strategy: WorkflowScheduleCFSPlanEntity.Strategy = WorkflowScheduleCFSPlanEntity.Strategy.TimeSlice,
+    tenant_id: str | None = "tenant-1",
+    weight: float = 1.0,
+) -> AsyncWorkflowCFSPlanScheduler:
+    plan = AsyncWorkflowCFSPlanEntity(
+        queue=AsyncWorkflowQueue.PROFESSIONAL_QUEUE,
+        tenant_id=tenant_id,
+        schedule_strategy=strategy,
+        granularity=10,
+        weight=weight,
+    )
+    return AsyncWorkflowCFSPlanScheduler(plan=plan)
+
+
+@pytest.fixture
+def redis_client():
+    with patch(f"{MODULE}.redis_client") as client:
+        client.eval.return_value = 0
+        yield client
+
+
+@pytest.fixture
+def clock():
+    now = SimpleNamespace(value=100.0)
+    fake_time = SimpleNamespace(time=lambda: 1_700_000_000.0, monotonic=lambda: now.value)
+    with patch(f"{MODULE}.time", fake_time):
+        yield now
+
+
+def _call_args(redis_client: MagicMock) -> tuple:
+    return redis_client.eval.call_args.args
+
+
+@pytest.mark.parametrize(
+    "scheduler",
+    [
+        _scheduler(strategy=WorkflowScheduleCFSPlanEntity.Strategy.Nop),
+        _scheduler(tenant_id=None),
+    ],
+)
+def test_disabled_plans_are_always_scheduled(redis_client, scheduler):
+    scheduler.enqueue()
+    assert scheduler.admit() == SchedulerCommand.NONE
+    assert scheduler.can_schedule() == SchedulerCommand.NONE
+    scheduler.release()
+
+    redis_client.eval.assert_not_called()
+
+
+def test_admit_passes_tenant_and_run_cost(redis_client, clock):
+    scheduler = _scheduler(weight=2.0)
+
+    assert scheduler.admit() == SchedulerCommand.NONE
+
+    args = _call_args(redis_client)
+    assert args[1] == 5
+    assert args[2:7] == tuple(
+        f"workflow_cfs:{{{AsyncWorkflowQueue.PROFESSIONAL_QUEUE.value}}}:{key}"
+        for key in ("vruntime", "inflight", "waiting", "seen", "reserved")
+    )
+    operation, tenant_id, _, charge, cost, slack, _ = args[7:]
+    assert (operation, tenant_id, charge, cost, slack) == ("admit", "tenant-1", 0.0, 5.0, 10)
+
+
+def test_ticks_charge_weighted_runtime_since_last_check(redis_client, clock):
+    scheduler = _scheduler(weight=2.0)
+    scheduler.admit()
+
+    clock.value += 10
+    scheduler.can_schedule()
+    assert _call_args(redis_client)[7] == "tick"
+    assert _call_args(redis_client)[10] == 5.0
+
+    clock.value += 4
+    scheduler.release()
+    assert _call_args(redis_client)[7] == "release"
+    assert _call_args(redis_client)[10] == 2.0
+
+
+def test_yield_is_reported_as_resource_limit_reached(redis_client, clock):
+    redis_client.eval.return_value = 1
+    scheduler = _scheduler()
+
+    assert scheduler.admit() == SchedulerCommand.RESOURCE_LIMIT_REACHED
+    assert scheduler.can_schedule() == SchedulerCommand.RESOURCE_LIMIT_REACHED
+
+
+def test_redis_errors_do_not_block_runs(redis_client, clock):
+    redis_client.eval.side_effect = RedisError("down")
+    scheduler = _scheduler()
+
+    assert scheduler.admit() == SchedulerCommand.NONE
+    assert scheduler.can_schedule() == SchedulerCommand.NONE
+
+
+def test_batch_checks_run_in_one_pipeline(redis_client, clock):
+    pipe = redis_client.pipeline.return_value
+    pipe.execute.return_value = [1, RedisError("busy")]
+    script = redis_client.register_script.return_value
+    schedulers = [_scheduler(tenant_id="tenant-1"), _scheduler(tenant_id=None), _scheduler(tenant_id="tenant-2")]
+
+    commands = AsyncWorkflowCFSPlanScheduler.can_schedule_batch(schedulers)
+
+    assert commands == [SchedulerCommand.RESOURCE_LIMIT_REACHED, SchedulerCommand.NONE, SchedulerCommand.NONE]
+    assert [call.kwargs["args"][:2] for call in script.call_args_list] == [["tick", "tenant-1"], ["tick", "tenant-2"]]
+    assert all(call.kwargs["client"] is pipe for call in script.call_args_list)
+    pipe.execute.assert_called_once()
+    redis_client.eval.assert_not_called()
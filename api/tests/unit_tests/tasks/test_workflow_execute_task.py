@@ -6,6 +6,7 @@ from unittest.mock import MagicMock
 
 import pytest
 
+from core.app.apps.stream_event_encoder import EncodedStreamEvent
 from models.model import AppMode
 from tasks.app_generate.workflow_execute_task import _publish_streaming_response
 
@@ -37,3 +38,11 @@ def test_publish_streaming_response_coerces_string_uuid(mock_topic: MagicMock):
     _publish_streaming_response(response_stream, str(workflow_run_id), app_mode=AppMode.ADVANCED_CHAT)
 
     mock_topic.publish.assert_called_once_with(json.dumps({"event": "bar"}).encode())
+
+
+def test_publish_streaming_response_publishes_encoded_events_as_is(mock_topic: MagicMock):
+    event = EncodedStreamEvent(event="message", data='{"event":"message","answer":"hi"}')
+
+    _publish_streaming_response(iter([event]), str(uuid.uuid4()), app_mode=AppMode.ADVANCED_CHAT)
+
+    mock_topic.publish.assert_called_once_with(b'{"event":"message","answer":"hi"}')